@@ -5,6 +5,8 @@ if [ "$1" == 'pylint_check' ]; then
     venv/bin/python -m pylint $(git ls-files 'src/*.py')
 elif [ "$1" == 'pyright_check' ]; then
     venv/bin/python -m pyright $(git ls-files 'src/*.py')
+elif [ "$1" == 'tests' ]; then
+    venv/bin/python -m pytest -q
 else
     venv/bin/python -m isort --check $(git ls-files 'src/*.py')
 fi
@@ -6,6 +6,8 @@ if [ "$1" == 'pylint_check' ]; then
     pip install pylint
 elif [ "$1" == 'pyright_check' ]; then
     pip install pyright
+elif [ "$1" == 'tests' ]; then
+    pip install -r requirements.txt pytest
 else
     pip install isort
 fi
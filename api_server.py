@@ -0,0 +1,171 @@
+"""
+Headless HTTP API for the qualification queries of the registered tournaments, for bots and dashboards, alongside the
+Streamlit app. It answers from the same tournament snapshots as the tournament pages, which it keeps polling.
+
+Every query answer is streamed as newline-delimited JSON, one document per line, tagged with the index of the query
+it answers: scenarios are sent one by one as they are found, and every query ends with a document of its kind, or
+with an error document carrying an HTTP status. Scenarios and probabilities stop with what they have once the time
+budget of the query runs out.
+
+Endpoints:
+    GET  /v1/tournaments
+    GET  /v1/tournaments/<tournament>/standings
+    GET  /v1/tournaments/<tournament>/feasibility?team=...&top_x_position_in_the_table=4
+    GET  /v1/tournaments/<tournament>/scenarios?team=...&number_of_scenarios=3&time_budget_in_seconds=5
+    GET  /v1/tournaments/<tournament>/probabilities?maximum_number_of_samples=100000&seed=0
+    POST /v1/queries, with {"queries": [{"kind": "scenarios", "tournament": ..., "team": ...}, ...],
+         "time_budget_in_seconds": 20}
+
+<tournament> is the name or the ESPNcricinfo seriesId of a tournament of the registry.
+
+Usage:
+    python api_server.py --port 8600
+"""
+import argparse
+import asyncio
+import json
+import logging
+import os
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, Iterator, List, Optional, Union
+import tornado.web
+from tornado.iostream import StreamClosedError
+from src.functions.scenario_api import (
+    MAXIMUM_TIME_BUDGET_IN_SECONDS,
+    QUERY_KINDS,
+    Query,
+    QueryError,
+    ScenarioApi
+)
+
+NDJSON_CONTENT_TYPE = "application/x-ndjson"
+MAXIMUM_NUMBER_OF_QUERIES_PER_BATCH = 100
+
+
+def _to_json_value(value: Any) -> Any:
+    """Converts the numpy scalars of the answers, which `json` does not know."""
+    if hasattr(value, "item"):
+        return value.item()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def _encode(document: Any) -> str:
+    return json.dumps(document, default=_to_json_value, allow_nan=False)
+
+
+class _ApiHandler(tornado.web.RequestHandler):     # pylint: disable = abstract-method
+
+    def initialize(     # pylint: disable = arguments-differ, attribute-defined-outside-init
+        self, scenario_api: ScenarioApi, executor: ThreadPoolExecutor
+    ):
+        self.scenario_api = scenario_api
+        self.executor = executor
+        self.is_connection_closed = False
+
+    def on_connection_close(self):
+        self.is_connection_closed = True     # pylint: disable = attribute-defined-outside-init
+
+    def write_error_document(self, query_error: QueryError):
+        self.set_status(query_error.status)
+        self.set_header("Content-Type", "application/json")
+        self.finish(_encode({"type": "error", "status": query_error.status, "error": str(query_error)}))
+
+    async def stream_answers(self, queries: List[Union[Query, QueryError]], time_budget_in_seconds: Optional[float] = None):
+        """
+        Sends the answers line by line as they come. The queries run on the executor, so that the server keeps
+        answering other requests meanwhile, and stop as soon as the client disconnects.
+        """
+        self.set_header("Content-Type", NDJSON_CONTENT_TYPE)
+        answers: Iterator[Dict[str, Any]] = self.scenario_api.iterate_answers(
+            queries, time_budget_in_seconds, is_cancelled=lambda: self.is_connection_closed
+        )
+        loop = asyncio.get_running_loop()
+        try:
+            while not self.is_connection_closed:
+                document = await loop.run_in_executor(self.executor, next, answers, None)
+                if document is None:
+                    break
+                if len(queries) == 1 and document["type"] == "error":
+                    self.set_status(document["status"])     # nothing is sent before the first line, so its status still fits
+                self.write(_encode(document) + "\n")
+                await self.flush()
+        except StreamClosedError:
+            return
+        self.finish()
+
+
+class TournamentsHandler(_ApiHandler):     # pylint: disable = abstract-method
+
+    def get(self):
+        self.set_header("Content-Type", "application/json")
+        self.finish(_encode(self.scenario_api.list_tournaments()))
+
+
+class QueryHandler(_ApiHandler):     # pylint: disable = abstract-method
+
+    async def get(self, tournament: str, kind: str):     # pylint: disable = arguments-differ
+        document = {name: self.get_argument(name) for name in self.request.arguments}
+        try:
+            query = Query.from_document({**document, "kind": kind, "tournament": tournament})
+            self.scenario_api.find_tournament(query.tournament)
+        except QueryError as query_error:
+            self.write_error_document(query_error)
+            return
+        await self.stream_answers([query])
+
+
+class BatchQueryHandler(_ApiHandler):     # pylint: disable = abstract-method
+
+    async def post(self):
+        try:
+            body = json.loads(self.request.body or b"null")
+            if not isinstance(body, dict) or not isinstance(body.get("queries"), list):
+                raise QueryError(400, "The body must be a JSON object with a list of 'queries'")
+            if len(body["queries"]) > MAXIMUM_NUMBER_OF_QUERIES_PER_BATCH:
+                raise QueryError(400, f"A batch holds at most {MAXIMUM_NUMBER_OF_QUERIES_PER_BATCH} queries")
+            time_budget_in_seconds = float(body.get("time_budget_in_seconds", MAXIMUM_TIME_BUDGET_IN_SECONDS))
+        except (ValueError, TypeError) as exception:
+            self.write_error_document(exception if isinstance(exception, QueryError) else QueryError(400, f"Invalid body: {exception}"))
+            return
+        queries: List[Union[Query, QueryError]] = []
+        for query_document in body["queries"]:
+            try:
+                queries.append(Query.from_document(query_document if isinstance(query_document, dict) else {}))
+            except QueryError as query_error:
+                queries.append(query_error)
+        await self.stream_answers(queries, min(max(time_budget_in_seconds, 0), MAXIMUM_TIME_BUDGET_IN_SECONDS))
+
+
+def make_application(scenario_api: ScenarioApi, executor: ThreadPoolExecutor) -> tornado.web.Application:
+    handler_arguments = {"scenario_api": scenario_api, "executor": executor}
+    return tornado.web.Application([
+        (r"/v1/tournaments", TournamentsHandler, handler_arguments),
+        (rf"/v1/tournaments/([^/]+)/({'|'.join(QUERY_KINDS)})", QueryHandler, handler_arguments),
+        (r"/v1/queries", BatchQueryHandler, handler_arguments),
+    ])
+
+
+async def _serve(arguments: argparse.Namespace):
+    scenario_api = ScenarioApi()
+    scenario_api.refresher.start()
+    with ThreadPoolExecutor(max_workers=arguments.workers, thread_name_prefix="api-query") as executor:
+        make_application(scenario_api, executor).listen(arguments.port, address=arguments.host)
+        logging.getLogger(__name__).info("Serving the API on http://%s:%d", arguments.host, arguments.port)
+        await asyncio.Event().wait()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8600)
+    parser.add_argument(
+        "--workers", type=int, default=min(4, os.cpu_count() or 1),
+        help="Threads the queries run on. Searches hold the GIL, so more threads mostly keep short queries from queueing behind long ones"
+    )
+    arguments = parser.parse_args()
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(name)s: %(message)s")
+    asyncio.run(_serve(arguments))
+
+
+if __name__ == "__main__":
+    main()
@@ -1,7 +1,11 @@
 import streamlit as st
-from src.views.custom_schedule.custom_schedule import simulate_the_qualification_for_custom_schedule
-from src.views.homepage import homepage
-from src.views.tournament import simulate_for_ipl
+from src.functions.instrumentation import (
+    enable_request_log,
+    is_request_log_enabled,
+    trace_request
+)
+from src.functions.lazy_pages import LazyPage, start_prewarming
+from src.functions.tournament_registry import load_tournament_registry
 
 st.set_page_config(
     # initial_sidebar_state="expanded",
@@ -11,11 +15,44 @@ st.set_page_config(
 )
 
 
+def _start_tournament_refresher():
+    from src.functions.tournament_refresher import tournament_refresher     # pylint: disable = import-outside-toplevel
+    tournament_refresher.start()
+
+
+def _prewarm_worker_pool():
+    from src.functions.parallel_scenario_search import prewarm_worker_pool     # pylint: disable = import-outside-toplevel
+    prewarm_worker_pool()
+
+
+# Each page module, along with pandas, requests and the simulator behind it, is only imported once the page is opened,
+# so that the sidebar and the home page render first on a cold start. The tournaments come from the registry
+# (src/static/tournaments.json).
 page_names_to_funcs = {
-    "Home": homepage,
-    "Indian Premier League (IPL)": simulate_for_ipl,
-    "Custom Schedule": simulate_the_qualification_for_custom_schedule
+    "Home": LazyPage("src.views.homepage", "homepage"),
+    **{
+        tournament.name: LazyPage("src.views.tournament", "simulate_for_tournament", (tournament,))
+        for tournament in load_tournament_registry()
+    },
+    "Custom Schedule": LazyPage("src.views.custom_schedule.custom_schedule", "simulate_the_qualification_for_custom_schedule"),
 }
 
+# Every page run is traced when the request log is enabled, or when the URL carries "?debug", which also shows where the
+# time of the run went at the bottom of the page. "?debug=profile" runs the page under cProfile as well.
+if is_request_log_enabled():
+    enable_request_log()
+debug_mode = st.query_params.get("debug")
+
 demo_name = st.sidebar.selectbox("Pages", page_names_to_funcs.keys())
-page_names_to_funcs[demo_name]()
+with trace_request(demo_name, is_enabled=debug_mode is not None or is_request_log_enabled(), is_profiled=debug_mode == "profile") as request_trace:
+    page_names_to_funcs[demo_name]()
+if debug_mode is not None and request_trace is not None:
+    from src.functions.streamlit_view_functions import _display_request_trace     # pylint: disable = import-outside-toplevel
+    _display_request_trace(request_trace)
+
+# Once the first page is out, the other pages are loaded and the tournaments polled in the background from then on, so
+# that their pages are ready before anyone opens them. The worker processes of the parallel search are forked last, so
+# that they start with the page modules already imported. Outside of a Streamlit server, such as in
+# `python -X importtime`, nothing is started.
+if st.runtime.exists():
+    start_prewarming(page_names_to_funcs.values(), warm_ups=[_start_tournament_refresher, _prewarm_worker_pool])
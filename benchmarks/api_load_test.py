@@ -0,0 +1,219 @@
+"""
+Load test of the headless API: concurrent clients send a mix of standings, feasibility, scenarios, probabilities and
+batch requests, and the p50 and p99 latency of each, along with the throughput, are reported.
+
+Unless `--url` points at a running instance, a local one is started with `python api_server.py`, on a synthetic
+tournament served by a stub of ESPNcricinfo, since the load test must not depend on the network. Latencies run until
+the last line of the streamed answer is read, and every distinct request is sent once beforehand, so that building
+the search and deriving the conditions are left out. Error answers, such as the scenarios of an eliminated team, are
+counted along with the queries whose time budget ran out.
+
+Usage:
+    python -m benchmarks.api_load_test
+    python -m benchmarks.api_load_test --url http://127.0.0.1:8600 --tournament 1410320
+"""
+import argparse
+import collections
+import contextlib
+import http.server
+import json
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import urllib.error
+import urllib.parse
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Iterator, List, Optional, Tuple
+from benchmarks.synthetic_tournaments import (
+    generate_espncricinfo_responses,
+    generate_tournament_schedule
+)
+
+REPOSITORY_DIRECTORY = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SYNTHETIC_TOURNAMENT = {"name": "Synthetic League", "series_id": 1, "refresh_interval_in_seconds": 3600}
+SERVER_START_TIMEOUT_IN_SECONDS = 60
+REQUEST_KINDS = ("standings", "feasibility", "scenarios", "probabilities", "batch")
+
+Request = Tuple[str, str, Optional[bytes]]
+
+
+def _get_free_port() -> int:
+    with socket.socket() as free_socket:
+        free_socket.bind(("127.0.0.1", 0))
+        return free_socket.getsockname()[1]
+
+
+@contextlib.contextmanager
+def _serve_synthetic_espncricinfo(number_of_teams: int, number_of_remaining_matches: int, seed: int) -> Iterator[str]:
+    """Serves the schedule and standings responses of a synthetic tournament, whatever the seriesId asked for."""
+    schedule_response, standings_response = generate_espncricinfo_responses(
+        generate_tournament_schedule(number_of_teams, number_of_remaining_matches, seed=seed)
+    )
+    documents = {"schedule": json.dumps(schedule_response).encode(), "standings": json.dumps(standings_response).encode()}
+
+    class StubHandler(http.server.BaseHTTPRequestHandler):
+
+        def do_GET(self):     # pylint: disable = invalid-name
+            document = documents.get(urllib.parse.urlparse(self.path).path.rsplit("/", 1)[-1])
+            self.send_response(200 if document is not None else 404)
+            self.send_header("Content-Type", "application/json")
+            self.end_headers()
+            self.wfile.write(document or b"{}")
+
+        def log_message(self, format, *args):     # pylint: disable = redefined-builtin
+            pass
+
+    stub_server = http.server.ThreadingHTTPServer(("127.0.0.1", 0), StubHandler)
+    threading.Thread(target=stub_server.serve_forever, daemon=True).start()
+    try:
+        yield f"http://127.0.0.1:{stub_server.server_address[1]}/v1/pages/series"
+    finally:
+        stub_server.shutdown()
+
+
+@contextlib.contextmanager
+def _start_local_api_server(espncricinfo_url: str, workers: int) -> Iterator[str]:
+    port = _get_free_port()
+    with tempfile.TemporaryDirectory() as registry_directory:
+        registry_path = os.path.join(registry_directory, "tournaments.json")
+        with open(registry_path, "w", encoding="utf-8") as registry_file:
+            json.dump([SYNTHETIC_TOURNAMENT], registry_file)
+        environment = {**os.environ, "ESPNCRICINFO_SERIES_API_URL": espncricinfo_url, "PLAYOFF_CALCULATOR_TOURNAMENTS": registry_path}
+        with subprocess.Popen(
+            [sys.executable, "api_server.py", "--port", str(port), "--workers", str(workers)],
+            cwd=REPOSITORY_DIRECTORY, env=environment, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+        ) as server_process:
+            try:
+                url = f"http://127.0.0.1:{port}"
+                _wait_for_the_tournament(url, str(SYNTHETIC_TOURNAMENT["series_id"]))
+                yield url
+            finally:
+                server_process.terminate()
+
+
+def _wait_for_the_tournament(url: str, tournament: str) -> None:
+    deadline = time.monotonic() + SERVER_START_TIMEOUT_IN_SECONDS
+    while True:
+        try:
+            if _send((f"{url}/v1/tournaments/{tournament}/standings", "GET", None))[0]["type"] == "standings":
+                return
+        except OSError:
+            pass
+        if time.monotonic() > deadline:
+            raise TimeoutError(f"The API at {url} did not serve the tournament within {SERVER_START_TIMEOUT_IN_SECONDS} seconds")
+        time.sleep(0.2)
+
+
+def _send(request: Request) -> List[Dict]:
+    """Sends a request and reads the streamed answer to its last line, which is an error document on an error status."""
+    url, method, body = request
+    try:
+        with urllib.request.urlopen(urllib.request.Request(url, data=body, method=method), timeout=120) as response:
+            return [json.loads(line) for line in response if line.strip()]
+    except urllib.error.HTTPError as http_error:
+        with http_error:
+            return [json.loads(line) for line in http_error if line.strip()]
+
+
+def _build_requests(url: str, tournament: str, teams: List[str], arguments: argparse.Namespace) -> Dict[str, List[Request]]:
+    tournament_url = f"{url}/v1/tournaments/{urllib.parse.quote(tournament)}"
+    position = f"top_x_position_in_the_table={arguments.top}"
+    budget = f"time_budget_in_seconds={arguments.time_budget}"
+    requests_by_kind: Dict[str, List[Request]] = {
+        "standings": [(f"{tournament_url}/standings", "GET", None)],
+        "probabilities": [(f"{tournament_url}/probabilities?{position}&maximum_number_of_samples={arguments.samples}&seed=0&{budget}", "GET", None)],
+        "feasibility": [],
+        "scenarios": [],
+        "batch": [],
+    }
+    for team in teams:
+        team_argument = f"team={urllib.parse.quote(team)}"
+        requests_by_kind["feasibility"].append((f"{tournament_url}/feasibility?{team_argument}&{position}", "GET", None))
+        requests_by_kind["scenarios"].append(
+            (f"{tournament_url}/scenarios?{team_argument}&{position}&number_of_scenarios={arguments.scenarios}&{budget}", "GET", None)
+        )
+        requests_by_kind["batch"].append((f"{url}/v1/queries", "POST", json.dumps({"queries": [
+            {"kind": "standings", "tournament": tournament},
+            {"kind": "feasibility", "tournament": tournament, "team": team, "top_x_position_in_the_table": arguments.top},
+            {"kind": "scenarios", "tournament": tournament, "team": team, "top_x_position_in_the_table": arguments.top,
+             "number_of_scenarios": arguments.scenarios, "time_budget_in_seconds": arguments.time_budget},
+        ]}).encode()))
+    return requests_by_kind
+
+
+def _percentile(values: List[float], percentile: float) -> float:
+    return statistics.quantiles(values, n=100, method="inclusive")[int(percentile) - 1] if len(values) > 1 else values[0]
+
+
+def _run_load(url: str, tournament: str, arguments: argparse.Namespace) -> None:
+    standings = _send((f"{url}/v1/tournaments/{urllib.parse.quote(tournament)}/standings", "GET", None))[0]
+    teams = [row["team"] for row in standings["points_table"]]
+    requests_by_kind = _build_requests(url, tournament, teams, arguments)
+    for kind_requests in requests_by_kind.values():
+        for request in kind_requests:
+            _send(request)
+
+    schedule = [requests_by_kind[kind][number % len(requests_by_kind[kind])] for number in range(arguments.requests) for kind in REQUEST_KINDS]
+    kinds = [kind for _ in range(arguments.requests) for kind in REQUEST_KINDS]
+    latencies: Dict[str, List[float]] = collections.defaultdict(list)
+    errors: Dict[str, int] = collections.Counter()
+    budgets_exhausted: Dict[str, int] = collections.Counter()
+
+    def send_timed(request_and_kind: Tuple[Request, str]) -> None:
+        request, kind = request_and_kind
+        start_time = time.perf_counter()
+        documents = _send(request)
+        latencies[kind].append(time.perf_counter() - start_time)
+        errors[kind] += sum(document["type"] == "error" for document in documents)
+        budgets_exhausted[kind] += sum(document.get("is_budget_exhausted", False) for document in documents)
+
+    start_time = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=arguments.concurrency) as executor:
+        list(executor.map(send_timed, zip(schedule, kinds)))
+    elapsed_time = time.perf_counter() - start_time
+
+    print(f"{len(schedule)} requests from {arguments.concurrency} concurrent clients in {elapsed_time:.2f} s, {len(schedule) / elapsed_time:.1f} requests/s")
+    print(f"  {'request':<16}{'count':>8}{'p50':>12}{'p99':>12}{'error answers':>16}{'budgets run out':>18}")
+    for kind in REQUEST_KINDS:
+        print(
+            f"  {kind:<16}{len(latencies[kind]):>8}{_percentile(latencies[kind], 50) * 1000:>9.1f} ms"
+            f"{_percentile(latencies[kind], 99) * 1000:>9.1f} ms{errors[kind]:>16}{budgets_exhausted[kind]:>18}"
+        )
+    all_latencies = [latency for kind_latencies in latencies.values() for latency in kind_latencies]
+    print(f"  {'all':<16}{len(all_latencies):>8}{_percentile(all_latencies, 50) * 1000:>9.1f} ms{_percentile(all_latencies, 99) * 1000:>9.1f} ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--url", help="URL of a running instance. Starts a local one on a synthetic tournament by default")
+    parser.add_argument("--tournament", help="Name or seriesId of the tournament of the running instance")
+    parser.add_argument("--requests", type=int, default=40, help="Requests of every kind")
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--workers", type=int, default=4, help="Query threads of the local instance")
+    parser.add_argument("--teams", type=int, default=10)
+    parser.add_argument("--remaining-matches", type=int, default=18)
+    parser.add_argument("--top", type=int, default=4)
+    parser.add_argument("--scenarios", type=int, default=5)
+    parser.add_argument("--samples", type=int, default=100_000, help="Maximum number of samples of the probabilities")
+    parser.add_argument("--time-budget", type=float, default=5.0, help="Time budget of every query, in seconds")
+    parser.add_argument("--seed", type=int, default=3)
+    arguments = parser.parse_args()
+
+    if arguments.url is not None:
+        if arguments.tournament is None:
+            parser.error("--tournament is required along with --url")
+        _run_load(arguments.url.rstrip("/"), arguments.tournament, arguments)
+        return
+    with _serve_synthetic_espncricinfo(arguments.teams, arguments.remaining_matches, arguments.seed) as espncricinfo_url:
+        with _start_local_api_server(espncricinfo_url, arguments.workers) as url:
+            _run_load(url, str(SYNTHETIC_TOURNAMENT["series_id"]), arguments)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,301 @@
+"""
+Benchmark suite for the hot paths behind qualification scenario generation, to tell whether a code change or a library
+bump made them slower.
+
+`run` times, on synthetic tournaments of 8 to 20 teams with 0 to 40 remaining matches, draws and no results:
+    - parse_fixture, parse_points_table: parsing ESPNcricinfo schedule and standings responses, match by match and team
+      by team. Responses recorded with `record` are decoded from their raw bytes and parsed as well, from
+      benchmarks/recordings/<seriesId>. The synthetic responses leave out most fields of the real ones and the playoff
+      matches, so `run` warns when there is no recording to parse.
+    - simulator: building the `PointsTableSimulator`, which rejects a completed tournament.
+    - search: finding the qualification scenarios of the first team in contention outside the top positions.
+    - render: preparing those scenarios with `_display_qualification_scenarios`, outside of a Streamlit server.
+Every benchmark is looped until a sample takes about 0.2 seconds, and the median and best time per call are written to
+a JSON file along with the Python, platform and package versions. Requests the search refuses, such as those below the
+completion cutoff, are listed as skipped.
+
+`compare` flags the benchmarks whose median time grew by more than the threshold between two result files, and exits
+with status 1 if any did. `record` saves the responses of an ESPNcricinfo series byte for byte, once the fixture
+collector parses them, which needs network access.
+
+Usage:
+    python -m benchmarks.benchmark_suite run --output benchmark_results.json
+    python -m benchmarks.benchmark_suite compare baseline.json benchmark_results.json
+    python -m benchmarks.benchmark_suite record --tournament-id 1410320
+"""
+import argparse
+import datetime
+import importlib.metadata
+import json
+import logging
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import timeit
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+from points_table_simulator import PointsTableSimulator
+from points_table_simulator.exceptions import (
+    AllMatchesCompletedError,
+    NoQualifyingScenariosError,
+    TournamentCompletionBelowCutoffError
+)
+from benchmarks.synthetic_tournaments import (
+    build_points_table_simulator,
+    generate_espncricinfo_responses,
+    generate_tournament_schedule
+)
+from src.functions.fixture_collector import (
+    ESPNCRICINFO_SERIES_API_URL,
+    _parse_fixture_response,
+    _parse_points_table_response,
+    espncricinfo_fetcher
+)
+from src.functions.qualification_scenario_search import (
+    QualificationScenarioSearch
+)
+from src.functions.qualification_verdict import QualificationVerdict
+from src.functions.streamlit_view_functions import (
+    _display_qualification_scenarios
+)
+
+RESULTS_SCHEMA_VERSION = 1
+RECORDINGS_DIRECTORY = os.path.join(os.path.dirname(os.path.abspath(__file__)), "recordings")
+PACKAGES = ("numpy", "pandas", "pyarrow", "streamlit", "points-table-simulator")
+MINIMUM_SAMPLE_TIME_IN_SECONDS = 0.2
+TOP_X_POSITION_IN_THE_TABLE = 4
+NUMBER_OF_SCENARIOS = 10
+
+
+def _time(function: Callable[[], object], repeats: int) -> Dict[str, float]:
+    """Times `function` as `timeit` does, with enough calls per sample for the sample to take about 0.2 seconds."""
+    timer = timeit.Timer(function)
+    number_of_calls = 1
+    while timer.timeit(number_of_calls) < MINIMUM_SAMPLE_TIME_IN_SECONDS and number_of_calls < 1_000_000:
+        number_of_calls *= 10
+    times_per_call = [sample / number_of_calls for sample in timer.repeat(repeat=repeats, number=number_of_calls)]
+    return {
+        "median_seconds": statistics.median(times_per_call),
+        "best_seconds": min(times_per_call),
+        "calls_per_sample": number_of_calls,
+        "samples": repeats,
+    }
+
+
+def _build_simulator_or_not(schedule) -> Optional[PointsTableSimulator]:
+    try:
+        return build_points_table_simulator(schedule)
+    except AllMatchesCompletedError:
+        return None
+
+
+def _get_team_in_contention(search: QualificationScenarioSearch) -> Optional[str]:
+    """Returns the best placed team outside the top positions that can still reach them, if any."""
+    teams_by_points = sorted(search.teams, key=lambda team: -search.current_points[search.team_index[team]])
+    for team_name in teams_by_points[TOP_X_POSITION_IN_THE_TABLE:]:
+        if search.get_qualification_verdict(team_name, TOP_X_POSITION_IN_THE_TABLE) == QualificationVerdict.IN_CONTENTION:
+            return team_name
+    return None
+
+
+def _iterate_recordings() -> Iterator[Tuple[str, bytes, bytes]]:
+    """Yields the name and the raw schedule and standings responses of every recorded series."""
+    if not os.path.isdir(RECORDINGS_DIRECTORY):
+        return
+    for tournament_id in sorted(os.listdir(RECORDINGS_DIRECTORY)):
+        with open(os.path.join(RECORDINGS_DIRECTORY, tournament_id, "schedule.json"), "rb") as schedule_file:
+            schedule_response = schedule_file.read()
+        with open(os.path.join(RECORDINGS_DIRECTORY, tournament_id, "standings.json"), "rb") as standings_file:
+            standings_response = standings_file.read()
+        yield f"recorded-{tournament_id}", schedule_response, standings_response
+
+
+def _run_benchmarks(arguments: argparse.Namespace) -> Tuple[Dict[str, Dict[str, float]], Dict[str, str]]:
+    benchmarks: Dict[str, Callable[[], object]] = {}
+    skipped: Dict[str, str] = {}
+    for name, schedule_response, standings_response in _iterate_recordings():
+        benchmarks[f"parse_fixture/{name}"] = lambda response=schedule_response: _parse_fixture_response(json.loads(response))
+        benchmarks[f"parse_points_table/{name}"] = lambda response=standings_response: _parse_points_table_response(json.loads(response))
+    if not benchmarks:
+        print(
+            f"  No ESPNcricinfo recording in {RECORDINGS_DIRECTORY}, the parsers only run on synthetic responses. "
+            "Add one with `record`.",
+            file=sys.stderr,
+        )
+
+    for number_of_teams in arguments.teams:
+        schedule_response, standings_response = generate_espncricinfo_responses(generate_tournament_schedule(
+            number_of_teams, max(arguments.remaining_matches), seed=arguments.seed,
+            draw_probability=arguments.draw_probability, no_result_probability=arguments.no_result_probability,
+        ))
+        benchmarks[f"parse_fixture/synthetic-{number_of_teams:02d}-teams"] = lambda response=schedule_response: _parse_fixture_response(response)
+        benchmarks[f"parse_points_table/synthetic-{number_of_teams:02d}-teams"] = (
+            lambda response=standings_response: _parse_points_table_response(response)
+        )
+
+        for number_of_remaining_matches in arguments.remaining_matches:
+            case_name = f"{number_of_teams:02d}-teams-{number_of_remaining_matches:02d}-remaining"
+            schedule = generate_tournament_schedule(
+                number_of_teams, number_of_remaining_matches, seed=arguments.seed,
+                draw_probability=arguments.draw_probability, no_result_probability=arguments.no_result_probability,
+            )
+            benchmarks[f"simulator/{case_name}"] = lambda schedule=schedule: _build_simulator_or_not(schedule)
+            points_table_simulator = _build_simulator_or_not(schedule)
+            if points_table_simulator is None:
+                skipped[f"search/{case_name}"] = skipped[f"render/{case_name}"] = "all matches are completed"
+                continue
+            search = QualificationScenarioSearch(points_table_simulator)
+            team_name = _get_team_in_contention(search)
+            if team_name is None:
+                skipped[f"search/{case_name}"] = skipped[f"render/{case_name}"] = "no team outside the top positions is in contention"
+                continue
+            try:
+                list_of_points_tables, list_of_qualification_scenarios = search.simulate_the_qualification_scenarios(
+                    team_name, TOP_X_POSITION_IN_THE_TABLE, NUMBER_OF_SCENARIOS
+                )
+            except (TournamentCompletionBelowCutoffError, NoQualifyingScenariosError) as exception:
+                skipped[f"search/{case_name}"] = skipped[f"render/{case_name}"] = type(exception).__name__
+                continue
+            benchmarks[f"search/{case_name}"] = lambda search=search, team_name=team_name: search.simulate_the_qualification_scenarios(
+                team_name, TOP_X_POSITION_IN_THE_TABLE, NUMBER_OF_SCENARIOS
+            )
+            benchmarks[f"render/{case_name}"] = lambda tables=(list_of_points_tables, list_of_qualification_scenarios), team_name=team_name: (
+                _display_qualification_scenarios(*tables, team_name)
+            )
+
+    results = {}
+    for name, function in benchmarks.items():
+        if arguments.filter and arguments.filter not in name:
+            continue
+        results[name] = _time(function, arguments.repeats)
+        print(f"  {name:<44}{results[name]['median_seconds'] * 1000:>12.3f} ms", file=sys.stderr)
+    return results, skipped
+
+
+def _get_environment() -> Dict[str, object]:
+    packages = {}
+    for package in PACKAGES:
+        try:
+            packages[package] = importlib.metadata.version(package)
+        except importlib.metadata.PackageNotFoundError:
+            packages[package] = None
+    try:
+        git_commit = subprocess.run(
+            ["git", "rev-parse", "HEAD"], capture_output=True, check=True, text=True, cwd=os.path.dirname(RECORDINGS_DIRECTORY)
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        git_commit = None
+    return {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "processor": platform.processor(),
+        "cpu_count": os.cpu_count(),
+        "packages": packages,
+        "git_commit": git_commit,
+        "created_at": datetime.datetime.now(datetime.timezone.utc).isoformat(timespec="seconds"),
+    }
+
+
+def run(arguments: argparse.Namespace) -> int:
+    logging.disable(logging.WARNING)   # Streamlit warns about the missing ScriptRunContext on every element
+    results, skipped = _run_benchmarks(arguments)
+    with open(arguments.output, "w", encoding="utf-8") as output_file:
+        json.dump(
+            {"schema_version": RESULTS_SCHEMA_VERSION, "environment": _get_environment(), "benchmarks": results, "skipped": skipped},
+            output_file,
+            indent=2,
+            sort_keys=True,
+        )
+    print(f"Wrote {len(results)} benchmarks to {arguments.output}, skipped {len(skipped)}")
+    return 0
+
+
+def compare(arguments: argparse.Namespace) -> int:
+    with open(arguments.baseline, encoding="utf-8") as baseline_file:
+        baseline = json.load(baseline_file)
+    with open(arguments.current, encoding="utf-8") as current_file:
+        current = json.load(current_file)
+
+    for package, version in current["environment"]["packages"].items():
+        baseline_version = baseline["environment"]["packages"].get(package)
+        if baseline_version != version:
+            print(f"{package} changed from {baseline_version} to {version}")
+
+    regressions: List[str] = []
+    print(f"  {'benchmark':<44}{'baseline':>14}{'current':>14}{'change':>10}")
+    for name in sorted(set(baseline["benchmarks"]) | set(current["benchmarks"])):
+        if name not in current["benchmarks"]:
+            print(f"  {name:<44}{'':>38}  removed")
+            continue
+        if name not in baseline["benchmarks"]:
+            print(f"  {name:<44}{'':>38}  added")
+            continue
+        baseline_time = baseline["benchmarks"][name]["median_seconds"]
+        current_time = current["benchmarks"][name]["median_seconds"]
+        change = current_time / baseline_time - 1
+        if change > arguments.threshold:
+            flag = "  REGRESSION"
+            regressions.append(name)
+        elif change < -arguments.threshold / (1 + arguments.threshold):
+            flag = "  improvement"
+        else:
+            flag = ""
+        print(f"  {name:<44}{baseline_time * 1000:>11.3f} ms{current_time * 1000:>11.3f} ms{change:>+10.1%}{flag}")
+
+    if regressions:
+        print(f"{len(regressions)} benchmarks are more than {arguments.threshold:.0%} slower")
+        return 1
+    print(f"No benchmark is more than {arguments.threshold:.0%} slower")
+    return 0
+
+
+def record(arguments: argparse.Namespace) -> int:
+    responses = {}
+    for endpoint, parse in (("schedule", _parse_fixture_response), ("standings", _parse_points_table_response)):
+        response = espncricinfo_fetcher.session.get(
+            f"{ESPNCRICINFO_SERIES_API_URL}/{endpoint}", params={"seriesId": arguments.tournament_id}, timeout=espncricinfo_fetcher.timeout_in_seconds
+        )
+        response.raise_for_status()
+        parse(json.loads(response.content))     # a response the app cannot parse is not worth benchmarking
+        responses[endpoint] = response.content
+    recording_directory = os.path.join(RECORDINGS_DIRECTORY, str(arguments.tournament_id))
+    os.makedirs(recording_directory, exist_ok=True)
+    for endpoint, response_body in responses.items():
+        with open(os.path.join(recording_directory, f"{endpoint}.json"), "wb") as recording_file:
+            recording_file.write(response_body)
+    print(f"Recorded the responses of series {arguments.tournament_id} to {recording_directory}")
+    return 0
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    run_parser = subparsers.add_parser("run", help="Run the benchmarks and write their results as JSON")
+    run_parser.add_argument("--output", default="benchmark_results.json")
+    run_parser.add_argument("--teams", type=int, nargs="+", default=[8, 14, 20])
+    run_parser.add_argument("--remaining-matches", type=int, nargs="+", default=[0, 10, 20, 40])
+    run_parser.add_argument("--draw-probability", type=float, default=0.02)
+    run_parser.add_argument("--no-result-probability", type=float, default=0.05)
+    run_parser.add_argument("--repeats", type=int, default=5)
+    run_parser.add_argument("--seed", type=int, default=3)
+    run_parser.add_argument("--filter", default="", help="Only run the benchmarks whose name contains this text")
+    run_parser.set_defaults(command=run)
+
+    compare_parser = subparsers.add_parser("compare", help="Flag the benchmarks that got slower between two result files")
+    compare_parser.add_argument("baseline")
+    compare_parser.add_argument("current")
+    compare_parser.add_argument("--threshold", type=float, default=0.2, help="Slowdown of the median time flagged as a regression")
+    compare_parser.set_defaults(command=compare)
+
+    record_parser = subparsers.add_parser("record", help="Record the ESPNcricinfo responses of a series")
+    record_parser.add_argument("--tournament-id", type=int, default=1410320)
+    record_parser.set_defaults(command=record)
+
+    arguments = parser.parse_args()
+    sys.exit(arguments.command(arguments))
+
+
+if __name__ == "__main__":
+    main()
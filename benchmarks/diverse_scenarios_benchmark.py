@@ -0,0 +1,93 @@
+"""
+Compares the diverse qualifying outcomes against the first outcomes of the depth-first search, for every team and
+position still in contention: how far apart the outcomes of a request are, and how long they take to find.
+
+Distances are Hamming distances between the outcomes of a request, counted over every remaining match and over the
+matches that matter, and the smallest distance between any two outcomes of a request is averaged over the requests. The
+time of the diverse outcomes includes deriving the qualification conditions they are built from.
+
+Usage:
+    python -m benchmarks.diverse_scenarios_benchmark
+"""
+import argparse
+import itertools
+import statistics
+import time
+from typing import Dict, List, Sequence, Tuple
+from benchmarks.synthetic_tournaments import (
+    build_points_table_simulator,
+    generate_tournament_schedule
+)
+from src.functions.qualification_conditions import (
+    MatchCondition,
+    derive_qualification_conditions,
+    iterate_diverse_qualifying_outcomes
+)
+from src.functions.qualification_scenario_search import (
+    QualificationScenarioSearch
+)
+from src.functions.qualification_verdict import QualificationVerdict
+
+
+def _get_smallest_distance(outcomes: Sequence[Tuple[int, ...]], match_indices: Sequence[int]) -> int:
+    return min(
+        (sum(outcome[match_index] != other_outcome[match_index] for match_index in match_indices)
+         for outcome, other_outcome in itertools.combinations(outcomes, 2)),
+        default=0,
+    )
+
+
+def _find_outcomes(
+    search: QualificationScenarioSearch, team_name: str, top_x_position_in_the_table: int, number_of_outcomes: int, is_diverse: bool
+) -> List[Tuple[int, ...]]:
+    if is_diverse:
+        conditions = derive_qualification_conditions(search, team_name, top_x_position_in_the_table)
+        outcomes = iterate_diverse_qualifying_outcomes(search, team_name, top_x_position_in_the_table, conditions)
+    else:
+        outcomes = search.iterate_qualifying_outcomes(team_name, top_x_position_in_the_table)
+    return list(itertools.islice(outcomes, number_of_outcomes))
+
+
+def main():     # pylint: disable = too-many-locals
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--tournaments", nargs="+", default=["8:12", "10:30", "14:40", "20:60"], help="teams:remaining-matches pairs")
+    parser.add_argument("--scenarios", type=int, default=10, help="Outcomes per request")
+    parser.add_argument("--seed", type=int, default=3)
+    arguments = parser.parse_args()
+
+    for tournament in arguments.tournaments:
+        number_of_teams, number_of_remaining_matches = (int(value) for value in tournament.split(":"))
+        search = QualificationScenarioSearch(
+            build_points_table_simulator(generate_tournament_schedule(number_of_teams, number_of_remaining_matches, seed=arguments.seed))
+        )
+        all_matches = range(len(search.remaining_matches))
+        smallest_distances: Dict[str, List[int]] = {"depth-first": [], "diverse": []}
+        smallest_relevant_distances: Dict[str, List[int]] = {"depth-first": [], "diverse": []}
+        times: Dict[str, List[float]] = {"depth-first": [], "diverse": []}
+        matches_that_do_not_matter = []
+        for team_name, top_x_position_in_the_table in itertools.product(search.teams, range(1, len(search.teams))):
+            if search.get_qualification_verdict(team_name, top_x_position_in_the_table) != QualificationVerdict.IN_CONTENTION:
+                continue
+            conditions = derive_qualification_conditions(search, team_name, top_x_position_in_the_table)
+            matches_that_do_not_matter.append(conditions.match_conditions.count(MatchCondition.DOES_NOT_MATTER) / len(all_matches))
+            for name, is_diverse in (("depth-first", False), ("diverse", True)):
+                start_time = time.perf_counter()
+                outcomes = _find_outcomes(search, team_name, top_x_position_in_the_table, arguments.scenarios, is_diverse)
+                times[name].append(time.perf_counter() - start_time)
+                smallest_distances[name].append(_get_smallest_distance(outcomes, all_matches))
+                smallest_relevant_distances[name].append(_get_smallest_distance(outcomes, conditions.relevant_matches))
+
+        print(
+            f"{number_of_teams} teams, {number_of_remaining_matches} remaining matches, {len(times['diverse'])} requests, "
+            f"{statistics.mean(matches_that_do_not_matter):.0%} of the matches do not matter on average"
+        )
+        print(f"  {'':<14}{'closest pair':>14}{'  (matters)':>12}{'median time':>14}{'worst time':>13}")
+        for name, request_times in times.items():
+            print(
+                f"  {name:<14}{statistics.mean(smallest_distances[name]):>14.2f}{statistics.mean(smallest_relevant_distances[name]):>12.2f}"
+                f"{statistics.median(request_times) * 1000:>11.2f} ms{max(request_times) * 1000:>10.2f} ms"
+            )
+
+
+if __name__ == "__main__":
+    main()
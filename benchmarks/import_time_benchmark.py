@@ -0,0 +1,66 @@
+"""
+Measures the cold start of the app with `python -X importtime`, in fresh interpreters: the time to import Streamlit,
+which every page waits for, then the time app.py takes on top of it to render the home page, against the time each page
+module takes on its own on top of Streamlit.
+
+Each line also lists the packages the import loaded besides those Streamlit loads itself (numpy, pandas and pyarrow),
+which for app.py should be none: they belong to the pages that need them.
+
+Usage:
+    python -m benchmarks.import_time_benchmark
+"""
+import argparse
+import os
+import re
+import statistics
+import subprocess
+import sys
+from typing import Dict, List, Tuple
+
+REPOSITORY_DIRECTORY = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+PAGE_MODULES = ("src.views.homepage", "src.views.tournament", "src.views.custom_schedule.custom_schedule")
+HEAVY_PACKAGES = ("requests", "urllib3", "points_table_simulator", "scipy", "matplotlib")
+IMPORT_TIME_LINE = re.compile(r"^import time:\s+(\d+) \|\s+(\d+) \| *(\S+)$")
+
+
+def _import(module_name: str) -> Tuple[Dict[str, Tuple[int, int]], List[str]]:
+    """
+    Imports a module in a fresh interpreter under `-X importtime`, after Streamlit unless it is Streamlit itself, and
+    returns the self and cumulative microseconds of every import, keyed by module, along with the heavy packages the
+    import loaded.
+    """
+    process = subprocess.run(
+        [
+            sys.executable, "-X", "importtime", "-c",
+            f"import sys, streamlit; import {module_name}; print(' '.join(p for p in {HEAVY_PACKAGES!r} if p in sys.modules))",
+        ],
+        cwd=REPOSITORY_DIRECTORY, capture_output=True, text=True, check=True,
+    )
+    import_times = {}
+    for line in process.stderr.splitlines():
+        match = IMPORT_TIME_LINE.match(line)
+        if match is not None:
+            import_times[match.group(3)] = (int(match.group(1)), int(match.group(2)))
+    return import_times, process.stdout.split()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeats", type=int, default=5, help="Fresh interpreters per module")
+    arguments = parser.parse_args()
+
+    streamlit_times = [_import("streamlit")[0]["streamlit"][1] for _ in range(arguments.repeats)]
+    print(f"{'streamlit':45s} median {statistics.median(streamlit_times) / 1000:8.1f} ms, before any page renders")
+    for module_name in ("app",) + PAGE_MODULES:
+        cumulative_times, heavy_packages = [], []
+        for _ in range(arguments.repeats):
+            import_times, heavy_packages = _import(module_name)
+            cumulative_times.append(import_times[module_name][1])
+        print(
+            f"{module_name:45s} median {statistics.median(cumulative_times) / 1000:8.1f} ms more, "
+            f"heavy packages loaded: {', '.join(heavy_packages) or 'none'}"
+        )
+
+
+if __name__ == "__main__":
+    main()
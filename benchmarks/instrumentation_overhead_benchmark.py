@@ -0,0 +1,103 @@
+"""
+Measures the overhead of the request instrumentation on the scenario search, with tracing disabled, as it is outside of
+a traced request, and enabled, against the search with every span and counter left out.
+
+The baseline calls the undecorated search constructor and the search itself, which still updates its node counters, so
+the disabled overhead reported is that of the decorators, the trace lookups and the span context managers.
+
+Usage:
+    python -m benchmarks.instrumentation_overhead_benchmark
+"""
+import argparse
+import inspect
+import itertools
+import statistics
+import timeit
+from typing import Callable, Dict, List
+from benchmarks.synthetic_tournaments import (
+    build_points_table_simulator,
+    generate_tournament_schedule
+)
+from src.functions.instrumentation import span, trace_request, traced
+from src.functions.qualification_scenario_search import (
+    QualificationScenarioSearch
+)
+
+NUMBER_OF_RENDERED_SCENARIOS = 10
+
+
+def _median_time(function: Callable[[], object], repeats: int) -> float:
+    return statistics.median(timeit.repeat(function, number=1, repeat=repeats))
+
+
+@traced("no-op")
+def _do_nothing() -> None:
+    pass
+
+
+def _run_request(search: QualificationScenarioSearch, team_name: str, top_x_position_in_the_table: int, number_of_outcomes: int) -> None:
+    """Consumes the outcomes in one search span, with a render span for each of the first scenarios, as the views do."""
+    with span("search"):
+        qualifying_outcomes = search.iterate_qualifying_outcomes(team_name, top_x_position_in_the_table)
+        for _ in itertools.islice(qualifying_outcomes, number_of_outcomes - NUMBER_OF_RENDERED_SCENARIOS):
+            pass
+    for _ in itertools.islice(qualifying_outcomes, NUMBER_OF_RENDERED_SCENARIOS):
+        with span("render"):
+            pass
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--teams", type=int, default=10)
+    parser.add_argument("--remaining-matches", type=int, default=20)
+    parser.add_argument("--outcomes", type=int, default=20_000)
+    parser.add_argument("--team", default="Team 04")
+    parser.add_argument("--top-x-position", type=int, default=4)
+    parser.add_argument("--calls", type=int, default=1_000_000)
+    parser.add_argument("--repeats", type=int, default=21)
+    parser.add_argument("--seed", type=int, default=3)
+    arguments = parser.parse_args()
+
+    schedule = generate_tournament_schedule(arguments.teams, arguments.remaining_matches, seed=arguments.seed)
+    points_table_simulator = build_points_table_simulator(schedule)
+    search = QualificationScenarioSearch(points_table_simulator)
+    undecorated_search_constructor = inspect.unwrap(QualificationScenarioSearch.__init__)
+    undecorated_do_nothing = inspect.unwrap(_do_nothing)
+
+    print("Calling a traced function that does nothing, per call")
+    for name, call in (
+        ("undecorated", undecorated_do_nothing),
+        ("tracing disabled", _do_nothing),
+        ("span disabled", lambda: span("no-op").__enter__()),     # pylint: disable = unnecessary-dunder-call
+    ):
+        elapsed_time = _median_time(lambda call=call: [call() for _ in range(arguments.calls)], arguments.repeats)
+        print(f"  {name:>18}: {elapsed_time / arguments.calls * 1e9:8.1f} ns")
+
+    print(f"Building the search and consuming {arguments.outcomes:,} outcomes of {arguments.team} in the top {arguments.top_x_position}")
+
+    def run_baseline() -> None:
+        undecorated_search_constructor(QualificationScenarioSearch.__new__(QualificationScenarioSearch), points_table_simulator)
+        for _ in itertools.islice(search.iterate_qualifying_outcomes(arguments.team, arguments.top_x_position), arguments.outcomes):
+            pass
+
+    def run_with_tracing(is_enabled: bool) -> None:
+        with trace_request("benchmark", is_enabled=is_enabled):
+            QualificationScenarioSearch(points_table_simulator)
+            _run_request(search, arguments.team, arguments.top_x_position, arguments.outcomes)
+
+    runs = {
+        "no instrumentation": run_baseline,
+        "tracing disabled": lambda: run_with_tracing(False),
+        "tracing enabled": lambda: run_with_tracing(True),
+    }
+    times: Dict[str, List[float]] = {name: [] for name in runs}
+    for _ in range(arguments.repeats):     # Interleaved, so that the runs share any drift in the speed of the machine
+        for name, run in runs.items():
+            times[name].append(timeit.timeit(run, number=1))
+    baseline_time = statistics.median(times["no instrumentation"])
+    for name, run_times in times.items():
+        print(f"  {name:>18}: {statistics.median(run_times) * 1000:8.2f} ms ({statistics.median(run_times) / baseline_time - 1:+.1%})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+"""
+Measures the throughput of the qualifying outcome search with and without points ties broken on net run rate, for
+every team and position still in contention, and how the outcomes split between the net run rate verdicts.
+
+Net run rates are drawn at random. Only the outcomes in which the team is level on points with rivals competing for its
+place have their net run rate intervals evaluated, and the share of those boundary cases is reported along with the
+throughput, which leaves out building the scenario DataFrames.
+
+Usage:
+    python -m benchmarks.net_run_rate_benchmark
+"""
+import argparse
+import collections
+import itertools
+import time
+from typing import Dict
+import numpy as np
+from benchmarks.synthetic_tournaments import (
+    build_points_table_simulator,
+    generate_tournament_schedule
+)
+from src.functions.net_run_rate import NetRunRateRanking, NetRunRateVerdict
+from src.functions.qualification_scenario_search import (
+    QualificationScenarioSearch
+)
+from src.functions.qualification_verdict import QualificationVerdict
+
+
+def main():     # pylint: disable = too-many-locals
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--teams", type=int, default=10)
+    parser.add_argument("--remaining-matches", type=int, nargs="+", default=[10, 20, 30])
+    parser.add_argument("--outcomes", type=int, default=2_000, help="Qualifying outcomes consumed per request")
+    parser.add_argument("--seed", type=int, default=3)
+    arguments = parser.parse_args()
+    random_generator = np.random.default_rng(arguments.seed)
+
+    for number_of_remaining_matches in arguments.remaining_matches:
+        search = QualificationScenarioSearch(
+            build_points_table_simulator(generate_tournament_schedule(arguments.teams, number_of_remaining_matches, seed=arguments.seed))
+        )
+        net_run_rates = {team: float(random_generator.normal(0, 0.75)) for team in search.teams}
+        net_run_rate_ranking = NetRunRateRanking(search.tournament_model, net_run_rates)
+        search_time = 0.0
+        net_run_rate_search_time = 0.0
+        number_of_outcomes = 0
+        verdicts: Dict[NetRunRateVerdict, int] = collections.Counter()
+        for team_name, top_x_position_in_the_table in itertools.product(search.teams, range(1, len(search.teams))):
+            if search.get_qualification_verdict(team_name, top_x_position_in_the_table) != QualificationVerdict.IN_CONTENTION:
+                continue
+            start_time = time.perf_counter()
+            number_of_outcomes += sum(1 for _ in itertools.islice(
+                search.iterate_qualifying_outcomes(team_name, top_x_position_in_the_table), arguments.outcomes
+            ))
+            search_time += time.perf_counter() - start_time
+
+            selected_team = search.team_index[team_name]
+            start_time = time.perf_counter()
+            for winners in itertools.islice(search.iterate_qualifying_outcomes(team_name, top_x_position_in_the_table), arguments.outcomes):
+                verdicts[net_run_rate_ranking.assess(winners, selected_team, top_x_position_in_the_table).verdict] += 1
+            net_run_rate_search_time += time.perf_counter() - start_time
+
+        print(f"{arguments.teams} teams, {number_of_remaining_matches} remaining matches, {number_of_outcomes:,} qualifying outcomes")
+        print(f"  {'on points':>22}: {number_of_outcomes / search_time:>12,.0f} outcomes/s")
+        print(f"  {'ties on net run rate':>22}: {number_of_outcomes / net_run_rate_search_time:>12,.0f} outcomes/s")
+        boundary_cases = number_of_outcomes - verdicts[NetRunRateVerdict.QUALIFIES_OUTRIGHT]
+        print(f"  {'boundary cases':>22}: {boundary_cases / number_of_outcomes:>12.1%}")
+        for verdict in NetRunRateVerdict:
+            print(f"  {verdict.value:>32}: {verdicts[verdict] / number_of_outcomes:>6.1%}")
+
+
+if __name__ == "__main__":
+    main()
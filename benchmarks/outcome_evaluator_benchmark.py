@@ -0,0 +1,75 @@
+"""
+Measures how many candidate outcomes per second the batch evaluator scores, for an IPL-sized fixture (10 teams,
+70 matches) and a 20-team football league (380 matches), against building one pandas points table per candidate.
+
+Usage:
+    python -m benchmarks.outcome_evaluator_benchmark
+"""
+import argparse
+import itertools
+import time
+from typing import List, Tuple
+import numpy as np
+import pandas as pd
+from src.functions.outcome_evaluator import BatchOutcomeEvaluator
+
+FIXTURES = {
+    "IPL-sized (10 teams, 70 matches)": (10, 70),
+    "Football league (20 teams, 380 matches)": (20, 380),
+}
+
+
+def _round_robin_matches(number_of_teams: int, number_of_matches: int) -> List[Tuple[int, int]]:
+    pairings = list(itertools.permutations(range(number_of_teams), 2))
+    return list(itertools.islice(itertools.cycle(pairings), number_of_matches))
+
+
+def _points_table_per_candidate(outcomes: np.ndarray, remaining_matches: List[Tuple[int, int]], number_of_teams: int) -> None:
+    """Baseline: one pandas points table per candidate, as the original simulator builds them."""
+    for outcome in outcomes:
+        points = [0] * number_of_teams
+        for (home_team, away_team), away_team_wins in zip(remaining_matches, outcome):
+            points[away_team if away_team_wins else home_team] += 2
+        points_table = pd.DataFrame({"team": range(number_of_teams), "points": points})
+        points_table.sort_values(by="points", ascending=False, inplace=True)
+
+
+def _candidates_per_second(function, number_of_candidates: int, repeats: int) -> float:
+    best_time = min(_timed(function) for _ in range(repeats))
+    return number_of_candidates / best_time
+
+
+def _timed(function) -> float:
+    start_time = time.perf_counter()
+    function()
+    return time.perf_counter() - start_time
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--batch-size", type=int, default=100_000, help="Candidate outcomes per batch")
+    parser.add_argument("--baseline-size", type=int, default=500, help="Candidate outcomes for the pandas baseline")
+    parser.add_argument("--repeats", type=int, default=3, help="Timed repetitions, the best one is reported")
+    parser.add_argument("--seed", type=int, default=0)
+    arguments = parser.parse_args()
+
+    random_generator = np.random.default_rng(arguments.seed)
+    print(f"{'fixture':<42}{'pandas per candidate':>22}{'qualifying mask':>20}{'full ranking':>20}")
+    for fixture_name, (number_of_teams, number_of_matches) in FIXTURES.items():
+        outcomes = random_generator.integers(0, 2, size=(arguments.batch_size, number_of_matches), dtype=np.int8)
+        baseline_rate, mask_rate, ranking_rate = _benchmark_fixture(number_of_teams, outcomes, arguments.baseline_size, arguments.repeats)
+        print(f"{fixture_name:<42}{baseline_rate:>18,.0f} /s{mask_rate:>16,.0f} /s{ranking_rate:>16,.0f} /s")
+
+
+def _benchmark_fixture(number_of_teams: int, outcomes: np.ndarray, baseline_size: int, repeats: int) -> Tuple[float, float, float]:
+    remaining_matches = _round_robin_matches(number_of_teams, outcomes.shape[1])
+    evaluator = BatchOutcomeEvaluator([0] * number_of_teams, remaining_matches, points_for_a_win=2)
+    baseline_rate = _candidates_per_second(
+        lambda: _points_table_per_candidate(outcomes[:baseline_size], remaining_matches, number_of_teams), baseline_size, repeats
+    )
+    mask_rate = _candidates_per_second(lambda: evaluator.qualifying_mask(outcomes, 0, 4), len(outcomes), repeats)
+    ranking_rate = _candidates_per_second(lambda: evaluator.rank_teams(evaluator.evaluate_points(outcomes)), len(outcomes), repeats)
+    return baseline_rate, mask_rate, ranking_rate
+
+if __name__ == "__main__":
+    main()
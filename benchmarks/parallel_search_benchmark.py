@@ -0,0 +1,61 @@
+"""
+Measures the wall time of the multi-process scenario search for 1, 2, 4 and 8 workers against the in-process search.
+
+The default workload collects up to `--outcomes` qualifying outcomes for a team that needs a narrow set of results
+to finish second, which walks a large part of the pruned search tree, as the requests that used to time out do.
+
+Usage:
+    python -m benchmarks.parallel_search_benchmark
+"""
+import argparse
+import itertools
+import os
+import time
+from benchmarks.synthetic_tournaments import (
+    build_points_table_simulator,
+    generate_tournament_schedule
+)
+from src.functions.parallel_scenario_search import (
+    find_qualifying_outcomes_in_parallel
+)
+from src.functions.qualification_scenario_search import (
+    QualificationScenarioSearch
+)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--teams", type=int, default=10)
+    parser.add_argument("--remaining-matches", type=int, default=32)
+    parser.add_argument("--team", default="Team 02")
+    parser.add_argument("--top-x-position", type=int, default=2)
+    parser.add_argument("--outcomes", type=int, default=200_000, help="Qualifying outcomes to collect before stopping")
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4, 8])
+    parser.add_argument("--seed", type=int, default=3)
+    arguments = parser.parse_args()
+
+    search = QualificationScenarioSearch(
+        build_points_table_simulator(generate_tournament_schedule(arguments.teams, arguments.remaining_matches, seed=arguments.seed))
+    )
+    team_name = arguments.team
+    print(f"{os.cpu_count()} CPUs, {arguments.teams} teams, {arguments.remaining_matches} remaining matches, {team_name} in the top {arguments.top_x_position}")
+
+    start_time = time.perf_counter()
+    number_of_outcomes = len(list(itertools.islice(search.iterate_qualifying_outcomes(team_name, arguments.top_x_position), arguments.outcomes)))
+    in_process_time = time.perf_counter() - start_time
+    print(f"{'in-process':>12}: {in_process_time:7.2f} s for {number_of_outcomes:,} outcomes")
+
+    for number_of_workers in arguments.workers:
+        start_time = time.perf_counter()
+        number_of_outcomes = len(find_qualifying_outcomes_in_parallel(
+            search, team_name, arguments.top_x_position, arguments.outcomes, number_of_workers=number_of_workers
+        ))
+        elapsed_time = time.perf_counter() - start_time
+        print(
+            f"{number_of_workers:>4} workers: {elapsed_time:7.2f} s for {number_of_outcomes:,} outcomes, "
+            f"{in_process_time / elapsed_time:4.2f}x the in-process speed"
+        )
+
+
+if __name__ == "__main__":
+    main()
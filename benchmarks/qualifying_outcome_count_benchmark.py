@@ -0,0 +1,97 @@
+"""
+Times the exact count of the qualifying outcomes of the remaining matches, over three results per match, for every team
+of football-style leagues: three points for a win, one for a draw, and a quarter of the completed matches drawn.
+
+For each tournament it reports the number of outcomes the count covers, the median and worst time of a count, the
+number of outcome groups played over all of its matches, and the number of teams whose count needs more groups at once
+than the page allows. Small tournaments are checked against enumerating every outcome.
+
+Usage:
+    python -m benchmarks.qualifying_outcome_count_benchmark
+"""
+import argparse
+import itertools
+import statistics
+import time
+from benchmarks.synthetic_tournaments import (
+    build_points_table_simulator,
+    generate_tournament_schedule
+)
+from src.functions.instrumentation import trace_request
+from src.functions.qualification_counting import (
+    MatchResult,
+    count_qualifying_outcomes
+)
+from src.functions.streamlit_view_functions import (
+    MAXIMUM_NUMBER_OF_COUNTING_GROUPS
+)
+from src.functions.tournament_model import TournamentModel
+
+POINTS_FOR_A_WIN = 3
+DRAW_PROBABILITY = 0.25
+MAXIMUM_NUMBER_OF_ENUMERATED_MATCHES = 10
+
+
+def _count_by_enumeration(tournament_model: TournamentModel, team_name: str, top_x_position_in_the_table: int) -> int:
+    selected_team = tournament_model.team_index[team_name]
+    remaining_matches = tournament_model.get_remaining_matches()
+    current_points = tournament_model.standings.points.tolist()
+    points_awarded = [(POINTS_FOR_A_WIN, 0), (0, POINTS_FOR_A_WIN), (tournament_model.points_for_a_draw, tournament_model.points_for_a_draw)]
+    number_of_qualifying_outcomes = 0
+    for outcome in itertools.product(points_awarded, repeat=len(remaining_matches)):
+        points = list(current_points)
+        for (home_team, away_team), (home_points, away_points) in zip(remaining_matches, outcome):
+            points[home_team] += home_points
+            points[away_team] += away_points
+        number_of_qualifying_outcomes += sum(team_points > points[selected_team] for team_points in points) < top_x_position_in_the_table
+    return number_of_qualifying_outcomes
+
+
+def main():     # pylint: disable = too-many-locals
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--tournaments", nargs="+", default=["6:8", "10:20", "10:30", "20:40", "20:60"], help="teams:remaining-matches pairs")
+    parser.add_argument("--top", type=int, default=4, help="Position in the points table to finish within")
+    parser.add_argument("--seed", type=int, default=1)
+    arguments = parser.parse_args()
+
+    possible_results = (MatchResult.WIN, MatchResult.DRAW)
+    for tournament in arguments.tournaments:
+        number_of_teams, number_of_remaining_matches = (int(value) for value in tournament.split(":"))
+        tournament_model = TournamentModel.from_points_table_simulator(build_points_table_simulator(
+            generate_tournament_schedule(number_of_teams, number_of_remaining_matches, seed=arguments.seed, draw_probability=DRAW_PROBABILITY),
+            points_for_a_win=POINTS_FOR_A_WIN,
+        ))
+        times, numbers_of_groups, fractions = [], [], []
+        number_of_teams_over_the_limit = 0
+        for team_name in tournament_model.teams:
+            with trace_request("count", is_enabled=True) as request_trace:
+                start_time = time.perf_counter()
+                try:
+                    qualifying_outcome_count = count_qualifying_outcomes(
+                        tournament_model, team_name, arguments.top, possible_results, MAXIMUM_NUMBER_OF_COUNTING_GROUPS
+                    )
+                except ValueError:
+                    number_of_teams_over_the_limit += 1
+                    continue
+                finally:
+                    times.append(time.perf_counter() - start_time)
+            numbers_of_groups.append(request_trace.counters.get("counting_groups", 0) if request_trace is not None else 0)
+            fractions.append(qualifying_outcome_count.fraction)
+            if number_of_remaining_matches <= MAXIMUM_NUMBER_OF_ENUMERATED_MATCHES:
+                assert qualifying_outcome_count.number_of_qualifying_outcomes == _count_by_enumeration(tournament_model, team_name, arguments.top)
+
+        print(
+            f"{number_of_teams} teams, {number_of_remaining_matches} remaining matches, 3^{number_of_remaining_matches} = "
+            f"{3 ** number_of_remaining_matches:.3g} outcomes, top {arguments.top}"
+            + (", checked against enumeration" if number_of_remaining_matches <= MAXIMUM_NUMBER_OF_ENUMERATED_MATCHES else "")
+        )
+        print(
+            f"  median {statistics.median(times) * 1000:.2f} ms, worst {max(times) * 1000:.2f} ms, "
+            f"groups played up to {max(numbers_of_groups, default=0)}, "
+            f"teams with a share strictly between 0% and 100%: {sum(0 < fraction < 1 for fraction in fractions)}, "
+            f"teams over the limit of {MAXIMUM_NUMBER_OF_COUNTING_GROUPS} groups: {number_of_teams_over_the_limit}"
+        )
+
+
+if __name__ == "__main__":
+    main()
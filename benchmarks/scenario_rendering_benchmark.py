@@ -0,0 +1,92 @@
+"""
+Measures how long the tournament page takes to render the qualification scenarios of one request, outside of a
+Streamlit server, against the previous rendering path that renamed the columns and styled the tables row by row for
+every scenario. The previous path also slept one second per scenario, which is left out of its time here.
+
+Usage:
+    python -m benchmarks.scenario_rendering_benchmark
+"""
+import argparse
+import logging
+import statistics
+import time
+from typing import Callable, List
+import pandas as pd
+import streamlit as st
+from benchmarks.synthetic_tournaments import (
+    build_points_table_simulator,
+    generate_tournament_schedule
+)
+from src.functions.qualification_scenario_search import (
+    QualificationScenarioSearch
+)
+from src.functions.streamlit_view_functions import (
+    _display_qualification_scenarios
+)
+
+
+def _display_qualification_scenarios_row_by_row(
+    list_of_points_tables: List[pd.DataFrame], list_of_qualification_scenarios: List[pd.DataFrame], selected_team: str
+) -> None:
+    """Baseline: the tables of every scenario renamed and styled with one function call per row, as they used to be."""
+    for points_table, schedule in zip(list_of_points_tables, list_of_qualification_scenarios):
+        schedule = schedule.rename({column: column.replace("_", " ").title() for column in schedule.columns}, axis=1)
+        st.dataframe(
+            schedule.style.apply(
+                lambda row: [
+                    'background-color: CornflowerBlue;' if selected_team in (row["team_2".replace('_', ' ').title()], row["team_1".replace('_', ' ').title()])
+                    else '' for _ in row
+                ],
+                axis=1
+            ),
+            hide_index=True
+        )
+        points_table = points_table.rename({column: column.replace("matches_", "").title() for column in points_table.columns}, axis=1)
+        points_table = points_table[["Team", "Played", "Won", "Lost", "Points"]]
+        st.dataframe(
+            points_table.style.apply(lambda row: ['background-color: CornflowerBlue;' if row["Team"] == selected_team else '' for _ in row], axis=1),
+            hide_index=True
+        )
+
+
+def _median_time(function: Callable[[], None], repeats: int) -> float:
+    times = []
+    for _ in range(repeats):
+        start_time = time.perf_counter()
+        function()
+        times.append(time.perf_counter() - start_time)
+    return statistics.median(times)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--teams", type=int, default=10)
+    parser.add_argument("--remaining-matches", type=int, default=20)
+    parser.add_argument("--team", default="Team 04")
+    parser.add_argument("--top-x-position", type=int, default=4)
+    parser.add_argument("--scenarios", type=int, default=10)
+    parser.add_argument("--repeats", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=2)
+    arguments = parser.parse_args()
+    logging.disable(logging.WARNING)   # Streamlit warns about the missing ScriptRunContext on every element
+
+    search = QualificationScenarioSearch(
+        build_points_table_simulator(generate_tournament_schedule(arguments.teams, arguments.remaining_matches, seed=arguments.seed))
+    )
+    list_of_points_tables, list_of_qualification_scenarios = search.simulate_the_qualification_scenarios(
+        arguments.team, arguments.top_x_position, arguments.scenarios
+    )
+    print(f"Rendering {len(list_of_points_tables)} scenarios of {arguments.team} in the top {arguments.top_x_position}")
+    renderers = {
+        "row by row": lambda: _display_qualification_scenarios_row_by_row(list_of_points_tables, list_of_qualification_scenarios, arguments.team),
+        "vectorized": lambda: _display_qualification_scenarios(list_of_points_tables, list_of_qualification_scenarios, arguments.team),
+        "on demand": lambda: _display_qualification_scenarios(
+            list_of_points_tables, list_of_qualification_scenarios, arguments.team, load_tables_on_demand=True
+        ),
+    }
+    for name, render in renderers.items():
+        print(f"{name:>12}: {_median_time(render, arguments.repeats) * 1000:8.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,215 @@
+"""
+Drives many concurrent Streamlit sessions through the app, headless, and counts how often each interaction fetches,
+parses and simulates the fixture, per session.
+
+Every session opens a page, submits its forms, opens a scenario and then reruns the page as a widget change would. The
+sessions are alive at the same time and take each interaction in turn, as the headless runner owns the process-wide
+Streamlit runtime during a run, and every session asks for the scenarios of another team, so that a session left
+with the scenarios of another one is reported. The tournament refresher polls a synthetic tournament in place of
+ESPNcricinfo, and the custom schedule page is given a synthetic upload, since the headless sessions can neither reach
+the network nor upload files. Fixture fetches count the polls of the refresher, which no page view should add to.
+
+Usage:
+    python -m benchmarks.session_load_test
+"""
+import argparse
+import collections
+import functools
+import logging
+import os
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional, Tuple
+import pandas as pd
+import streamlit as st
+from points_table_simulator import PointsTableSimulator
+from streamlit.testing.v1 import AppTest
+import src.functions.schedule_ingestion
+import src.functions.streamlit_view_functions
+import src.views.custom_schedule.custom_schedule
+from benchmarks.synthetic_tournaments import (
+    generate_espncricinfo_responses,
+    generate_tournament_schedule
+)
+from src.functions.qualification_scenario_search import (
+    QualificationScenarioSearch
+)
+from src.functions.session_state import SESSION_FIXTURES_KEY
+from src.functions.tournament_refresher import tournament_refresher
+
+APP_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "app.py")
+COUNTED_WORK = ("fixture fetches", "schedule loads", "schedule parses", "simulators built", "searches built", "scenario searches")
+
+_counts: Dict[str, int] = collections.Counter()
+_counts_lock = threading.Lock()
+
+
+class _SyntheticUpload:
+    """Stands in for the `UploadedFile` of a session's upload."""
+
+    def __init__(self, file_id: str, content: bytes):
+        self.file_id = file_id
+        self.content = content
+
+    def getvalue(self) -> bytes:
+        return self.content
+
+
+class _SyntheticFetcher:
+    """Stands in for the fetcher of the tournament refresher, answering every seriesId with the synthetic tournament."""
+
+    def __init__(self, tournament_schedule: pd.DataFrame):
+        schedule_response, standings_response = generate_espncricinfo_responses(tournament_schedule)
+        self.documents = {"schedule": schedule_response, "standings": standings_response}
+
+    def revalidate_json(self, url: str, params: Optional[Dict[str, Any]] = None) -> Any:     # pylint: disable = unused-argument
+        return self.documents[url.rsplit("/", 1)[-1]]
+
+
+def _counted(name: str, function: Callable) -> Callable:
+    @functools.wraps(function)
+    def counted_function(*args, **kwargs):
+        with _counts_lock:
+            _counts[name] += 1
+        return function(*args, **kwargs)
+    return counted_function
+
+
+def _count_the_work(tournament_schedule: pd.DataFrame) -> None:
+    tournament_refresher.fetcher = _SyntheticFetcher(tournament_schedule)
+    tournament_refresher.refresh = _counted("fixture fetches", tournament_refresher.refresh)
+    src.views.custom_schedule.custom_schedule.load_uploaded_schedule = _counted(
+        "schedule loads", src.views.custom_schedule.custom_schedule.load_uploaded_schedule
+    )
+    src.functions.schedule_ingestion.read_schedule_csv = _counted("schedule parses", src.functions.schedule_ingestion.read_schedule_csv)
+    PointsTableSimulator.__init__ = _counted("simulators built", PointsTableSimulator.__init__)
+    QualificationScenarioSearch.__init__ = _counted("searches built", QualificationScenarioSearch.__init__)
+    src.functions.streamlit_view_functions._iterate_qualification_scenarios = _counted(   # pylint: disable = protected-access
+        "scenario searches", src.functions.streamlit_view_functions._iterate_qualification_scenarios    # pylint: disable = protected-access
+    )
+
+
+def _open_page(page_name: str) -> Callable[[AppTest, str], None]:
+    def open_page(app: AppTest, _team_name: str) -> None:
+        app.run()
+        app.sidebar.selectbox[0].select(page_name).run()
+    return open_page
+
+
+def _submit_schedule_details(app: AppTest, _team_name: str) -> None:
+    app.main.button[0].click().run()
+
+
+def _submit_scenarios_request(number_of_scenarios: int) -> Callable[[AppTest, str], None]:
+    def submit_scenarios_request(app: AppTest, team_name: str) -> None:
+        app.main.selectbox[0].select(team_name)
+        app.number_input(key="number_of_qualification_scenarios").set_value(number_of_scenarios)
+        app.main.checkbox[0].check()
+        app.main.button[-1].click().run()
+    return submit_scenarios_request
+
+
+def _is_holding_the_scenarios_of_another_team(app: AppTest, team_name: str) -> bool:
+    session_fixtures = app.session_state[SESSION_FIXTURES_KEY] if SESSION_FIXTURES_KEY in app.session_state else {}
+    return any(
+        session_fixture.scenarios_request_key is not None and session_fixture.scenarios_request_key[0] != team_name
+        for session_fixture in session_fixtures.values()
+    )
+
+
+def _open_a_scenario(app: AppTest, _team_name: str) -> None:
+    if app.toggle:     # Teams that have clinched or been eliminated have no scenario to open
+        app.toggle[0].set_value(True).run()
+
+
+def _rerun(app: AppTest, _team_name: str) -> None:
+    app.run()
+
+
+def _run_sessions(
+    interactions: List[Tuple[str, Callable[[AppTest, str], None]]], team_names: List[str]
+) -> List[Tuple[str, Dict[str, int], float]]:
+    """
+    Runs the sessions, one per team, through each interaction in turn, and returns the work counted during each
+    interaction.
+    """
+    apps = [AppTest.from_file(APP_PATH, default_timeout=120) for _ in team_names]
+    results = []
+    for interaction_name, interact in interactions:
+        with _counts_lock:
+            _counts.clear()
+        start_time = time.perf_counter()
+        for app, team_name in zip(apps, team_names):
+            interact(app, team_name)
+            if app.exception:
+                raise RuntimeError(f"{interaction_name} failed: {app.exception[0].value}")
+            if _is_holding_the_scenarios_of_another_team(app, team_name):
+                raise RuntimeError(f"{interaction_name} left another session's scenarios in the session of {team_name}")
+        elapsed_time = time.perf_counter() - start_time
+        with _counts_lock:
+            results.append((interaction_name, dict(_counts), elapsed_time))
+    return results
+
+
+def _print_results(page_name: str, results: List[Tuple[str, Dict[str, int], float]], number_of_sessions: int) -> None:
+    print(f"{page_name}, {number_of_sessions} concurrent sessions, work per session")
+    print(f"  {'interaction':<28}" + "".join(f"{name:>18}" for name in COUNTED_WORK) + f"{'wall time':>12}")
+    for interaction_name, counts, elapsed_time in results:
+        print(
+            f"  {interaction_name:<28}"
+            + "".join(f"{counts.get(name, 0) / number_of_sessions:>18.2f}" for name in COUNTED_WORK)
+            + f"{elapsed_time:>10.2f} s"
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sessions", type=int, default=16)
+    parser.add_argument("--teams", type=int, default=10)
+    parser.add_argument("--remaining-matches", type=int, default=18)
+    parser.add_argument("--scenarios", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=3)
+    arguments = parser.parse_args()
+    logging.disable(logging.WARNING)
+
+    tournament_schedule = generate_tournament_schedule(arguments.teams, arguments.remaining_matches, seed=arguments.seed)
+    uploaded_schedule = tournament_schedule.rename(columns={"team_1": "Home", "team_2": "Away", "winner": "Winner", "match_number": "Match No"})
+    upload = _SyntheticUpload("synthetic-upload", uploaded_schedule.to_csv(index=False).encode())
+    st.file_uploader = lambda *args, **kwargs: upload
+    _count_the_work(tournament_schedule)
+    teams = sorted(set(tournament_schedule["team_1"]) | set(tournament_schedule["team_2"]))
+    team_names = [teams[session_number % len(teams)] for session_number in range(arguments.sessions)]
+
+    submit_scenarios_request = _submit_scenarios_request(arguments.scenarios)
+    tournament_page_name = next(iter(tournament_refresher.tournaments))
+    _print_results(
+        tournament_page_name,
+        _run_sessions(
+            [
+                ("open the page", _open_page(tournament_page_name)),
+                ("submit a scenarios request", submit_scenarios_request),
+                ("open a scenario", _open_a_scenario),
+                ("rerun", _rerun),
+            ],
+            team_names,
+        ),
+        arguments.sessions,
+    )
+    _print_results(
+        "Custom Schedule",
+        _run_sessions(
+            [
+                ("open the page", _open_page("Custom Schedule")),
+                ("submit the schedule details", _submit_schedule_details),
+                ("submit a scenarios request", submit_scenarios_request),
+                ("open a scenario", _open_a_scenario),
+                ("rerun", _rerun),
+            ],
+            team_names,
+        ),
+        arguments.sessions,
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,124 @@
+"""
+Synthetic tournament schedules in the layout returned by `get_fixture_for_given_tournament`, and the ESPNcricinfo
+schedule and standings responses they would be parsed from.
+"""
+import itertools
+import random
+from typing import Dict, List, Optional, Tuple
+import pandas as pd
+from points_table_simulator import PointsTableSimulator
+
+
+def generate_tournament_schedule(     # pylint: disable = too-many-arguments, too-many-positional-arguments
+    number_of_teams: int,
+    number_of_remaining_matches: int,
+    number_of_rounds: int = 2,
+    seed: Optional[int] = 0,
+    draw_probability: float = 0.0,
+    no_result_probability: float = 0.0,
+) -> pd.DataFrame:
+    """
+    Generates a round-robin schedule where every pair of teams meets `number_of_rounds` times, with random results
+    for all but the last `number_of_remaining_matches` matches.
+
+    Parameters:
+        number_of_teams (int): Number of teams in the tournament.
+        number_of_remaining_matches (int): Number of matches left without a result.
+        number_of_rounds (int): Number of times every pair of teams meets.
+        seed (int, optional): Seed of the random number generator.
+        draw_probability (float): Probability of a completed match ending in a "Draw".
+        no_result_probability (float): Probability of a completed match ending with "No Result".
+
+    Returns:
+        pd.DataFrame: Schedule with 'match_number', 'team_1', 'team_2' and 'winner' columns.
+    """
+    random_generator = random.Random(seed)
+    teams = [f"Team {team_number + 1:02d}" for team_number in range(number_of_teams)]
+    matches = [pairing for _ in range(number_of_rounds) for pairing in itertools.combinations(teams, 2)]
+    random_generator.shuffle(matches)
+    number_of_completed_matches = len(matches) - number_of_remaining_matches
+
+    def _get_result(home_team: str, away_team: str) -> str:
+        if draw_probability or no_result_probability:     # keeps the schedules of a seed unchanged without them
+            random_number = random_generator.random()
+            if random_number < draw_probability:
+                return "Draw"
+            if random_number < draw_probability + no_result_probability:
+                return "No Result"
+        return random_generator.choice((home_team, away_team))
+
+    return pd.DataFrame([
+        {
+            "match_number": match_index + 1,
+            "team_1": home_team,
+            "team_2": away_team,
+            "winner": _get_result(home_team, away_team) if match_index < number_of_completed_matches else None,
+        }
+        for match_index, (home_team, away_team) in enumerate(matches)
+    ])
+
+
+def generate_espncricinfo_responses(tournament_schedule: pd.DataFrame, points_for_a_win: int = 2) -> Tuple[Dict, Dict]:
+    """
+    Generates the ESPNcricinfo schedule and standings responses of a schedule, with the fields the fixture collector
+    reads along with a few of those it skips, so that parsing them takes about as long as parsing recorded ones.
+
+    Parameters:
+        tournament_schedule (pd.DataFrame): Schedule from `generate_tournament_schedule`.
+        points_for_a_win (int): Points awarded for a win, with one point for a draw or no result.
+
+    Returns:
+        Tuple[Dict, Dict]: The decoded JSON of the schedule and standings endpoints.
+    """
+    teams = sorted(set(tournament_schedule["team_1"]) | set(tournament_schedule["team_2"]))
+    team_ids = {team: 1000 + team_number for team_number, team in enumerate(teams)}
+    statistics = {team: {"matchesPlayed": 0, "matchesWon": 0, "matchesLost": 0, "matchesNoResult": 0, "points": 0} for team in teams}
+    matches: List[Dict] = []
+    for match_number, home_team, away_team, winner in tournament_schedule[["match_number", "team_1", "team_2", "winner"]].itertuples(index=False):
+        if not winner:
+            status, status_text, winner_team_id = "FIXTURE", "Match yet to begin", None
+        elif winner in ("Draw", "No Result"):
+            status, status_text, winner_team_id = "NO RESULT", "No result", None
+        else:
+            status, status_text, winner_team_id = "RESULT", f"{winner} won", team_ids[winner]
+        matches.append({
+            "objectId": 9_000_000 + match_number,
+            "title": f"{match_number}th Match",
+            "status": status,
+            "statusText": status_text,
+            "winnerTeamId": winner_team_id,
+            "startDate": "2024-03-22T00:00:00.000Z",
+            "ground": {"name": "Synthetic Ground", "town": {"name": "Synthetic Town"}},
+            "teams": [
+                {"team": {"id": team_ids[team], "longName": team, "abbreviation": team[-2:]}, "score": None, "isHome": is_home}
+                for team, is_home in ((home_team, True), (away_team, False))
+            ],
+        })
+        if winner_team_id is None and status != "FIXTURE":
+            for team in (home_team, away_team):
+                statistics[team]["matchesPlayed"] += 1
+                statistics[team]["matchesNoResult"] += 1
+                statistics[team]["points"] += 1
+        elif winner_team_id is not None:
+            loser = away_team if winner == home_team else home_team
+            statistics[winner]["matchesPlayed"] += 1
+            statistics[winner]["matchesWon"] += 1
+            statistics[winner]["points"] += points_for_a_win
+            statistics[loser]["matchesPlayed"] += 1
+            statistics[loser]["matchesLost"] += 1
+
+    ranked_teams = sorted(teams, key=lambda team: -statistics[team]["points"])
+    team_stats = [
+        {"teamInfo": {"id": team_ids[team], "longName": team}, "rank": rank + 1, "nrr": f"{(len(teams) / 2 - rank) / 10 + 0.0:+.3f}", **statistics[team]}
+        for rank, team in enumerate(ranked_teams)
+    ]
+    return {"content": {"matches": matches}}, {"content": {"standings": {"groups": [{"teamStats": team_stats}]}}}
+
+
+def build_points_table_simulator(tournament_schedule: pd.DataFrame, points_for_a_win: int = 2) -> PointsTableSimulator:
+    return PointsTableSimulator(
+        tournament_schedule=tournament_schedule,
+        points_for_a_win=points_for_a_win,
+        tournament_schedule_away_team_column_name="team_2",
+        tournament_schedule_home_team_column_name="team_1",
+    )
@@ -0,0 +1,63 @@
+"""
+Measures how long the streaming scenario search takes to yield its first qualification scenario, against the time the
+blocking search takes to return all of the requested scenarios, for every team and position still in contention.
+
+Both times include building the points table and remaining match outcome DataFrames of the scenarios.
+
+Usage:
+    python -m benchmarks.time_to_first_scenario_benchmark
+"""
+import argparse
+import itertools
+import statistics
+import time
+from typing import List
+from benchmarks.synthetic_tournaments import (
+    build_points_table_simulator,
+    generate_tournament_schedule
+)
+from src.functions.qualification_scenario_search import (
+    QualificationScenarioSearch
+)
+from src.functions.qualification_verdict import QualificationVerdict
+
+
+def _milliseconds(times: List[float]) -> str:
+    return f"median {statistics.median(times) * 1000:8.2f} ms, max {max(times) * 1000:8.2f} ms"
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--teams", type=int, default=10)
+    parser.add_argument(
+        "--remaining-matches", type=int, nargs="+", default=[10, 20, 30],
+        help="Beyond 40%% of the schedule, the search refuses the requests as below the completion cutoff"
+    )
+    parser.add_argument("--scenarios", type=int, default=10, help="Scenarios requested, as the form's maximum")
+    parser.add_argument("--seed", type=int, default=3)
+    arguments = parser.parse_args()
+
+    for number_of_remaining_matches in arguments.remaining_matches:
+        search = QualificationScenarioSearch(
+            build_points_table_simulator(generate_tournament_schedule(arguments.teams, number_of_remaining_matches, seed=arguments.seed))
+        )
+        times_to_first_scenario: List[float] = []
+        times_to_all_scenarios: List[float] = []
+        for team_name, top_x_position_in_the_table in itertools.product(search.teams, range(1, len(search.teams))):
+            if search.get_qualification_verdict(team_name, top_x_position_in_the_table) != QualificationVerdict.IN_CONTENTION:
+                continue
+            start_time = time.perf_counter()
+            next(search.iterate_qualification_scenarios(team_name, top_x_position_in_the_table))
+            times_to_first_scenario.append(time.perf_counter() - start_time)
+
+            start_time = time.perf_counter()
+            search.simulate_the_qualification_scenarios(team_name, top_x_position_in_the_table, arguments.scenarios)
+            times_to_all_scenarios.append(time.perf_counter() - start_time)
+
+        print(f"{arguments.teams} teams, {number_of_remaining_matches} remaining matches, {len(times_to_first_scenario)} requests")
+        print(f"  {'first scenario':>16}: {_milliseconds(times_to_first_scenario)}")
+        print(f"  {f'all {arguments.scenarios} scenarios':>16}: {_milliseconds(times_to_all_scenarios)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+"""
+Reports the memory taken by the compact tournament model of a 20-team double round-robin, against the DataFrames and
+per-match dicts it replaces inside the search engine and the views.
+
+Every representation is built from the same schedule under tracemalloc, which reports the memory it still holds once
+built and the peak reached while building it, and is then timed without tracemalloc. The search is listed as a whole,
+as it holds the model along with the remaining fixture it hands back to the views.
+
+Usage:
+    python -m benchmarks.tournament_model_memory_benchmark
+"""
+import argparse
+import gc
+import statistics
+import time
+import tracemalloc
+from typing import Any, Callable, Tuple
+import pandas as pd
+from benchmarks.synthetic_tournaments import (
+    build_points_table_simulator,
+    generate_tournament_schedule
+)
+from src.functions.qualification_scenario_search import (
+    QualificationScenarioSearch
+)
+from src.functions.tournament_model import Match, TournamentModel
+
+
+def _measure(build: Callable[[], Any], repeats: int) -> Tuple[int, int, float]:
+    """
+    Returns the memory held by what `build` returns and the peak memory while building it, both under tracemalloc, and
+    the median time it takes without tracemalloc.
+    """
+    gc.collect()
+    tracemalloc.start()
+    memory_before, _ = tracemalloc.get_traced_memory()
+    result = build()
+    memory_after, peak_memory = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del result
+
+    times = []
+    for _ in range(repeats):
+        start_time = time.perf_counter()
+        build()
+        times.append(time.perf_counter() - start_time)
+    return memory_after - memory_before, peak_memory - memory_before, statistics.median(times)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--teams", type=int, default=20)
+    parser.add_argument("--remaining-matches", type=int, default=60)
+    parser.add_argument("--repeats", type=int, default=20)
+    parser.add_argument("--seed", type=int, default=0)
+    arguments = parser.parse_args()
+
+    schedule = generate_tournament_schedule(arguments.teams, arguments.remaining_matches, seed=arguments.seed)
+    points_table_simulator = build_points_table_simulator(schedule)
+    tournament_model = TournamentModel.from_points_table_simulator(points_table_simulator)
+    match_rows = schedule.to_dict(orient="records")
+    print(f"{arguments.teams} teams, {len(schedule)} matches, {arguments.remaining_matches} remaining")
+
+    representations = {
+        "match dicts": lambda: [dict(match_row) for match_row in match_rows],
+        "Match records": lambda: [Match(home_team, away_team) for home_team, away_team in zip(
+            tournament_model.home_teams.tolist(), tournament_model.away_teams.tolist()
+        )],
+        "schedule DataFrame": lambda: pd.DataFrame(match_rows),
+        "tournament model": lambda: TournamentModel.from_points_table_simulator(points_table_simulator),
+        "points table, simulator": lambda: points_table_simulator.current_points_table,
+        "points table, model": tournament_model.get_current_points_table,
+        "qualification search": lambda: QualificationScenarioSearch(points_table_simulator),
+    }
+    print(f"  {'representation':<26}{'held':>12}{'peak':>12}{'time':>12}")
+    for name, build in representations.items():
+        held_memory, peak_memory, elapsed_time = _measure(build, arguments.repeats)
+        print(f"  {name:<26}{held_memory / 1024:>8.1f} KiB{peak_memory / 1024:>8.1f} KiB{elapsed_time * 1000:>9.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,60 @@
+"""
+Precomputes what every team needs to finish within every position of a tournament's points table, and writes it to the
+snapshot the tournament page serves its answers from.
+
+Usage:
+    python precompute_qualification_matrix.py --tournament-id 1410320
+"""
+import argparse
+import sys
+import time
+from points_table_simulator import PointsTableSimulator
+from points_table_simulator.exceptions import AllMatchesCompletedError
+from src.functions.fixture_collector import (
+    get_fixture_for_given_tournament,
+    mark_undecided_matches
+)
+from src.functions.qualification_matrix import (
+    DEFAULT_NUMBER_OF_SCENARIOS_PER_REQUEST,
+    build_qualification_matrix,
+    get_default_snapshot_path,
+    write_qualification_matrix_snapshot
+)
+from src.functions.qualification_scenario_search import (
+    QualificationScenarioSearch
+)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--tournament-id", type=int, default=1410320, help="ESPNcricinfo seriesId of the tournament")
+    parser.add_argument("--points-for-a-win", type=int, default=2)
+    parser.add_argument(
+        "--number-of-scenarios", type=int, default=DEFAULT_NUMBER_OF_SCENARIOS_PER_REQUEST,
+        help="Qualifying scenarios kept per team and position"
+    )
+    parser.add_argument("--output", help="Path of the Parquet snapshot. Defaults to the path the tournament page reads")
+    arguments = parser.parse_args()
+
+    start_time = time.time()
+    tournament_df = get_fixture_for_given_tournament(arguments.tournament_id)
+    try:
+        points_table_simulator = PointsTableSimulator(
+            tournament_schedule=mark_undecided_matches(tournament_df),
+            points_for_a_win=arguments.points_for_a_win,
+            tournament_schedule_away_team_column_name="team_2",
+            tournament_schedule_home_team_column_name="team_1",
+        )
+    except AllMatchesCompletedError:
+        sys.exit("All league matches in the tournament are completed, there is nothing to precompute.")
+    snapshot = build_qualification_matrix(QualificationScenarioSearch(points_table_simulator), arguments.number_of_scenarios)
+    output_path = arguments.output or get_default_snapshot_path(arguments.tournament_id)
+    write_qualification_matrix_snapshot(snapshot, output_path)
+    print(
+        f"Wrote {len(snapshot.entries)} team and position entries for {len(snapshot.teams)} teams to {output_path} "
+        f"in {round(time.time() - start_time, 2)} seconds"
+    )
+
+
+if __name__ == "__main__":
+    main()
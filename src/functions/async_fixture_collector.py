@@ -0,0 +1,183 @@
+import asyncio
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+import pandas as pd
+from tornado.httpclient import AsyncHTTPClient, HTTPRequest
+from tornado.httputil import url_concat
+from src.functions.fixture_collector import (
+    ESPNCRICINFO_SERIES_API_URL,
+    REQUEST_HEADERS,
+    _parse_fixture_response,
+    _parse_points_table_response,
+    espncricinfo_fetcher
+)
+from src.functions.http_fetcher import CachedJsonFetcher
+from src.functions.instrumentation import traced
+
+DEFAULT_MAXIMUM_CONCURRENT_REQUESTS = 8
+DEFAULT_REQUEST_DEADLINE_IN_SECONDS = 20
+
+
+async def fetch_fixtures_and_points_tables_async(
+    tournament_ids: Iterable[int],
+    maximum_concurrent_requests: int = DEFAULT_MAXIMUM_CONCURRENT_REQUESTS,
+    request_deadline_in_seconds: float = DEFAULT_REQUEST_DEADLINE_IN_SECONDS,
+    fetcher: CachedJsonFetcher = espncricinfo_fetcher,
+) -> Dict[int, Tuple[pd.DataFrame, pd.DataFrame]]:
+    """
+    Fetches the fixture and the points table of several tournaments concurrently.
+
+    Every schedule and standings request is sent at once, with at most `maximum_concurrent_requests` of them in flight.
+    Documents already cached by `fetcher` are served from it, and fetched documents are stored in it, so the async and
+    the sync fetchers share the same cache.
+
+    Parameters:
+        tournament_ids (Iterable[int]): The IDs of the cricket tournaments.
+        maximum_concurrent_requests (int): Maximum number of requests in flight at the same time.
+        request_deadline_in_seconds (float): Time after which a single request fails, queueing excluded.
+        fetcher (CachedJsonFetcher): Cache the documents are looked up in and stored to.
+
+    Returns:
+        Dict[int, Tuple[pd.DataFrame, pd.DataFrame]]: Fixture and points table of every tournament, by tournament ID.
+
+    Raises:
+        tornado.httpclient.HTTPClientError: If a request fails or misses its deadline.
+    """
+    tournament_ids = list(tournament_ids)
+    documents = await _get_documents(tournament_ids, maximum_concurrent_requests, request_deadline_in_seconds, fetcher, is_revalidated=False)
+    return {
+        tournament_id: (_parse_fixture_response(schedule_response), _parse_points_table_response(standings_response))
+        for tournament_id, (schedule_response, standings_response) in documents.items()
+    }
+
+
+async def revalidate_schedules_and_standings_async(
+    tournament_ids: Iterable[int],
+    maximum_concurrent_requests: int = DEFAULT_MAXIMUM_CONCURRENT_REQUESTS,
+    request_deadline_in_seconds: float = DEFAULT_REQUEST_DEADLINE_IN_SECONDS,
+    fetcher: CachedJsonFetcher = espncricinfo_fetcher,
+) -> Dict[int, Tuple[Any, Any]]:
+    """
+    Fetches the schedule and the standings documents of several tournaments concurrently, whatever the age of their
+    cached copies, as `CachedJsonFetcher.revalidate_json` does for one document. For pollers that run off the request path.
+
+    Parameters:
+        tournament_ids (Iterable[int]): The IDs of the cricket tournaments.
+        maximum_concurrent_requests (int): Maximum number of requests in flight at the same time.
+        request_deadline_in_seconds (float): Time after which a single request fails, queueing excluded.
+        fetcher (CachedJsonFetcher): Cache the documents are revalidated against and stored to.
+
+    Returns:
+        Dict[int, Tuple[Any, Any]]: Decoded schedule and standings documents of every tournament, by tournament ID, the
+            very objects cached before when the server answers 304 Not Modified.
+
+    Raises:
+        tornado.httpclient.HTTPClientError: If a request fails or misses its deadline.
+    """
+    return await _get_documents(list(tournament_ids), maximum_concurrent_requests, request_deadline_in_seconds, fetcher, is_revalidated=True)
+
+
+async def fetch_fixture_and_points_table_async(
+    tournament_id: int, request_deadline_in_seconds: float = DEFAULT_REQUEST_DEADLINE_IN_SECONDS
+) -> Tuple[pd.DataFrame, pd.DataFrame]:
+    """
+    Fetches the fixture and the points table of a tournament concurrently.
+
+    Parameters:
+        tournament_id (int): The ID of the cricket tournament.
+        request_deadline_in_seconds (float): Time after which a single request fails.
+
+    Returns:
+        Tuple[pd.DataFrame, pd.DataFrame]: The fixture and the points table.
+    """
+    tournaments = await fetch_fixtures_and_points_tables_async([tournament_id], request_deadline_in_seconds=request_deadline_in_seconds)
+    return tournaments[tournament_id]
+
+
+def fetch_fixtures_and_points_tables(
+    tournament_ids: Iterable[int],
+    maximum_concurrent_requests: int = DEFAULT_MAXIMUM_CONCURRENT_REQUESTS,
+    request_deadline_in_seconds: float = DEFAULT_REQUEST_DEADLINE_IN_SECONDS,
+) -> Dict[int, Tuple[pd.DataFrame, pd.DataFrame]]:
+    """
+    Blocking wrapper of `fetch_fixtures_and_points_tables_async`, for callers without a running event loop such as the
+    Streamlit views.
+    """
+    return asyncio.run(fetch_fixtures_and_points_tables_async(tournament_ids, maximum_concurrent_requests, request_deadline_in_seconds))
+
+
+def revalidate_schedules_and_standings(
+    tournament_ids: Iterable[int],
+    maximum_concurrent_requests: int = DEFAULT_MAXIMUM_CONCURRENT_REQUESTS,
+    request_deadline_in_seconds: float = DEFAULT_REQUEST_DEADLINE_IN_SECONDS,
+    fetcher: CachedJsonFetcher = espncricinfo_fetcher,
+) -> Dict[int, Tuple[Any, Any]]:
+    """Blocking wrapper of `revalidate_schedules_and_standings_async`, for the background refresher."""
+    return asyncio.run(revalidate_schedules_and_standings_async(tournament_ids, maximum_concurrent_requests, request_deadline_in_seconds, fetcher))
+
+
+@traced("fetch")
+def fetch_fixture_and_points_table(
+    tournament_id: int, request_deadline_in_seconds: float = DEFAULT_REQUEST_DEADLINE_IN_SECONDS
+) -> Tuple[pd.DataFrame, pd.DataFrame]:
+    """
+    Blocking wrapper of `fetch_fixture_and_points_table_async`, for callers without a running event loop such as the
+    Streamlit views.
+
+    Parameters:
+        tournament_id (int): The ID of the cricket tournament.
+        request_deadline_in_seconds (float): Time after which a single request fails.
+
+    Returns:
+        Tuple[pd.DataFrame, pd.DataFrame]: The fixture and the points table.
+    """
+    return asyncio.run(fetch_fixture_and_points_table_async(tournament_id, request_deadline_in_seconds))
+
+
+async def _get_documents(
+    tournament_ids: List[int],
+    maximum_concurrent_requests: int,
+    request_deadline_in_seconds: float,
+    fetcher: CachedJsonFetcher,
+    is_revalidated: bool,
+) -> Dict[int, Tuple[Any, Any]]:
+    """Sends every schedule and standings request at once, with at most `maximum_concurrent_requests` of them in flight."""
+    semaphore = asyncio.Semaphore(maximum_concurrent_requests)
+    client = AsyncHTTPClient(force_instance=True, max_clients=maximum_concurrent_requests)
+    try:
+        response_data = await asyncio.gather(*(
+            _get_json(
+                client, semaphore, fetcher, f"{ESPNCRICINFO_SERIES_API_URL}/{endpoint}", tournament_id, request_deadline_in_seconds, is_revalidated
+            )
+            for tournament_id in tournament_ids
+            for endpoint in ("schedule", "standings")
+        ))
+    finally:
+        client.close()
+    return {tournament_id: (response_data[2 * index], response_data[2 * index + 1]) for index, tournament_id in enumerate(tournament_ids)}
+
+
+async def _get_json(     # pylint: disable = too-many-arguments, too-many-positional-arguments
+    client: AsyncHTTPClient,
+    semaphore: asyncio.Semaphore,
+    fetcher: CachedJsonFetcher,
+    url: str,
+    tournament_id: int,
+    request_deadline_in_seconds: float,
+    is_revalidated: bool,
+) -> Any:
+    params: Dict[str, Any] = {'seriesId': tournament_id}
+    cached_body: Optional[Any] = None if is_revalidated else fetcher.get_cached_json(url, params)
+    if cached_body is not None:
+        return cached_body
+
+    async with semaphore:
+        request = HTTPRequest(
+            url_concat(url, params),
+            headers={**REQUEST_HEADERS, **fetcher.get_conditional_headers(url, params)},
+            connect_timeout=request_deadline_in_seconds,
+            request_timeout=request_deadline_in_seconds,
+        )
+        response = await client.fetch(request, raise_error=False)
+    if response.code != 304:
+        response.rethrow()
+    return fetcher.store_response(url, params, response.code, response.headers, response.body)
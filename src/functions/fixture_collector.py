@@ -1,11 +1,22 @@
+import os
 from typing import Dict, Union
 import pandas as pd
-import requests
+from src.functions.http_fetcher import CachedJsonFetcher, create_pooled_session
+from src.functions.instrumentation import traced
+
+ESPNCRICINFO_SERIES_API_URL = os.environ.get(
+    "ESPNCRICINFO_SERIES_API_URL", "https://hs-consumer-api.espncricinfo.com/v1/pages/series"
+)   # overridable so that the app can be pointed at a local stub server
+UNDECIDED_WINNERS = ("", "Live")
+REQUEST_HEADERS = {'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/58.0.3029.110 Safari/537.3'}
+
+espncricinfo_fetcher = CachedJsonFetcher(session=create_pooled_session(REQUEST_HEADERS))
 
 
 def get_fixture_for_given_tournament(tournament_id: int) -> pd.DataFrame:
     """
-    Fetches fixture data for a given tournament ID.
+    Fetches fixture data for a given tournament ID. The response is cached and shared across sessions, see
+    `CachedJsonFetcher`.
 
     Parameters:
         tournament_id (int): The ID of the cricket tournament.
@@ -14,18 +25,11 @@ def get_fixture_for_given_tournament(tournament_id: int) -> pd.DataFrame:
         pd.DataFrame: DataFrame containing match information.
     """
 
-    url = "https://hs-consumer-api.espncricinfo.com/v1/pages/series/schedule"
+    url = f"{ESPNCRICINFO_SERIES_API_URL}/schedule"
     params = {'seriesId': tournament_id}
-    headers = {'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/58.0.3029.110 Safari/537.3'}
 
-    response = requests.get(url, params=params, headers=headers, timeout=20)
-    response.raise_for_status()
-    response_data = response.json()
-    fixture_data = response_data["content"]["matches"]
-    match_list = [
-        _get_match_info(match_data, match_index) for match_index, match_data in enumerate(fixture_data) if "Match" in match_data["title"]
-    ]   # condition for "Match" has been added as it indicates league matches and we are not considering the playoff matches in the fixture
-    return pd.DataFrame(match_list)
+    response_data = espncricinfo_fetcher.get_json(url, params=params)
+    return _parse_fixture_response(response_data)
 
 
 def fetch_points_table_for_given_tournament(tournament_id: int) -> pd.DataFrame:
@@ -38,13 +42,42 @@ def fetch_points_table_for_given_tournament(tournament_id: int) -> pd.DataFrame:
     Returns:
         pd.DataFrame: DataFrame containing points table information.
     """
-    url = "https://hs-consumer-api.espncricinfo.com/v1/pages/series/standings"
+    url = f"{ESPNCRICINFO_SERIES_API_URL}/standings"
     params = {'seriesId': tournament_id}
-    headers = {'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/58.0.3029.110 Safari/537.3'}
 
-    response = requests.get(url, params=params, headers=headers, timeout=20)
-    response.raise_for_status()
-    response_data = response.json()
+    response_data = espncricinfo_fetcher.get_json(url, params=params)
+    return _parse_points_table_response(response_data)
+
+
+@traced("parse")
+def _parse_fixture_response(response_data: Dict) -> pd.DataFrame:
+    """
+    Builds the fixture DataFrame from a schedule response.
+
+    Parameters:
+        response_data (Dict): Decoded JSON of the schedule endpoint.
+
+    Returns:
+        pd.DataFrame: DataFrame containing match information.
+    """
+    fixture_data = response_data["content"]["matches"]
+    match_list = [
+        _get_match_info(match_data, match_index) for match_index, match_data in enumerate(fixture_data) if "Match" in match_data["title"]
+    ]   # condition for "Match" has been added as it indicates league matches and we are not considering the playoff matches in the fixture
+    return pd.DataFrame(match_list)
+
+
+@traced("parse")
+def _parse_points_table_response(response_data: Dict) -> pd.DataFrame:
+    """
+    Builds the points table DataFrame from a standings response.
+
+    Parameters:
+        response_data (Dict): Decoded JSON of the standings endpoint.
+
+    Returns:
+        pd.DataFrame: DataFrame containing points table information.
+    """
     points_table_data = response_data["content"]["standings"]["groups"][0]["teamStats"]
     points_table_list = [_extract_points_table_info(points_table_data[index]) for index in range(len(points_table_data))]
     points_table_df = pd.DataFrame(points_table_list)
@@ -83,6 +116,20 @@ def _extract_points_table_info(points_table_data: Dict) -> Dict[str, Union[int,
     }
 
 
+def mark_undecided_matches(tournament_df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Leaves the winner of the matches without a result yet, blank or "Live" in the fixture, missing instead, as that is
+    how `PointsTableSimulator` tells the remaining matches apart.
+
+    Parameters:
+        tournament_df (pd.DataFrame): Fixture from `get_fixture_for_given_tournament`.
+
+    Returns:
+        pd.DataFrame: A copy of the fixture.
+    """
+    return tournament_df.assign(winner=tournament_df["winner"].where(~tournament_df["winner"].isin(UNDECIDED_WINNERS), None))
+
+
 def _get_match_info(match_data: Dict, match_index: int) -> Dict[str, Union[int, str]]:
     """
     Extracts match information from match data.
@@ -0,0 +1,245 @@
+import json
+import logging
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Hashable, Mapping, Optional, Set
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+DEFAULT_TIME_TO_LIVE_IN_SECONDS = 60
+DEFAULT_STALE_WHILE_REVALIDATE_IN_SECONDS = 15 * 60
+DEFAULT_TIMEOUT_IN_SECONDS = 20
+CONNECTION_POOL_SIZE = 16
+RETRY_STRATEGY = Retry(
+    total=3, backoff_factor=0.3, status_forcelist=(429, 500, 502, 503, 504), allowed_methods=("GET",), raise_on_status=False
+)
+
+logger = logging.getLogger(__name__)
+
+
+class NotModifiedWithoutCachedCopyError(ValueError):
+    """Raised when a response is 304 Not Modified but there is no cached copy to serve, such as after `clear`."""
+
+    def __init__(self, url: str):
+        super().__init__(f"{url} answered 304 Not Modified, but no copy of it is cached")
+        self.url = url
+
+
+@dataclass
+class _CacheEntry:
+    body: Any
+    fetched_at: float
+    etag: Optional[str] = None
+    last_modified: Optional[str] = None
+
+
+def create_pooled_session(headers: Optional[Dict[str, str]] = None) -> requests.Session:
+    """
+    Creates a session that keeps connections alive in a pool and retries idempotent requests on transient failures.
+
+    Parameters:
+        headers (Dict[str, str], optional): Headers sent with every request.
+
+    Returns:
+        requests.Session: The session.
+    """
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=CONNECTION_POOL_SIZE, pool_maxsize=CONNECTION_POOL_SIZE, max_retries=RETRY_STRATEGY)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    session.headers.update(headers or {})
+    return session
+
+
+class CachedJsonFetcher:     # pylint: disable = too-many-instance-attributes
+    """
+    Fetches JSON documents through a pooled session and caches them in memory, shared by every Streamlit session.
+
+    A cached document is served as is while it is younger than `time_to_live_in_seconds`. Once older, it is still
+    served straight away for another `stale_while_revalidate_in_seconds` while a background thread revalidates it with
+    `If-None-Match`/`If-Modified-Since`, so a warm page never waits on the network. Only cold or expired documents are
+    fetched on the caller's thread, and concurrent callers asking for the same document share a single request.
+
+    Parameters:
+        session (requests.Session, optional): Session to send the requests with. Defaults to a pooled session.
+        time_to_live_in_seconds (float): How long a document is served without revalidation.
+        stale_while_revalidate_in_seconds (float): How long an expired document is still served while it is revalidated.
+        timeout_in_seconds (float): Timeout of every request.
+        clock (Callable[[], float]): Monotonic clock, replaceable in tests.
+    """
+
+    def __init__(     # pylint: disable = too-many-arguments
+        self,
+        session: Optional[requests.Session] = None,
+        time_to_live_in_seconds: float = DEFAULT_TIME_TO_LIVE_IN_SECONDS,
+        stale_while_revalidate_in_seconds: float = DEFAULT_STALE_WHILE_REVALIDATE_IN_SECONDS,
+        timeout_in_seconds: float = DEFAULT_TIMEOUT_IN_SECONDS,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.session = session or create_pooled_session()
+        self.time_to_live_in_seconds = time_to_live_in_seconds
+        self.stale_while_revalidate_in_seconds = stale_while_revalidate_in_seconds
+        self.timeout_in_seconds = timeout_in_seconds
+        self.clock = clock
+        self._cache: Dict[Hashable, _CacheEntry] = {}
+        self._lock = threading.Lock()
+        self._fetch_locks: Dict[Hashable, threading.Lock] = {}
+        self._keys_being_revalidated: Set[Hashable] = set()
+
+    def get_json(self, url: str, params: Optional[Dict[str, Any]] = None) -> Any:
+        """
+        Returns the JSON document at the given URL, from the cache whenever it is fresh enough.
+
+        Parameters:
+            url (str): URL of the document.
+            params (Dict[str, Any], optional): Query string parameters, part of the cache key.
+
+        Returns:
+            Any: The decoded JSON document. It is shared with other callers and must not be modified.
+
+        Raises:
+            requests.HTTPError: If the document is not cached and the server answers with an error status.
+        """
+        cached_body = self.get_cached_json(url, params)
+        if cached_body is not None:
+            return cached_body
+        return self._fetch(url, params)
+
+    def get_cached_json(self, url: str, params: Optional[Dict[str, Any]] = None) -> Optional[Any]:
+        """
+        Returns the cached JSON document if it can be served without waiting on the network, revalidating it in the
+        background when it is stale.
+
+        Parameters:
+            url (str): URL of the document.
+            params (Dict[str, Any], optional): Query string parameters, part of the cache key.
+
+        Returns:
+            Optional[Any]: The decoded JSON document, or None if it has to be fetched.
+        """
+        entry = self._get_entry(url, params)
+        if entry is None:
+            return None
+        age = self.clock() - entry.fetched_at
+        if age < self.time_to_live_in_seconds:
+            return entry.body
+        if age < self.time_to_live_in_seconds + self.stale_while_revalidate_in_seconds:
+            self._revalidate_in_background(url, params)
+            return entry.body
+        return None
+
+    def get_conditional_headers(self, url: str, params: Optional[Dict[str, Any]] = None) -> Dict[str, str]:
+        """Returns the headers revalidating the cached copy of a document, empty if it is not cached."""
+        entry = self._get_entry(url, params)
+        conditional_headers: Dict[str, str] = {}
+        if entry is not None and entry.etag:
+            conditional_headers["If-None-Match"] = entry.etag
+        if entry is not None and entry.last_modified:
+            conditional_headers["If-Modified-Since"] = entry.last_modified
+        return conditional_headers
+
+    def store_response(     # pylint: disable = too-many-arguments
+        self,
+        url: str,
+        params: Optional[Dict[str, Any]],
+        status_code: int,
+        response_headers: Mapping[str, str],
+        response_body: bytes,
+    ) -> Any:
+        """
+        Caches the response to a request sent with `get_conditional_headers`, which may come from any HTTP client.
+
+        Parameters:
+            url (str): URL of the document.
+            params (Dict[str, Any], optional): Query string parameters, part of the cache key.
+            status_code (int): Status code of the response, which must be 200 or 304.
+            response_headers (Mapping[str, str]): Headers of the response.
+            response_body (bytes): Body of the response, ignored for a 304.
+
+        Returns:
+            Any: The decoded JSON document.
+
+        Raises:
+            NotModifiedWithoutCachedCopyError: If the response is 304 Not Modified and the document is not cached.
+        """
+        entry = self._get_entry(url, params)
+        if status_code == 304:
+            if entry is None:
+                raise NotModifiedWithoutCachedCopyError(url)
+            new_entry = _CacheEntry(entry.body, self.clock(), entry.etag, entry.last_modified)
+        else:
+            new_entry = _CacheEntry(
+                json.loads(response_body), self.clock(), response_headers.get("ETag"), response_headers.get("Last-Modified")
+            )
+        with self._lock:
+            self._cache[self._get_cache_key(url, params)] = new_entry
+        return new_entry.body
+
+    def revalidate_json(self, url: str, params: Optional[Dict[str, Any]] = None) -> Any:
+        """
+        Fetches the JSON document on the caller's thread whatever the age of the cached copy, which is revalidated
+        rather than downloaded again when the server supports it. For pollers that run off the request path.
+
+        Parameters:
+            url (str): URL of the document.
+            params (Dict[str, Any], optional): Query string parameters, part of the cache key.
+
+        Returns:
+            Any: The decoded JSON document, the very object cached before when the server answers 304 Not Modified.
+
+        Raises:
+            requests.HTTPError: If the server answers with an error status.
+        """
+        return self._fetch(url, params, force=True)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._cache.clear()
+
+    @staticmethod
+    def _get_cache_key(url: str, params: Optional[Dict[str, Any]]) -> Hashable:
+        return url, tuple(sorted((str(name), str(value)) for name, value in (params or {}).items()))
+
+    def _get_entry(self, url: str, params: Optional[Dict[str, Any]]) -> Optional[_CacheEntry]:
+        with self._lock:
+            return self._cache.get(self._get_cache_key(url, params))
+
+    def _fetch(self, url: str, params: Optional[Dict[str, Any]], force: bool = False) -> Any:
+        with self._lock:
+            fetch_lock = self._fetch_locks.setdefault(self._get_cache_key(url, params), threading.Lock())
+        with fetch_lock:
+            entry = self._get_entry(url, params)
+            if not force and entry is not None and self.clock() - entry.fetched_at < self.time_to_live_in_seconds:
+                return entry.body   # fetched by a concurrent caller while this one was waiting
+
+            response = self.session.get(
+                url, params=params, headers=self.get_conditional_headers(url, params), timeout=self.timeout_in_seconds
+            )
+            if response.status_code != 304:
+                response.raise_for_status()
+            try:
+                return self.store_response(url, params, response.status_code, response.headers, response.content)
+            except NotModifiedWithoutCachedCopyError:
+                # the cached copy was cleared while it was being revalidated, so the document is fetched in full
+                response = self.session.get(url, params=params, timeout=self.timeout_in_seconds)
+                response.raise_for_status()
+                return self.store_response(url, params, response.status_code, response.headers, response.content)
+
+    def _revalidate_in_background(self, url: str, params: Optional[Dict[str, Any]]) -> None:
+        key = self._get_cache_key(url, params)
+        with self._lock:
+            if key in self._keys_being_revalidated:
+                return
+            self._keys_being_revalidated.add(key)
+        threading.Thread(target=self._revalidate, args=(url, params), daemon=True, name="cached-json-fetcher-revalidation").start()
+
+    def _revalidate(self, url: str, params: Optional[Dict[str, Any]]) -> None:
+        try:
+            self._fetch(url, params, force=True)
+        except (requests.RequestException, ValueError) as exception:
+            logger.warning("Revalidation of %s failed, the stale document is served until it expires: %s", url, exception)
+        finally:
+            with self._lock:
+                self._keys_being_revalidated.discard(self._get_cache_key(url, params))
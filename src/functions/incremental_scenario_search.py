@@ -0,0 +1,182 @@
+import itertools
+import threading
+from dataclasses import dataclass, field
+from typing import (
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Set,
+    Tuple
+)
+from src.functions.qualification_scenario_search import (
+    QualificationScenarioSearch
+)
+
+QualifyingOutcome = Tuple[int, ...]
+
+
+@dataclass
+class _FixtureSourceState:
+    search: QualificationScenarioSearch
+    outcomes_per_request: Dict[Tuple[str, int], List[QualifyingOutcome]] = field(default_factory=dict)
+
+
+_fixture_source_states: Dict[str, _FixtureSourceState] = {}
+_fixture_source_states_lock = threading.Lock()
+
+
+def get_newly_decided_matches(
+    previous_search: QualificationScenarioSearch, search: QualificationScenarioSearch
+) -> Optional[Dict[int, str]]:
+    """
+    Finds the remaining matches of a previous fixture state that have a result in the current one.
+
+    Parameters:
+        previous_search (QualificationScenarioSearch): Search built from the previous fixture state.
+        search (QualificationScenarioSearch): Search built from the current fixture state.
+
+    Returns:
+        Optional[Dict[int, str]]: Winner of every newly decided match, by its position in the previous remaining
+            matches, or None if the current state does not follow from the previous one by results landing (teams,
+            points system or scheduled matches changed).
+    """
+    previous_simulator, simulator = previous_search.points_table_simulator, search.points_table_simulator
+    if (
+        previous_search.teams != search.teams
+        or previous_search.number_of_matches != search.number_of_matches
+        or (previous_simulator.points_for_a_win, previous_simulator.points_for_a_draw, previous_simulator.points_for_a_no_result)
+        != (simulator.points_for_a_win, simulator.points_for_a_draw, simulator.points_for_a_no_result)
+    ):
+        return None
+
+    position_of_remaining_match = {label: position for position, label in enumerate(search.remaining_schedule_df.index)}
+    if not set(position_of_remaining_match).issubset(previous_search.remaining_schedule_df.index):
+        return None
+    winners = simulator.tournament_schedule[simulator.tournament_schedule_winning_team_column_name]
+    expected_points = list(previous_search.current_points)
+    newly_decided_matches: Dict[int, str] = {}
+    for previous_position, label in enumerate(previous_search.remaining_schedule_df.index):
+        home_team, away_team = previous_search.remaining_matches[previous_position]
+        if label in position_of_remaining_match:
+            if search.remaining_matches[position_of_remaining_match[label]] != (home_team, away_team):
+                return None
+            continue
+        winner = winners.at[label]
+        newly_decided_matches[previous_position] = winner
+        if winner in search.team_index:
+            expected_points[search.team_index[winner]] += simulator.points_for_a_win
+        else:
+            shared_points = simulator.points_for_a_draw if winner == "Draw" else simulator.points_for_a_no_result
+            expected_points[home_team] += shared_points
+            expected_points[away_team] += shared_points
+
+    if expected_points != search.current_points:   # a completed result was amended as well
+        return None
+    return newly_decided_matches
+
+
+def carry_over_qualifying_outcomes(
+    previous_search: QualificationScenarioSearch,
+    previous_outcomes: List[QualifyingOutcome],
+    search: QualificationScenarioSearch,
+    newly_decided_matches: Dict[int, str],
+) -> List[QualifyingOutcome]:
+    """
+    Keeps the previous qualifying outcomes that agree with the newly decided matches, restricted to the matches that
+    remain. They still qualify, as they lead to the very same final points table.
+
+    Parameters:
+        previous_search (QualificationScenarioSearch): Search built from the previous fixture state.
+        previous_outcomes (List[QualifyingOutcome]): Qualifying outcomes found in the previous fixture state.
+        search (QualificationScenarioSearch): Search built from the current fixture state.
+        newly_decided_matches (Dict[int, str]): Output of `get_newly_decided_matches`.
+
+    Returns:
+        List[QualifyingOutcome]: The consistent outcomes, over the current remaining matches, in their previous order.
+    """
+    winner_of_newly_decided_match = {
+        previous_position: search.team_index.get(winner) for previous_position, winner in newly_decided_matches.items()
+    }   # a draw or no result maps to None, which no previous outcome agrees with
+    previous_position_of_label = {label: position for position, label in enumerate(previous_search.remaining_schedule_df.index)}
+    previous_position_of_remaining_match = [previous_position_of_label[label] for label in search.remaining_schedule_df.index]
+    return [
+        tuple(outcome[previous_position] for previous_position in previous_position_of_remaining_match)
+        for outcome in previous_outcomes
+        if all(outcome[position] == winner for position, winner in winner_of_newly_decided_match.items())
+    ]
+
+
+def iterate_qualifying_outcomes_incrementally(     # pylint: disable = too-many-arguments, too-many-positional-arguments
+    search: QualificationScenarioSearch,
+    team_name: str,
+    top_x_position_in_the_table: int,
+    desired_number_of_scenarios: int,
+    iterate_outcomes: Callable[[int], Iterable[QualifyingOutcome]],
+    fixture_source: Optional[str] = None,
+) -> Iterator[QualifyingOutcome]:
+    """
+    Yields qualifying outcomes for a team, reusing the outcomes found for the previous fixture state of the same source.
+
+    When the fixture only moved on by some results landing, the previous outcomes that agree with the results are kept
+    and the others dropped. The kept outcomes are yielded straight away, and the search runs whenever they are not
+    enough, as they are never taken for every qualifying outcome there is. Searched outcomes are yielded as they are
+    found, and remembered for the next fixture state even if the caller stops early.
+
+    Parameters:
+        search (QualificationScenarioSearch): Search built from the current fixture state.
+        team_name (str): The name of the team for which qualification scenarios are being determined.
+        top_x_position_in_the_table (int): The desired position in the points table for qualification.
+        desired_number_of_scenarios (int): The desired number of qualifying scenarios.
+        iterate_outcomes (Callable[[int], Iterable[QualifyingOutcome]]): Searches the current fixture state for up to the
+            given number of qualifying outcomes.
+        fixture_source (str, optional): Identifies where the fixture comes from. Without it, every call searches.
+
+    Returns:
+        Iterator[QualifyingOutcome]: Up to `desired_number_of_scenarios` qualifying outcomes.
+    """
+    if fixture_source is None:
+        yield from itertools.islice(iterate_outcomes(desired_number_of_scenarios), desired_number_of_scenarios)
+        return
+
+    state = _advance_fixture_source(fixture_source, search)
+    request_key = (team_name, int(top_x_position_in_the_table))
+    known_outcomes = state.outcomes_per_request.get(request_key, [])
+    yield from known_outcomes[:desired_number_of_scenarios]
+    if len(known_outcomes) >= desired_number_of_scenarios:
+        return
+
+    maximum_number_of_outcomes = desired_number_of_scenarios + len(known_outcomes)
+    seen_outcomes: Set[QualifyingOutcome] = set(known_outcomes)
+    merged_outcomes = list(known_outcomes)
+    try:
+        for outcome in itertools.islice(iterate_outcomes(maximum_number_of_outcomes), maximum_number_of_outcomes):
+            if outcome in seen_outcomes:
+                continue
+            seen_outcomes.add(outcome)
+            merged_outcomes.append(outcome)
+            yield outcome
+            if len(merged_outcomes) >= desired_number_of_scenarios:
+                break
+    finally:
+        with _fixture_source_states_lock:
+            state.outcomes_per_request[request_key] = merged_outcomes
+
+
+def _advance_fixture_source(fixture_source: str, search: QualificationScenarioSearch) -> _FixtureSourceState:
+    """Moves the outcomes known for a source over to the given fixture state, or forgets them if it cannot."""
+    with _fixture_source_states_lock:
+        state = _fixture_source_states.get(fixture_source)
+        if state is not None and state.search is search:
+            return state
+        new_state = _FixtureSourceState(search)
+        newly_decided_matches = None if state is None else get_newly_decided_matches(state.search, search)
+        if state is not None and newly_decided_matches is not None:
+            for request_key, outcomes in state.outcomes_per_request.items():
+                new_state.outcomes_per_request[request_key] = carry_over_qualifying_outcomes(
+                    state.search, outcomes, search, newly_decided_matches
+                )
+        _fixture_source_states[fixture_source] = new_state
+        return new_state
@@ -0,0 +1,197 @@
+import contextlib
+import contextvars
+import cProfile
+import functools
+import io
+import json
+import logging
+import os
+import pstats
+import time
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Iterator, List, Optional, TypeVar, cast
+
+REQUEST_LOG_ENVIRONMENT_VARIABLE = "PLAYOFF_CALCULATOR_REQUEST_LOG"
+NUMBER_OF_PROFILED_FUNCTIONS = 30
+
+logger = logging.getLogger(__name__)
+
+_current_request_trace: contextvars.ContextVar[Optional["RequestTrace"]] = contextvars.ContextVar("current_request_trace", default=None)
+_NO_SPAN = contextlib.nullcontext()
+
+Function = TypeVar("Function", bound=Callable[..., Any])
+
+
+@dataclass
+class Span:
+    """
+    A timed section of a request.
+
+    Attributes:
+        name (str): What the section does, such as 'fetch' or 'search'.
+        depth (int): Number of spans the section is nested in.
+        start (float): Seconds from the start of the request to the start of the section.
+        duration (float): Seconds the section took, nested spans included.
+        nested_duration (float): Seconds taken by the spans directly nested in it.
+    """
+
+    name: str
+    depth: int
+    start: float
+    duration: float = 0.0
+    nested_duration: float = 0.0
+
+    @property
+    def self_duration(self) -> float:
+        return self.duration - self.nested_duration
+
+
+@dataclass
+class RequestTrace:
+    """
+    Spans, counters and, optionally, the profile of one request, which is one run of a page.
+
+    Attributes:
+        name (str): Identifies the request, such as the page it ran.
+        spans (List[Span]): Spans in the order they started.
+        counters (Dict[str, int]): Counters by name, such as the search nodes explored.
+        duration (float): Seconds the request took, set once it ends.
+        profile (str, optional): The cProfile statistics of the request, when it was profiled.
+        started_at (float): `time.perf_counter` at the start of the request.
+    """
+
+    name: str
+    spans: List[Span] = field(default_factory=list)
+    counters: Dict[str, int] = field(default_factory=dict)
+    duration: float = 0.0
+    profile: Optional[str] = None
+    started_at: float = field(default_factory=time.perf_counter)
+    _open_spans: List[Span] = field(default_factory=list)
+
+    @contextlib.contextmanager
+    def span(self, name: str) -> Iterator[Span]:
+        new_span = Span(name, len(self._open_spans), time.perf_counter() - self.started_at)
+        self.spans.append(new_span)
+        self._open_spans.append(new_span)
+        try:
+            yield new_span
+        finally:
+            new_span.duration = time.perf_counter() - self.started_at - new_span.start
+            self._open_spans.pop()
+            if self._open_spans:
+                self._open_spans[-1].nested_duration += new_span.duration
+
+    def count(self, name: str, amount: int = 1) -> None:
+        self.counters[name] = self.counters.get(name, 0) + amount
+
+    def summarize_spans(self) -> Dict[str, Dict[str, float]]:
+        """
+        Returns the number of spans, their total time and their time outside of nested spans, by span name. The time
+        spent outside of any span is reported as 'other'.
+        """
+        summary: Dict[str, Dict[str, float]] = {}
+        for request_span in self.spans:
+            span_summary = summary.setdefault(request_span.name, {"count": 0, "total_seconds": 0.0, "self_seconds": 0.0})
+            span_summary["count"] += 1
+            span_summary["total_seconds"] += request_span.duration
+            span_summary["self_seconds"] += request_span.self_duration
+        other_duration = self.duration - sum(request_span.duration for request_span in self.spans if request_span.depth == 0)
+        summary["other"] = {"count": 1, "total_seconds": other_duration, "self_seconds": other_duration}
+        return summary
+
+    def to_log_record(self) -> Dict[str, Any]:
+        return {
+            "request": self.name,
+            "duration_ms": round(self.duration * 1000, 3),
+            "spans": {
+                name: {"count": int(span_summary["count"]), "self_ms": round(span_summary["self_seconds"] * 1000, 3)}
+                for name, span_summary in self.summarize_spans().items()
+            },
+            "counters": self.counters,
+        }
+
+
+def get_request_trace() -> Optional[RequestTrace]:
+    """Returns the trace of the request being run in the current context, None when it is not traced."""
+    return _current_request_trace.get()
+
+
+def span(name: str) -> contextlib.AbstractContextManager:
+    """
+    Times the section run within the returned context manager as a span of the current request. Outside of a traced
+    request, a shared no-op context manager is returned.
+    """
+    request_trace = _current_request_trace.get()
+    if request_trace is None:
+        return _NO_SPAN
+    return request_trace.span(name)
+
+
+def traced(name: str) -> Callable[[Function], Function]:
+    """Decorator timing every call of a function as a span of the current request, if it is traced."""
+    def decorator(function: Function) -> Function:
+        @functools.wraps(function)
+        def traced_function(*args, **kwargs):
+            request_trace = _current_request_trace.get()
+            if request_trace is None:
+                return function(*args, **kwargs)
+            with request_trace.span(name):
+                return function(*args, **kwargs)
+        return cast(Function, traced_function)
+    return decorator
+
+
+def count(name: str, amount: int = 1) -> None:
+    request_trace = _current_request_trace.get()
+    if request_trace is not None:
+        request_trace.count(name, amount)
+
+
+@contextlib.contextmanager
+def trace_request(name: str, is_enabled: bool, is_profiled: bool = False) -> Iterator[Optional[RequestTrace]]:
+    """
+    Traces the request run within the context, then logs its spans and counters as one JSON line at INFO level.
+
+    Parameters:
+        name (str): Identifies the request.
+        is_enabled (bool): Whether to trace the request at all. Without it, None is yielded and nothing is recorded.
+        is_profiled (bool): Whether to run the request under cProfile as well.
+
+    Returns:
+        Iterator[Optional[RequestTrace]]: The trace of the request, complete once the context exits.
+    """
+    if not is_enabled:
+        yield None
+        return
+    request_trace = RequestTrace(name)
+    token = _current_request_trace.set(request_trace)
+    profiler = cProfile.Profile() if is_profiled else None
+    try:
+        if profiler is not None:
+            profiler.enable()
+        yield request_trace
+    finally:
+        if profiler is not None:
+            profiler.disable()
+        request_trace.duration = time.perf_counter() - request_trace.started_at
+        _current_request_trace.reset(token)
+        if profiler is not None:
+            profile = io.StringIO()
+            pstats.Stats(profiler, stream=profile).sort_stats(pstats.SortKey.CUMULATIVE).print_stats(NUMBER_OF_PROFILED_FUNCTIONS)
+            request_trace.profile = profile.getvalue()
+        logger.info("%s", json.dumps(request_trace.to_log_record(), sort_keys=True))
+
+
+def is_request_log_enabled() -> bool:
+    """Whether every request is traced and logged, as set by the `PLAYOFF_CALCULATOR_REQUEST_LOG` environment variable."""
+    return os.environ.get(REQUEST_LOG_ENVIRONMENT_VARIABLE, "").lower() in ("1", "true", "yes")
+
+
+def enable_request_log() -> None:
+    """Sends the request log lines to the standard error, unless logging was already set up for them."""
+    if logger.handlers:
+        return
+    handler = logging.StreamHandler()
+    handler.setFormatter(logging.Formatter("%(asctime)s %(levelname)s %(name)s: %(message)s"))
+    logger.addHandler(handler)
+    logger.setLevel(logging.INFO)
@@ -0,0 +1,66 @@
+import importlib
+import logging
+import threading
+from dataclasses import dataclass
+from typing import Any, Callable, Iterable, Optional, Sequence, Tuple
+
+logger = logging.getLogger(__name__)
+
+_prewarming_lock = threading.Lock()
+_prewarming_thread: Optional[threading.Thread] = None
+
+
+@dataclass(frozen=True)
+class LazyPage:
+    """
+    A page of the app whose module, and with it every heavy dependency of the page, is only imported when the page is
+    first opened or pre-warmed.
+
+    Attributes:
+        module_name (str): Module defining the function that displays the page.
+        function_name (str): Name of that function.
+        arguments (Tuple[Any, ...]): Arguments the function is called with.
+    """
+
+    module_name: str
+    function_name: str
+    arguments: Tuple[Any, ...] = ()
+
+    def load(self) -> Callable[..., None]:
+        """Imports the module of the page, once per process, and returns the function that displays it."""
+        return getattr(importlib.import_module(self.module_name), self.function_name)
+
+    def __call__(self) -> None:
+        self.load()(*self.arguments)
+
+
+def start_prewarming(pages: Iterable[LazyPage], warm_ups: Sequence[Callable[[], None]] = ()) -> None:
+    """
+    Imports the modules of the pages on a daemon thread, then calls each of `warm_ups`, so that the pages nobody has
+    opened yet are ready before someone does. Worker processes forked by a later warm-up, such as the shared pool of the
+    parallel search, start with those modules already imported. Only the first call in a process starts the thread,
+    and a page or warm-up that fails is logged and skipped.
+
+    Parameters:
+        pages (Iterable[LazyPage]): The pages to load.
+        warm_ups (Sequence[Callable[[], None]]): Called after the pages are loaded, such as to start fetching data.
+    """
+    global _prewarming_thread     # pylint: disable = global-statement
+    with _prewarming_lock:
+        if _prewarming_thread is not None:
+            return
+        _prewarming_thread = threading.Thread(target=_prewarm, args=(list(pages), list(warm_ups)), name="page-prewarming", daemon=True)
+        _prewarming_thread.start()
+
+
+def _prewarm(pages: Sequence[LazyPage], warm_ups: Sequence[Callable[[], None]]) -> None:
+    for module_name in dict.fromkeys(page.module_name for page in pages):
+        try:
+            importlib.import_module(module_name)
+        except Exception:     # pylint: disable = broad-exception-caught
+            logger.exception("Pre-warming the page module %s failed", module_name)
+    for warm_up in warm_ups:
+        try:
+            warm_up()
+        except Exception:     # pylint: disable = broad-exception-caught
+            logger.exception("Pre-warming with %s failed", getattr(warm_up, "__name__", warm_up))
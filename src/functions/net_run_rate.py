@@ -0,0 +1,333 @@
+import hashlib
+import threading
+import time
+from dataclasses import dataclass
+from enum import Enum
+from typing import Callable, Dict, Iterator, List, Optional, Sequence, Tuple
+import numpy as np
+import pandas as pd
+from src.functions.parallel_scenario_search import (
+    find_qualifying_outcomes_in_parallel
+)
+from src.functions.qualification_scenario_search import (
+    QualificationScenarioSearch
+)
+from src.functions.tournament_model import TournamentModel
+
+DEFAULT_MINIMUM_WINNING_MARGIN = 0.05      # runs per over, a one-run win over 20 overs
+DEFAULT_MAXIMUM_WINNING_MARGIN = 5.0       # runs per over, a 100-run win over 20 overs
+DEFAULT_OVERS_PER_INNINGS = 20
+DEFAULT_SEARCH_BUDGET_IN_SECONDS = 5.0
+
+
+class NetRunRateVerdict(Enum):
+    QUALIFIES_OUTRIGHT = "Qualifies outright"
+    QUALIFIES_ON_NET_RUN_RATE = "Qualifies on net run rate"
+    NEEDS_A_WINNING_MARGIN = "Needs a winning margin"
+    MISSES_OUT_ON_NET_RUN_RATE = "Misses out on net run rate"
+
+
+@dataclass(frozen=True)
+class NetRunRateAssessment:
+    """
+    How a team fares in one qualifying outcome of the remaining matches once points ties are broken on net run rate.
+
+    Attributes:
+        verdict (NetRunRateVerdict): Whether the team qualifies on points alone, on net run rate whatever the margins,
+            only with a large enough winning margin, or not at all.
+        minimum_winning_margin (float, optional): Average margin, in runs per over, the team has to win its matches by
+            to qualify whatever the other margins. None when no margin within the modelled range is enough on its own.
+    """
+
+    verdict: NetRunRateVerdict
+    minimum_winning_margin: Optional[float] = None
+
+    def describe(self, overs_per_innings: int = DEFAULT_OVERS_PER_INNINGS) -> str:
+        if self.verdict != NetRunRateVerdict.NEEDS_A_WINNING_MARGIN:
+            return self.verdict.value
+        if self.minimum_winning_margin is None:
+            return f"{self.verdict.value}, along with favourable margins in the other matches"
+        return (
+            f"{self.verdict.value} of at least {self.minimum_winning_margin:.2f} runs per over on average "
+            f"(about {self.minimum_winning_margin * overs_per_innings:.0f} runs over {overs_per_innings} overs)"
+        )
+
+
+class NetRunRateSearchBudgetExhaustedError(Exception):
+    """Raised when the search runs out of its time budget before finding the desired number of scenarios."""
+
+    def __init__(self, team_name: str, top_x_position_in_the_table: int, number_of_scenarios_found: int, budget_in_seconds: float):
+        self.team_name = team_name
+        self.top_x_position_in_the_table = top_x_position_in_the_table
+        self.number_of_scenarios_found = number_of_scenarios_found
+        self.budget_in_seconds = budget_in_seconds
+        super().__init__(
+            f"Found {number_of_scenarios_found} scenarios for '{team_name}' within the top {top_x_position_in_the_table} "
+            f"in the search budget of {budget_in_seconds} seconds"
+        )
+
+
+class NetRunRateRanking:     # pylint: disable = too-many-instance-attributes
+    """
+    Breaks points ties on net run rate, with the margin of every remaining match modelled as an interval.
+
+    A team's net run rate is treated as the average run-rate margin of the matches it has completed, so every remaining
+    match moves it by the margin of that match, gained by the winner and given up by the loser. With every winning margin
+    within [`minimum_winning_margin`, `maximum_winning_margin`], interval arithmetic bounds a team's final net run rate
+    by its wins and losses alone. The intervals leave out that both teams of a match share its margin, so they are
+    wider than the exact ranges, and a verdict of qualifying on net run rate holds whatever the margins.
+
+    Only outcomes in which the team is level on points with rivals competing for its place are evaluated; every other
+    qualifying outcome is outright.
+
+    Parameters:
+        tournament_model (TournamentModel): Model of the tournament.
+        net_run_rates (Dict[str, float]): Current net run rate of every team, 0 for the teams left out.
+        minimum_winning_margin (float): Smallest winning margin, in runs per over.
+        maximum_winning_margin (float): Largest winning margin, in runs per over.
+    """
+
+    def __init__(
+        self,
+        tournament_model: TournamentModel,
+        net_run_rates: Dict[str, float],
+        minimum_winning_margin: float = DEFAULT_MINIMUM_WINNING_MARGIN,
+        maximum_winning_margin: float = DEFAULT_MAXIMUM_WINNING_MARGIN,
+    ):
+        if not 0 <= minimum_winning_margin <= maximum_winning_margin:
+            raise ValueError("'minimum_winning_margin' must be between 0 and 'maximum_winning_margin'")
+        self.tournament_model = tournament_model
+        self.minimum_winning_margin = minimum_winning_margin
+        self.maximum_winning_margin = maximum_winning_margin
+        self.points_for_a_win = tournament_model.points_for_a_win
+        standings = tournament_model.standings
+        self.current_net_run_rates = np.array([float(net_run_rates.get(team, 0.0)) for team in tournament_model.teams])
+        self.current_points: List[int] = standings.points.tolist()
+        self.remaining_matches_per_team = standings.remaining_matches
+        matches_counted = standings.matches_played - standings.matches_with_no_result
+        self.net_run_rate_totals = self.current_net_run_rates * matches_counted
+        self.final_number_of_matches = np.maximum(matches_counted + standings.remaining_matches, 1)
+        # Copies as plain ints and floats, for the per-outcome assessment
+        self._remaining_matches_per_team: List[int] = self.remaining_matches_per_team.tolist()
+        self._net_run_rate_totals: List[float] = self.net_run_rate_totals.tolist()
+        self._final_number_of_matches: List[int] = self.final_number_of_matches.tolist()
+
+    def get_state_digest(self) -> str:
+        """Hashes the net run rates and margins the assessments depend on, to tell the cached scenarios apart."""
+        return hashlib.sha256(repr((
+            self.current_net_run_rates.tolist(), self.minimum_winning_margin, self.maximum_winning_margin
+        )).encode()).hexdigest()
+
+    def assess(self, winners: Sequence[int], selected_team: int, top_x_position_in_the_table: int) -> NetRunRateAssessment:
+        """
+        Assesses one qualifying outcome of the remaining matches, found with points ties resolved in the team's favour.
+
+        Most outcomes are settled on points, and the others only involve a few teams, so the assessment is worked out
+        with plain ints and floats for the teams tied with the selected team alone.
+
+        Parameters:
+            winners (Sequence[int]): Winning team code of every remaining match.
+            selected_team (int): Code of the team to assess.
+            top_x_position_in_the_table (int): The position in the points table the team must finish within.
+
+        Returns:
+            NetRunRateAssessment: The assessment of the outcome.
+        """
+        wins = [0] * len(self.current_points)
+        for winner in winners:
+            wins[winner] += 1
+        points = [team_points + self.points_for_a_win * team_wins for team_points, team_wins in zip(self.current_points, wins)]
+        selected_team_points = points[selected_team]
+        places_left = top_x_position_in_the_table - sum(1 for team_points in points if team_points > selected_team_points)
+        tied_rivals = [team for team, team_points in enumerate(points) if team_points == selected_team_points and team != selected_team]
+        if len(tied_rivals) < places_left:
+            return NetRunRateAssessment(NetRunRateVerdict.QUALIFIES_OUTRIGHT)
+
+        # The team qualifies for sure once it is above the best case of all but `places_left - 1` tied rivals, and
+        # cannot qualify once it is below the worst case of `places_left` of them
+        rival_net_run_rate_ranges = [self._get_net_run_rate_range(team, wins[team]) for team in tied_rivals]
+        net_run_rate_to_be_sure = sorted((highest for _, highest in rival_net_run_rate_ranges), reverse=True)[places_left - 1]
+        net_run_rate_to_have_a_chance = sorted((lowest for lowest, _ in rival_net_run_rate_ranges), reverse=True)[places_left - 1]
+        lowest_net_run_rate, highest_net_run_rate = self._get_net_run_rate_range(selected_team, wins[selected_team])
+        if lowest_net_run_rate > net_run_rate_to_be_sure:
+            return NetRunRateAssessment(NetRunRateVerdict.QUALIFIES_ON_NET_RUN_RATE)
+        if highest_net_run_rate <= net_run_rate_to_have_a_chance:
+            return NetRunRateAssessment(NetRunRateVerdict.MISSES_OUT_ON_NET_RUN_RATE)
+        return NetRunRateAssessment(
+            NetRunRateVerdict.NEEDS_A_WINNING_MARGIN,
+            self._get_minimum_winning_margin(selected_team, wins[selected_team], net_run_rate_to_be_sure),
+        )
+
+    def iterate_qualifying_outcomes(
+        self,
+        qualification_scenario_search: QualificationScenarioSearch,
+        team_name: str,
+        top_x_position_in_the_table: int,
+        budget_in_seconds: float = DEFAULT_SEARCH_BUDGET_IN_SECONDS,
+    ) -> Iterator[Tuple[Tuple[int, ...], NetRunRateAssessment]]:
+        """
+        Yields the outcomes in which the team still qualifies once points ties are broken on net run rate, with their
+        assessment.
+
+        The search yields the outcomes that qualify with points ties going the team's way, and those the team misses out
+        on are dropped. When every one of them is dropped, the whole qualifying space would be searched before the page
+        shows anything, so the search is cancelled once it has taken `budget_in_seconds`, the time the caller spends
+        between two outcomes left out.
+
+        Parameters:
+            qualification_scenario_search (QualificationScenarioSearch): Search built from the tournament.
+            team_name (str): The team to find the outcomes for.
+            top_x_position_in_the_table (int): The position in the points table the team must finish within.
+            budget_in_seconds (float): Time the search may take before giving up.
+
+        Returns:
+            Iterator[Tuple[Tuple[int, ...], NetRunRateAssessment]]: Winning team indices, in the order of
+                `remaining_matches`, and the assessment of each outcome.
+
+        Raises:
+            NetRunRateSearchBudgetExhaustedError: If the budget runs out before the qualifying outcomes do.
+        """
+        selected_team = qualification_scenario_search.team_index[team_name]
+        number_of_scenarios_found = 0
+        seconds_spent_before_resuming = 0.0     # the time the caller spends between two outcomes is not counted
+        resumed_at = time.perf_counter()
+
+        def is_over_budget() -> bool:
+            return seconds_spent_before_resuming + time.perf_counter() - resumed_at > budget_in_seconds
+
+        for winners in qualification_scenario_search.iterate_qualifying_outcomes(team_name, top_x_position_in_the_table, is_cancelled=is_over_budget):
+            if is_over_budget():
+                break
+            assessment = self.assess(winners, selected_team, top_x_position_in_the_table)
+            if assessment.verdict != NetRunRateVerdict.MISSES_OUT_ON_NET_RUN_RATE:
+                number_of_scenarios_found += 1
+                seconds_spent_before_resuming += time.perf_counter() - resumed_at
+                yield winners, assessment
+                resumed_at = time.perf_counter()
+        if is_over_budget():
+            raise NetRunRateSearchBudgetExhaustedError(team_name, top_x_position_in_the_table, number_of_scenarios_found, budget_in_seconds)
+
+    def iterate_qualifying_outcomes_in_parallel(     # pylint: disable = too-many-arguments, too-many-positional-arguments
+        self,
+        qualification_scenario_search: QualificationScenarioSearch,
+        team_name: str,
+        top_x_position_in_the_table: int,
+        maximum_number_of_outcomes: int,
+        budget_in_seconds: float = DEFAULT_SEARCH_BUDGET_IN_SECONDS,
+        on_progress: Optional[Callable[[int], None]] = None,
+    ) -> Iterator[Tuple[Tuple[int, ...], NetRunRateAssessment]]:
+        """
+        Yields the same outcomes as `iterate_qualifying_outcomes`, up to `maximum_number_of_outcomes`, with the search
+        spread over worker processes by `find_qualifying_outcomes_in_parallel`.
+
+        The workers drop the outcomes the team misses out on themselves, so only the ones kept are sent back. They are
+        stopped once `budget_in_seconds` have passed, and the outcomes found by then are yielded before giving up.
+
+        Parameters:
+            qualification_scenario_search (QualificationScenarioSearch): Search built from the tournament.
+            team_name (str): The team to find the outcomes for.
+            top_x_position_in_the_table (int): The position in the points table the team must finish within.
+            maximum_number_of_outcomes (int): Number of outcomes after which the search stops.
+            budget_in_seconds (float): Time the search may take before giving up.
+            on_progress (Callable[[int], None], optional): Called with the number of outcomes found so far.
+
+        Returns:
+            Iterator[Tuple[Tuple[int, ...], NetRunRateAssessment]]: Winning team indices, in the order of
+                `remaining_matches`, and the assessment of each outcome.
+
+        Raises:
+            NetRunRateSearchBudgetExhaustedError: If the budget runs out before enough outcomes are found.
+        """
+        selected_team = qualification_scenario_search.team_index[team_name]
+        budget_exhausted_event = threading.Event()
+        budget_timer = threading.Timer(budget_in_seconds, budget_exhausted_event.set)
+        budget_timer.start()
+        try:
+            qualifying_outcomes = find_qualifying_outcomes_in_parallel(
+                qualification_scenario_search,
+                team_name,
+                top_x_position_in_the_table,
+                maximum_number_of_outcomes,
+                cancellation_event=budget_exhausted_event,
+                on_progress=on_progress,
+                outcome_filter=_QualifiesOnNetRunRate(self, selected_team, top_x_position_in_the_table),
+            )
+        finally:
+            budget_timer.cancel()
+        for winners in qualifying_outcomes:
+            yield winners, self.assess(winners, selected_team, top_x_position_in_the_table)
+        if budget_exhausted_event.is_set() and len(qualifying_outcomes) < maximum_number_of_outcomes:
+            raise NetRunRateSearchBudgetExhaustedError(team_name, top_x_position_in_the_table, len(qualifying_outcomes), budget_in_seconds)
+
+    def get_net_run_rate_ranges(self, winners: Sequence[int]) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Returns the lowest and highest final net run rate of every team, indexed by team code, once the remaining
+        matches are played with the given winners.
+        """
+        wins = np.bincount(np.asarray(winners, dtype=np.int64), minlength=len(self.current_points))
+        losses = self.remaining_matches_per_team - wins
+        return (
+            (self.net_run_rate_totals + wins * self.minimum_winning_margin - losses * self.maximum_winning_margin) / self.final_number_of_matches,
+            (self.net_run_rate_totals + wins * self.maximum_winning_margin - losses * self.minimum_winning_margin) / self.final_number_of_matches,
+        )
+
+    def _get_net_run_rate_range(self, team: int, wins: int) -> Tuple[float, float]:
+        losses = self._remaining_matches_per_team[team] - wins
+        net_run_rate_total = self._net_run_rate_totals[team]
+        final_number_of_matches = self._final_number_of_matches[team]
+        return (
+            (net_run_rate_total + wins * self.minimum_winning_margin - losses * self.maximum_winning_margin) / final_number_of_matches,
+            (net_run_rate_total + wins * self.maximum_winning_margin - losses * self.minimum_winning_margin) / final_number_of_matches,
+        )
+
+    def _get_minimum_winning_margin(self, selected_team: int, wins: int, net_run_rate_to_be_sure: float) -> Optional[float]:
+        """Solves for the average winning margin that lifts the team above `net_run_rate_to_be_sure`, losing narrowly."""
+        if wins == 0:
+            return None
+        losses = self._remaining_matches_per_team[selected_team] - wins
+        minimum_winning_margin = (
+            net_run_rate_to_be_sure * self._final_number_of_matches[selected_team]
+            - self._net_run_rate_totals[selected_team]
+            + losses * self.minimum_winning_margin
+        ) / wins
+        if minimum_winning_margin > self.maximum_winning_margin:
+            return None
+        return max(minimum_winning_margin, self.minimum_winning_margin)
+
+    def annotate_points_table(
+        self, points_table: pd.DataFrame, winners: Sequence[int], assessment: NetRunRateAssessment, team_name: str
+    ) -> pd.DataFrame:
+        """
+        Adds the final net run rate range of every team and the team's verdict to the points table of a scenario.
+
+        Parameters:
+            points_table (pd.DataFrame): Points table of the scenario.
+            winners (Sequence[int]): Winning team code of every remaining match in the scenario.
+            assessment (NetRunRateAssessment): Assessment of the scenario.
+            team_name (str): The selected team, which the verdict is given for.
+
+        Returns:
+            pd.DataFrame: The points table with 'net_run_rate' and 'net_run_rate_verdict' columns.
+        """
+        points_table = points_table.copy()
+        team_codes = [self.tournament_model.team_index[team] for team in points_table["team"]]
+        lowest_net_run_rates, highest_net_run_rates = self.get_net_run_rate_ranges(winners)
+        points_table["net_run_rate"] = [
+            f"{lowest:+.3f} to {highest:+.3f}"
+            for lowest, highest in zip(lowest_net_run_rates[team_codes].tolist(), highest_net_run_rates[team_codes].tolist())
+        ]
+        points_table["net_run_rate_verdict"] = np.where(points_table["team"] == team_name, assessment.describe(), "")
+        return points_table
+
+
+@dataclass(frozen=True)
+class _QualifiesOnNetRunRate:
+    """Outcome filter of the parallel search, picklable so that the workers can apply it."""
+
+    net_run_rate_ranking: NetRunRateRanking
+    selected_team: int
+    top_x_position_in_the_table: int
+
+    def __call__(self, winners: Tuple[int, ...]) -> bool:
+        assessment = self.net_run_rate_ranking.assess(winners, self.selected_team, self.top_x_position_in_the_table)
+        return assessment.verdict != NetRunRateVerdict.MISSES_OUT_ON_NET_RUN_RATE
@@ -0,0 +1,101 @@
+from typing import Sequence, Tuple
+import numpy as np
+
+HOME_TEAM_WINS = 0
+AWAY_TEAM_WINS = 1
+
+
+class BatchOutcomeEvaluator:
+    """
+    Evaluates many outcomes of the remaining matches at once with array operations.
+
+    An outcome batch is a 2D array with one row per candidate scenario and one column per remaining match, holding
+    `HOME_TEAM_WINS` or `AWAY_TEAM_WINS`. The final points of every team in every row come from a single matrix product
+    with the precomputed team x match incidence matrix, so no per-candidate points table is ever built.
+
+    Parameters:
+        current_points (Sequence[int]): Current points of every team, indexed by team code.
+        remaining_matches (Sequence[Tuple[int, int]]): Home and away team code of every remaining match.
+        points_for_a_win (int): Points awarded for a win.
+    """
+
+    def __init__(self, current_points: Sequence[int], remaining_matches: Sequence[Tuple[int, int]], points_for_a_win: int):
+        self.points_for_a_win = points_for_a_win
+        self.number_of_teams = len(current_points)
+        self.number_of_matches = len(remaining_matches)
+
+        home_incidence = np.zeros((self.number_of_teams, self.number_of_matches), dtype=np.float32)
+        away_incidence = np.zeros((self.number_of_teams, self.number_of_matches), dtype=np.float32)
+        for match_index, (home_team, away_team) in enumerate(remaining_matches):
+            home_incidence[home_team, match_index] = 1
+            away_incidence[away_team, match_index] = 1
+
+        self.points_if_home_teams_win = np.asarray(current_points, dtype=np.int32) + points_for_a_win * home_incidence.sum(axis=1).astype(np.int32)
+        self.swing_incidence = np.ascontiguousarray((away_incidence - home_incidence).T * points_for_a_win)
+
+    def evaluate_points(self, outcomes: np.ndarray) -> np.ndarray:
+        """
+        Computes the final points of every team for a batch of outcomes.
+
+        Parameters:
+            outcomes (np.ndarray): Outcome batch of shape (number of scenarios, number of remaining matches).
+
+        Returns:
+            np.ndarray: Final points of shape (number of scenarios, number of teams).
+        """
+        swings = np.asarray(outcomes, dtype=np.float32) @ self.swing_incidence
+        return self.points_if_home_teams_win + swings.astype(np.int32)
+
+    @staticmethod
+    def rank_teams(points: np.ndarray) -> np.ndarray:
+        """
+        Ranks every team in every row, where a team's position is one more than the number of teams with more points.
+
+        Parameters:
+            points (np.ndarray): Final points of shape (number of scenarios, number of teams).
+
+        Returns:
+            np.ndarray: Positions of shape (number of scenarios, number of teams), starting at 1.
+        """
+        return 1 + (points[:, np.newaxis, :] > points[:, :, np.newaxis]).sum(axis=2)
+
+    @staticmethod
+    def position_of_team(points: np.ndarray, team: int) -> np.ndarray:
+        """
+        Ranks a single team in every row, with ties resolved in its favour.
+
+        Parameters:
+            points (np.ndarray): Final points of shape (number of scenarios, number of teams).
+            team (int): Code of the team to rank.
+
+        Returns:
+            np.ndarray: Position of the team in every row, starting at 1.
+        """
+        return 1 + (points > points[:, team, np.newaxis]).sum(axis=1)
+
+    def qualifying_mask(self, outcomes: np.ndarray, team: int, top_x_position_in_the_table: int) -> np.ndarray:
+        """
+        Flags the outcomes in which the team finishes within the top positions of the points table.
+
+        Parameters:
+            outcomes (np.ndarray): Outcome batch of shape (number of scenarios, number of remaining matches).
+            team (int): Code of the team to check.
+            top_x_position_in_the_table (int): The position in the points table the team must finish within.
+
+        Returns:
+            np.ndarray: Boolean mask with one entry per scenario.
+        """
+        return self.position_of_team(self.evaluate_points(outcomes), team) <= top_x_position_in_the_table
+
+
+def enumerate_outcomes(number_of_matches: int) -> np.ndarray:
+    """
+    Lists every outcome of the given number of matches as an outcome batch, in binary counting order.
+
+    Parameters:
+        number_of_matches (int): Number of matches to enumerate, kept small as the batch has 2 ** number_of_matches rows.
+
+    Returns:
+        np.ndarray: Outcome batch of shape (2 ** number_of_matches, number_of_matches).
+    """
+    return ((np.arange(2 ** number_of_matches)[:, np.newaxis] >> np.arange(number_of_matches)) & 1).astype(np.int8)
@@ -0,0 +1,295 @@
+import itertools
+import math
+import multiprocessing
+import os
+import threading
+import time
+from concurrent.futures import (
+    FIRST_COMPLETED,
+    Future,
+    ProcessPoolExecutor,
+    wait
+)
+from concurrent.futures.process import BrokenProcessPool
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+import pandas as pd
+from points_table_simulator.exceptions import NoQualifyingScenariosError
+from src.functions.qualification_scenario_search import (
+    QualificationScenarioSearch
+)
+
+PARALLEL_SEARCH_MINIMUM_REMAINING_MATCHES = 24
+PREFIXES_PER_WORKER = 4
+PROGRESS_POLL_INTERVAL_IN_SECONDS = 0.1
+WORKER_START_UP_TASK_DURATION_IN_SECONDS = 0.05
+
+_worker_stop_event = None
+_worker_outcome_counter = None
+
+
+class _WorkerPool:
+    """
+    Worker processes with the stop event and outcome counter they share, which run the prefixes of one search at a time.
+
+    Parameters:
+        number_of_workers (int): Number of worker processes.
+    """
+
+    def __init__(self, number_of_workers: int):
+        context = _get_multiprocessing_context()
+        self.number_of_workers = number_of_workers
+        self.stop_event = context.Event()
+        self.outcome_counter = context.Value("i", 0)
+        self.executor = ProcessPoolExecutor(
+            max_workers=number_of_workers,
+            mp_context=context,
+            initializer=_initialise_worker,
+            initargs=(self.stop_event, self.outcome_counter),
+        )
+        self.search_lock = threading.Lock()
+
+    def start_workers(self) -> None:
+        """
+        Starts every worker now instead of on the first search. Forking executors start them all on the first task,
+        and the others only start another worker while none is idle, so each start-up task keeps its worker busy.
+        """
+        wait([self.executor.submit(time.sleep, WORKER_START_UP_TASK_DURATION_IN_SECONDS) for _ in range(self.number_of_workers)])
+
+    def shutdown(self) -> None:
+        self.stop_event.set()
+        self.executor.shutdown(wait=True, cancel_futures=True)
+
+
+_shared_worker_pool: Optional[_WorkerPool] = None
+_shared_worker_pool_lock = threading.Lock()
+
+
+def default_number_of_workers() -> int:
+    return os.cpu_count() or 1
+
+
+def should_search_in_parallel(qualification_scenario_search: QualificationScenarioSearch) -> bool:
+    """Smaller searches finish in milliseconds in-process, well before a pool of workers could even start."""
+    return default_number_of_workers() > 1 and len(qualification_scenario_search.remaining_matches) >= PARALLEL_SEARCH_MINIMUM_REMAINING_MATCHES
+
+
+def prewarm_worker_pool() -> None:
+    """
+    Starts the shared worker pool, which the searches without an explicit number of workers run on, so that the first
+    of them does not wait for the workers to fork. Workers fork from the process as it is at this point, so it should
+    be called once the modules the searches need are imported. Does nothing on a single CPU, where searches stay
+    in-process.
+    """
+    if default_number_of_workers() > 1:
+        _get_shared_worker_pool().start_workers()
+
+
+def shutdown_worker_pool() -> None:
+    """Stops the workers of the shared pool, if it was started. The next search starts a new one."""
+    global _shared_worker_pool     # pylint: disable = global-statement
+    with _shared_worker_pool_lock:
+        worker_pool, _shared_worker_pool = _shared_worker_pool, None
+    if worker_pool is not None:
+        worker_pool.shutdown()
+
+
+def simulate_the_qualification_scenarios_in_parallel(     # pylint: disable = too-many-arguments, too-many-positional-arguments
+    qualification_scenario_search: QualificationScenarioSearch,
+    team_name: str,
+    top_x_position_in_the_table: int,
+    desired_number_of_scenarios: int = 3,
+    number_of_workers: Optional[int] = None,
+    cancellation_event: Optional[threading.Event] = None,
+    on_progress: Optional[Callable[[int], None]] = None,
+) -> Tuple[List[pd.DataFrame], List[pd.DataFrame]]:
+    """
+    Finds qualification scenarios for a team with `find_qualifying_outcomes_in_parallel`, as a drop-in replacement of
+    `QualificationScenarioSearch.simulate_the_qualification_scenarios`.
+
+    Returns:
+        Tuple[List[pd.DataFrame], List[pd.DataFrame]]: Points tables and remaining match outcomes for each scenario.
+
+    Raises:
+        NoQualifyingScenariosError: If no outcome of the remaining matches places the team in the top positions.
+    """
+    search = qualification_scenario_search
+    search.validate_the_request(team_name, top_x_position_in_the_table, desired_number_of_scenarios)
+    qualifying_outcomes = find_qualifying_outcomes_in_parallel(
+        search, team_name, top_x_position_in_the_table, desired_number_of_scenarios, number_of_workers, cancellation_event, on_progress
+    )
+    if not qualifying_outcomes:
+        raise NoQualifyingScenariosError(top_x_position_in_the_table, team_name)
+    return (
+        [search.build_points_table(winners, team_name) for winners in qualifying_outcomes],
+        [search.build_remaining_match_outcome(winners) for winners in qualifying_outcomes],
+    )
+
+
+def find_qualifying_outcomes_in_parallel(     # pylint: disable = too-many-arguments, too-many-positional-arguments
+    qualification_scenario_search: QualificationScenarioSearch,
+    team_name: str,
+    top_x_position_in_the_table: int,
+    maximum_number_of_outcomes: int,
+    number_of_workers: Optional[int] = None,
+    cancellation_event: Optional[threading.Event] = None,
+    on_progress: Optional[Callable[[int], None]] = None,
+    outcome_filter: Optional[Callable[[Tuple[int, ...]], bool]] = None,
+) -> List[Tuple[int, ...]]:
+    """
+    Collects qualifying outcomes for a team by spreading the search over a pool of worker processes.
+
+    The outcome space is split by fixing the winners of the first few matches of the search order, and every such
+    prefix is searched by a worker. Without a `number_of_workers`, the search runs on the shared worker pool started by
+    `prewarm_worker_pool`, or by the first such search, unless another search is running on it already. Otherwise a
+    pool is started for the search alone. All workers share a stop event, which is set as soon as `maximum_number_of_outcomes`
+    have been collected across workers, when `cancellation_event` is set, or when `on_progress` raises (as Streamlit
+    does when the user changes the form while the search runs). With an `outcome_filter`, the workers drop the outcomes
+    it rejects themselves, and only the others count towards `maximum_number_of_outcomes`.
+
+    Parameters:
+        qualification_scenario_search (QualificationScenarioSearch): The search to run in parallel.
+        team_name (str): The name of the team for which qualification scenarios are being determined.
+        top_x_position_in_the_table (int): The desired position in the points table for qualification.
+        maximum_number_of_outcomes (int): Number of qualifying outcomes after which the search stops.
+        number_of_workers (int, optional): Number of worker processes of a pool started for this search. Defaults to
+            the shared pool, with a worker per CPU.
+        cancellation_event (threading.Event, optional): Stops the search when set.
+        on_progress (Callable[[int], None], optional): Called with the number of outcomes found so far, while waiting
+            on the workers.
+        outcome_filter (Callable[[Tuple[int, ...]], bool], optional): Keeps the outcomes it returns True for. Sent to
+            the workers, so it must be picklable.
+
+    Returns:
+        List[Tuple[int, ...]]: Winning team indices of every remaining match, for the outcomes found before stopping.
+    """
+    shared_worker_pool = _get_shared_worker_pool() if number_of_workers is None else None
+    if shared_worker_pool is not None and shared_worker_pool.search_lock.acquire(blocking=False):
+        try:
+            return _search_on_worker_pool(
+                shared_worker_pool, qualification_scenario_search, team_name, top_x_position_in_the_table,
+                maximum_number_of_outcomes, cancellation_event, on_progress, outcome_filter
+            )
+        except BrokenProcessPool:
+            shutdown_worker_pool()
+            raise
+        finally:
+            shared_worker_pool.search_lock.release()
+    worker_pool = _WorkerPool(number_of_workers or default_number_of_workers())
+    try:
+        return _search_on_worker_pool(
+            worker_pool, qualification_scenario_search, team_name, top_x_position_in_the_table,
+            maximum_number_of_outcomes, cancellation_event, on_progress, outcome_filter
+        )
+    finally:
+        worker_pool.shutdown()
+
+
+def _search_on_worker_pool(     # pylint: disable = too-many-arguments, too-many-positional-arguments
+    worker_pool: _WorkerPool,
+    qualification_scenario_search: QualificationScenarioSearch,
+    team_name: str,
+    top_x_position_in_the_table: int,
+    maximum_number_of_outcomes: int,
+    cancellation_event: Optional[threading.Event],
+    on_progress: Optional[Callable[[int], None]],
+    outcome_filter: Optional[Callable[[Tuple[int, ...]], bool]],
+) -> List[Tuple[int, ...]]:
+    """Runs the prefixes of the search on the pool, and waits until none of them is left running before returning."""
+    prefixes = _split_outcome_space(qualification_scenario_search, team_name, worker_pool.number_of_workers * PREFIXES_PER_WORKER)
+    outcomes_per_prefix: Dict[int, List[Tuple[int, ...]]] = {}
+    worker_pool.stop_event.clear()
+    worker_pool.outcome_counter.value = 0
+    pending_futures: Dict[Future, int] = {}
+    try:
+        pending_futures = {
+            worker_pool.executor.submit(
+                _search_prefix,
+                qualification_scenario_search,
+                team_name,
+                top_x_position_in_the_table,
+                prefix,
+                maximum_number_of_outcomes,
+                outcome_filter,
+            ): prefix_index
+            for prefix_index, prefix in enumerate(prefixes)
+        }
+        while pending_futures:
+            done_futures, _ = wait(pending_futures, timeout=PROGRESS_POLL_INTERVAL_IN_SECONDS, return_when=FIRST_COMPLETED)
+            for future in done_futures:
+                outcomes_per_prefix[pending_futures.pop(future)] = future.result()
+            if on_progress is not None:
+                on_progress(min(worker_pool.outcome_counter.value, maximum_number_of_outcomes))
+            if cancellation_event is not None and cancellation_event.is_set():
+                worker_pool.stop_event.set()
+    finally:
+        worker_pool.stop_event.set()
+        for future in pending_futures:
+            future.cancel()
+        wait(pending_futures)
+
+    return list(itertools.islice(
+        itertools.chain.from_iterable(outcomes_per_prefix[prefix_index] for prefix_index in sorted(outcomes_per_prefix)),
+        maximum_number_of_outcomes,
+    ))
+
+
+def _split_outcome_space(search: QualificationScenarioSearch, team_name: str, minimum_number_of_prefixes: int) -> List[Tuple[int, ...]]:
+    """Fixes the winners of the first k matches of the search order, with k just large enough for the requested pieces."""
+    match_order = search.get_match_order(team_name)
+    number_of_fixed_matches = min(len(match_order), max(0, math.ceil(math.log2(minimum_number_of_prefixes))))
+    selected_team = search.team_index[team_name]
+    candidate_winners = []
+    for match_index in match_order[:number_of_fixed_matches]:
+        home_team, away_team = search.remaining_matches[match_index]
+        candidate_winners.append((away_team, home_team) if away_team == selected_team else (home_team, away_team))
+    return list(itertools.product(*candidate_winners))
+
+
+def _get_multiprocessing_context():
+    """Forks where available, so that workers start without re-importing pandas and the app modules."""
+    if "fork" in multiprocessing.get_all_start_methods():
+        return multiprocessing.get_context("fork")
+    return multiprocessing.get_context()
+
+
+def _get_shared_worker_pool() -> _WorkerPool:
+    global _shared_worker_pool     # pylint: disable = global-statement
+    with _shared_worker_pool_lock:
+        if _shared_worker_pool is None:
+            _shared_worker_pool = _WorkerPool(default_number_of_workers())
+        return _shared_worker_pool
+
+
+def _initialise_worker(stop_event, outcome_counter) -> None:
+    global _worker_stop_event, _worker_outcome_counter    # pylint: disable = global-statement
+    _worker_stop_event = stop_event
+    _worker_outcome_counter = outcome_counter
+
+
+def _search_prefix(     # pylint: disable = too-many-arguments, too-many-positional-arguments
+    search: QualificationScenarioSearch,
+    team_name: str,
+    top_x_position_in_the_table: int,
+    prefix_winners: Sequence[int],
+    maximum_number_of_outcomes: int,
+    outcome_filter: Optional[Callable[[Tuple[int, ...]], bool]],
+) -> List[Tuple[int, ...]]:
+    """Searches the outcomes starting with the given prefix until the outcomes found across all workers are enough."""
+    assert _worker_stop_event is not None and _worker_outcome_counter is not None
+    qualifying_outcomes: List[Tuple[int, ...]] = []
+    if _worker_stop_event.is_set():
+        return qualifying_outcomes
+    for winners in search.iterate_qualifying_outcomes(
+        team_name, top_x_position_in_the_table, prefix_winners=prefix_winners, is_cancelled=_worker_stop_event.is_set
+    ):
+        if outcome_filter is not None and not outcome_filter(winners):
+            if _worker_stop_event.is_set():     # the search only polls between batches, which may all be dropped
+                break
+            continue
+        qualifying_outcomes.append(winners)
+        with _worker_outcome_counter.get_lock():
+            _worker_outcome_counter.value += 1
+            if _worker_outcome_counter.value >= maximum_number_of_outcomes:
+                _worker_stop_event.set()
+                break
+    return qualifying_outcomes
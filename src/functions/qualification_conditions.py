@@ -0,0 +1,270 @@
+from dataclasses import dataclass
+from enum import Enum
+from typing import Dict, Iterator, List, Mapping, Optional, Tuple
+from src.functions.qualification_scenario_search import (
+    QualificationScenarioSearch
+)
+from src.functions.qualification_verdict import can_finish_in_top_positions
+
+
+class MatchCondition(str, Enum):
+    MUST_WIN = "Must win"
+    REQUIRED_RESULT = "Required result"
+    MATTERS = "Matters, either result can work"
+    DOES_NOT_MATTER = "Does not matter"
+
+
+@dataclass(frozen=True)
+class QualificationConditions:
+    """
+    What the remaining matches have to look like for a team to finish within the top positions, with points ties going
+    its way.
+
+    Attributes:
+        team_name (str): The team.
+        top_x_position_in_the_table (int): The position in the points table the team must finish within.
+        required_winners (Dict[int, int]): Winning team index of every match with a single result that keeps
+            qualification possible, by index into `remaining_matches`. The team's own matches among them must be won.
+        match_conditions (List[MatchCondition]): Condition of every remaining match, in the order of
+            `remaining_matches`.
+    """
+
+    team_name: str
+    top_x_position_in_the_table: int
+    required_winners: Dict[int, int]
+    match_conditions: List[MatchCondition]
+
+    @property
+    def relevant_matches(self) -> List[int]:
+        """Indices of the matches whose result matters without being settled."""
+        return [match_index for match_index, condition in enumerate(self.match_conditions) if condition == MatchCondition.MATTERS]
+
+
+def derive_qualification_conditions(
+    search: QualificationScenarioSearch,
+    team_name: str,
+    top_x_position_in_the_table: int,
+    minimum_number_of_wins_needed: Optional[int] = None,
+) -> QualificationConditions:
+    """
+    Derives which matches the team must win, which results it needs from its rivals' matches and which matches do not
+    matter, by propagating constraints over the remaining fixture instead of listing outcomes.
+
+    A result is required when fixing the other result leaves no qualifying outcome, as told by
+    `can_finish_in_top_positions`, so every match costs at most two checks, and a check left undecided requires
+    nothing. The required results then bound every team's final points, with the team's own points bounded below by
+    the wins it needs, when known. A match between two rivals that both stay above the team, or both cannot pass it,
+    within those bounds does not matter: flipping its result never turns a qualifying outcome into one that does not
+    qualify.
+
+    Parameters:
+        search (QualificationScenarioSearch): Search built from the tournament.
+        team_name (str): The team, which must not be eliminated.
+        top_x_position_in_the_table (int): The position in the points table the team must finish within.
+        minimum_number_of_wins_needed (int, optional): Output of `get_minimum_number_of_wins_needed`, which spots more
+            of the matches that do not matter. It is not worked out here, as it takes many more checks than the rest.
+
+    Returns:
+        QualificationConditions: The conditions of every remaining match.
+
+    Raises:
+        ValueError: If the team cannot finish within the top positions.
+    """
+    if _can_qualify(search, team_name, top_x_position_in_the_table, {}) is False:
+        raise ValueError(f"'{team_name}' cannot finish within the top {top_x_position_in_the_table}")
+    selected_team = search.team_index[team_name]
+    required_winners: Dict[int, int] = {}
+    for match_index, (home_team, away_team) in enumerate(search.remaining_matches):
+        for winner, loser in ((home_team, away_team), (away_team, home_team)):
+            if winner == selected_team:
+                continue    # a win never hurts the team, so its own matches only need the loss checked
+            if _can_qualify(search, team_name, top_x_position_in_the_table, {match_index: winner}) is False:
+                required_winners[match_index] = loser
+                break
+
+    points_for_a_win = search.points_for_a_win
+    required_wins = [0] * len(search.teams)
+    required_losses = [0] * len(search.teams)
+    for match_index, winner in required_winners.items():
+        home_team, away_team = search.remaining_matches[match_index]
+        required_wins[winner] += 1
+        required_losses[away_team if winner == home_team else home_team] += 1
+    minimum_points = [points + points_for_a_win * wins for points, wins in zip(search.current_points, required_wins)]
+    maximum_points = [
+        points + points_for_a_win * (remaining_matches - losses)
+        for points, remaining_matches, losses in zip(search.current_points, search.remaining_matches_per_team, required_losses)
+    ]
+    lowest_qualifying_points = max(
+        minimum_points[selected_team], search.current_points[selected_team] + points_for_a_win * (minimum_number_of_wins_needed or 0)
+    )
+    highest_points = maximum_points[selected_team]
+    settled_teams = {
+        team for team in range(len(search.teams))
+        if team != selected_team and (minimum_points[team] > highest_points or maximum_points[team] <= lowest_qualifying_points)
+    }
+
+    match_conditions: List[MatchCondition] = []
+    for match_index, (home_team, away_team) in enumerate(search.remaining_matches):
+        if match_index in required_winners:
+            match_conditions.append(
+                MatchCondition.MUST_WIN if selected_team in (home_team, away_team) else MatchCondition.REQUIRED_RESULT
+            )
+        elif home_team in settled_teams and away_team in settled_teams:
+            match_conditions.append(MatchCondition.DOES_NOT_MATTER)
+        else:
+            match_conditions.append(MatchCondition.MATTERS)
+    return QualificationConditions(team_name, top_x_position_in_the_table, required_winners, match_conditions)
+
+
+def iterate_diverse_qualifying_outcomes(
+    search: QualificationScenarioSearch,
+    team_name: str,
+    top_x_position_in_the_table: int,
+    conditions: Optional[QualificationConditions] = None,
+) -> Iterator[Tuple[int, ...]]:
+    """
+    Lazily yields qualifying outcomes that differ from each other in as many of the matches that matter as possible,
+    instead of the near-identical outcomes a depth-first search lists first.
+
+    Every outcome is built one match at a time, in the order of `get_match_order`: each match takes the result that
+    moves the outcome furthest, in Hamming distance over the matches that matter, from the closest outcome yielded so
+    far, provided a qualifying outcome is still possible with it, and the other result otherwise. As every step keeps
+    qualification possible, building an outcome takes one check per match that matters and never backtracks.
+    Required results are fixed, and the matches that do not matter always go to the home team, so outcomes never
+    differ in them alone. Should the greedy choices repeat an outcome, or miss one as a check was left undecided, a
+    new one is looked for among the results shared with the yielded outcomes, and the iterator stops once no other
+    qualifying outcome is found in the matches that matter.
+
+    Parameters:
+        search (QualificationScenarioSearch): Search built from the tournament.
+        team_name (str): The team, which must not be eliminated.
+        top_x_position_in_the_table (int): The position in the points table the team must finish within.
+        conditions (QualificationConditions, optional): Conditions from `derive_qualification_conditions`, derived
+            here when not given.
+
+    Returns:
+        Iterator[Tuple[int, ...]]: Winning team indices, in the order of `remaining_matches`.
+    """
+    conditions = conditions or derive_qualification_conditions(search, team_name, top_x_position_in_the_table)
+    relevant_matches = set(conditions.relevant_matches)
+    match_order = [match_index for match_index in search.get_match_order(team_name) if match_index in relevant_matches]
+    fixed_winners = dict(conditions.required_winners)
+    for match_index, condition in enumerate(conditions.match_conditions):
+        if condition == MatchCondition.DOES_NOT_MATTER:
+            fixed_winners[match_index] = search.remaining_matches[match_index][0]
+
+    yielded_outcomes: List[Tuple[int, ...]] = []
+    while True:
+        outcome = _build_diverse_outcome(search, team_name, top_x_position_in_the_table, fixed_winners, match_order, yielded_outcomes)
+        if outcome in yielded_outcomes or not _qualifies(search, team_name, top_x_position_in_the_table, outcome):
+            outcome = _build_new_outcome(search, team_name, top_x_position_in_the_table, dict(fixed_winners), match_order, yielded_outcomes)
+            if outcome is None:
+                return
+        yielded_outcomes.append(outcome)
+        yield outcome
+
+
+def _build_diverse_outcome(     # pylint: disable = too-many-arguments, too-many-positional-arguments
+    search: QualificationScenarioSearch,
+    team_name: str,
+    top_x_position_in_the_table: int,
+    fixed_winners: Mapping[int, int],
+    match_order: List[int],
+    yielded_outcomes: List[Tuple[int, ...]],
+) -> Tuple[int, ...]:
+    """Completes the fixed results into a qualifying outcome, greedily as far as possible from the yielded ones."""
+    selected_team = search.team_index[team_name]
+    winners = dict(fixed_winners)
+    distances = [0] * len(yielded_outcomes)
+    for match_index in match_order:
+        if match_index not in winners:
+            home_team, away_team = search.remaining_matches[match_index]
+            preferred_winner, other_winner = sorted(
+                (home_team, away_team),
+                key=lambda team, match_index=match_index: (
+                    _get_distance_gain(team, match_index, yielded_outcomes, distances), team == selected_team
+                ),
+                reverse=True,
+            )
+            winners[match_index] = preferred_winner
+            can_qualify = _can_qualify(search, team_name, top_x_position_in_the_table, winners)
+            if can_qualify is False:
+                winners[match_index] = other_winner
+            elif can_qualify is None:
+                winners[match_index] = other_winner
+                if not _can_qualify(search, team_name, top_x_position_in_the_table, winners):
+                    winners[match_index] = preferred_winner
+        for outcome_number, outcome in enumerate(yielded_outcomes):
+            distances[outcome_number] += outcome[match_index] != winners[match_index]
+    return tuple(winners[match_index] for match_index in range(len(search.remaining_matches)))
+
+
+def _build_new_outcome(     # pylint: disable = too-many-arguments, too-many-positional-arguments
+    search: QualificationScenarioSearch,
+    team_name: str,
+    top_x_position_in_the_table: int,
+    winners: Dict[int, int],
+    match_order: List[int],
+    yielded_outcomes: List[Tuple[int, ...]],
+    depth: int = 0,
+) -> Optional[Tuple[int, ...]]:
+    """
+    Finds a qualifying outcome unlike every yielded one in some match that matters, or None if there is none. Only the
+    results shared with a yielded outcome are branched on, as any qualifying completion of the others is new.
+    """
+    if not yielded_outcomes:
+        outcome = _build_diverse_outcome(search, team_name, top_x_position_in_the_table, winners, match_order, [])
+        return outcome if _qualifies(search, team_name, top_x_position_in_the_table, outcome) else None
+    if depth == len(match_order):
+        return None
+    match_index = match_order[depth]
+    for winner in search.remaining_matches[match_index]:
+        winners[match_index] = winner
+        if _can_qualify(search, team_name, top_x_position_in_the_table, winners) is not False:
+            outcome = _build_new_outcome(
+                search,
+                team_name,
+                top_x_position_in_the_table,
+                winners,
+                match_order,
+                [yielded_outcome for yielded_outcome in yielded_outcomes if yielded_outcome[match_index] == winner],
+                depth + 1,
+            )
+            if outcome is not None:
+                return outcome
+    del winners[match_index]
+    return None
+
+
+def _get_distance_gain(team: int, match_index: int, yielded_outcomes: List[Tuple[int, ...]], distances: List[int]) -> Tuple[int, int]:
+    """Ranks a winner by the resulting distance to the closest yielded outcome, then to all of them. The team's own win
+    comes first among equals."""
+    if not yielded_outcomes:
+        return 0, 0
+    new_distances = [distance + (outcome[match_index] != team) for outcome, distance in zip(yielded_outcomes, distances)]
+    return min(new_distances), sum(new_distances)
+
+
+def _qualifies(search: QualificationScenarioSearch, team_name: str, top_x_position_in_the_table: int, outcome: Tuple[int, ...]) -> bool:
+    """Checks a full outcome, which leaves `can_finish_in_top_positions` nothing to search."""
+    return bool(_can_qualify(search, team_name, top_x_position_in_the_table, dict(enumerate(outcome))))
+
+
+def _can_qualify(
+    search: QualificationScenarioSearch, team_name: str, top_x_position_in_the_table: int, winners: Mapping[int, int]
+) -> Optional[bool]:
+    """Checks whether some outcome of the matches left open by `winners` still places the team within the top positions."""
+    points = list(search.current_points)
+    for winner in winners.values():
+        points[winner] += search.points_for_a_win
+    return can_finish_in_top_positions(
+        dict(zip(search.teams, points)),
+        [
+            (search.teams[home_team], search.teams[away_team])
+            for match_index, (home_team, away_team) in enumerate(search.remaining_matches)
+            if match_index not in winners
+        ],
+        team_name,
+        top_x_position_in_the_table,
+        search.points_for_a_win,
+    )
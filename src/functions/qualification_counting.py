@@ -0,0 +1,372 @@
+from collections import Counter
+from dataclasses import dataclass
+from enum import Enum
+from typing import Dict, List, Optional, Sequence, Set, Tuple
+from src.functions.instrumentation import count, traced
+from src.functions.tournament_model import Match, TournamentModel
+
+_DECIDED = -1
+
+# Distances of the teams below the selected team's final points, packed into one integer, the number of teams above it,
+# and the number of teams above it or still able to get there
+DistanceGroup = Tuple[int, int, int]
+
+
+class MatchResult(str, Enum):
+    WIN = "Win"
+    DRAW = "Draw"
+    NO_RESULT = "No result"
+
+
+@dataclass(frozen=True)
+class QualifyingOutcomeCount:
+    """
+    Exact number of the outcomes of the remaining matches that place a team within the top positions.
+
+    Attributes:
+        team_name (str): The team.
+        top_x_position_in_the_table (int): The position in the points table the team must finish within.
+        possible_results (Tuple[MatchResult, ...]): Results every remaining match may end in, a win counting once for
+            either team.
+        number_of_qualifying_outcomes (int): Outcomes in which the team finishes within the top positions.
+        number_of_outcomes (int): Every outcome of the remaining matches.
+    """
+
+    team_name: str
+    top_x_position_in_the_table: int
+    possible_results: Tuple[MatchResult, ...]
+    number_of_qualifying_outcomes: int
+    number_of_outcomes: int
+
+    @property
+    def fraction(self) -> float:
+        return self.number_of_qualifying_outcomes / self.number_of_outcomes
+
+
+@traced("count_outcomes")
+def count_qualifying_outcomes(     # pylint: disable = too-many-locals
+    tournament_model: TournamentModel,
+    team_name: str,
+    top_x_position_in_the_table: int,
+    possible_results: Sequence[MatchResult] = (MatchResult.WIN, MatchResult.DRAW),
+    maximum_number_of_groups: Optional[int] = None,
+) -> QualifyingOutcomeCount:
+    """
+    Counts the outcomes of the remaining matches that place a team within the top positions, without enumerating them.
+
+    The matches are played one at a time, and the outcomes played so far are grouped by the points they leave the
+    teams on, each group holding how many outcomes led to it. The team's own matches come first, which fixes its final
+    points, and every other team is then kept as its distance below them, or dropped from the group key as soon as it
+    is certain to finish above or at most level with the team. Groups that already have N teams above the team are
+    discarded, and groups with fewer than N teams that could still finish above it are counted along with every
+    outcome of the matches left.
+
+    Teams certain to finish above the team, or at most level with it, whatever its own results, are never tracked:
+    their matches with each other only multiply the count, and their matches with a contender only add to that
+    contender's points, so those are merged into one distribution of points played once the contender has no other
+    match left. The matches between contenders are ordered to keep as few partly played teams as possible, and the
+    distances of a group are packed into a single integer, so that a result only adds a precomputed difference to it.
+    Results awarding the same points are merged, so a draw and a no result worth as much cost no more than one of them.
+    As in the search, a team finishing level on points with others counts as qualified, the tie being settled by the
+    net run rate.
+
+    Parameters:
+        tournament_model (TournamentModel): The tournament, along with its points system.
+        team_name (str): The team.
+        top_x_position_in_the_table (int): The position in the points table the team must finish within.
+        possible_results (Sequence[MatchResult]): Results every remaining match may end in. Defaults to a win or a draw.
+        maximum_number_of_groups (int, optional): Largest number of groups to hold at once, which bounds the time and
+            memory taken. Unbounded if not given.
+
+    Returns:
+        QualifyingOutcomeCount: The number of qualifying outcomes, out of every outcome of the remaining matches.
+
+    Raises:
+        ValueError: If no result is possible, or if more than `maximum_number_of_groups` groups are needed.
+    """
+    possible_results = tuple(dict.fromkeys(MatchResult(result) for result in possible_results))
+    if not possible_results:
+        raise ValueError("A remaining match must be able to end in at least one result")
+    selected_team = tournament_model.team_index[team_name]
+    points_awarded = _get_points_awarded(tournament_model, possible_results)
+    number_of_results = sum(points_awarded.values())
+    largest_points_awarded = max(max(home_points, away_points) for home_points, away_points in points_awarded)
+    remaining_matches = tournament_model.get_remaining_matches()
+    current_points: List[int] = tournament_model.standings.points.tolist()
+    number_of_outcomes = number_of_results ** len(remaining_matches)
+
+    own_matches = [match for match in remaining_matches if selected_team in match]
+    other_matches = [match for match in remaining_matches if selected_team not in match]
+    contenders = _get_contenders(current_points, remaining_matches, selected_team, points_awarded)
+    shared_matches = [match for match in other_matches if match.home_team in contenders and match.away_team in contenders]
+    private_points, private_matches = _get_private_points(other_matches, contenders, points_awarded)
+    number_of_untracked_matches = len(other_matches) - len(shared_matches) - sum(private_matches.values())
+    number_of_matches_to_play = len(shared_matches) + sum(private_matches.values())
+
+    shared_matches_left = Counter(team for match in shared_matches for team in match)
+    largest_points_left = [
+        largest_points_awarded * shared_matches_left[team] + max(private_points[team]) if team in contenders
+        else largest_points_awarded * sum(team in match for match in other_matches)
+        for team in range(len(current_points))
+    ]
+    # A distance is packed as one more than itself, so that a team certain of its place takes no room at all
+    place_values = [(max(largest_points_left) + 1) ** team for team in range(len(current_points))]
+    points_groups: Dict[Tuple[int, ...], int] = {tuple(current_points): 1}
+    for match in own_matches:
+        points_groups = _play_match(points_groups, match, points_awarded)
+    distance_groups = _get_distance_groups(points_groups, selected_team, largest_points_left, place_values, top_x_position_in_the_table)
+
+    number_of_qualifying_outcomes = 0
+    for team in contenders:
+        if not shared_matches_left[team]:
+            distance_groups = _play_private_matches(distance_groups, place_values, team, private_points[team], top_x_position_in_the_table)
+            number_of_matches_to_play -= private_matches[team]
+    for match in _order_by_frontier(shared_matches, own_matches):
+        number_of_qualifying_outcomes += _collect_decided_groups(
+            distance_groups, top_x_position_in_the_table, number_of_results ** number_of_matches_to_play
+        )
+        number_of_matches_to_play -= 1
+        for team in match:
+            shared_matches_left[team] -= 1
+            largest_points_left[team] -= largest_points_awarded
+        distance_groups = _play_match_on_distances(
+            distance_groups, place_values, match, points_awarded, largest_points_left, top_x_position_in_the_table
+        )
+        for team in match:
+            if not shared_matches_left[team]:
+                distance_groups = _play_private_matches(distance_groups, place_values, team, private_points[team], top_x_position_in_the_table)
+                number_of_matches_to_play -= private_matches[team]
+        count("counting_groups", len(distance_groups))
+        if maximum_number_of_groups is not None and len(distance_groups) > maximum_number_of_groups:
+            raise ValueError(f"Counting the outcomes for '{team_name}' needs more than {maximum_number_of_groups} groups")
+    number_of_qualifying_outcomes += _collect_decided_groups(distance_groups, top_x_position_in_the_table, 1)
+    return QualifyingOutcomeCount(
+        team_name,
+        top_x_position_in_the_table,
+        possible_results,
+        number_of_qualifying_outcomes * number_of_results ** number_of_untracked_matches,
+        number_of_outcomes,
+    )
+
+
+def _get_points_awarded(tournament_model: TournamentModel, possible_results: Sequence[MatchResult]) -> Dict[Tuple[int, int], int]:
+    """Returns how many of the possible results of a match award each pair of home and away team points."""
+    points_awarded: Dict[Tuple[int, int], int] = Counter()
+    for result in possible_results:
+        if result == MatchResult.WIN:
+            points_awarded[(tournament_model.points_for_a_win, 0)] += 1
+            points_awarded[(0, tournament_model.points_for_a_win)] += 1
+        elif result == MatchResult.DRAW:
+            points_awarded[(tournament_model.points_for_a_draw, tournament_model.points_for_a_draw)] += 1
+        else:
+            points_awarded[(tournament_model.points_for_a_no_result, tournament_model.points_for_a_no_result)] += 1
+    return points_awarded
+
+
+def _get_contenders(
+    current_points: List[int], remaining_matches: List[Match], selected_team: int, points_awarded: Dict[Tuple[int, int], int]
+) -> Set[int]:
+    """Returns the teams that may or may not finish above the selected team, depending on the results."""
+    largest_points_awarded = max(max(home_points, away_points) for home_points, away_points in points_awarded)
+    smallest_points_awarded = min(min(home_points, away_points) for home_points, away_points in points_awarded)
+    matches_left = Counter(team for match in remaining_matches for team in match)
+    lowest_final_points = current_points[selected_team] + smallest_points_awarded * matches_left[selected_team]
+    highest_final_points = current_points[selected_team] + largest_points_awarded * matches_left[selected_team]
+    return {
+        team for team, team_points in enumerate(current_points)
+        if team != selected_team and lowest_final_points < team_points + largest_points_awarded * matches_left[team] and team_points <= highest_final_points
+    }
+
+
+def _get_private_points(
+    matches: List[Match], contenders: Set[int], points_awarded: Dict[Tuple[int, int], int]
+) -> Tuple[Dict[int, Dict[int, int]], Dict[int, int]]:
+    """
+    Returns, for every contender, the number of ways its matches with untracked teams can add up to each number of
+    points, along with the number of those matches.
+    """
+    private_points: Dict[int, Dict[int, int]] = {team: {0: 1} for team in contenders}
+    private_matches: Dict[int, int] = Counter()
+    for match in matches:
+        if (match.home_team in contenders) != (match.away_team in contenders):
+            contender = match.home_team if match.home_team in contenders else match.away_team
+            private_points[contender] = _add_private_match(private_points[contender], match, contender, points_awarded)
+            private_matches[contender] += 1
+    return private_points, private_matches
+
+
+def _get_distance_groups(
+    points_groups: Dict[Tuple[int, ...], int],
+    selected_team: int,
+    largest_points_left: List[int],
+    place_values: List[int],
+    top_x_position_in_the_table: int,
+) -> Dict[DistanceGroup, int]:
+    """Converts the groups of points left by the selected team's matches to the distances below its final points."""
+    distance_groups: Dict[DistanceGroup, int] = Counter()
+    for points, number_of_outcomes in points_groups.items():
+        distances = 0
+        teams_above = teams_in_reach = 0
+        for team, team_points in enumerate(points):
+            if team != selected_team:
+                distance, is_above = _settle(points[selected_team] - team_points, largest_points_left[team])
+                distances += (distance + 1) * place_values[team]
+                teams_above += is_above
+                teams_in_reach += is_above or distance != _DECIDED
+        if teams_above < top_x_position_in_the_table:
+            distance_groups[(distances, teams_above, teams_in_reach)] += number_of_outcomes
+    return distance_groups
+
+
+def _order_by_frontier(matches: List[Match], played_matches: List[Match]) -> List[Match]:
+    """
+    Orders the matches so that few teams are partly played at any time: each next match is the one bringing in the
+    fewest new teams, then finishing the most.
+    """
+    matches_left: Counter = Counter()
+    for match in matches:
+        matches_left.update(match)
+    started_teams = {team for match in played_matches for team in match}
+    ordered_matches: List[Match] = []
+    unordered_matches = list(matches)
+    while unordered_matches:
+        match_number = max(
+            range(len(unordered_matches)),
+            key=lambda match_number: (
+                sum(team in started_teams for team in unordered_matches[match_number]),
+                sum(matches_left[team] == 1 for team in unordered_matches[match_number]),
+                -match_number,
+            ),
+        )
+        match = unordered_matches.pop(match_number)
+        ordered_matches.append(match)
+        matches_left.subtract(match)
+        started_teams.update(match)
+    return ordered_matches
+
+
+def _add_private_match(
+    points_distribution: Dict[int, int], match: Match, contender: int, points_awarded: Dict[Tuple[int, int], int]
+) -> Dict[int, int]:
+    """Adds a contender's points from a match with an untracked team to the number of ways it can reach each total."""
+    new_points_distribution: Dict[int, int] = Counter()
+    for points, number_of_ways in points_distribution.items():
+        for (home_points, away_points), number_of_results in points_awarded.items():
+            new_points_distribution[points + (home_points if contender == match.home_team else away_points)] += number_of_ways * number_of_results
+    return new_points_distribution
+
+
+def _play_match(
+    points_groups: Dict[Tuple[int, ...], int], match: Match, points_awarded: Dict[Tuple[int, int], int]
+) -> Dict[Tuple[int, ...], int]:
+    new_points_groups: Dict[Tuple[int, ...], int] = Counter()
+    for points, number_of_outcomes in points_groups.items():
+        for (home_points, away_points), number_of_results in points_awarded.items():
+            new_points = list(points)
+            new_points[match.home_team] += home_points
+            new_points[match.away_team] += away_points
+            new_points_groups[tuple(new_points)] += number_of_outcomes * number_of_results
+    return new_points_groups
+
+
+def _play_match_on_distances(     # pylint: disable = too-many-arguments, too-many-positional-arguments, too-many-locals
+    distance_groups: Dict[DistanceGroup, int],
+    place_values: List[int],
+    match: Match,
+    points_awarded: Dict[Tuple[int, int], int],
+    largest_points_left: List[int],
+    top_x_position_in_the_table: int,
+) -> Dict[DistanceGroup, int]:
+    """
+    Plays a match of two other teams on every group, dropping the groups in which the team can no longer qualify. The
+    results of a match are worked out once for each pair of distances its teams are on.
+    """
+    new_distance_groups: Dict[DistanceGroup, int] = Counter()
+    home_team, away_team = match
+    home_team_place_value, away_team_place_value = place_values[home_team], place_values[away_team]
+    radix = place_values[1] if len(place_values) > 1 else 1
+    results_by_distances: Dict[Tuple[int, int], List[Tuple[int, int, int, int]]] = {}
+    for (distances, teams_above, teams_in_reach), number_of_outcomes in distance_groups.items():
+        team_distances = (distances // home_team_place_value % radix - 1, distances // away_team_place_value % radix - 1)
+        results = results_by_distances.get(team_distances)
+        if results is None:
+            results = results_by_distances[team_distances] = _get_results_on_distances(
+                team_distances, (home_team_place_value, away_team_place_value), points_awarded,
+                (largest_points_left[home_team], largest_points_left[away_team]),
+            )
+        for difference, new_teams_above, teams_out_of_reach, number_of_results in results:
+            if teams_above + new_teams_above < top_x_position_in_the_table:
+                new_distance_groups[
+                    (distances + difference, teams_above + new_teams_above, teams_in_reach - teams_out_of_reach)
+                ] += number_of_outcomes * number_of_results
+    return new_distance_groups
+
+
+def _get_results_on_distances(
+    team_distances: Tuple[int, int],
+    team_place_values: Tuple[int, int],
+    points_awarded: Dict[Tuple[int, int], int],
+    largest_points_left: Tuple[int, int],
+) -> List[Tuple[int, int, int, int]]:
+    """
+    Returns what each result of a match does to a group its home and away teams are at the given distances in: the
+    difference it makes to the packed distances, the number of the two teams it puts above the selected team, the
+    number it puts out of reach, and the number of results.
+    """
+    results = []
+    for team_points, number_of_results in points_awarded.items():
+        difference = teams_above = teams_out_of_reach = 0
+        for distance, points, place_value, points_left in zip(team_distances, team_points, team_place_values, largest_points_left):
+            if distance != _DECIDED:
+                new_distance, is_above = _settle(distance - points, points_left)
+                difference += (new_distance - distance) * place_value
+                teams_above += is_above
+                teams_out_of_reach += new_distance == _DECIDED and not is_above
+        results.append((difference, teams_above, teams_out_of_reach, number_of_results))
+    return results
+
+
+def _play_private_matches(
+    distance_groups: Dict[DistanceGroup, int],
+    place_values: List[int],
+    team: int,
+    points_distribution: Dict[int, int],
+    top_x_position_in_the_table: int,
+) -> Dict[DistanceGroup, int]:
+    """Plays every match left of a contender at once, from the number of ways it can reach each total, settling it."""
+    new_distance_groups: Dict[DistanceGroup, int] = Counter()
+    number_of_ways = sum(points_distribution.values())
+    radix = place_values[1] if len(place_values) > 1 else 1
+    for (distances, teams_above, teams_in_reach), number_of_outcomes in distance_groups.items():
+        distance = distances // place_values[team] % radix - 1
+        if distance == _DECIDED:
+            new_distance_groups[(distances, teams_above, teams_in_reach)] += number_of_outcomes * number_of_ways
+            continue
+        number_of_ways_above = sum(ways for points, ways in points_distribution.items() if points > distance)
+        new_distances = distances - (distance + 1) * place_values[team]
+        if number_of_ways_above and teams_above + 1 < top_x_position_in_the_table:
+            new_distance_groups[(new_distances, teams_above + 1, teams_in_reach)] += number_of_outcomes * number_of_ways_above
+        if number_of_ways_above < number_of_ways:
+            new_distance_groups[(new_distances, teams_above, teams_in_reach - 1)] += number_of_outcomes * (number_of_ways - number_of_ways_above)
+    return new_distance_groups
+
+
+def _settle(distance: int, largest_points_left: int) -> Tuple[int, bool]:
+    """
+    Returns a team's distance below the selected team's final points, or `_DECIDED` once the team is certain to finish
+    above it or at most level with it, along with whether it finishes above.
+    """
+    if distance < 0:
+        return _DECIDED, True
+    if distance >= largest_points_left:
+        return _DECIDED, False
+    return distance, False
+
+
+def _collect_decided_groups(distance_groups: Dict[DistanceGroup, int], top_x_position_in_the_table: int, number_of_outcomes_left: int) -> int:
+    """
+    Removes the groups in which fewer than N teams can still finish above the team, and returns the number of
+    qualifying outcomes they account for, every outcome of the matches left included.
+    """
+    decided_groups = [group for group in distance_groups if group[2] < top_x_position_in_the_table]
+    return sum(distance_groups.pop(group) for group in decided_groups) * number_of_outcomes_left
@@ -0,0 +1,217 @@
+import itertools
+import json
+import os
+import threading
+import time
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
+import pyarrow as pa
+import pyarrow.parquet as pq
+from src.functions.qualification_conditions import (
+    derive_qualification_conditions,
+    iterate_diverse_qualifying_outcomes
+)
+from src.functions.qualification_scenario_search import (
+    QualificationScenarioSearch
+)
+from src.functions.qualification_verdict import QualificationVerdict
+from src.functions.scenario_result_cache import hash_fixture_state
+
+DEFAULT_NUMBER_OF_SCENARIOS_PER_REQUEST = 10
+DEFAULT_SNAPSHOT_DIRECTORY = "snapshots"
+SNAPSHOT_FORMAT_VERSION = "1"
+
+_snapshot_cache: Dict[str, Tuple[float, "QualificationMatrixSnapshot"]] = {}
+_snapshot_cache_lock = threading.Lock()
+
+
+@dataclass(frozen=True)
+class QualificationMatrixEntry:
+    verdict: QualificationVerdict
+    minimum_number_of_wins_needed: Optional[int]
+    qualifying_outcomes: List[Tuple[int, ...]]
+
+
+@dataclass(frozen=True)
+class QualificationMatrixSnapshot:
+    """
+    What every team needs to finish within every position of the points table, for one fixture state.
+
+    Attributes:
+        fixture_state_hash (str): Hash of the fixture state the snapshot was computed for, from `hash_fixture_state`.
+        created_at (float): Unix time at which the snapshot was computed.
+        teams (List[str]): Team names, which the team indices of the qualifying outcomes refer to.
+        number_of_scenarios_per_request (int): Number of qualifying outcomes kept per team and position. Fewer are kept
+            only when there are no more.
+        entries (Dict[Tuple[str, int], QualificationMatrixEntry]): Verdict, minimum wins and qualifying outcomes by team
+            and position.
+    """
+
+    fixture_state_hash: str
+    created_at: float
+    teams: List[str]
+    number_of_scenarios_per_request: int
+    entries: Dict[Tuple[str, int], QualificationMatrixEntry]
+
+    def is_fresh_for(self, qualification_scenario_search: QualificationScenarioSearch) -> bool:
+        return self.teams == qualification_scenario_search.teams and self.fixture_state_hash == hash_fixture_state(qualification_scenario_search)
+
+    def get_qualifying_outcomes(
+        self, team_name: str, top_x_position_in_the_table: int, desired_number_of_scenarios: int
+    ) -> Optional[List[Tuple[int, ...]]]:
+        """
+        Returns the stored qualifying outcomes for a request, or None if the snapshot cannot answer it.
+
+        Parameters:
+            team_name (str): The name of the team for which qualification scenarios are being determined.
+            top_x_position_in_the_table (int): The desired position in the points table for qualification.
+            desired_number_of_scenarios (int): The desired number of qualifying scenarios.
+
+        Returns:
+            Optional[List[Tuple[int, ...]]]: Winning team index of every remaining match, for each stored outcome.
+        """
+        entry = self.entries.get((team_name, int(top_x_position_in_the_table)))
+        if entry is None:
+            return None
+        are_all_outcomes_stored = len(entry.qualifying_outcomes) < self.number_of_scenarios_per_request
+        if desired_number_of_scenarios > len(entry.qualifying_outcomes) and not are_all_outcomes_stored:
+            return None
+        return entry.qualifying_outcomes[:desired_number_of_scenarios]
+
+    def to_arrow_table(self) -> pa.Table:
+        """Lays the snapshot out as one row per team and position, with dictionary-encoded names and int8 outcomes."""
+        keys = sorted(self.entries, key=lambda key: (self.teams.index(key[0]), key[1]))
+        table = pa.table({
+            "team": pa.array([team for team, _ in keys]).dictionary_encode(),
+            "position": pa.array([position for _, position in keys], type=pa.int8()),
+            "verdict": pa.array([self.entries[key].verdict.value for key in keys]).dictionary_encode(),
+            "minimum_number_of_wins_needed": pa.array([self.entries[key].minimum_number_of_wins_needed for key in keys], type=pa.int16()),
+            "qualifying_outcomes": pa.array(
+                [[list(outcome) for outcome in self.entries[key].qualifying_outcomes] for key in keys], type=pa.list_(pa.list_(pa.int8()))
+            ),
+        })
+        return table.replace_schema_metadata({
+            "format_version": SNAPSHOT_FORMAT_VERSION,
+            "fixture_state_hash": self.fixture_state_hash,
+            "created_at": repr(self.created_at),
+            "teams": json.dumps(self.teams),
+            "number_of_scenarios_per_request": str(self.number_of_scenarios_per_request),
+        })
+
+    @classmethod
+    def from_arrow_table(cls, table: pa.Table) -> "QualificationMatrixSnapshot":
+        metadata = {key.decode(): value.decode() for key, value in (table.schema.metadata or {}).items()}
+        if metadata.get("format_version") != SNAPSHOT_FORMAT_VERSION:
+            raise ValueError(f"Unsupported qualification matrix snapshot format '{metadata.get('format_version')}'")
+        columns = table.to_pydict()
+        return cls(
+            fixture_state_hash=metadata["fixture_state_hash"],
+            created_at=float(metadata["created_at"]),
+            teams=json.loads(metadata["teams"]),
+            number_of_scenarios_per_request=int(metadata["number_of_scenarios_per_request"]),
+            entries={
+                (team, position): QualificationMatrixEntry(
+                    QualificationVerdict(verdict), minimum_number_of_wins_needed, [tuple(outcome) for outcome in qualifying_outcomes]
+                )
+                for team, position, verdict, minimum_number_of_wins_needed, qualifying_outcomes in zip(
+                    columns["team"], columns["position"], columns["verdict"], columns["minimum_number_of_wins_needed"],
+                    columns["qualifying_outcomes"]
+                )
+            },
+        )
+
+
+def build_qualification_matrix(
+    qualification_scenario_search: QualificationScenarioSearch,
+    number_of_scenarios_per_request: int = DEFAULT_NUMBER_OF_SCENARIOS_PER_REQUEST,
+) -> QualificationMatrixSnapshot:
+    """
+    Computes, for every team and every position of the points table, the verdict, the minimum number of wins needed
+    and a few qualifying outcomes, as diverse as `iterate_diverse_qualifying_outcomes` makes them for the teams still
+    in contention.
+
+    Parameters:
+        qualification_scenario_search (QualificationScenarioSearch): Search built from the tournament.
+        number_of_scenarios_per_request (int): Number of qualifying outcomes to keep per team and position.
+
+    Returns:
+        QualificationMatrixSnapshot: The matrix for the current fixture state.
+    """
+    search = qualification_scenario_search
+    entries: Dict[Tuple[str, int], QualificationMatrixEntry] = {}
+    for team_name in search.teams:
+        for top_x_position_in_the_table in range(1, len(search.teams) + 1):
+            verdict = search.get_qualification_verdict(team_name, top_x_position_in_the_table)
+            minimum_number_of_wins_needed = search.get_minimum_number_of_wins_needed(team_name, top_x_position_in_the_table)
+            qualifying_outcomes: List[Tuple[int, ...]] = []
+            if verdict == QualificationVerdict.CLINCHED:
+                qualifying_outcomes = list(itertools.islice(
+                    search.iterate_qualifying_outcomes(team_name, top_x_position_in_the_table), number_of_scenarios_per_request
+                ))
+            elif verdict == QualificationVerdict.IN_CONTENTION:
+                qualifying_outcomes = list(itertools.islice(
+                    iterate_diverse_qualifying_outcomes(
+                        search,
+                        team_name,
+                        top_x_position_in_the_table,
+                        derive_qualification_conditions(search, team_name, top_x_position_in_the_table, minimum_number_of_wins_needed),
+                    ),
+                    number_of_scenarios_per_request,
+                ))
+            entries[(team_name, top_x_position_in_the_table)] = QualificationMatrixEntry(verdict, minimum_number_of_wins_needed, qualifying_outcomes)
+    return QualificationMatrixSnapshot(hash_fixture_state(search), time.time(), list(search.teams), number_of_scenarios_per_request, entries)
+
+
+def get_qualification_verdict_and_minimum_number_of_wins_needed(
+    qualification_scenario_search: QualificationScenarioSearch,
+    team_name: str,
+    top_x_position_in_the_table: int,
+    snapshot: Optional[QualificationMatrixSnapshot] = None,
+) -> Tuple[QualificationVerdict, Optional[int]]:
+    """
+    Returns the verdict of a team and the fewest remaining matches it has to win, from the snapshot when it holds them,
+    and from the checks of the search otherwise.
+    """
+    entry = None if snapshot is None else snapshot.entries.get((team_name, top_x_position_in_the_table))
+    if entry is not None:
+        return entry.verdict, entry.minimum_number_of_wins_needed
+    return (
+        qualification_scenario_search.get_qualification_verdict(team_name, top_x_position_in_the_table),
+        qualification_scenario_search.get_minimum_number_of_wins_needed(team_name, top_x_position_in_the_table),
+    )
+
+
+def get_default_snapshot_path(tournament_id: int) -> str:
+    return os.path.join(DEFAULT_SNAPSHOT_DIRECTORY, f"qualification_matrix_{tournament_id}.parquet")
+
+
+def write_qualification_matrix_snapshot(snapshot: QualificationMatrixSnapshot, path: str) -> None:
+    """Writes the snapshot to a Parquet file, atomically so that readers never see a partial file."""
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    temporary_path = f"{path}.{os.getpid()}.tmp"
+    pq.write_table(snapshot.to_arrow_table(), temporary_path, compression="zstd")
+    os.replace(temporary_path, path)
+
+
+def read_qualification_matrix_snapshot(path: str) -> Optional[QualificationMatrixSnapshot]:
+    """
+    Reads a snapshot written by `write_qualification_matrix_snapshot`, keeping it in memory until the file changes.
+
+    Parameters:
+        path (str): Path of the Parquet file.
+
+    Returns:
+        Optional[QualificationMatrixSnapshot]: The snapshot, or None if there is no file.
+    """
+    try:
+        modified_at = os.stat(path).st_mtime
+    except FileNotFoundError:
+        return None
+    with _snapshot_cache_lock:
+        cached_snapshot = _snapshot_cache.get(path)
+    if cached_snapshot is not None and cached_snapshot[0] == modified_at:
+        return cached_snapshot[1]
+    snapshot = QualificationMatrixSnapshot.from_arrow_table(pq.read_table(path))
+    with _snapshot_cache_lock:
+        _snapshot_cache[path] = (modified_at, snapshot)
+    return snapshot
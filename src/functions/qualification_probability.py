@@ -0,0 +1,161 @@
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Optional, Sequence, Tuple, Union
+import numpy as np
+import pandas as pd
+from src.functions.outcome_evaluator import BatchOutcomeEvaluator
+
+DEFAULT_CHUNK_SIZE = 100_000
+DEFAULT_MAXIMUM_NUMBER_OF_SAMPLES = 2_000_000
+DEFAULT_CONFIDENCE_INTERVAL_HALF_WIDTH = 0.001
+Z_SCORE_FOR_95_PERCENT_CONFIDENCE = 1.96
+
+
+@dataclass
+class PositionProbabilities:
+    """
+    Monte Carlo estimate of every team's probability of finishing at every position of the points table.
+
+    Attributes:
+        teams (List[str]): Team names, in the row order of the arrays.
+        position_counts (np.ndarray): Number of sampled outcomes in which each team (row) finished at each position (column).
+        number_of_samples (int): Number of sampled outcomes.
+        z_score (float): Z-score of the reported confidence intervals.
+    """
+
+    teams: List[str]
+    position_counts: np.ndarray
+    number_of_samples: int
+    z_score: float = Z_SCORE_FOR_95_PERCENT_CONFIDENCE
+
+    @property
+    def probabilities(self) -> np.ndarray:
+        return self.position_counts / max(self.number_of_samples, 1)
+
+    def confidence_intervals(self, counts: Optional[np.ndarray] = None) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Returns the Wilson score interval of every probability.
+
+        Parameters:
+            counts (np.ndarray, optional): Counts to build the intervals for. Defaults to `position_counts`.
+
+        Returns:
+            Tuple[np.ndarray, np.ndarray]: Lower and upper bounds, shaped like the counts.
+        """
+        counts = self.position_counts if counts is None else counts
+        number_of_samples = max(self.number_of_samples, 1)
+        probabilities = counts / number_of_samples
+        z_squared = self.z_score ** 2
+        denominator = 1 + z_squared / number_of_samples
+        centre = (probabilities + z_squared / (2 * number_of_samples)) / denominator
+        half_width = self.z_score * np.sqrt(
+            probabilities * (1 - probabilities) / number_of_samples + z_squared / (4 * number_of_samples ** 2)
+        ) / denominator
+        return np.clip(centre - half_width, 0, 1), np.clip(centre + half_width, 0, 1)
+
+    def maximum_confidence_interval_half_width(self) -> float:
+        lower_bounds, upper_bounds = self.confidence_intervals()
+        return float(((upper_bounds - lower_bounds) / 2).max())
+
+    def top_positions_probabilities(self, top_x_position: int) -> pd.DataFrame:
+        """
+        Returns every team's probability of finishing within the top positions, along with its confidence interval.
+
+        Parameters:
+            top_x_position (int): The position in the points table to finish within.
+
+        Returns:
+            pd.DataFrame: Columns 'team', 'probability', 'lower_bound' and 'upper_bound', sorted by probability.
+        """
+        counts = self.position_counts[:, :top_x_position].sum(axis=1)
+        lower_bounds, upper_bounds = self.confidence_intervals(counts)
+        top_positions_df = pd.DataFrame({
+            "team": self.teams,
+            "probability": counts / max(self.number_of_samples, 1),
+            "lower_bound": lower_bounds,
+            "upper_bound": upper_bounds,
+        })
+        return top_positions_df.sort_values(by="probability", ascending=False).reset_index(drop=True)
+
+    def to_dataframe(self) -> pd.DataFrame:
+        """Returns the probabilities as a DataFrame with one row per team and one column per position."""
+        return pd.DataFrame(
+            self.probabilities, index=pd.Index(self.teams, name="team"), columns=range(1, len(self.teams) + 1)
+        )
+
+
+def estimate_position_probabilities(     # pylint: disable = too-many-arguments, too-many-positional-arguments, too-many-locals
+    current_points: Dict[str, int],
+    remaining_matches: Sequence[Tuple[str, str]],
+    points_for_a_win: int,
+    home_team_win_probabilities: Optional[Union[Sequence[float], np.ndarray]] = None,
+    seed: Optional[int] = None,
+    maximum_number_of_samples: int = DEFAULT_MAXIMUM_NUMBER_OF_SAMPLES,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    confidence_interval_half_width: float = DEFAULT_CONFIDENCE_INTERVAL_HALF_WIDTH,
+    is_cancelled: Optional[Callable[[], bool]] = None,
+) -> PositionProbabilities:
+    """
+    Estimates every team's probability of finishing at every position by sampling outcomes of the remaining matches.
+
+    Outcomes are drawn in chunks of `chunk_size`, so memory stays bounded by a single chunk however many outcomes are
+    sampled, and sampling stops early once every confidence interval is narrower than `confidence_interval_half_width`,
+    or once `is_cancelled` returns True after a chunk, leaving the estimate with fewer samples and wider intervals.
+    Teams level on points are placed in a random order, as the tie would be settled by the net run rate.
+
+    Parameters:
+        current_points (Dict[str, int]): Current points of every team.
+        remaining_matches (Sequence[Tuple[str, str]]): Home and away team of every remaining match.
+        points_for_a_win (int): Points awarded for a win.
+        home_team_win_probabilities (Union[Sequence[float], np.ndarray], optional): Probability of the home team winning each remaining match.
+            Every match is a coin toss if not given.
+        seed (int, optional): Seed of the random number generator, for reproducible estimates.
+        maximum_number_of_samples (int): Upper limit on the number of sampled outcomes.
+        chunk_size (int): Number of outcomes sampled and evaluated at once.
+        confidence_interval_half_width (float): Target half-width of the 95% confidence intervals.
+        is_cancelled (Callable[[], bool], optional): Polled after every chunk, sampling stops as soon as it returns True.
+
+    Returns:
+        PositionProbabilities: The estimated probabilities.
+
+    Raises:
+        ValueError: If a team of the remaining matches has no current points, or the probabilities do not match the
+            remaining matches.
+    """
+    teams = list(current_points)
+    team_index = {team: index for index, team in enumerate(teams)}
+    unknown_teams = sorted({team for match in remaining_matches for team in match} - team_index.keys())
+    if unknown_teams:
+        raise ValueError(f"The remaining matches include teams missing from the points table: {', '.join(unknown_teams)}")
+    evaluator = BatchOutcomeEvaluator(
+        [current_points[team] for team in teams],
+        [(team_index[home_team], team_index[away_team]) for home_team, away_team in remaining_matches],
+        points_for_a_win,
+    )
+    home_team_win_thresholds: Optional[np.ndarray] = None
+    if home_team_win_probabilities is not None:
+        home_team_win_thresholds = np.clip(np.asarray(home_team_win_probabilities, dtype=np.float64), 0, 1)
+        if home_team_win_thresholds.shape != (len(remaining_matches),):
+            raise ValueError("'home_team_win_probabilities' must hold one probability per remaining match")
+
+    random_generator = np.random.default_rng(seed)
+    position_probabilities = PositionProbabilities(teams, np.zeros((len(teams), len(teams)), dtype=np.int64), 0)
+    while position_probabilities.number_of_samples < maximum_number_of_samples:
+        number_of_samples = min(chunk_size, maximum_number_of_samples - position_probabilities.number_of_samples)
+        if home_team_win_thresholds is None:
+            outcomes = random_generator.integers(0, 2, size=(number_of_samples, len(remaining_matches)), dtype=np.int8)
+        else:
+            outcomes = random_generator.random((number_of_samples, len(remaining_matches))) >= home_team_win_thresholds
+
+        points = evaluator.evaluate_points(outcomes) + random_generator.random((number_of_samples, len(teams)))
+        finishing_order = np.argsort(-points, axis=1)
+        team_and_position = finishing_order * len(teams) + np.arange(len(teams))
+        position_probabilities.position_counts += np.bincount(
+            team_and_position.ravel(), minlength=len(teams) ** 2
+        ).reshape(len(teams), len(teams))
+        position_probabilities.number_of_samples += number_of_samples
+
+        if position_probabilities.maximum_confidence_interval_half_width() <= confidence_interval_half_width:
+            break
+        if is_cancelled is not None and is_cancelled():
+            break
+    return position_probabilities
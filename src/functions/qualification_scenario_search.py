@@ -0,0 +1,361 @@
+import itertools
+from dataclasses import dataclass
+from typing import Callable, Dict, Iterator, List, Optional, Sequence, Tuple
+import numpy as np
+import pandas as pd
+from points_table_simulator import PointsTableSimulator
+from points_table_simulator.constants import (
+    TOURNAMENT_COMPLETION_CUTOFF_PERCENTAGE
+)
+from points_table_simulator.exceptions import (
+    NoQualifyingScenariosError,
+    TeamNotFoundError,
+    TournamentCompletionBelowCutoffError
+)
+from src.functions.instrumentation import get_request_trace, traced
+from src.functions.outcome_evaluator import (
+    HOME_TEAM_WINS,
+    BatchOutcomeEvaluator,
+    enumerate_outcomes
+)
+from src.functions.qualification_verdict import (
+    QualificationVerdict,
+    can_finish_in_top_positions,
+    get_minimum_number_of_wins_needed,
+    get_qualification_verdict
+)
+from src.functions.tournament_model import Match, TournamentModel
+
+CANCELLATION_CHECK_INTERVAL = 4096
+LEAF_BATCH_SIZE_IN_MATCHES = 10
+
+
+@dataclass
+class _SearchState:     # pylint: disable = too-many-instance-attributes
+    selected_team: int
+    top_x_position_in_the_table: int
+    match_order: List[int]
+    batched_depth: int
+    tail_winners: np.ndarray
+    tail_points: np.ndarray
+    points: List[int]
+    remaining_matches_per_team: List[int]
+    winners: List[int]
+    is_cancelled: Callable[[], bool]
+    cancelled: bool = False
+    nodes_explored: int = 0
+    nodes_pruned: int = 0
+
+
+class QualificationScenarioSearch:     # pylint: disable = too-many-instance-attributes
+    """
+    Branch-and-bound search for the remaining-match outcomes that place a team within the top N of the points table.
+
+    The tournament is reduced to its `TournamentModel` once, and the counters the search branches on are copied out of
+    it as lists of plain ints, so every search node only does scalar integer arithmetic. Matches of the selected team
+    are branched on first, followed by the matches whose teams can still move past the selected team, and any partial
+    assignment in which N other teams are already out of reach is pruned. A team is treated as qualified when fewer than
+    N other teams finish on strictly more points than it.
+
+    Parameters:
+        points_table_simulator (PointsTableSimulator): Simulator holding the tournament schedule and points system.
+    """
+
+    @traced("build_search")
+    def __init__(self, points_table_simulator: PointsTableSimulator):
+        self.points_table_simulator = points_table_simulator
+        self.tournament_model = TournamentModel.from_points_table_simulator(points_table_simulator)
+        self.points_for_a_win = points_table_simulator.points_for_a_win
+        self.teams: List[str] = self.tournament_model.teams
+        self.team_index: Dict[str, int] = self.tournament_model.team_index
+
+        self.number_of_matches = self.tournament_model.number_of_matches
+        self.remaining_schedule_df: pd.DataFrame = points_table_simulator.tournament_schedule.iloc[self.tournament_model.remaining_match_positions]
+        self.remaining_matches: List[Match] = self.tournament_model.get_remaining_matches()
+
+        standings = self.tournament_model.standings
+        self.current_points: List[int] = standings.points.tolist()
+        self.matches_played: List[int] = standings.matches_played.tolist()
+        self.matches_won: List[int] = standings.matches_won.tolist()
+        self.matches_drawn: List[int] = standings.matches_drawn.tolist()
+        self.matches_with_no_result: List[int] = standings.matches_with_no_result.tolist()
+        self.remaining_matches_per_team: List[int] = standings.remaining_matches.tolist()
+
+    def simulate_the_qualification_scenarios(
+        self, team_name: str, top_x_position_in_the_table: int, desired_number_of_scenarios: int = 3
+    ) -> Tuple[List[pd.DataFrame], List[pd.DataFrame]]:
+        """
+        Finds qualification scenarios for a team, as a drop-in replacement of
+        `PointsTableSimulator.simulate_the_qualification_scenarios`.
+
+        Parameters:
+            team_name (str): The name of the team for which qualification scenarios are being determined.
+            top_x_position_in_the_table (int): The desired position in the points table for qualification.
+            desired_number_of_scenarios (int): The desired number of qualifying scenarios to find.
+
+        Returns:
+            Tuple[List[pd.DataFrame], List[pd.DataFrame]]: Points tables and remaining match outcomes for each scenario.
+
+        Raises:
+            NoQualifyingScenariosError: If no outcome of the remaining matches places the team in the top positions.
+        """
+        self.validate_the_request(team_name, top_x_position_in_the_table, desired_number_of_scenarios)
+        list_of_points_tables: List[pd.DataFrame] = []
+        list_of_remaining_match_outcomes: List[pd.DataFrame] = []
+        for points_table, remaining_match_outcome in itertools.islice(
+            self.iterate_qualification_scenarios(team_name, top_x_position_in_the_table), desired_number_of_scenarios
+        ):
+            list_of_points_tables.append(points_table)
+            list_of_remaining_match_outcomes.append(remaining_match_outcome)
+
+        if not list_of_points_tables:
+            raise NoQualifyingScenariosError(top_x_position_in_the_table, team_name)
+        return list_of_points_tables, list_of_remaining_match_outcomes
+
+    def iterate_qualification_scenarios(
+        self, team_name: str, top_x_position_in_the_table: int, is_cancelled: Optional[Callable[[], bool]] = None
+    ) -> Iterator[Tuple[pd.DataFrame, pd.DataFrame]]:
+        """
+        Lazily yields every qualification scenario for a team the moment the search finds it, so that callers can show
+        the first scenarios while the search goes on.
+
+        Parameters:
+            team_name (str): The name of the team for which qualification scenarios are being determined.
+            top_x_position_in_the_table (int): The desired position in the points table for qualification.
+            is_cancelled (Callable[[], bool], optional): Stops the search as soon as it returns True.
+
+        Returns:
+            Iterator[Tuple[pd.DataFrame, pd.DataFrame]]: Points table and remaining match outcome of each scenario.
+        """
+        for winners in self.iterate_qualifying_outcomes(team_name, top_x_position_in_the_table, is_cancelled=is_cancelled):
+            yield self.build_points_table(winners, team_name), self.build_remaining_match_outcome(winners)
+
+    def get_qualification_verdict(self, team_name: str, top_x_position_in_the_table: int) -> QualificationVerdict:
+        """
+        Returns the verdict on whether the team has clinched, is eliminated from, or is still in contention
+        for the top positions, without searching the remaining match outcomes.
+
+        Parameters:
+            team_name (str): The team to check.
+            top_x_position_in_the_table (int): The position in the points table the team must finish within.
+
+        Returns:
+            QualificationVerdict: The verdict for the team.
+        """
+        return get_qualification_verdict(*self._verdict_inputs(team_name, top_x_position_in_the_table))
+
+    def get_minimum_number_of_wins_needed(self, team_name: str, top_x_position_in_the_table: int) -> Optional[int]:
+        """
+        Returns the fewest remaining matches the team has to win to keep a chance of finishing within the top positions.
+
+        Parameters:
+            team_name (str): The team to check.
+            top_x_position_in_the_table (int): The position in the points table the team must finish within.
+
+        Returns:
+            Optional[int]: The minimum number of wins, or None if the team is eliminated whatever it wins or the
+                answer could not be settled within the work limit of the verdict checks.
+        """
+        return get_minimum_number_of_wins_needed(*self._verdict_inputs(team_name, top_x_position_in_the_table))
+
+    def _verdict_inputs(self, team_name: str, top_x_position_in_the_table: int) -> Tuple[Dict[str, int], List[Tuple[str, str]], str, int, int]:
+        current_points = dict(zip(self.teams, self.current_points))
+        remaining_matches = [(self.teams[home_team], self.teams[away_team]) for home_team, away_team in self.remaining_matches]
+        return current_points, remaining_matches, team_name, top_x_position_in_the_table, self.points_for_a_win
+
+    def iterate_qualifying_outcomes(
+        self,
+        team_name: str,
+        top_x_position_in_the_table: int,
+        prefix_winners: Sequence[int] = (),
+        is_cancelled: Optional[Callable[[], bool]] = None,
+    ) -> Iterator[Tuple[int, ...]]:
+        """
+        Lazily yields qualifying outcomes as tuples holding the winning team index of every remaining match.
+
+        Parameters:
+            team_name (str): The name of the team for which qualification scenarios are being determined.
+            top_x_position_in_the_table (int): The desired position in the points table for qualification.
+            prefix_winners (Sequence[int], optional): Winning team index of the first matches of `get_match_order`,
+                restricting the search to the outcomes that start with them.
+            is_cancelled (Callable[[], bool], optional): Polled every `CANCELLATION_CHECK_INTERVAL` search nodes, the
+                search stops as soon as it returns True.
+
+        Returns:
+            Iterator[Tuple[int, ...]]: Winning team indices, in the order of `remaining_matches`.
+        """
+        selected_team = self.team_index[team_name]
+        match_order = self.get_match_order(team_name)
+        batched_depth = max(len(prefix_winners), len(match_order) - LEAF_BATCH_SIZE_IN_MATCHES)
+        tail_matches = [self.remaining_matches[match_index] for match_index in match_order[batched_depth:]]
+        tail_outcomes = enumerate_outcomes(len(tail_matches))
+        tail_evaluator = BatchOutcomeEvaluator([0] * len(self.teams), tail_matches, self.points_for_a_win)
+        state = _SearchState(
+            selected_team=selected_team,
+            top_x_position_in_the_table=top_x_position_in_the_table,
+            match_order=match_order,
+            batched_depth=batched_depth,
+            tail_winners=np.where(tail_outcomes == HOME_TEAM_WINS, *np.array(tail_matches, dtype=np.int64).reshape(-1, 2).T),
+            tail_points=tail_evaluator.evaluate_points(tail_outcomes),
+            points=list(self.current_points),
+            remaining_matches_per_team=list(self.remaining_matches_per_team),
+            winners=[-1] * len(self.remaining_matches),
+            is_cancelled=is_cancelled or (lambda: False),
+        )
+        for match_index, winner in zip(match_order, prefix_winners):
+            home_team, away_team = self.remaining_matches[match_index]
+            state.remaining_matches_per_team[home_team] -= 1
+            state.remaining_matches_per_team[away_team] -= 1
+            state.points[winner] += self.points_for_a_win
+            state.winners[match_index] = winner
+        request_trace = get_request_trace()
+        try:
+            yield from self._search(state, len(prefix_winners))
+        finally:
+            if request_trace is not None:
+                request_trace.count("nodes_explored", state.nodes_explored)
+                request_trace.count("nodes_pruned", state.nodes_pruned)
+
+    def get_match_order(self, team_name: str) -> List[int]:
+        """
+        Returns the indices of the remaining matches in the order the search branches on them for the given team.
+
+        Parameters:
+            team_name (str): The name of the team for which qualification scenarios are being determined.
+
+        Returns:
+            List[int]: Indices into `remaining_matches`.
+        """
+        return self._order_matches_by_relevance(self.team_index[team_name])
+
+    def _search(self, state: "_SearchState", depth: int) -> Iterator[Tuple[int, ...]]:
+        state.nodes_explored += 1
+        if state.cancelled or (state.nodes_explored % CANCELLATION_CHECK_INTERVAL == 0 and state.is_cancelled()):
+            state.cancelled = True
+            return
+        points = state.points
+        best_case_points = points[state.selected_team] + self.points_for_a_win * state.remaining_matches_per_team[state.selected_team]
+        teams_out_of_reach = sum(1 for team_points in points if team_points > best_case_points)
+        if teams_out_of_reach >= state.top_x_position_in_the_table:
+            state.nodes_pruned += 1
+            return
+        if depth == state.batched_depth:
+            yield from self._evaluate_tail(state)
+            return
+
+        match_index = state.match_order[depth]
+        home_team, away_team = self.remaining_matches[match_index]
+        state.remaining_matches_per_team[home_team] -= 1
+        state.remaining_matches_per_team[away_team] -= 1
+        for winner in self._order_winners(state.selected_team, home_team, away_team, points, best_case_points):
+            points[winner] += self.points_for_a_win
+            state.winners[match_index] = winner
+            yield from self._search(state, depth + 1)
+            points[winner] -= self.points_for_a_win
+        state.winners[match_index] = -1
+        state.remaining_matches_per_team[home_team] += 1
+        state.remaining_matches_per_team[away_team] += 1
+
+    @staticmethod
+    def _evaluate_tail(state: "_SearchState") -> Iterator[Tuple[int, ...]]:
+        """Evaluates every outcome of the last few matches in one batch instead of branching on them one by one."""
+        final_points = state.tail_points + np.asarray(state.points, dtype=np.int32)
+        qualifying_rows = np.flatnonzero(
+            BatchOutcomeEvaluator.position_of_team(final_points, state.selected_team) <= state.top_x_position_in_the_table
+        )
+        tail_match_indices = state.match_order[state.batched_depth:]
+        winners = state.winners
+        for tail_winners in state.tail_winners[qualifying_rows].tolist():
+            for match_index, winner in zip(tail_match_indices, tail_winners):
+                winners[match_index] = winner
+            yield tuple(winners)
+        for match_index in tail_match_indices:
+            winners[match_index] = -1
+
+    def _order_winners(
+        self, selected_team: int, home_team: int, away_team: int, points: List[int], best_case_points: int
+    ) -> Tuple[int, int]:
+        """Tries the selected team's win first, otherwise the winner that does not push a rival past the selected team."""
+        if away_team == selected_team:
+            return away_team, home_team
+        if home_team == selected_team:
+            return home_team, away_team
+
+        def _harm(team: int) -> Tuple[bool, int]:
+            overtakes = points[team] <= best_case_points < points[team] + self.points_for_a_win
+            return overtakes, points[team]
+
+        return (home_team, away_team) if _harm(home_team) <= _harm(away_team) else (away_team, home_team)
+
+    def _order_matches_by_relevance(self, selected_team: int) -> List[int]:
+        """
+        Orders the remaining matches so that the selected team's matches come first, followed by the matches between
+        rivals who can still overtake the selected team, and finally the matches that cannot affect its position.
+        """
+        best_case_points = self.current_points[selected_team] + self.points_for_a_win * self.remaining_matches_per_team[selected_team]
+
+        def _is_contender(team: int) -> bool:
+            maximum_points = self.current_points[team] + self.points_for_a_win * self.remaining_matches_per_team[team]
+            return self.current_points[team] <= best_case_points < maximum_points
+
+        def _relevance(match_index: int) -> Tuple[int, int]:
+            home_team, away_team = self.remaining_matches[match_index]
+            if selected_team in (home_team, away_team):
+                return 0, match_index
+            return 3 - _is_contender(home_team) - _is_contender(away_team), match_index
+
+        return sorted(range(len(self.remaining_matches)), key=_relevance)
+
+    def build_points_table(self, winners: Sequence[int], team_name: str) -> pd.DataFrame:
+        """
+        Builds the points table, in the `PointsTableSimulator` layout, for one outcome of the remaining matches.
+
+        Parameters:
+            winners (Sequence[int]): Winning team index of every remaining match.
+            team_name (str): The selected team, listed ahead of the teams it is level on points with.
+
+        Returns:
+            pd.DataFrame: The points table after the remaining matches are played.
+        """
+        points_table = self.tournament_model.get_standings_after(winners).to_dataframe(self.teams)
+        points_table["is_selected_team"] = points_table["team"] == team_name
+        points_table.sort_values(by=["points", "is_selected_team"], ascending=False, inplace=True, kind="stable")
+        return points_table.drop(columns="is_selected_team").reset_index(drop=True)
+
+    def build_remaining_match_outcome(self, winners: Sequence[int]) -> pd.DataFrame:
+        """
+        Builds the remaining fixture with the winner column filled in for one outcome of the remaining matches.
+
+        Parameters:
+            winners (Sequence[int]): Winning team index of every remaining match.
+
+        Returns:
+            pd.DataFrame: The remaining fixture along with the given outcome.
+        """
+        remaining_match_outcome = self.remaining_schedule_df.copy()
+        remaining_match_outcome[self.points_table_simulator.tournament_schedule_winning_team_column_name] = [
+            self.teams[winner] for winner in winners
+        ]
+        return remaining_match_outcome
+
+    def validate_the_request(self, team_name: str, top_x_position_in_the_table: int, desired_number_of_scenarios: int) -> None:
+        """
+        Validates a request for qualification scenarios before any search is run.
+
+        Raises:
+            ValueError: If the number of scenarios or the position is out of range.
+            TeamNotFoundError: If the team is not part of the schedule.
+            TournamentCompletionBelowCutoffError: If too few matches of the tournament have been played.
+            NoQualifyingScenariosError: If the team is mathematically eliminated from the top positions.
+        """
+        if desired_number_of_scenarios <= 0:
+            raise ValueError("'desired_number_of_scenarios' must be greater than 0")
+        if not 0 < top_x_position_in_the_table <= len(self.teams):
+            raise ValueError("'top_x_position_in_the_table' must be between 1 and the number of teams in the table")
+        if team_name not in self.team_index:
+            raise TeamNotFoundError(f"'{team_name}' is not found in the current points table or in the given schedule")
+        tournament_completion_percentage = (1 - len(self.remaining_matches) / self.number_of_matches) * 100
+        if tournament_completion_percentage < TOURNAMENT_COMPLETION_CUTOFF_PERCENTAGE:
+            raise TournamentCompletionBelowCutoffError(TOURNAMENT_COMPLETION_CUTOFF_PERCENTAGE, round(tournament_completion_percentage, 2))
+        if can_finish_in_top_positions(*self._verdict_inputs(team_name, top_x_position_in_the_table)) is False:
+            raise NoQualifyingScenariosError(top_x_position_in_the_table, team_name)
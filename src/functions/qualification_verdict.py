@@ -0,0 +1,316 @@
+from collections import Counter, deque
+from enum import Enum
+from typing import Deque, Dict, List, Optional, Sequence, Set, Tuple
+
+MAXIMUM_NUMBER_OF_ASSIGNMENTS = 2000
+
+Pairings = Dict[Tuple[int, int], int]
+
+
+class QualificationVerdict(str, Enum):
+    CLINCHED = "Clinched"
+    IN_CONTENTION = "In contention"
+    ELIMINATED = "Eliminated"
+
+
+class _WorkLimitReached(Exception):
+    pass
+
+
+def can_finish_in_top_positions(
+    current_points: Dict[str, int], remaining_matches: Sequence[Tuple[str, str]], team_name: str, top_x_position: int, points_for_a_win: int
+) -> Optional[bool]:
+    """
+    Checks whether a team can still finish within the top positions of the points table.
+
+    The team is assumed to win all of its remaining matches, which fixes its best possible points, see
+    `_can_finish_in_top_positions_with_wins`.
+
+    Parameters:
+        current_points (Dict[str, int]): Current points of every team.
+        remaining_matches (Sequence[Tuple[str, str]]): Home and away team of every remaining match.
+        team_name (str): The team to check.
+        top_x_position (int): The position in the points table the team must finish within.
+        points_for_a_win (int): Points awarded for a win.
+
+    Returns:
+        Optional[bool]: False if the team is mathematically eliminated from the top positions, None if that could not
+            be settled within `MAXIMUM_NUMBER_OF_ASSIGNMENTS`.
+    """
+    number_of_own_matches = sum(team_name in match for match in remaining_matches)
+    return _can_finish_in_top_positions_with_wins(
+        current_points, remaining_matches, team_name, top_x_position, points_for_a_win, number_of_own_matches
+    )
+
+
+def has_clinched_top_positions(
+    current_points: Dict[str, int], remaining_matches: Sequence[Tuple[str, str]], team_name: str, top_x_position: int, points_for_a_win: int
+) -> Optional[bool]:
+    """
+    Checks whether a team is guaranteed to finish within the top positions of the points table.
+
+    The team is assumed to lose all of its remaining matches, which fixes its worst possible points. The team has not
+    clinched if `top_x_position` rivals can all finish above it, with points ties going its way, as in the scenario
+    search. Each of those rivals needs a number of wins, so it can afford only so many losses, and the check looks for
+    rivals whose losses can all be kept within what they afford, see `_can_lift_caps`.
+
+    Parameters:
+        current_points (Dict[str, int]): Current points of every team.
+        remaining_matches (Sequence[Tuple[str, str]]): Home and away team of every remaining match.
+        team_name (str): The team to check.
+        top_x_position (int): The position in the points table the team must finish within.
+        points_for_a_win (int): Points awarded for a win.
+
+    Returns:
+        Optional[bool]: True if the team finishes within the top positions in every outcome of the remaining matches,
+            None if that could not be settled within `MAXIMUM_NUMBER_OF_ASSIGNMENTS`.
+    """
+    points_after_losing_out = dict(current_points)
+    for home_team, away_team in remaining_matches:
+        if team_name in (home_team, away_team):
+            points_after_losing_out[away_team if home_team == team_name else home_team] += points_for_a_win
+    worst_case_points = points_after_losing_out[team_name]
+    rivals, pairings = _index_rival_matches(points_after_losing_out, remaining_matches, team_name)
+    matches_per_rival = _count_matches_per_team(pairings, len(rivals))
+    loss_caps: List[Optional[int]] = []
+    number_of_rivals_to_pass = top_x_position
+    for rival, number_of_matches in zip(rivals, matches_per_rival):
+        wins_needed_to_pass = max(0, (worst_case_points - points_after_losing_out[rival]) // points_for_a_win + 1)
+        number_of_rivals_to_pass -= wins_needed_to_pass == 0
+        loss_caps.append(number_of_matches - wins_needed_to_pass if 0 < wins_needed_to_pass <= number_of_matches else None)
+    if number_of_rivals_to_pass <= 0:
+        return False
+    candidates = [rival for rival, loss_cap in enumerate(loss_caps) if loss_cap is not None]
+    if len(candidates) < number_of_rivals_to_pass:
+        return True
+    can_pass = _can_lift_caps(pairings, loss_caps, candidates, len(candidates) - number_of_rivals_to_pass)
+    return None if can_pass is None else not can_pass
+
+
+def get_qualification_verdict(
+    current_points: Dict[str, int], remaining_matches: Sequence[Tuple[str, str]], team_name: str, top_x_position: int, points_for_a_win: int
+) -> QualificationVerdict:
+    """
+    Returns whether a team has clinched, is eliminated from, or is still in contention for the top positions. A team
+    whose checks are left unsettled by the work limit is in contention.
+
+    Parameters:
+        current_points (Dict[str, int]): Current points of every team.
+        remaining_matches (Sequence[Tuple[str, str]]): Home and away team of every remaining match.
+        team_name (str): The team to check.
+        top_x_position (int): The position in the points table the team must finish within.
+        points_for_a_win (int): Points awarded for a win.
+
+    Returns:
+        QualificationVerdict: The verdict for the team.
+    """
+    if can_finish_in_top_positions(current_points, remaining_matches, team_name, top_x_position, points_for_a_win) is False:
+        return QualificationVerdict.ELIMINATED
+    if has_clinched_top_positions(current_points, remaining_matches, team_name, top_x_position, points_for_a_win):
+        return QualificationVerdict.CLINCHED
+    return QualificationVerdict.IN_CONTENTION
+
+
+def get_minimum_number_of_wins_needed(
+    current_points: Dict[str, int], remaining_matches: Sequence[Tuple[str, str]], team_name: str, top_x_position: int, points_for_a_win: int
+) -> Optional[int]:
+    """
+    Returns the fewest remaining matches a team has to win to keep a chance of finishing within the top positions.
+
+    Winning an extra match never hurts a team, so the answer is found by a binary search over the number of wins, each
+    step checking with `_can_finish_in_top_positions_with_wins` whether some choice of that many of its matches to win
+    still leaves a qualifying outcome.
+
+    Parameters:
+        current_points (Dict[str, int]): Current points of every team.
+        remaining_matches (Sequence[Tuple[str, str]]): Home and away team of every remaining match.
+        team_name (str): The team to check.
+        top_x_position (int): The position in the points table the team must finish within.
+        points_for_a_win (int): Points awarded for a win.
+
+    Returns:
+        Optional[int]: The minimum number of wins, or None if the team is eliminated whatever it wins or a check could
+            not be settled within `MAXIMUM_NUMBER_OF_ASSIGNMENTS`.
+    """
+    if not can_finish_in_top_positions(current_points, remaining_matches, team_name, top_x_position, points_for_a_win):
+        return None
+    fewest_wins_known_to_do, most_wins_known_not_to_do = sum(team_name in match for match in remaining_matches), -1
+    while fewest_wins_known_to_do - most_wins_known_not_to_do > 1:
+        number_of_wins = (fewest_wins_known_to_do + most_wins_known_not_to_do) // 2
+        can_finish = _can_finish_in_top_positions_with_wins(
+            current_points, remaining_matches, team_name, top_x_position, points_for_a_win, number_of_wins
+        )
+        if can_finish is None:
+            return None
+        if can_finish:
+            fewest_wins_known_to_do = number_of_wins
+        else:
+            most_wins_known_not_to_do = number_of_wins
+    return fewest_wins_known_to_do
+
+
+def _can_finish_in_top_positions_with_wins(   # pylint: disable = too-many-arguments, too-many-positional-arguments
+    current_points: Dict[str, int],
+    remaining_matches: Sequence[Tuple[str, str]],
+    team_name: str,
+    top_x_position: int,
+    points_for_a_win: int,
+    number_of_wins: int,
+) -> Optional[bool]:
+    """
+    Checks whether the team can finish within the top positions when it wins `number_of_wins` of its remaining matches,
+    whichever ones suit it best.
+
+    Those wins fix the team's final points and cap the wins every rival can take without passing it. Finishing level on
+    points counts as qualified, as the tie is settled by the net run rate. The team's own matches stay in the network,
+    with the team capped at `number_of_wins`, so the flow chooses which of them it wins: winning fewer than that only
+    hands points to rivals that are within their caps anyway. The check then looks for the fewest rivals to let past the
+    team such that all the matches can be shared out within the caps of the others, see `_can_lift_caps`.
+    """
+    final_points = current_points[team_name] + points_for_a_win * number_of_wins
+    teams = list(current_points)
+    team_index = {team: index for index, team in enumerate(teams)}
+    pairings: Pairings = Counter((team_index[home_team], team_index[away_team]) for home_team, away_team in remaining_matches)
+    matches_per_team = _count_matches_per_team(pairings, len(teams))
+    caps: List[Optional[int]] = []
+    contenders: List[int] = []
+    number_of_teams_allowed_above = top_x_position - 1
+    for team, number_of_matches in zip(teams, matches_per_team):
+        wins_before_overtaking = number_of_wins if team == team_name else (final_points - current_points[team]) // points_for_a_win
+        number_of_teams_allowed_above -= wins_before_overtaking < 0
+        caps.append(wins_before_overtaking if 0 <= wins_before_overtaking < number_of_matches else None)
+        if team != team_name and caps[-1] is not None:
+            contenders.append(team_index[team])
+    if number_of_teams_allowed_above < 0:
+        return False
+    return _can_lift_caps(pairings, caps, contenders, number_of_teams_allowed_above)
+
+
+def _index_rival_matches(
+    current_points: Dict[str, int], remaining_matches: Sequence[Tuple[str, str]], team_name: str
+) -> Tuple[List[str], Pairings]:
+    """Numbers the rivals of a team and counts their remaining matches against each other by pairing."""
+    rivals = [team for team in current_points if team != team_name]
+    rival_index = {rival: index for index, rival in enumerate(rivals)}
+    pairings: Pairings = Counter(
+        (rival_index[home_team], rival_index[away_team]) for home_team, away_team in remaining_matches if team_name not in (home_team, away_team)
+    )
+    return rivals, pairings
+
+
+def _count_matches_per_team(pairings: Pairings, number_of_teams: int) -> List[int]:
+    matches_per_team = [0] * number_of_teams
+    for (home_team, away_team), number_of_matches in pairings.items():
+        matches_per_team[home_team] += number_of_matches
+        matches_per_team[away_team] += number_of_matches
+    return matches_per_team
+
+
+def _can_lift_caps(pairings: Pairings, caps: List[Optional[int]], liftable_teams: List[int], maximum_number_of_lifts: int) -> Optional[bool]:
+    """
+    Checks whether lifting the caps of at most `maximum_number_of_lifts` of the liftable teams lets every match be
+    handed to one of its two teams without any team going over its cap, None caps being unlimited.
+
+    For given caps this is a bipartite max-flow, solved by `_find_overloaded_group`, but choosing the teams to lift is
+    as hard as finding a maximum independent set when every cap is 0, so there is no single max-flow for it. The teams
+    are chosen by branch and bound instead: some team of the group that the current caps leave overloaded must be
+    lifted, so the search branches on those, most relieving first, and stops at a group whose excess the remaining
+    lifts cannot relieve. Every branch takes one assignment, and the search gives up with None after
+    `MAXIMUM_NUMBER_OF_ASSIGNMENTS` of them.
+    """
+    number_of_assignments = [0]
+
+    def can_lift(caps: List[Optional[int]], number_of_lifts_left: int, kept_teams: Set[int]) -> bool:
+        number_of_assignments[0] += 1
+        if number_of_assignments[0] > MAXIMUM_NUMBER_OF_ASSIGNMENTS:
+            raise _WorkLimitReached
+        overloaded_group = _find_overloaded_group(pairings, caps)
+        if overloaded_group is None:
+            return True
+        if number_of_lifts_left == 0:
+            return False
+        matches_per_team: Dict[int, int] = Counter()
+        number_of_matches_in_group = 0
+        for (home_team, away_team), number_of_matches in pairings.items():
+            if home_team in overloaded_group and away_team in overloaded_group:
+                matches_per_team[home_team] += number_of_matches
+                matches_per_team[away_team] += number_of_matches
+                number_of_matches_in_group += number_of_matches
+        excess = number_of_matches_in_group - sum(caps[team] or 0 for team in overloaded_group)
+        reliefs = {
+            team: matches_per_team[team] - (caps[team] or 0)
+            for team in overloaded_group if team in liftable_set and team not in kept_teams
+        }   # lifting a team lowers the excess of the group by at most its relief
+        teams_to_lift = sorted(reliefs, key=lambda team: -reliefs[team])
+        if sum(max(reliefs[team], 0) for team in teams_to_lift[:number_of_lifts_left]) < excess:
+            return False
+        for position, team in enumerate(teams_to_lift):
+            lifted_caps = list(caps)
+            lifted_caps[team] = None
+            if can_lift(lifted_caps, number_of_lifts_left - 1, kept_teams.union(teams_to_lift[:position])):
+                return True
+        return False
+
+    liftable_set = set(liftable_teams)
+    try:
+        return can_lift(list(caps), maximum_number_of_lifts, set())
+    except _WorkLimitReached:
+        return None
+
+
+def _find_overloaded_group(pairings: Pairings, caps: List[Optional[int]]) -> Optional[Set[int]]:
+    """
+    Hands every match to one of its teams within their caps, or returns a group of teams whose matches against each other
+    outnumber their caps together, which proves it cannot be done.
+
+    The matches are handed out greedily, then every team over its cap passes wins on along a path of teams that beat the
+    next one until a team with room takes it, which is an augmenting path of the max-flow. When no path leaves a team
+    over its cap, the teams reachable from it form the overloaded group.
+    """
+    number_of_teams = len(caps)
+    wins = [0] * number_of_teams
+    wins_against: List[List[int]] = [[0] * number_of_teams for _ in range(number_of_teams)]
+    for (home_team, away_team), number_of_matches in pairings.items():
+        home_cap = caps[home_team]
+        home_wins = number_of_matches if home_cap is None else min(number_of_matches, max(home_cap - wins[home_team], 0))
+        wins[home_team] += home_wins
+        wins[away_team] += number_of_matches - home_wins
+        wins_against[home_team][away_team] += home_wins
+        wins_against[away_team][home_team] += number_of_matches - home_wins
+
+    for overloaded_team, cap in enumerate(caps):
+        if cap is None:
+            continue
+        while wins[overloaded_team] > cap:
+            parents, receiving_team = _find_path_to_team_with_room(wins_against, wins, caps, overloaded_team)
+            if receiving_team is None:
+                return set(parents)
+            team = receiving_team
+            while team != overloaded_team:
+                wins_against[parents[team]][team] -= 1
+                wins_against[team][parents[team]] += 1
+                team = parents[team]
+            wins[overloaded_team] -= 1
+            wins[receiving_team] += 1
+    return None
+
+
+def _find_path_to_team_with_room(
+    wins_against: List[List[int]], wins: List[int], caps: List[Optional[int]], overloaded_team: int
+) -> Tuple[Dict[int, int], Optional[int]]:
+    """
+    Breadth-first search from an overloaded team along the teams it beat, returning the parent of every team reached and
+    the first team with room below its cap, or None when every reachable team is full.
+    """
+    parents = {overloaded_team: overloaded_team}
+    queue: Deque[int] = deque([overloaded_team])
+    while queue:
+        team = queue.popleft()
+        for beaten_team, number_of_wins in enumerate(wins_against[team]):
+            if number_of_wins > 0 and beaten_team not in parents:
+                parents[beaten_team] = team
+                beaten_team_cap = caps[beaten_team]
+                if beaten_team_cap is None or wins[beaten_team] < beaten_team_cap:
+                    return parents, beaten_team
+                queue.append(beaten_team)
+    return parents, None
@@ -0,0 +1,424 @@
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Mapping,
+    Optional,
+    Sequence,
+    Tuple,
+    Union
+)
+import pandas as pd
+from points_table_simulator.exceptions import (
+    NoQualifyingScenariosError,
+    TournamentCompletionBelowCutoffError
+)
+from src.functions.incremental_scenario_search import (
+    iterate_qualifying_outcomes_incrementally
+)
+from src.functions.qualification_conditions import (
+    QualificationConditions,
+    derive_qualification_conditions,
+    iterate_diverse_qualifying_outcomes
+)
+from src.functions.qualification_matrix import (
+    QualificationMatrixSnapshot,
+    get_default_snapshot_path,
+    get_qualification_verdict_and_minimum_number_of_wins_needed,
+    read_qualification_matrix_snapshot
+)
+from src.functions.qualification_probability import (
+    DEFAULT_MAXIMUM_NUMBER_OF_SAMPLES,
+    estimate_position_probabilities
+)
+from src.functions.qualification_scenario_search import (
+    QualificationScenarioSearch
+)
+from src.functions.qualification_verdict import QualificationVerdict
+from src.functions.tournament_refresher import (
+    TournamentRefresher,
+    TournamentSnapshot,
+    tournament_refresher
+)
+from src.functions.tournament_registry import RegisteredTournament
+
+QUERY_KINDS = ("standings", "feasibility", "scenarios", "probabilities")
+DEFAULT_TIME_BUDGET_IN_SECONDS = 5.0
+MAXIMUM_TIME_BUDGET_IN_SECONDS = 60.0
+MAXIMUM_NUMBER_OF_SCENARIOS = 50
+MAXIMUM_NUMBER_OF_SAMPLES = 5_000_000
+FIRST_SNAPSHOT_TIMEOUT_IN_SECONDS = 30
+
+
+class QueryError(ValueError):
+    """A query that cannot be answered, along with the HTTP status that says why."""
+
+    def __init__(self, status: int, message: str):
+        super().__init__(message)
+        self.status = status
+
+
+@dataclass(frozen=True)
+class Query:     # pylint: disable = too-many-instance-attributes
+    """
+    One question about a registered tournament.
+
+    Attributes:
+        kind (str): One of `QUERY_KINDS`.
+        tournament (str): Name or ESPNcricinfo seriesId of the tournament.
+        team (str, optional): The team, needed by the feasibility and scenarios queries.
+        top_x_position_in_the_table (int): The position in the points table to finish within.
+        number_of_scenarios (int): Number of qualification scenarios to find.
+        maximum_number_of_samples (int): Upper limit on the outcomes sampled for the probabilities.
+        seed (int, optional): Seed of the sampling, for reproducible probabilities.
+        time_budget_in_seconds (float): Time after which a scenarios or probabilities query stops with what it has,
+            and any other query is no longer started.
+    """
+
+    kind: str
+    tournament: str
+    team: Optional[str] = None
+    top_x_position_in_the_table: int = 4
+    number_of_scenarios: int = 3
+    maximum_number_of_samples: int = DEFAULT_MAXIMUM_NUMBER_OF_SAMPLES
+    seed: Optional[int] = None
+    time_budget_in_seconds: float = DEFAULT_TIME_BUDGET_IN_SECONDS
+
+    @classmethod
+    def from_document(cls, document: Mapping[str, Any]) -> "Query":
+        """
+        Reads a query from a JSON object, or from query string arguments, whose values are all strings.
+
+        Raises:
+            QueryError: If a field is unknown, missing or out of range.
+        """
+        unknown_fields = set(document) - set(cls.__dataclass_fields__)     # pylint: disable = no-member
+        if unknown_fields:
+            raise QueryError(400, f"Unknown query fields: {', '.join(sorted(unknown_fields))}")
+        kind = str(document.get("kind", ""))
+        if kind not in QUERY_KINDS:
+            raise QueryError(400, f"'kind' must be one of {', '.join(QUERY_KINDS)}")
+        if "tournament" not in document:
+            raise QueryError(400, "'tournament' is required")
+        team = document.get("team")
+        if team is None and kind in ("feasibility", "scenarios"):
+            raise QueryError(400, f"'team' is required by {kind} queries")
+        seed = document.get("seed")
+        return cls(
+            kind=kind,
+            tournament=str(document["tournament"]),
+            team=None if team is None else str(team),
+            top_x_position_in_the_table=_read_number(document, "top_x_position_in_the_table", int, 4, 1, None),
+            number_of_scenarios=_read_number(document, "number_of_scenarios", int, 3, 1, MAXIMUM_NUMBER_OF_SCENARIOS),
+            maximum_number_of_samples=_read_number(
+                document, "maximum_number_of_samples", int, DEFAULT_MAXIMUM_NUMBER_OF_SAMPLES, 1, MAXIMUM_NUMBER_OF_SAMPLES
+            ),
+            seed=None if seed is None else _read_number(document, "seed", int, 0, 0, None),
+            time_budget_in_seconds=_read_number(
+                document, "time_budget_in_seconds", float, DEFAULT_TIME_BUDGET_IN_SECONDS, 0, MAXIMUM_TIME_BUDGET_IN_SECONDS
+            ),
+        )
+
+
+def _read_number(     # pylint: disable = too-many-arguments, too-many-positional-arguments
+    document: Mapping[str, Any], name: str, number_type: type, default: Any, minimum: Any, maximum: Optional[Any]
+) -> Any:
+    if document.get(name) is None:
+        return default
+    try:
+        value = number_type(document[name])
+    except (TypeError, ValueError) as exception:
+        raise QueryError(400, f"'{name}' must be a number") from exception
+    if value < minimum or (maximum is not None and value > maximum):
+        raise QueryError(400, f"'{name}' must be between {minimum} and {maximum}" if maximum is not None else f"'{name}' must be at least {minimum}")
+    return value
+
+
+@dataclass
+class _TournamentState:
+    """A tournament snapshot along with the search built from it and what is derived from the search."""
+
+    snapshot: TournamentSnapshot
+    _qualification_scenario_search: Optional[QualificationScenarioSearch] = None
+    _qualification_matrix_snapshot: Optional[QualificationMatrixSnapshot] = None
+    _is_qualification_matrix_snapshot_read: bool = False
+    _qualification_conditions: Dict[Tuple[str, int], QualificationConditions] = field(default_factory=dict)
+    _lock: threading.Lock = field(default_factory=threading.Lock)
+
+    @property
+    def qualification_scenario_search(self) -> QualificationScenarioSearch:
+        with self._lock:
+            if self._qualification_scenario_search is None:
+                if self.snapshot.points_table_simulator is None:
+                    raise QueryError(409, "All league matches in the tournament are completed")
+                self._qualification_scenario_search = QualificationScenarioSearch(self.snapshot.points_table_simulator)
+            return self._qualification_scenario_search
+
+    @property
+    def qualification_matrix_snapshot(self) -> Optional[QualificationMatrixSnapshot]:
+        """The precomputed snapshot of the tournament, if there is one for the fixture state of this snapshot."""
+        search = self.qualification_scenario_search
+        with self._lock:
+            if not self._is_qualification_matrix_snapshot_read:
+                qualification_matrix_snapshot = read_qualification_matrix_snapshot(get_default_snapshot_path(self.snapshot.tournament.series_id))
+                if qualification_matrix_snapshot is not None and qualification_matrix_snapshot.is_fresh_for(search):
+                    self._qualification_matrix_snapshot = qualification_matrix_snapshot
+                self._is_qualification_matrix_snapshot_read = True
+            return self._qualification_matrix_snapshot
+
+    def get_qualification_conditions(
+        self, team_name: str, top_x_position_in_the_table: int, minimum_number_of_wins_needed: Optional[int] = None
+    ) -> QualificationConditions:
+        search = self.qualification_scenario_search
+        request_key = (team_name, top_x_position_in_the_table)
+        with self._lock:
+            if request_key not in self._qualification_conditions:
+                self._qualification_conditions[request_key] = derive_qualification_conditions(
+                    search, team_name, top_x_position_in_the_table, minimum_number_of_wins_needed
+                )
+            return self._qualification_conditions[request_key]
+
+
+class ScenarioApi:
+    """
+    Answers standings, feasibility, scenarios and probabilities queries on the registered tournaments, without
+    Streamlit, for the headless HTTP API.
+
+    Queries are answered from the snapshots published by the tournament refresher, the same ones the tournament pages
+    render, so the API never calls ESPNcricinfo on a request either. The search built from a snapshot is shared by
+    every query until the next snapshot, and scenarios come from the precomputed snapshot when it is fresh, and from
+    the diverse search otherwise, carrying outcomes over from the previous fixture state as the pages do.
+
+    Every answer is a sequence of JSON-serialisable documents, so that the scenarios of a query are sent as soon as
+    they are found, and a query stops with what it has once its time budget runs out.
+
+    Parameters:
+        refresher (TournamentRefresher): Publishes the snapshots of the tournaments.
+        first_snapshot_timeout_in_seconds (float): Longest wait for the first poll of a tournament.
+    """
+
+    def __init__(self, refresher: TournamentRefresher = tournament_refresher, first_snapshot_timeout_in_seconds: float = FIRST_SNAPSHOT_TIMEOUT_IN_SECONDS):
+        self.refresher = refresher
+        self.first_snapshot_timeout_in_seconds = first_snapshot_timeout_in_seconds
+        self._tournament_states: Dict[str, _TournamentState] = {}
+        self._lock = threading.Lock()
+
+    def list_tournaments(self) -> List[Dict[str, Any]]:
+        tournaments = []
+        for tournament in self.refresher.tournaments.values():
+            snapshot = self.refresher.get_snapshot(tournament.name)
+            tournaments.append({
+                "name": tournament.name,
+                "series_id": tournament.series_id,
+                "version": None if snapshot is None else snapshot.version,
+                "refreshed_at": None if snapshot is None else snapshot.refreshed_at,
+                "is_league_stage_completed": None if snapshot is None else snapshot.is_league_stage_completed,
+            })
+        return tournaments
+
+    def find_tournament(self, tournament_name_or_series_id: str) -> RegisteredTournament:
+        """
+        Raises:
+            QueryError: If no registered tournament has the given name or seriesId.
+        """
+        for tournament in self.refresher.tournaments.values():
+            if tournament_name_or_series_id in (tournament.name, str(tournament.series_id)):
+                return tournament
+        raise QueryError(404, f"Unknown tournament '{tournament_name_or_series_id}'")
+
+    def iterate_answers(
+        self,
+        queries: Sequence[Union[Query, QueryError]],
+        time_budget_in_seconds: Optional[float] = None,
+        is_cancelled: Optional[Callable[[], bool]] = None,
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        Answers a batch of queries in order, each within its own time budget and all of them within the batch's.
+
+        Parameters:
+            queries (Sequence[Union[Query, QueryError]]): The queries, along with the errors of those that could not be
+                read, which are answered as such.
+            time_budget_in_seconds (float, optional): Time after which the remaining queries are answered with a 504
+                error, and the running one stops with what it has.
+            is_cancelled (Callable[[], bool], optional): Stops the batch as soon as it returns True, such as when the
+                client disconnects.
+
+        Returns:
+            Iterator[Dict[str, Any]]: Documents tagged with the index of the query they answer. Every query ends with a
+                document of its kind, or with an error document carrying an HTTP status.
+        """
+        batch_deadline = time.monotonic() + (MAXIMUM_TIME_BUDGET_IN_SECONDS if time_budget_in_seconds is None else time_budget_in_seconds)
+        for query_index, query in enumerate(queries):
+            if is_cancelled is not None and is_cancelled():
+                return
+            try:
+                if isinstance(query, QueryError):
+                    raise query
+                if time.monotonic() >= batch_deadline:
+                    raise QueryError(504, "The time budget of the batch ran out before the query started")
+                deadline = min(time.monotonic() + query.time_budget_in_seconds, batch_deadline)
+
+                def is_over(deadline: float = deadline) -> bool:
+                    return time.monotonic() >= deadline or (is_cancelled is not None and is_cancelled())
+
+                for document in self.iterate_answer(query, is_over):
+                    yield {"index": query_index, **document}
+            except QueryError as query_error:
+                yield {"index": query_index, "type": "error", "status": query_error.status, "error": str(query_error)}
+
+    def iterate_answer(self, query: Query, is_over: Callable[[], bool] = lambda: False) -> Iterator[Dict[str, Any]]:
+        """
+        Answers one query.
+
+        Raises:
+            QueryError: If the tournament is unknown or not fetched yet, or the query does not fit the tournament.
+        """
+        tournament_state = self._get_tournament_state(self.find_tournament(query.tournament))
+        if query.kind == "standings":
+            yield self._get_standings(tournament_state)
+        elif query.kind == "feasibility":
+            yield self._get_feasibility(tournament_state, query)
+        elif query.kind == "scenarios":
+            yield from self._iterate_scenarios(tournament_state, query, is_over)
+        else:
+            yield self._get_probabilities(tournament_state, query, is_over)
+
+    def _get_tournament_state(self, tournament: RegisteredTournament) -> _TournamentState:
+        snapshot = self.refresher.get_snapshot(tournament.name)
+        if snapshot is None:
+            self.refresher.start()
+            snapshot = self.refresher.wait_for_snapshot(tournament.name, self.first_snapshot_timeout_in_seconds)
+        if snapshot is None:
+            raise QueryError(503, "The fixture of the tournament could not be fetched yet")
+        with self._lock:
+            tournament_state = self._tournament_states.get(tournament.name)
+            if tournament_state is None or tournament_state.snapshot.version != snapshot.version:
+                tournament_state = self._tournament_states[tournament.name] = _TournamentState(snapshot)
+            return tournament_state
+
+    @staticmethod
+    def _get_standings(tournament_state: _TournamentState) -> Dict[str, Any]:
+        snapshot = tournament_state.snapshot
+        return {
+            "type": "standings",
+            "tournament": snapshot.tournament.name,
+            "version": snapshot.version,
+            "refreshed_at": snapshot.refreshed_at,
+            "is_league_stage_completed": snapshot.is_league_stage_completed,
+            "points_table": _to_records(snapshot.current_points_table),
+        }
+
+    @staticmethod
+    def _get_feasibility(tournament_state: _TournamentState, query: Query) -> Dict[str, Any]:
+        search = tournament_state.qualification_scenario_search
+        team_name, top_x_position_in_the_table = _validate_team_and_position(search, query)
+        verdict, minimum_number_of_wins_needed = get_qualification_verdict_and_minimum_number_of_wins_needed(
+            search, team_name, top_x_position_in_the_table, tournament_state.qualification_matrix_snapshot
+        )
+        match_conditions = []
+        if verdict == QualificationVerdict.IN_CONTENTION:
+            qualification_conditions = tournament_state.get_qualification_conditions(team_name, top_x_position_in_the_table, minimum_number_of_wins_needed)
+            for match_index, (match, condition) in enumerate(zip(_to_records(search.remaining_schedule_df), qualification_conditions.match_conditions)):
+                required_winner = qualification_conditions.required_winners.get(match_index)
+                match_conditions.append({
+                    **match,
+                    "condition": condition.value,
+                    "required_winner": None if required_winner is None else search.teams[required_winner],
+                })
+        return {
+            "type": "feasibility",
+            "team": team_name,
+            "top_x_position_in_the_table": top_x_position_in_the_table,
+            "verdict": verdict.value,
+            "minimum_number_of_wins_needed": minimum_number_of_wins_needed,
+            "match_conditions": match_conditions,
+        }
+
+    @staticmethod
+    def _iterate_scenarios(tournament_state: _TournamentState, query: Query, is_over: Callable[[], bool]) -> Iterator[Dict[str, Any]]:
+        search = tournament_state.qualification_scenario_search
+        team_name, top_x_position_in_the_table = _validate_team_and_position(search, query)
+        try:
+            search.validate_the_request(team_name, top_x_position_in_the_table, query.number_of_scenarios)
+        except (NoQualifyingScenariosError, TournamentCompletionBelowCutoffError) as exception:
+            raise QueryError(422, str(exception)) from exception
+
+        def iterate_outcomes(_: int) -> Iterable[Tuple[int, ...]]:
+            return iterate_diverse_qualifying_outcomes(
+                search, team_name, top_x_position_in_the_table, tournament_state.get_qualification_conditions(team_name, top_x_position_in_the_table)
+            )
+
+        qualification_matrix_snapshot = tournament_state.qualification_matrix_snapshot
+        qualifying_outcomes: Optional[Iterable[Tuple[int, ...]]] = None
+        if qualification_matrix_snapshot is not None:
+            qualifying_outcomes = qualification_matrix_snapshot.get_qualifying_outcomes(team_name, top_x_position_in_the_table, query.number_of_scenarios)
+        if qualifying_outcomes is None:
+            qualifying_outcomes = iterate_qualifying_outcomes_incrementally(
+                search, team_name, top_x_position_in_the_table, query.number_of_scenarios, iterate_outcomes,
+                tournament_state.snapshot.tournament.fixture_source,
+            )
+
+        number_of_scenarios = 0
+        is_budget_exhausted = False
+        qualifying_outcome_iterator = iter(qualifying_outcomes)
+        while True:
+            if is_over():     # checked before every scenario, as finding the next one is what takes the time
+                is_budget_exhausted = True
+                break
+            winners = next(qualifying_outcome_iterator, None)
+            if winners is None:
+                break
+            number_of_scenarios += 1
+            yield {
+                "type": "scenario",
+                "scenario_number": number_of_scenarios,
+                "points_table": _to_records(search.build_points_table(winners, team_name)),
+                "remaining_match_outcome": _to_records(search.build_remaining_match_outcome(winners)),
+            }
+        yield {
+            "type": "scenarios",
+            "team": team_name,
+            "top_x_position_in_the_table": top_x_position_in_the_table,
+            "number_of_scenarios": number_of_scenarios,
+            "is_budget_exhausted": is_budget_exhausted,
+        }
+
+    @staticmethod
+    def _get_probabilities(tournament_state: _TournamentState, query: Query, is_over: Callable[[], bool]) -> Dict[str, Any]:
+        search = tournament_state.qualification_scenario_search
+        if query.top_x_position_in_the_table > len(search.teams):
+            raise QueryError(400, "'top_x_position_in_the_table' must be between 1 and the number of teams in the table")
+        position_probabilities = estimate_position_probabilities(
+            dict(zip(search.teams, search.current_points)),
+            [(search.teams[home_team], search.teams[away_team]) for home_team, away_team in search.remaining_matches],
+            search.points_for_a_win,
+            seed=query.seed,
+            maximum_number_of_samples=query.maximum_number_of_samples,
+            is_cancelled=is_over,
+        )
+        return {
+            "type": "probabilities",
+            "top_x_position_in_the_table": query.top_x_position_in_the_table,
+            "number_of_samples": position_probabilities.number_of_samples,
+            "is_budget_exhausted": is_over(),
+            "teams": _to_records(position_probabilities.top_positions_probabilities(query.top_x_position_in_the_table)),
+        }
+
+
+def _validate_team_and_position(search: QualificationScenarioSearch, query: Query) -> Tuple[str, int]:
+    if query.team not in search.team_index:
+        raise QueryError(404, f"'{query.team}' is not found in the points table of the tournament")
+    if query.top_x_position_in_the_table > len(search.teams):
+        raise QueryError(400, "'top_x_position_in_the_table' must be between 1 and the number of teams in the table")
+    return query.team, query.top_x_position_in_the_table
+
+
+def _to_records(dataframe: pd.DataFrame) -> List[Dict[str, Any]]:
+    """Rows of a DataFrame as JSON objects, with missing values as null."""
+    return dataframe.astype(object).where(dataframe.notna(), None).to_dict(orient="records")
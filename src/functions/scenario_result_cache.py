@@ -0,0 +1,219 @@
+import hashlib
+import threading
+from collections import OrderedDict
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+import pandas as pd
+from src.functions.qualification_scenario_search import (
+    QualificationScenarioSearch
+)
+
+DEFAULT_MAXIMUM_SIZE_IN_BYTES = 64 * 1024 * 1024
+
+QualificationScenarios = Tuple[List[pd.DataFrame], List[pd.DataFrame]]
+_CacheKey = Tuple[str, str, int, int]
+
+
+def hash_fixture_state(qualification_scenario_search: QualificationScenarioSearch) -> str:
+    """
+    Hashes everything the qualification scenarios of a tournament depend on: the remaining fixture, the current
+    standings and the points system.
+
+    Parameters:
+        qualification_scenario_search (QualificationScenarioSearch): Search built from the tournament.
+
+    Returns:
+        str: Hex digest, which changes whenever a result lands or the schedule changes.
+    """
+    search = qualification_scenario_search
+    simulator = search.points_table_simulator
+    digest = hashlib.sha256()
+    digest.update(repr((
+        search.teams,
+        search.current_points,
+        search.matches_played,
+        search.matches_won,
+        search.matches_drawn,
+        search.matches_with_no_result,
+        search.number_of_matches,
+        (simulator.points_for_a_win, simulator.points_for_a_draw, simulator.points_for_a_no_result),
+    )).encode())
+    digest.update(repr(search.remaining_schedule_df.to_dict(orient="split")).encode())
+    return digest.hexdigest()
+
+
+class ScenarioResultCache:     # pylint: disable = too-many-instance-attributes
+    """
+    Memory-bounded LRU cache of qualification scenarios, shared by every Streamlit session of the process.
+
+    Entries are keyed by the fixture state hash and the request parameters, so a new result or a rescheduled match
+    never serves outdated scenarios. When a fixture source (such as a tournament fetched from ESPNcricinfo) reports a new
+    fixture state, the entries of its previous state are dropped straight away instead of waiting to be evicted.
+    Concurrent requests for the same entry run the search once.
+
+    Parameters:
+        maximum_size_in_bytes (int): Approximate memory budget of the cached DataFrames.
+    """
+
+    def __init__(self, maximum_size_in_bytes: int = DEFAULT_MAXIMUM_SIZE_IN_BYTES):
+        self.maximum_size_in_bytes = maximum_size_in_bytes
+        self.size_in_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self._entries: "OrderedDict[_CacheKey, Tuple[QualificationScenarios, int]]" = OrderedDict()
+        self._fixture_state_of_source: Dict[str, str] = {}
+        self._lock = threading.Lock()
+        self._compute_locks: Dict[_CacheKey, threading.Lock] = {}
+
+    def get_or_compute(     # pylint: disable = too-many-arguments, too-many-positional-arguments
+        self,
+        fixture_state_hash: str,
+        team_name: str,
+        top_x_position_in_the_table: int,
+        desired_number_of_scenarios: int,
+        compute: Callable[[], QualificationScenarios],
+        fixture_source: Optional[str] = None,
+    ) -> Tuple[QualificationScenarios, bool]:
+        """
+        Returns the cached scenarios for a request, computing and caching them on a miss.
+
+        Parameters:
+            fixture_state_hash (str): Hash of the fixture state, from `hash_fixture_state`.
+            team_name (str): The name of the team for which qualification scenarios are being determined.
+            top_x_position_in_the_table (int): The desired position in the points table for qualification.
+            desired_number_of_scenarios (int): The desired number of qualifying scenarios.
+            compute (Callable[[], QualificationScenarios]): Runs the search. Exceptions are raised as is and not cached.
+            fixture_source (str, optional): Identifies where the fixture comes from, so that the entries of its
+                previous fixture state are invalidated.
+
+        Returns:
+            Tuple[QualificationScenarios, bool]: The scenarios, which are shared and must not be modified, and whether
+                they came from the cache.
+        """
+        key = self._get_key(fixture_state_hash, team_name, top_x_position_in_the_table, desired_number_of_scenarios, fixture_source)
+        with self._computing(key):
+            cached_scenarios = self._get(key)
+            if cached_scenarios is not None:
+                return cached_scenarios, True
+            qualification_scenarios = compute()
+            self._put(key, qualification_scenarios)
+            return qualification_scenarios, False
+
+    def iterate_or_compute(     # pylint: disable = too-many-arguments, too-many-positional-arguments
+        self,
+        fixture_state_hash: str,
+        team_name: str,
+        top_x_position_in_the_table: int,
+        desired_number_of_scenarios: int,
+        iterate_scenarios: Callable[[], Iterable[Tuple[pd.DataFrame, pd.DataFrame]]],
+        fixture_source: Optional[str] = None,
+    ) -> Iterator[Tuple[pd.DataFrame, pd.DataFrame]]:
+        """
+        Streaming counterpart of `get_or_compute`: yields the cached scenarios of a request, or on a miss yields the
+        scenarios of `iterate_scenarios` as they are found and caches them once it is exhausted. A caller that stops
+        early caches nothing.
+
+        Parameters:
+            fixture_state_hash (str): Hash of the fixture state, from `hash_fixture_state`.
+            team_name (str): The name of the team for which qualification scenarios are being determined.
+            top_x_position_in_the_table (int): The desired position in the points table for qualification.
+            desired_number_of_scenarios (int): The desired number of qualifying scenarios.
+            iterate_scenarios (Callable[[], Iterable[Tuple[pd.DataFrame, pd.DataFrame]]]): Runs the search, yielding the
+                points table and remaining match outcome of each scenario. Exceptions are raised as is.
+            fixture_source (str, optional): Identifies where the fixture comes from, so that the entries of its
+                previous fixture state are invalidated.
+
+        Returns:
+            Iterator[Tuple[pd.DataFrame, pd.DataFrame]]: Points table and remaining match outcome of each scenario, which
+                are shared and must not be modified.
+        """
+        key = self._get_key(fixture_state_hash, team_name, top_x_position_in_the_table, desired_number_of_scenarios, fixture_source)
+        with self._computing(key):
+            cached_scenarios = self._get(key)
+            if cached_scenarios is not None:
+                yield from zip(*cached_scenarios)
+                return
+            list_of_points_tables: List[pd.DataFrame] = []
+            list_of_remaining_match_outcomes: List[pd.DataFrame] = []
+            for points_table, remaining_match_outcome in iterate_scenarios():
+                list_of_points_tables.append(points_table)
+                list_of_remaining_match_outcomes.append(remaining_match_outcome)
+                yield points_table, remaining_match_outcome
+            self._put(key, (list_of_points_tables, list_of_remaining_match_outcomes))
+
+    def contains(
+        self, fixture_state_hash: str, team_name: str, top_x_position_in_the_table: int, desired_number_of_scenarios: int
+    ) -> bool:
+        """Whether a request is cached, without counting a hit or a miss."""
+        with self._lock:
+            return (fixture_state_hash, team_name, int(top_x_position_in_the_table), int(desired_number_of_scenarios)) in self._entries
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._fixture_state_of_source.clear()
+            self.size_in_bytes = 0
+
+    def _get_key(     # pylint: disable = too-many-arguments, too-many-positional-arguments
+        self,
+        fixture_state_hash: str,
+        team_name: str,
+        top_x_position_in_the_table: int,
+        desired_number_of_scenarios: int,
+        fixture_source: Optional[str],
+    ) -> _CacheKey:
+        if fixture_source is not None:
+            self._register_fixture_state(fixture_source, fixture_state_hash)
+        return (fixture_state_hash, team_name, int(top_x_position_in_the_table), int(desired_number_of_scenarios))
+
+    @contextmanager
+    def _computing(self, key: _CacheKey) -> Iterator[None]:
+        """Holds the compute lock of a key, so that concurrent requests for the same entry run the search once."""
+        with self._lock:
+            compute_lock = self._compute_locks.setdefault(key, threading.Lock())
+        try:
+            with compute_lock:
+                yield
+        finally:
+            with self._lock:
+                self._compute_locks.pop(key, None)
+
+    def _get(self, key: _CacheKey) -> Optional[QualificationScenarios]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+    def _put(self, key: _CacheKey, qualification_scenarios: QualificationScenarios) -> None:
+        entry_size = sum(
+            int(dataframe.memory_usage(index=True, deep=True).sum())
+            for dataframes in qualification_scenarios for dataframe in dataframes
+        )
+        if entry_size > self.maximum_size_in_bytes:
+            return
+        with self._lock:
+            if key in self._entries:
+                self.size_in_bytes -= self._entries.pop(key)[1]
+            self._entries[key] = (qualification_scenarios, entry_size)
+            self.size_in_bytes += entry_size
+            while self.size_in_bytes > self.maximum_size_in_bytes:
+                _, (_, evicted_size) = self._entries.popitem(last=False)
+                self.size_in_bytes -= evicted_size
+
+    def _register_fixture_state(self, fixture_source: str, fixture_state_hash: str) -> None:
+        with self._lock:
+            previous_fixture_state_hash = self._fixture_state_of_source.get(fixture_source)
+            if previous_fixture_state_hash == fixture_state_hash:
+                return
+            self._fixture_state_of_source[fixture_source] = fixture_state_hash
+            if previous_fixture_state_hash is None:
+                return
+            for key in [key for key in self._entries if key[0] == previous_fixture_state_hash]:
+                self.size_in_bytes -= self._entries.pop(key)[1]
+
+
+scenario_result_cache = ScenarioResultCache()
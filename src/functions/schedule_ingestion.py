@@ -0,0 +1,129 @@
+import hashlib
+import io
+import threading
+from collections import OrderedDict
+from typing import Tuple
+import pandas as pd
+import pyarrow as pa
+import pyarrow.csv as pa_csv
+from points_table_simulator import PointsTableSimulator
+from src.functions.instrumentation import span, traced
+
+MAXIMUM_NUMBER_OF_CACHED_SCHEDULES = 8
+
+TEAM_NAME_TYPE = pa.dictionary(pa.int32(), pa.string())
+
+_ScheduleKey = Tuple[str, str, str, str, str, int, int, int]
+_schedule_cache: "OrderedDict[_ScheduleKey, PointsTableSimulator]" = OrderedDict()
+_schedule_cache_lock = threading.Lock()
+
+
+@traced("parse")
+def read_schedule_csv(
+    content: bytes, home_team_column_name: str, away_team_column_name: str, winner_team_column_name: str
+) -> pd.DataFrame:
+    """
+    Parses a tournament schedule CSV with the pyarrow engine, typing the given columns instead of inferring them.
+
+    The team columns are read as categoricals sharing the same categories, so every team name is stored once and the
+    matches hold integer codes. The winner column is read as strings, with empty cells as missing, as `pd.read_csv`
+    does. The columns keep their names from the file, and the other columns are inferred.
+
+    Parameters:
+        content (bytes): The CSV file.
+        home_team_column_name (str): Name of the column holding the home teams.
+        away_team_column_name (str): Name of the column holding the away teams.
+        winner_team_column_name (str): Name of the column holding the winners of the completed matches.
+
+    Returns:
+        pd.DataFrame: The schedule. Columns missing from the file are left for `PointsTableSimulator` to report.
+
+    Raises:
+        pyarrow.ArrowInvalid: If the file is not a valid CSV.
+    """
+    table = pa_csv.read_csv(
+        io.BytesIO(content),
+        convert_options=pa_csv.ConvertOptions(
+            column_types={
+                home_team_column_name: TEAM_NAME_TYPE,
+                away_team_column_name: TEAM_NAME_TYPE,
+                winner_team_column_name: pa.string(),
+            },
+            strings_can_be_null=True,
+        ),
+    )
+    schedule_df = table.to_pandas(split_blocks=True, self_destruct=True)
+    team_columns = [column for column in (home_team_column_name, away_team_column_name) if column in schedule_df.columns]
+    if team_columns:
+        teams = sorted(set().union(*(schedule_df[column].cat.categories for column in team_columns)))
+        for column in team_columns:
+            schedule_df[column] = schedule_df[column].cat.set_categories(teams)
+    return schedule_df
+
+
+def load_uploaded_schedule(     # pylint: disable = too-many-arguments, too-many-positional-arguments
+    content: bytes,
+    home_team_column_name: str,
+    away_team_column_name: str,
+    winner_team_column_name: str,
+    match_number_column_name: str,
+    points_for_a_win: int,
+    points_for_a_draw: int = 1,
+    points_for_a_no_result: int = 1,
+) -> PointsTableSimulator:
+    """
+    Parses and validates an uploaded schedule once, and serves the validated simulator for as long as the same file is
+    used with the same column names and points system.
+
+    Parameters:
+        content (bytes): The uploaded CSV file.
+        home_team_column_name (str): Name of the column holding the home teams.
+        away_team_column_name (str): Name of the column holding the away teams.
+        winner_team_column_name (str): Name of the column holding the winners of the completed matches.
+        match_number_column_name (str): Name of the column holding the match numbers.
+        points_for_a_win (int): Points awarded for a win.
+        points_for_a_draw (int): Points awarded for a draw.
+        points_for_a_no_result (int): Points awarded for a match with no result.
+
+    Returns:
+        PointsTableSimulator: Simulator built from the schedule, which is shared and must not be modified.
+
+    Raises:
+        pyarrow.ArrowInvalid: If the file is not a valid CSV.
+        InvalidColumnNamesError: If a given column is not found in the file.
+        InvalidScheduleDataError: If a team or match number is missing.
+        AllMatchesCompletedError: If every match has a winner.
+    """
+    key: _ScheduleKey = (
+        hashlib.sha256(content).hexdigest(),
+        home_team_column_name,
+        away_team_column_name,
+        winner_team_column_name,
+        match_number_column_name,
+        points_for_a_win,
+        points_for_a_draw,
+        points_for_a_no_result,
+    )
+    with _schedule_cache_lock:
+        points_table_simulator = _schedule_cache.get(key)
+        if points_table_simulator is not None:
+            _schedule_cache.move_to_end(key)
+            return points_table_simulator
+
+    tournament_schedule = read_schedule_csv(content, home_team_column_name, away_team_column_name, winner_team_column_name)
+    with span("build_simulator"):
+        points_table_simulator = PointsTableSimulator(
+            tournament_schedule=tournament_schedule,
+            points_for_a_win=points_for_a_win,
+            points_for_a_draw=points_for_a_draw,
+            points_for_a_no_result=points_for_a_no_result,
+            tournament_schedule_away_team_column_name=away_team_column_name,
+            tournament_schedule_home_team_column_name=home_team_column_name,
+            tournament_schedule_winning_team_column_name=winner_team_column_name,
+            tournament_schedule_match_number_column_name=match_number_column_name,
+        )
+    with _schedule_cache_lock:
+        _schedule_cache[key] = points_table_simulator
+        while len(_schedule_cache) > MAXIMUM_NUMBER_OF_CACHED_SCHEDULES:
+            _schedule_cache.popitem(last=False)
+    return points_table_simulator
@@ -0,0 +1,229 @@
+import time
+from dataclasses import dataclass, field
+from typing import (
+    Callable,
+    Dict,
+    Hashable,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Tuple
+)
+import pandas as pd
+import streamlit as st
+from points_table_simulator import PointsTableSimulator
+from points_table_simulator.exceptions import NoQualifyingScenariosError
+from src.functions.qualification_conditions import (
+    QualificationConditions,
+    derive_qualification_conditions
+)
+from src.functions.qualification_counting import (
+    MatchResult,
+    QualifyingOutcomeCount,
+    count_qualifying_outcomes
+)
+from src.functions.qualification_scenario_search import (
+    QualificationScenarioSearch
+)
+from src.functions.scenario_result_cache import hash_fixture_state
+from src.functions.tournament_model import TournamentModel
+
+SESSION_FIXTURES_KEY = "session_fixtures"
+
+QualificationScenario = Tuple[pd.DataFrame, pd.DataFrame]
+
+
+@dataclass
+class SessionFixture:     # pylint: disable = too-many-instance-attributes
+    """
+    A page's fixture within a Streamlit session, along with the work derived from it, kept in `st.session_state` so
+    that the session's reruns reuse it without sharing anything with the other sessions.
+
+    Invalidation rules:
+        - The fixture is loaded again when the page loads it from another source (another upload, other column names
+          or points system, another tournament), or when it is older than the maximum age the page allows.
+        - A fixture loaded again in the same fixture state changes nothing: the previous fixture is kept along with its
+          search, submitted requests and scenarios, and only takes the new simulator and points table, so that a
+          simulator shared by every session is recognised on the next load without hashing it again.
+        - Submitted requests and scenarios belong to the fixture, and are dropped along with it as soon as the fixture
+          state changes.
+        - Submitting a form replaces its previous request, and the scenarios of a request replace those of the previous
+          one. A request without any qualifying scenario is kept as such, and an interrupted search is not kept.
+
+    Attributes:
+        source_key (Hashable): Identifies what the fixture was loaded from.
+        points_table_simulator (PointsTableSimulator): Simulator built from the fixture.
+        loaded_at (float): Monotonic time at which the fixture was loaded.
+        current_points_table (pd.DataFrame, optional): Points table provided by the source, converted from the
+            tournament model on first use otherwise.
+        submitted_requests (Dict[str, Dict]): Inputs of the last submission of each form, by form key.
+        scenarios_request_key (Hashable): Request the stored scenarios answer.
+        scenarios (List[QualificationScenario]): Points table and remaining match outcome of each scenario.
+        scenarios_error (NoQualifyingScenariosError, optional): Raised by the search of the stored request.
+    """
+
+    source_key: Hashable
+    points_table_simulator: PointsTableSimulator
+    loaded_at: float
+    current_points_table: Optional[pd.DataFrame] = None
+    submitted_requests: Dict[str, Dict] = field(default_factory=dict)
+    scenarios_request_key: Hashable = None
+    scenarios: List[QualificationScenario] = field(default_factory=list)
+    scenarios_error: Optional[NoQualifyingScenariosError] = None
+    _qualification_scenario_search: Optional[QualificationScenarioSearch] = None
+    _fixture_state_hash: Optional[str] = None
+    _qualification_conditions: Dict[Tuple[str, int], QualificationConditions] = field(default_factory=dict)
+    _qualifying_outcome_counts: Dict[Tuple[str, int, Tuple[MatchResult, ...]], QualifyingOutcomeCount] = field(default_factory=dict)
+
+    @property
+    def qualification_scenario_search(self) -> QualificationScenarioSearch:
+        if self._qualification_scenario_search is None:
+            self._qualification_scenario_search = QualificationScenarioSearch(self.points_table_simulator)
+        return self._qualification_scenario_search
+
+    @property
+    def fixture_state_hash(self) -> str:
+        if self._fixture_state_hash is None:
+            self._fixture_state_hash = hash_fixture_state(self.qualification_scenario_search)
+        return self._fixture_state_hash
+
+    @property
+    def tournament_model(self) -> TournamentModel:
+        return self.qualification_scenario_search.tournament_model
+
+    def get_qualification_conditions(
+        self, team_name: str, top_x_position_in_the_table: int, minimum_number_of_wins_needed: Optional[int] = None
+    ) -> QualificationConditions:
+        request_key = (team_name, int(top_x_position_in_the_table))
+        if request_key not in self._qualification_conditions:
+            self._qualification_conditions[request_key] = derive_qualification_conditions(
+                self.qualification_scenario_search, team_name, top_x_position_in_the_table, minimum_number_of_wins_needed
+            )
+        return self._qualification_conditions[request_key]
+
+    def get_qualifying_outcome_count(
+        self,
+        team_name: str,
+        top_x_position_in_the_table: int,
+        possible_results: Tuple[MatchResult, ...],
+        maximum_number_of_groups: Optional[int] = None,
+    ) -> QualifyingOutcomeCount:
+        request_key = (team_name, int(top_x_position_in_the_table), tuple(possible_results))
+        if request_key not in self._qualifying_outcome_counts:
+            self._qualifying_outcome_counts[request_key] = count_qualifying_outcomes(
+                self.tournament_model, team_name, top_x_position_in_the_table, possible_results, maximum_number_of_groups
+            )
+        return self._qualifying_outcome_counts[request_key]
+
+    def get_current_points_table(self) -> pd.DataFrame:
+        if self.current_points_table is None:
+            self.current_points_table = self.tournament_model.get_current_points_table()
+        return self.current_points_table
+
+
+def load_session_fixture(
+    page_key: str,
+    source_key: Hashable,
+    load: Callable[[], Tuple[PointsTableSimulator, Optional[pd.DataFrame]]],
+    maximum_age_in_seconds: Optional[float] = None,
+) -> SessionFixture:
+    """
+    Returns the session's fixture of a page, loading it only when it comes from another source or is older than the
+    maximum age.
+
+    Parameters:
+        page_key (str): Identifies the page, which keeps its own fixture.
+        source_key (Hashable): Identifies what the fixture is loaded from.
+        load (Callable[[], Tuple[PointsTableSimulator, Optional[pd.DataFrame]]]): Loads the fixture, returning the
+            simulator and the current points table, if the source provides one. Exceptions are raised as is.
+        maximum_age_in_seconds (float, optional): Age after which the fixture is loaded again. Without it, the fixture
+            is kept for as long as the source does not change.
+
+    Returns:
+        SessionFixture: The session's fixture.
+    """
+    session_fixtures: Dict[str, SessionFixture] = st.session_state.setdefault(SESSION_FIXTURES_KEY, {})
+    session_fixture = session_fixtures.get(page_key)
+    now = time.monotonic()
+    if session_fixture is not None and session_fixture.source_key == source_key and (
+        maximum_age_in_seconds is None or now - session_fixture.loaded_at < maximum_age_in_seconds
+    ):
+        return session_fixture
+
+    points_table_simulator, current_points_table = load()
+    new_session_fixture = SessionFixture(source_key, points_table_simulator, now, current_points_table)
+    if session_fixture is not None and session_fixture.source_key == source_key and (
+        session_fixture.points_table_simulator is points_table_simulator
+        or session_fixture.fixture_state_hash == new_session_fixture.fixture_state_hash
+    ):
+        session_fixture.points_table_simulator, session_fixture.loaded_at = points_table_simulator, now
+        if current_points_table is not None:
+            session_fixture.current_points_table = current_points_table
+        return session_fixture
+    session_fixtures[page_key] = new_session_fixture
+    return new_session_fixture
+
+
+def get_session_fixture(points_table_simulator: PointsTableSimulator) -> SessionFixture:
+    """
+    Returns the session's fixture of a simulator, so that the views share its search and fixture state hash. A simulator
+    that was not loaded through `load_session_fixture` is kept as the fixture of no page in particular, and matched by
+    fixture state on the next rerun.
+    """
+    for session_fixture in st.session_state.get(SESSION_FIXTURES_KEY, {}).values():
+        if session_fixture.points_table_simulator is points_table_simulator:
+            return session_fixture
+    return load_session_fixture("", None, lambda: (points_table_simulator, None), maximum_age_in_seconds=0)
+
+
+def submit_request(session_fixture: SessionFixture, form_key: str, inputs: Dict) -> None:
+    session_fixture.submitted_requests[form_key] = inputs
+
+
+def get_submitted_request(session_fixture: SessionFixture, form_key: str) -> Optional[Dict]:
+    return session_fixture.submitted_requests.get(form_key)
+
+
+def iterate_session_scenarios(
+    session_fixture: SessionFixture, request_key: Hashable, compute_scenarios: Callable[[], Iterable[QualificationScenario]]
+) -> Tuple[Iterator[QualificationScenario], bool]:
+    """
+    Returns the session's scenarios for a request, or the computed ones, which the session keeps once they are all
+    consumed.
+
+    Parameters:
+        session_fixture (SessionFixture): The session's fixture.
+        request_key (Hashable): Identifies the request within the fixture state.
+        compute_scenarios (Callable[[], Iterable[QualificationScenario]]): Computes the scenarios on a miss.
+
+    Returns:
+        Tuple[Iterator[QualificationScenario], bool]: The scenarios, and whether they came from the session.
+    """
+    if session_fixture.scenarios_request_key == request_key:
+        return _replay_scenarios(session_fixture.scenarios, session_fixture.scenarios_error), True
+    return _remember_scenarios(session_fixture, request_key, compute_scenarios()), False
+
+
+def _replay_scenarios(
+    scenarios: List[QualificationScenario], scenarios_error: Optional[NoQualifyingScenariosError]
+) -> Iterator[QualificationScenario]:
+    yield from scenarios
+    if scenarios_error is not None:
+        raise scenarios_error
+
+
+def _remember_scenarios(
+    session_fixture: SessionFixture, request_key: Hashable, qualification_scenarios: Iterable[QualificationScenario]
+) -> Iterator[QualificationScenario]:
+    scenarios: List[QualificationScenario] = []
+    try:
+        for qualification_scenario in qualification_scenarios:
+            scenarios.append(qualification_scenario)
+            yield qualification_scenario
+    except NoQualifyingScenariosError as no_qualifying_scenarios_error:
+        session_fixture.scenarios_request_key, session_fixture.scenarios = request_key, scenarios
+        session_fixture.scenarios_error = no_qualifying_scenarios_error
+        raise
+    session_fixture.scenarios_request_key, session_fixture.scenarios = request_key, scenarios
+    session_fixture.scenarios_error = None
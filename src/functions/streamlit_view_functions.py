@@ -1,12 +1,68 @@
+import itertools
 import time
-from typing import Dict, List
+from dataclasses import dataclass
+from typing import (
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+    cast
+)
+import numpy as np
 import pandas as pd
 import streamlit as st
+from pandas.io.formats.style import Styler
 from points_table_simulator import PointsTableSimulator
 from points_table_simulator.exceptions import (
     NoQualifyingScenariosError,
     TournamentCompletionBelowCutoffError
 )
+from src.functions.incremental_scenario_search import (
+    iterate_qualifying_outcomes_incrementally
+)
+from src.functions.instrumentation import RequestTrace, span, traced
+from src.functions.net_run_rate import (
+    NetRunRateRanking,
+    NetRunRateSearchBudgetExhaustedError
+)
+from src.functions.parallel_scenario_search import should_search_in_parallel
+from src.functions.qualification_conditions import (
+    MatchCondition,
+    QualificationConditions,
+    iterate_diverse_qualifying_outcomes
+)
+from src.functions.qualification_counting import MatchResult
+from src.functions.qualification_matrix import (
+    QualificationMatrixSnapshot,
+    get_qualification_verdict_and_minimum_number_of_wins_needed,
+    read_qualification_matrix_snapshot
+)
+from src.functions.qualification_probability import (
+    estimate_position_probabilities
+)
+from src.functions.qualification_scenario_search import (
+    QualificationScenarioSearch
+)
+from src.functions.qualification_verdict import QualificationVerdict
+from src.functions.scenario_result_cache import scenario_result_cache
+from src.functions.session_state import (
+    SessionFixture,
+    get_session_fixture,
+    get_submitted_request,
+    iterate_session_scenarios,
+    submit_request
+)
+
+PROBABILITY_MODE = "Qualification probability"
+SCENARIOS_MODE = "Qualification scenarios"
+SCENARIO_HIGHLIGHT_STYLE = "background-color: CornflowerBlue;"
+SCENARIO_POINTS_TABLE_COLUMNS = ("team", "matches_played", "matches_won", "matches_lost", "points")
+NET_RUN_RATE_POINTS_TABLE_COLUMNS = SCENARIO_POINTS_TABLE_COLUMNS + ("net_run_rate",)
+QUALIFICATION_SCENARIOS_FORM_KEY = "select_team_to_generate_qualification_scenarios"
+MAXIMUM_NUMBER_OF_COUNTING_GROUPS = 500_000
 
 
 def _display_non_winner_foot_notes(team_name):
@@ -22,6 +78,7 @@ def _display_non_winner_foot_notes(team_name):
 
 
 
+@traced("render")
 def _display_given_fixture_and_current_points_table(
     current_points_table: pd.DataFrame, remaining_fixture: pd.DataFrame, expanded: bool = False
 ):
@@ -41,90 +98,524 @@ def _display_given_fixture_and_current_points_table(
         points_table_df_column.dataframe(current_points_table, hide_index=True)
 
 
-def _display_qualification_scenarios(
+@traced("verdicts")
+def _display_qualification_verdicts(points_table_simulator: PointsTableSimulator, top_x_position_in_the_table: int = 4):
+    """Display whether every team has clinched, is eliminated from, or is still in contention for the top positions."""
+    qualification_scenario_search = get_session_fixture(points_table_simulator).qualification_scenario_search
+    current_points = dict(zip(qualification_scenario_search.teams, qualification_scenario_search.current_points))
+    verdicts_df = pd.DataFrame([
+        {
+            "Team": team,
+            "Points": current_points[team],
+            f"Top {top_x_position_in_the_table} Verdict": qualification_scenario_search.get_qualification_verdict(
+                team, top_x_position_in_the_table
+            ).value,
+        }
+        for team in sorted(current_points, key=lambda team: -current_points[team])
+    ])
+    with st.expander(f"**Click here to check which teams can still finish in the top {top_x_position_in_the_table}**"):
+        st.dataframe(verdicts_df, hide_index=True)
+
+
+@dataclass(frozen=True)
+class _ScenarioTableLayout:
+    """Display names of the scenario tables' columns, worked out once per request instead of once per scenario."""
+
+    schedule_column_names: List[str]
+    points_table_columns: List[str]
+    points_table_column_names: List[str]
+    home_team_column_name: str
+    away_team_column_name: str
+
+
+def _get_scenario_table_layout(
+    schedule: pd.DataFrame,
+    away_team_column_name: str = "team_2",
+    home_team_column_name: str = "team_1",
+    points_table_columns: Iterable[str] = SCENARIO_POINTS_TABLE_COLUMNS,
+) -> _ScenarioTableLayout:
+    return _ScenarioTableLayout(
+        schedule_column_names=[column.replace("_", " ").title() for column in schedule.columns],
+        points_table_columns=list(points_table_columns),
+        points_table_column_names=[column.replace("matches_", "").replace("_", " ").title() for column in points_table_columns],
+        home_team_column_name=home_team_column_name,
+        away_team_column_name=away_team_column_name,
+    )
+
+
+def _highlight_rows(dataframe: pd.DataFrame, is_highlighted: np.ndarray) -> Styler:
+    """Style the given rows with a single vectorized pass, instead of calling a function per row."""
+    styles = np.where(np.broadcast_to(is_highlighted[:, np.newaxis], dataframe.shape), SCENARIO_HIGHLIGHT_STYLE, "")
+    return dataframe.style.apply(lambda _: styles, axis=None)
+
+
+def _display_qualification_scenarios(     # pylint: disable = too-many-arguments, too-many-positional-arguments
     list_of_points_tables: List[pd.DataFrame],
     list_of_qualification_scenarios: List[pd.DataFrame],
     selected_team: str,
     away_team_column_name: str = "team_2",
-    home_team_column_name: str = "team_1"
+    home_team_column_name: str = "team_1",
+    load_tables_on_demand: bool = False,
 ):
     """Display the qualification scenarios."""
+    if not list_of_qualification_scenarios:
+        return
+    scenario_table_layout = _get_scenario_table_layout(list_of_qualification_scenarios[0], away_team_column_name, home_team_column_name)
     for scenario_no, (points_table, schedule) in enumerate(zip(list_of_points_tables, list_of_qualification_scenarios)):
-        with st.expander(f"**Click here to expand qualification scenario {scenario_no + 1}**"):
-            st.write("")
-            st.markdown(f"<h3 style='color: #1e90ff;'>Qualification Scenario {scenario_no + 1}:</h3>", unsafe_allow_html=True)
-            st.write("")
-            schedule_renamed_columns = {column:column.replace("_", " ").title() for column in schedule.columns}
-            schedule = schedule.rename(schedule_renamed_columns, axis=1)
-            qualification_fixture_column, qualification_points_table_column = st.columns(2, gap="small")
-            qualification_fixture_column.markdown(
-                "<p style='font-weight: bold; color: #4CAF50;'>Remaining Fixture Favourable Outcome</p>", unsafe_allow_html=True
+        _display_qualification_scenario(scenario_no, points_table, schedule, selected_team, scenario_table_layout, load_tables_on_demand)
+
+
+def _display_qualification_scenario(     # pylint: disable = too-many-arguments, too-many-positional-arguments
+    scenario_no: int,
+    points_table: pd.DataFrame,
+    schedule: pd.DataFrame,
+    selected_team: str,
+    scenario_table_layout: _ScenarioTableLayout,
+    load_tables_on_demand: bool = False,
+):
+    """
+    Display one qualification scenario in its own expander, so that scenarios can be appended as they are found. When
+    loading the tables on demand, they are only built once the toggle inside the expander is switched on.
+    """
+    with st.expander(f"**Click here to expand qualification scenario {scenario_no + 1}**"):
+        st.write("")
+        st.markdown(f"<h3 style='color: #1e90ff;'>Qualification Scenario {scenario_no + 1}:</h3>", unsafe_allow_html=True)
+        st.write("")
+        if load_tables_on_demand and not st.toggle("Show this scenario", key=f"show_qualification_scenario_{scenario_no}"):
+            return
+        is_selected_team_match = (
+            (schedule[scenario_table_layout.home_team_column_name] == selected_team)
+            | (schedule[scenario_table_layout.away_team_column_name] == selected_team)
+        ).to_numpy()
+        schedule_to_display = schedule.set_axis(scenario_table_layout.schedule_column_names, axis=1)
+        qualification_fixture_column, qualification_points_table_column = st.columns(2, gap="small")
+        qualification_fixture_column.markdown(
+            "<p style='font-weight: bold; color: #4CAF50;'>Remaining Fixture Favourable Outcome</p>", unsafe_allow_html=True
+        )
+        qualification_fixture_column.dataframe(_highlight_rows(schedule_to_display, is_selected_team_match), hide_index=True)
+        qualification_points_table_column.markdown("<p style='font-weight: bold; color: #4CAF50;'>Points Table</p>", unsafe_allow_html=True)
+        points_table_to_display = points_table.reindex(columns=scenario_table_layout.points_table_columns).set_axis(
+            scenario_table_layout.points_table_column_names, axis=1
+        )
+        qualification_points_table_column.dataframe(
+            _highlight_rows(points_table_to_display, (points_table["team"] == selected_team).to_numpy()), hide_index=True
+        )
+        st.write("")
+        if "net_run_rate_verdict" in points_table.columns:
+            st.caption(
+                f"{selected_team}: {points_table.loc[points_table['team'] == selected_team, 'net_run_rate_verdict'].iloc[0]}. "
+                "Net run rates are given as the range the remaining winning margins can take them to."
             )
-            qualification_fixture_column.dataframe(
-                schedule.style.apply(
-                    lambda row: [
-                        'background-color: CornflowerBlue;' if 
-                        selected_team in (row[away_team_column_name.replace('_', ' ').title()], row[home_team_column_name.replace('_', ' ').title()])
-                        else '' for _ in row
-                    ],
-                    axis=1
-                ),
-                hide_index=True
+        _display_non_winner_foot_notes(selected_team)
+
+
+def _select_simulation_mode() -> Optional[str]:
+    return st.radio(
+        "What would you like to find out?",
+        options=(SCENARIOS_MODE, PROBABILITY_MODE),
+        horizontal=True,
+        help="Scenarios list the remaining match outcomes that qualify a team, probabilities sample millions of outcomes to \
+            estimate every team's chance of finishing at every position",
+    )
+
+
+def _display_qualification_probabilities(points_table_simulator: PointsTableSimulator, home_team_win_probability_column_name: str = ""):
+    """
+    Display every team's Monte Carlo probability of finishing at every position in the points table.
+
+    The teams and their points come from the same model as the remaining matches, so that every team of the fixture is
+    known by the same name on both sides.
+    """
+    qualification_scenario_search = get_session_fixture(points_table_simulator).qualification_scenario_search
+    current_points = dict(zip(qualification_scenario_search.teams, qualification_scenario_search.current_points))
+    home_team_win_probabilities = None
+    if home_team_win_probability_column_name:
+        if home_team_win_probability_column_name not in qualification_scenario_search.remaining_schedule_df.columns:
+            st.error(f"Error: Given column '{home_team_win_probability_column_name}' is not found in the given CSV", icon="⚠️")
+            return
+        home_team_win_probabilities = np.nan_to_num(np.asarray(pd.to_numeric(
+            qualification_scenario_search.remaining_schedule_df[home_team_win_probability_column_name], errors="coerce"
+        ), dtype=np.float64), nan=0.5)
+
+    with st.form(key="qualification_probability_inputs"):
+        input_column_1, input_column_2, input_column_3 = st.columns(3, gap="small")
+        top_x_position_in_the_table = input_column_1.number_input(
+            "Qualification position in the points table", max_value=len(current_points), min_value=1, value=min(4, len(current_points))
+        )
+        maximum_number_of_samples = cast(int, input_column_2.select_slider(
+            "Maximum number of simulated outcomes",
+            options=(100_000, 500_000, 1_000_000, 2_000_000, 5_000_000),
+            value=2_000_000,
+            help="Sampling stops earlier once every probability is known within ±0.1%",
+        ))
+        seed = input_column_3.number_input("Random seed", min_value=0, value=0, help="The same seed reproduces the same estimate")
+        is_form_submitted = st.form_submit_button("Submit")
+
+    if not is_form_submitted:
+        return
+    start_time = time.time()
+    try:
+        with st.spinner("Simulating the remaining matches..."), span("simulate_probabilities"):
+            position_probabilities = estimate_position_probabilities(
+                current_points,
+                [(qualification_scenario_search.teams[home_team], qualification_scenario_search.teams[away_team])
+                 for home_team, away_team in qualification_scenario_search.remaining_matches],
+                qualification_scenario_search.points_for_a_win,
+                home_team_win_probabilities=home_team_win_probabilities,
+                seed=int(seed),
+                maximum_number_of_samples=int(maximum_number_of_samples),
             )
-            qualification_points_table_column.markdown("<p style='font-weight: bold; color: #4CAF50;'>Points Table</p>", unsafe_allow_html=True)
-            rename_dict = {column: column.replace("matches_", "").title() for column in points_table.columns}
-            points_table = points_table.rename(rename_dict, axis=1)
-            points_table = points_table[["Team", "Played", "Won", "Lost", "Points"]]
-            qualification_points_table_column.dataframe(
-                points_table.style.apply(
-                    lambda row: ['background-color: CornflowerBlue;' if row["Team"] == selected_team else '' for _ in row],
-                    axis=1
+    except ValueError as value_error:
+        st.error(f"Error: {value_error}", icon="⚠️")
+        return
+    end_time = time.time()
+
+    top_positions_df = position_probabilities.top_positions_probabilities(int(top_x_position_in_the_table))
+    st.markdown(
+        f"<p>Chance of every team finishing in the <b>top {top_x_position_in_the_table}</b>, with 95% confidence intervals</p>",
+        unsafe_allow_html=True
+    )
+    st.dataframe(
+        pd.DataFrame({
+            "Team": top_positions_df["team"],
+            f"Top {top_x_position_in_the_table} Probability": [f"{probability * 100:.2f}%" for probability in top_positions_df["probability"]],
+            "95% Confidence Interval": [
+                f"{lower_bound * 100:.2f}% - {upper_bound * 100:.2f}%"
+                for lower_bound, upper_bound in zip(top_positions_df["lower_bound"], top_positions_df["upper_bound"])
+            ],
+        }),
+        hide_index=True
+    )
+    with st.expander("**Click here to expand the probability of finishing at every position**"):
+        position_probabilities_df = (position_probabilities.to_dataframe() * 100).round(2)
+        position_probabilities_df.columns = [f"Position {position} (%)" for position in position_probabilities_df.columns]
+        st.dataframe(position_probabilities_df.loc[top_positions_df["team"]])
+    st.write(
+        f"Simulated {position_probabilities.number_of_samples:,} outcomes of the remaining matches in {round(end_time - start_time, 2)} seconds"
+    )
+
+
+def _iterate_qualification_scenarios(     # pylint: disable = too-many-arguments, too-many-positional-arguments
+    qualification_scenario_search: QualificationScenarioSearch,
+    inputs_for_generating_qualification_scenarios: Dict,
+    fixture_source: Optional[str] = None,
+    qualification_matrix_snapshot: Optional[QualificationMatrixSnapshot] = None,
+    net_run_rate_ranking: Optional[NetRunRateRanking] = None,
+    qualification_conditions: Optional[QualificationConditions] = None,
+) -> Iterator[Tuple[pd.DataFrame, pd.DataFrame]]:
+    """
+    Yield the points table and remaining match outcome of each qualification scenario as soon as it is available.
+
+    Scenarios come from a fresh precomputed snapshot when it holds enough of them. Otherwise they are built one by one
+    from the `qualification_conditions`, each as unlike the previous ones as the matches that matter allow, so that a
+    few scenarios cover what many near-identical ones would. Scenarios found for the previous fixture state of
+    `fixture_source` are carried over when they agree with the new results, and come first.
+
+    With a `net_run_rate_ranking`, points ties are broken on net run rate instead: the search yields its outcomes one by
+    one, those the team misses out on are dropped, and the points tables carry the net run rate ranges and the verdict.
+    """
+    team_name, top_x_position_in_the_table, desired_number_of_scenarios = (
+        inputs_for_generating_qualification_scenarios["selected_team_to_generate_qualification_scenarios"],
+        inputs_for_generating_qualification_scenarios["expected_position_in_the_points_table"],
+        inputs_for_generating_qualification_scenarios["number_of_qualification_scenarios"],
+    )
+    qualification_scenario_search.validate_the_request(team_name, top_x_position_in_the_table, desired_number_of_scenarios)
+    if net_run_rate_ranking is not None:
+        yield from _iterate_qualification_scenarios_on_net_run_rate(
+            qualification_scenario_search, net_run_rate_ranking, team_name, top_x_position_in_the_table, desired_number_of_scenarios
+        )
+        return
+
+    def iterate_outcomes(_: int) -> Iterable[Tuple[int, ...]]:
+        return iterate_diverse_qualifying_outcomes(
+            qualification_scenario_search, team_name, top_x_position_in_the_table, qualification_conditions
+        )
+
+    qualifying_outcomes: Optional[Iterable[Tuple[int, ...]]] = None
+    if qualification_matrix_snapshot is not None:
+        qualifying_outcomes = qualification_matrix_snapshot.get_qualifying_outcomes(
+            team_name, top_x_position_in_the_table, desired_number_of_scenarios
+        )
+    if qualifying_outcomes is None:
+        qualifying_outcomes = iterate_qualifying_outcomes_incrementally(
+            qualification_scenario_search, team_name, top_x_position_in_the_table, desired_number_of_scenarios, iterate_outcomes, fixture_source
+        )
+    for winners in qualifying_outcomes:
+        yield qualification_scenario_search.build_points_table(winners, team_name), qualification_scenario_search.build_remaining_match_outcome(winners)
+
+
+def _iterate_qualification_scenarios_on_net_run_rate(     # pylint: disable = too-many-arguments, too-many-positional-arguments
+    qualification_scenario_search: QualificationScenarioSearch,
+    net_run_rate_ranking: NetRunRateRanking,
+    team_name: str,
+    top_x_position_in_the_table: int,
+    desired_number_of_scenarios: int,
+) -> Iterator[Tuple[pd.DataFrame, pd.DataFrame]]:
+    """
+    Yield the scenarios in which the team still qualifies once points ties are broken on net run rate, within the time
+    budget of `NetRunRateRanking.iterate_qualifying_outcomes`.
+
+    Heavy searches, in which most qualifying outcomes can be dropped on net run rate, are spread over all CPUs, with
+    the number of scenarios found shown while the workers run.
+    """
+    if should_search_in_parallel(qualification_scenario_search):
+        progress_placeholder = st.empty()
+
+        def report_progress(number_of_scenarios_found: int) -> None:
+            progress_placeholder.caption(f"Found {number_of_scenarios_found} of {desired_number_of_scenarios} qualification scenarios...")
+
+        qualifying_outcomes = net_run_rate_ranking.iterate_qualifying_outcomes_in_parallel(
+            qualification_scenario_search, team_name, top_x_position_in_the_table, desired_number_of_scenarios, on_progress=report_progress
+        )
+    else:
+        progress_placeholder = None
+        qualifying_outcomes = net_run_rate_ranking.iterate_qualifying_outcomes(qualification_scenario_search, team_name, top_x_position_in_the_table)
+    try:
+        for winners, assessment in itertools.islice(qualifying_outcomes, desired_number_of_scenarios):
+            if progress_placeholder is not None:
+                progress_placeholder.empty()
+            yield (
+                net_run_rate_ranking.annotate_points_table(
+                    qualification_scenario_search.build_points_table(winners, team_name), winners, assessment, team_name
                 ),
-                hide_index=True
+                qualification_scenario_search.build_remaining_match_outcome(winners),
             )
-            time.sleep(1)
-            st.write("")
-            _display_non_winner_foot_notes(selected_team)
+    finally:
+        if progress_placeholder is not None:
+            progress_placeholder.empty()
 
 
-def _generate_qualification_scenarios(points_table_simulator: PointsTableSimulator):
-    _session_state = {
-        "generate_qualification_scenarios_inputs_submitted" : False
-    }
+def _get_fresh_qualification_matrix_snapshot(
+    qualification_matrix_snapshot_path: Optional[str], qualification_scenario_search: QualificationScenarioSearch
+) -> Optional[QualificationMatrixSnapshot]:
+    """Return the precomputed snapshot, unless there is none or it was computed for another fixture state."""
+    if qualification_matrix_snapshot_path is None:
+        return None
+    qualification_matrix_snapshot = read_qualification_matrix_snapshot(qualification_matrix_snapshot_path)
+    if qualification_matrix_snapshot is None or not qualification_matrix_snapshot.is_fresh_for(qualification_scenario_search):
+        return None
+    return qualification_matrix_snapshot
+
+
+def _display_minimum_number_of_wins_needed(team_name: str, top_x_position_in_the_table: int, minimum_number_of_wins_needed: Optional[int]):
+    if minimum_number_of_wins_needed is None:
+        return
+    if minimum_number_of_wins_needed == 0:
+        st.info(f"{team_name} can still finish in the top {top_x_position_in_the_table} without winning another match", icon="ℹ️")
+    else:
+        st.info(
+            f"{team_name} has to win at least {minimum_number_of_wins_needed} of its remaining matches "
+            f"to keep a top {top_x_position_in_the_table} finish possible",
+            icon="ℹ️"
+        )
+
+
+def _display_qualification_conditions(qualification_scenario_search: QualificationScenarioSearch, qualification_conditions: QualificationConditions):
+    """Display which matches the team must win, which results it needs from its rivals and which matches do not matter."""
+    teams = qualification_scenario_search.teams
+    match_conditions = qualification_conditions.match_conditions
+    st.markdown(
+        f"<p>What <b>{qualification_conditions.team_name}</b> needs from the {len(match_conditions)} remaining matches, with points "
+        f"ties going its way: matches it must win: <b>{match_conditions.count(MatchCondition.MUST_WIN)}</b>, results needed from "
+        f"its rivals' matches: <b>{match_conditions.count(MatchCondition.REQUIRED_RESULT)}</b>, matches that do not matter: "
+        f"<b>{match_conditions.count(MatchCondition.DOES_NOT_MATTER)}</b>. The scenarios below differ from each other in as many "
+        "of the other matches as possible.</p>",
+        unsafe_allow_html=True,
+    )
+    condition_order = list(MatchCondition)
+    match_indices = sorted(range(len(match_conditions)), key=lambda match_index: condition_order.index(match_conditions[match_index]))
+    with st.expander(f"**Click here to see what every remaining match means for {qualification_conditions.team_name}**"):
+        st.dataframe(
+            pd.DataFrame({
+                "Match": [
+                    " vs ".join(teams[team] for team in qualification_scenario_search.remaining_matches[match_index]) for match_index in match_indices
+                ],
+                "Condition": [match_conditions[match_index].value for match_index in match_indices],
+                "Needed Winner": [
+                    teams[qualification_conditions.required_winners[match_index]] if match_index in qualification_conditions.required_winners else ""
+                    for match_index in match_indices
+                ],
+            }),
+            hide_index=True,
+        )
+
+
+def _display_qualifying_outcome_count(
+    session_fixture: SessionFixture, team_name: str, top_x_position_in_the_table: int, possible_results: Sequence[MatchResult]
+):
+    """Display the exact share of the outcomes of the remaining matches in which the team finishes within the top positions."""
+    if not possible_results:
+        return
     try:
-        inputs_for_generating_qualification_scenarios = _get_inputs_to_generate_qualification_scenarios(points_table_simulator)
-        if inputs_for_generating_qualification_scenarios["generate_qualification_scenarios_inputs_submitted"]:
-            _session_state["generate_qualification_scenarios_inputs_submitted"] = True
-
-        if _session_state["generate_qualification_scenarios_inputs_submitted"]:
-            list_of_points_tables = []
-            list_of_qualification_scenarios = []
-            start_time = time.time()
-            with st.balloons():
-                (
-                    list_of_points_tables,
-                    list_of_qualification_scenarios
-                ) = points_table_simulator.simulate_the_qualification_scenarios(
-                    inputs_for_generating_qualification_scenarios["selected_team_to_generate_qualification_scenarios"],
-                    inputs_for_generating_qualification_scenarios["expected_position_in_the_points_table"],
-                    inputs_for_generating_qualification_scenarios["number_of_qualification_scenarios"]
-                )
-            st.markdown(
-                f"<p>Please find below the various qualification scenarios for <b>\
-                    {inputs_for_generating_qualification_scenarios['selected_team_to_generate_qualification_scenarios']}</b>\
-                        to be placed within <b>top {inputs_for_generating_qualification_scenarios['expected_position_in_the_points_table']}\
-                            position</b> in the points table </p><hr>",
-                unsafe_allow_html=True
+        with st.spinner("Counting the outcomes of the remaining matches..."):
+            qualifying_outcome_count = session_fixture.get_qualifying_outcome_count(
+                team_name, top_x_position_in_the_table, tuple(possible_results), MAXIMUM_NUMBER_OF_COUNTING_GROUPS
             )
-            if list_of_points_tables:
-                end_time = time.time()
-                _display_qualification_scenarios(
-                    list_of_points_tables,
-                    list_of_qualification_scenarios,
-                    inputs_for_generating_qualification_scenarios["selected_team_to_generate_qualification_scenarios"],
+    except ValueError:
+        st.info("The remaining matches can end in too many ways to count the outcomes in which the team qualifies", icon="ℹ️")
+        return
+    fraction = qualifying_outcome_count.fraction
+    share = "less than 0.1%" if 0 < fraction < 0.001 else f"{fraction:.1%}"
+    st.info(
+        f"{team_name} finishes in the top {top_x_position_in_the_table} in {share} of all outcomes of the remaining matches, "
+        f"each ending in a {' or a '.join(result.value.lower() for result in qualifying_outcome_count.possible_results)}, "
+        "with points ties going its way",
+        icon="ℹ️"
+    )
+
+
+def _display_qualification_scenarios_as_they_are_found(
+    qualification_scenarios: Iterator[Tuple[pd.DataFrame, pd.DataFrame]],
+    points_table_simulator: PointsTableSimulator,
+    inputs_for_generating_qualification_scenarios: Dict,
+    is_served_from_cache: bool = False,
+):
+    """
+    Append an expander for each scenario the moment the search yields it, then report the time taken to find the first
+    scenario and the time spent searching for all of them, rendering left out.
+
+    Raises:
+        NoQualifyingScenariosError: If the search yields no scenario.
+    """
+    team_name, top_x_position_in_the_table = (
+        inputs_for_generating_qualification_scenarios["selected_team_to_generate_qualification_scenarios"],
+        inputs_for_generating_qualification_scenarios["expected_position_in_the_points_table"],
+    )
+    scenario_table_layout = None
+    start_time = time.time()
+    time_to_first_scenario = 0.0
+    search_time = 0.0
+    number_of_scenarios = 0
+    with st.spinner("Searching for the qualification scenarios..."):
+        while True:
+            search_start_time = time.time()
+            with span("search"):
+                qualification_scenario = next(qualification_scenarios, None)
+            search_time += time.time() - search_start_time
+            if qualification_scenario is None:
+                break
+            if scenario_table_layout is None:
+                time_to_first_scenario = time.time() - start_time
+                scenario_table_layout = _get_scenario_table_layout(
+                    qualification_scenario[1],
+                    points_table_simulator.tournament_schedule_away_team_column_name,
+                    points_table_simulator.tournament_schedule_home_team_column_name,
+                    NET_RUN_RATE_POINTS_TABLE_COLUMNS
+                    if "net_run_rate" in qualification_scenario[0].columns else SCENARIO_POINTS_TABLE_COLUMNS,
+                )
+                st.markdown(
+                    f"<p>Please find below the various qualification scenarios for <b>{team_name}</b> to be placed within "
+                    f"<b>top {top_x_position_in_the_table} position</b> in the points table </p><hr>",
+                    unsafe_allow_html=True
+                )
+            with span("render"):
+                _display_qualification_scenario(
+                    number_of_scenarios,
+                    *qualification_scenario,
+                    team_name,
+                    scenario_table_layout,
+                    inputs_for_generating_qualification_scenarios["load_scenario_tables_on_demand"],
                 )
-                st.write(f"Time taken to generate the qualification scenarios: {round(end_time - start_time, 2)} seconds")
-                list_of_points_tables = []
+            number_of_scenarios += 1
+    if scenario_table_layout is None:
+        raise NoQualifyingScenariosError(top_x_position_in_the_table, team_name)
+    st.write(
+        f"Time taken to find the first qualification scenario: {round(time_to_first_scenario, 2)} seconds, "
+        f"and all {number_of_scenarios} of them: {round(search_time, 2)} seconds"
+        + (" (served from cache)" if is_served_from_cache else "")
+    )
+
+
+def _generate_qualification_scenarios(     # pylint: disable = too-many-locals
+    points_table_simulator: PointsTableSimulator,
+    fixture_source: Optional[str] = None,
+    qualification_matrix_snapshot_path: Optional[str] = None,
+    net_run_rates: Optional[Dict[str, float]] = None,
+    counted_results: Optional[Sequence[MatchResult]] = None,
+):
+    """
+    Generate and display the qualification scenarios requested in the form. Answers come from the precomputed snapshot
+    at `qualification_matrix_snapshot_path` while it matches the fixture, and from a live search otherwise. Results are
+    memoized across sessions by fixture state, and `fixture_source` names where the fixture comes from so that a new
+    fixture drops its old results. Given the teams' `net_run_rates`, the form offers to break points ties on them. Given
+    the `counted_results` a remaining match may end in, the share of the outcomes in which the team qualifies is counted.
+    """
+    try:
+        inputs_for_generating_qualification_scenarios = _get_inputs_to_generate_qualification_scenarios(
+            points_table_simulator, is_net_run_rate_available=net_run_rates is not None
+        )
+        is_form_submitted = inputs_for_generating_qualification_scenarios["generate_qualification_scenarios_inputs_submitted"]
+        session_fixture = get_session_fixture(points_table_simulator)
+        if is_form_submitted:
+            submit_request(session_fixture, QUALIFICATION_SCENARIOS_FORM_KEY, inputs_for_generating_qualification_scenarios)
+        inputs_for_generating_qualification_scenarios = get_submitted_request(session_fixture, QUALIFICATION_SCENARIOS_FORM_KEY)
+        if inputs_for_generating_qualification_scenarios is None:
+            return
+        qualification_scenario_search = session_fixture.qualification_scenario_search
+        fixture_state_hash = session_fixture.fixture_state_hash
+        net_run_rate_ranking = None
+        if net_run_rates is not None and inputs_for_generating_qualification_scenarios.get("break_ties_on_net_run_rate"):
+            # The cached scenarios of this mode depend on the net run rates as well, and are kept apart from the others
+            net_run_rate_ranking = NetRunRateRanking(session_fixture.tournament_model, net_run_rates)
+            fixture_state_hash = f"{fixture_state_hash}:net_run_rate:{net_run_rate_ranking.get_state_digest()}"
+            fixture_source = None if fixture_source is None else f"{fixture_source}:net_run_rate"
+            qualification_matrix_snapshot_path = None
+        qualification_matrix_snapshot = _get_fresh_qualification_matrix_snapshot(
+            qualification_matrix_snapshot_path, qualification_scenario_search
+        )
+        team_name, top_x_position_in_the_table = (
+            inputs_for_generating_qualification_scenarios["selected_team_to_generate_qualification_scenarios"],
+            int(inputs_for_generating_qualification_scenarios["expected_position_in_the_points_table"]),
+        )
+        verdict, minimum_number_of_wins_needed = get_qualification_verdict_and_minimum_number_of_wins_needed(
+            qualification_scenario_search, team_name, top_x_position_in_the_table, qualification_matrix_snapshot
+        )
+        if verdict == QualificationVerdict.CLINCHED and net_run_rate_ranking is None:
+            st.success(
+                f"{inputs_for_generating_qualification_scenarios['selected_team_to_generate_qualification_scenarios']} has already \
+                    clinched a place in the top {inputs_for_generating_qualification_scenarios['expected_position_in_the_points_table']}, \
+                        whatever the results of the remaining matches",
+                icon="✅"
+            )
+            return
+        _display_minimum_number_of_wins_needed(team_name, top_x_position_in_the_table, minimum_number_of_wins_needed)
+        qualification_conditions = None
+        if verdict == QualificationVerdict.IN_CONTENTION and net_run_rate_ranking is None:
+            qualification_conditions = session_fixture.get_qualification_conditions(
+                team_name, top_x_position_in_the_table, minimum_number_of_wins_needed
+            )
+            _display_qualification_conditions(qualification_scenario_search, qualification_conditions)
+            if counted_results is not None:
+                _display_qualifying_outcome_count(session_fixture, team_name, top_x_position_in_the_table, counted_results)
+        desired_number_of_scenarios = int(inputs_for_generating_qualification_scenarios["number_of_qualification_scenarios"])
+        is_served_from_cache = scenario_result_cache.contains(
+            fixture_state_hash, team_name, top_x_position_in_the_table, desired_number_of_scenarios
+        )
+        qualification_scenarios, is_served_from_session = iterate_session_scenarios(
+            session_fixture,
+            (team_name, top_x_position_in_the_table, desired_number_of_scenarios, net_run_rate_ranking is not None),
+            lambda: scenario_result_cache.iterate_or_compute(
+                fixture_state_hash,
+                team_name,
+                top_x_position_in_the_table,
+                desired_number_of_scenarios,
+                lambda: _iterate_qualification_scenarios(
+                    qualification_scenario_search,
+                    inputs_for_generating_qualification_scenarios,
+                    fixture_source,
+                    qualification_matrix_snapshot,
+                    net_run_rate_ranking,
+                    qualification_conditions,
+                ),
+                fixture_source=fixture_source,
+            ),
+        )
+        if is_form_submitted:
+            st.balloons()
+        _display_qualification_scenarios_as_they_are_found(
+            qualification_scenarios, points_table_simulator, inputs_for_generating_qualification_scenarios,
+            is_served_from_cache or is_served_from_session
+        )
 
     except NoQualifyingScenariosError as no_qualifying_scenarios_error:
         st.error(
@@ -138,20 +629,28 @@ def _generate_qualification_scenarios(points_table_simulator: PointsTableSimulat
                 should atleast be {exception.cutoff_percentage}% completed to check for the qualification scenarios",
                 icon="⚠️"
         )
+    except NetRunRateSearchBudgetExhaustedError as budget_exhausted_error:
+        st.warning(
+            f"No{' more' if budget_exhausted_error.number_of_scenarios_found else ''} scenario found within the search budget of "
+            f"{budget_exhausted_error.budget_in_seconds:g} seconds in which '{budget_exhausted_error.team_name}' finishes in the top "
+            f"{budget_exhausted_error.top_x_position_in_the_table} once points ties are broken on net run rate",
+            icon="⏱️"
+        )
 
 
-def _get_inputs_to_generate_qualification_scenarios(points_table_simulator: PointsTableSimulator) -> Dict:
+def _get_inputs_to_generate_qualification_scenarios(points_table_simulator: PointsTableSimulator, is_net_run_rate_available: bool = False) -> Dict:
     """Get inputs to generate qualification scenarios."""
-    with st.form(key="select_team_to_generate_qualification_scenarios"):
+    tournament_model = get_session_fixture(points_table_simulator).tournament_model
+    with st.form(key=QUALIFICATION_SCENARIOS_FORM_KEY):
         selected_team = st.selectbox(
             label="Select Team to generate qualification scenarios",
-            options=points_table_simulator.available_teams_in_fixture,
+            options=tournament_model.teams,
             help="Select the team you want to generate the qualification scenarios",
         )
         input_column_1, input_column_2 = st.columns(2, gap="small")
         expected_position_in_the_points_table = input_column_1.number_input(
             "Your expected position in the points table",
-            max_value=len(points_table_simulator.current_points_table) + 1,
+            max_value=tournament_model.number_of_teams + 1,
             min_value=1,
             value=4,
         )
@@ -163,10 +662,47 @@ def _get_inputs_to_generate_qualification_scenarios(points_table_simulator: Poin
             help="Select the number of qualification scenarios you want to generate",
             key="number_of_qualification_scenarios"
         )
+        load_scenario_tables_on_demand = st.checkbox(
+            "Load each scenario only when it is opened",
+            help="Builds the tables of a scenario once you switch it on, which keeps the page light when asking for many scenarios",
+        )
+        break_ties_on_net_run_rate = is_net_run_rate_available and st.checkbox(
+            "Break points ties on net run rate",
+            help="Drops the scenarios in which the team misses out on net run rate, and tells whether it qualifies outright, \
+                on net run rate or needs a winning margin",
+        )
         is_form_submitted = st.form_submit_button("Submit")
     return {
         "selected_team_to_generate_qualification_scenarios": selected_team,
         "expected_position_in_the_points_table": expected_position_in_the_points_table,
         "number_of_qualification_scenarios": number_of_qualification_scenarios,
+        "load_scenario_tables_on_demand": load_scenario_tables_on_demand,
+        "break_ties_on_net_run_rate": bool(break_ties_on_net_run_rate),
         "generate_qualification_scenarios_inputs_submitted": bool(is_form_submitted)
     }
+
+
+def _display_request_trace(request_trace: RequestTrace):
+    """Display where the time of the page run went, its counters and its profile, for the `?debug` panel."""
+    with st.expander(f"**Debug: this run took {request_trace.duration * 1000:.1f} ms**"):
+        st.dataframe(
+            pd.DataFrame({
+                "Span": ["· " * request_span.depth + request_span.name for request_span in request_trace.spans],
+                "Start (ms)": [round(request_span.start * 1000, 2) for request_span in request_trace.spans],
+                "Duration (ms)": [round(request_span.duration * 1000, 2) for request_span in request_trace.spans],
+                "Self (ms)": [round(request_span.self_duration * 1000, 2) for request_span in request_trace.spans],
+            }),
+            hide_index=True,
+        )
+        span_summary_df = pd.DataFrame.from_dict(request_trace.summarize_spans(), orient="index")
+        st.dataframe(
+            pd.DataFrame({
+                "Count": span_summary_df["count"].astype(int),
+                "Total (ms)": (span_summary_df["total_seconds"] * 1000).round(2),
+                "Self (ms)": (span_summary_df["self_seconds"] * 1000).round(2),
+            })
+        )
+        if request_trace.counters:
+            st.dataframe(pd.Series(request_trace.counters, name="Count"))
+        if request_trace.profile is not None:
+            st.code(request_trace.profile, language=None)
@@ -0,0 +1,231 @@
+from typing import Dict, List, NamedTuple, Sequence
+import numpy as np
+import pandas as pd
+from points_table_simulator import PointsTableSimulator
+
+UNDECIDED_RESULTS = ("", "Live")
+
+UNDECIDED = -1
+DRAW = -2
+NO_RESULT = -3
+UNAWARDED = -4      # a result naming none of the teams, played without any points awarded
+
+TEAM_CODE_DTYPE = np.int16
+COUNT_DTYPE = np.int32
+
+
+class Match(NamedTuple):
+    """Home and away team code of a match. Being a named tuple, it has empty `__slots__` and no per-instance dict."""
+
+    home_team: int
+    away_team: int
+
+
+class Standings:
+    """
+    Fixed-width per-team counters of a points table, indexed by team code.
+
+    Attributes:
+        matches_played (np.ndarray): Completed matches of every team.
+        matches_won (np.ndarray): Wins of every team.
+        matches_drawn (np.ndarray): Draws of every team.
+        matches_with_no_result (np.ndarray): Matches of every team that ended without a result.
+        remaining_matches (np.ndarray): Matches every team has left to play.
+        points (np.ndarray): Points of every team.
+    """
+
+    __slots__ = ("matches_played", "matches_won", "matches_drawn", "matches_with_no_result", "remaining_matches", "points")
+
+    def __init__(     # pylint: disable = too-many-arguments, too-many-positional-arguments
+        self,
+        matches_played: np.ndarray,
+        matches_won: np.ndarray,
+        matches_drawn: np.ndarray,
+        matches_with_no_result: np.ndarray,
+        remaining_matches: np.ndarray,
+        points: np.ndarray,
+    ):
+        self.matches_played = matches_played
+        self.matches_won = matches_won
+        self.matches_drawn = matches_drawn
+        self.matches_with_no_result = matches_with_no_result
+        self.remaining_matches = remaining_matches
+        self.points = points
+
+    @property
+    def matches_lost(self) -> np.ndarray:
+        return self.matches_played - self.matches_won - self.matches_drawn - self.matches_with_no_result
+
+    def to_dataframe(self, teams: Sequence[str]) -> pd.DataFrame:
+        """
+        Converts the standings to a points table in the `PointsTableSimulator` layout, in team code order.
+
+        Parameters:
+            teams (Sequence[str]): Name of every team, indexed by team code.
+
+        Returns:
+            pd.DataFrame: The points table, left unsorted.
+        """
+        return pd.DataFrame({
+            "team": teams,
+            "matches_played": self.matches_played,
+            "matches_won": self.matches_won,
+            "matches_lost": self.matches_lost,
+            "matches_drawn": self.matches_drawn,
+            "matches_with_no_result": self.matches_with_no_result,
+            "remaining_matches": self.remaining_matches,
+            "points": self.points,
+        })
+
+
+class TournamentModel:     # pylint: disable = too-many-instance-attributes
+    """
+    Compact model of a tournament shared by the search engine and the views, built once from the schedule DataFrame.
+
+    Teams are interned to small integer codes in sorted name order, the fixture is held as parallel arrays of team codes
+    and result codes, and the standings as fixed-width arrays. Team names only come back at the boundaries, when a
+    points table or a remaining fixture is converted to a DataFrame for display.
+
+    Parameters:
+        teams (Sequence[str]): Name of every team, indexed by team code.
+        home_teams (np.ndarray): Home team code of every match, in schedule order.
+        away_teams (np.ndarray): Away team code of every match, in schedule order.
+        results (np.ndarray): Winning team code of every match, or one of `UNDECIDED`, `DRAW`, `NO_RESULT` and
+            `UNAWARDED`.
+        points_for_a_win (int): Points awarded for a win.
+        points_for_a_draw (int): Points awarded for a draw.
+        points_for_a_no_result (int): Points awarded for a match with no result.
+    """
+
+    __slots__ = (
+        "teams",
+        "team_index",
+        "home_teams",
+        "away_teams",
+        "results",
+        "points_for_a_win",
+        "points_for_a_draw",
+        "points_for_a_no_result",
+        "remaining_match_positions",
+        "standings",
+    )
+
+    def __init__(     # pylint: disable = too-many-arguments, too-many-positional-arguments
+        self,
+        teams: Sequence[str],
+        home_teams: np.ndarray,
+        away_teams: np.ndarray,
+        results: np.ndarray,
+        points_for_a_win: int,
+        points_for_a_draw: int = 1,
+        points_for_a_no_result: int = 1,
+    ):
+        self.teams: List[str] = list(teams)
+        self.team_index: Dict[str, int] = {team: index for index, team in enumerate(self.teams)}
+        self.home_teams = np.asarray(home_teams, dtype=TEAM_CODE_DTYPE)
+        self.away_teams = np.asarray(away_teams, dtype=TEAM_CODE_DTYPE)
+        self.results = np.asarray(results, dtype=TEAM_CODE_DTYPE)
+        self.points_for_a_win = points_for_a_win
+        self.points_for_a_draw = points_for_a_draw
+        self.points_for_a_no_result = points_for_a_no_result
+        self.remaining_match_positions: np.ndarray = np.flatnonzero(self.results == UNDECIDED)
+        self.standings = self._compute_standings()
+
+    @classmethod
+    def from_points_table_simulator(cls, points_table_simulator: PointsTableSimulator) -> "TournamentModel":
+        """
+        Builds the model from the schedule and points system of a simulator, with array operations only.
+
+        Parameters:
+            points_table_simulator (PointsTableSimulator): Simulator holding the tournament schedule and points system.
+
+        Returns:
+            TournamentModel: The model of the tournament.
+        """
+        schedule = points_table_simulator.tournament_schedule
+        teams = sorted(points_table_simulator.available_teams_in_fixture)
+        team_codes = pd.Index(teams)
+        winners = schedule[points_table_simulator.tournament_schedule_winning_team_column_name].astype(object).fillna("").to_numpy()
+        results = team_codes.get_indexer(winners).astype(TEAM_CODE_DTYPE)
+        results[results == UNDECIDED] = UNAWARDED
+        results[winners == "No Result"] = NO_RESULT
+        results[winners == "Draw"] = DRAW
+        for undecided_result in UNDECIDED_RESULTS:
+            results[winners == undecided_result] = UNDECIDED
+        return cls(
+            teams,
+            team_codes.get_indexer(schedule[points_table_simulator.tournament_schedule_home_team_column_name]),
+            team_codes.get_indexer(schedule[points_table_simulator.tournament_schedule_away_team_column_name]),
+            results,
+            points_for_a_win=points_table_simulator.points_for_a_win,
+            points_for_a_draw=points_table_simulator.points_for_a_draw,
+            points_for_a_no_result=points_table_simulator.points_for_a_no_result,
+        )
+
+    @property
+    def number_of_teams(self) -> int:
+        return len(self.teams)
+
+    @property
+    def number_of_matches(self) -> int:
+        return len(self.results)
+
+    def get_remaining_matches(self) -> List[Match]:
+        """Returns the home and away team codes of the remaining matches, in schedule order."""
+        positions = self.remaining_match_positions
+        return [
+            Match(home_team, away_team)
+            for home_team, away_team in zip(self.home_teams[positions].tolist(), self.away_teams[positions].tolist())
+        ]
+
+    def get_standings_after(self, winners: Sequence[int]) -> Standings:
+        """
+        Returns the standings once the remaining matches are played with the given winners.
+
+        Parameters:
+            winners (Sequence[int]): Winning team code of every remaining match, in schedule order.
+
+        Returns:
+            Standings: The final standings.
+        """
+        positions = self.remaining_match_positions
+        wins = self._count(np.asarray(winners, dtype=TEAM_CODE_DTYPE))
+        return Standings(
+            matches_played=self.standings.matches_played + self._count(self.home_teams[positions]) + self._count(self.away_teams[positions]),
+            matches_won=self.standings.matches_won + wins,
+            matches_drawn=self.standings.matches_drawn,
+            matches_with_no_result=self.standings.matches_with_no_result,
+            remaining_matches=np.zeros(self.number_of_teams, dtype=COUNT_DTYPE),
+            points=self.standings.points + self.points_for_a_win * wins,
+        )
+
+    def get_current_points_table(self) -> pd.DataFrame:
+        """Converts the current standings to a points table in the `PointsTableSimulator` layout, by points."""
+        return self.standings.to_dataframe(self.teams).sort_values(by="points", ascending=False, kind="stable").reset_index(drop=True)
+
+    def _count(self, team_codes: np.ndarray) -> np.ndarray:
+        return np.bincount(team_codes, minlength=self.number_of_teams).astype(COUNT_DTYPE)
+
+    def _compute_standings(self) -> Standings:
+        is_decided = self.results != UNDECIDED
+        is_drawn = self.results == DRAW
+        has_no_result = self.results == NO_RESULT
+
+        def _count_both_teams(mask: np.ndarray) -> np.ndarray:
+            return self._count(self.home_teams[mask]) + self._count(self.away_teams[mask])
+
+        matches_won = self._count(self.results[self.results >= 0])
+        matches_drawn = _count_both_teams(is_drawn)
+        matches_with_no_result = _count_both_teams(has_no_result)
+        return Standings(
+            matches_played=_count_both_teams(is_decided),
+            matches_won=matches_won,
+            matches_drawn=matches_drawn,
+            matches_with_no_result=matches_with_no_result,
+            remaining_matches=_count_both_teams(~is_decided),
+            points=(
+                self.points_for_a_win * matches_won
+                + self.points_for_a_draw * matches_drawn
+                + self.points_for_a_no_result * matches_with_no_result
+            ).astype(COUNT_DTYPE),
+        )
@@ -0,0 +1,200 @@
+import heapq
+import logging
+import random
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+import pandas as pd
+from points_table_simulator import PointsTableSimulator
+from points_table_simulator.exceptions import AllMatchesCompletedError
+from src.functions.async_fixture_collector import (
+    revalidate_schedules_and_standings
+)
+from src.functions.fixture_collector import (
+    _parse_fixture_response,
+    _parse_points_table_response,
+    espncricinfo_fetcher,
+    mark_undecided_matches
+)
+from src.functions.http_fetcher import CachedJsonFetcher
+from src.functions.tournament_registry import (
+    RegisteredTournament,
+    load_tournament_registry
+)
+
+DEFAULT_JITTER_FRACTION = 0.1
+DEFAULT_RETRY_INTERVAL_IN_SECONDS = 30
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class TournamentSnapshot:
+    """
+    The fixture and the points table of a tournament as of one poll. Snapshots are published whole and never modified
+    afterwards, so a page reads one without any lock, and everything in it is shared by every session.
+
+    Attributes:
+        tournament (RegisteredTournament): The tournament.
+        points_table_simulator (PointsTableSimulator, optional): Simulator built from the fixture, None once every
+            league match is completed.
+        current_points_table (pd.DataFrame): The points table.
+        refreshed_at (float): `time.time` of the last poll that found the snapshot up to date.
+        version (int): Incremented whenever the fixture or the points table changes.
+    """
+
+    tournament: RegisteredTournament
+    points_table_simulator: Optional[PointsTableSimulator]
+    current_points_table: pd.DataFrame
+    refreshed_at: float
+    version: int
+
+    @property
+    def is_league_stage_completed(self) -> bool:
+        return self.points_table_simulator is None
+
+
+class TournamentRefresher:     # pylint: disable = too-many-instance-attributes
+    """
+    Polls the fixture and the points table of every registered tournament on a background thread, and publishes them as
+    immutable snapshots, so that the tournament pages render without waiting on the network.
+
+    The first poll of each tournament is staggered over a second, and every later one is spread by up to
+    `jitter_fraction` of the tournament's refresh interval, so that the polls do not line up. The schedule and the
+    standings are revalidated concurrently by the async collector, with `If-None-Match`/`If-Modified-Since` against the
+    cache of the shared fetcher, and the simulator is only rebuilt when a document differs from the one the snapshot was
+    built from. A failed poll keeps the previous snapshot, and is
+    retried after `retry_interval_in_seconds`.
+
+    Parameters:
+        tournaments (Sequence[RegisteredTournament]): The tournaments to poll.
+        fetcher (CachedJsonFetcher): Fetcher whose cache the documents are revalidated against.
+        jitter_fraction (float): Largest share of the refresh interval a poll is moved by, either way.
+        retry_interval_in_seconds (float): Time after which a failed poll is retried.
+        random_generator (random.Random, optional): Source of the jitter, replaceable in tests.
+        clock (Callable[[], float]): Monotonic clock the polls are scheduled on.
+    """
+
+    def __init__(     # pylint: disable = too-many-arguments, too-many-positional-arguments
+        self,
+        tournaments: Sequence[RegisteredTournament],
+        fetcher: CachedJsonFetcher = espncricinfo_fetcher,
+        jitter_fraction: float = DEFAULT_JITTER_FRACTION,
+        retry_interval_in_seconds: float = DEFAULT_RETRY_INTERVAL_IN_SECONDS,
+        random_generator: Optional[random.Random] = None,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.tournaments = {tournament.name: tournament for tournament in tournaments}
+        self.fetcher = fetcher
+        self.jitter_fraction = jitter_fraction
+        self.retry_interval_in_seconds = retry_interval_in_seconds
+        self.random_generator = random_generator or random.Random()
+        self.clock = clock
+        self._snapshots: Dict[str, TournamentSnapshot] = {}
+        self._responses: Dict[str, Tuple[Any, Any]] = {}
+        self._first_polls_done = {name: threading.Event() for name in self.tournaments}
+        self._lock = threading.Lock()
+        self._stop_requested = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def get_snapshot(self, tournament_name: str) -> Optional[TournamentSnapshot]:
+        """Returns the latest snapshot of a tournament, None until its first poll succeeds. Never blocks."""
+        return self._snapshots.get(tournament_name)
+
+    def wait_for_snapshot(self, tournament_name: str, timeout_in_seconds: float) -> Optional[TournamentSnapshot]:
+        """
+        Returns the latest snapshot of a tournament, waiting up to `timeout_in_seconds` for its first poll if it has
+        not been polled yet. Returns None if that poll fails or does not finish in time.
+        """
+        self._first_polls_done[tournament_name].wait(timeout_in_seconds)
+        return self.get_snapshot(tournament_name)
+
+    def start(self) -> None:
+        """Starts polling on a daemon thread, unless it is already running."""
+        with self._lock:
+            if self._thread is not None and self._thread.is_alive():
+                return
+            self._stop_requested.clear()
+            self._thread = threading.Thread(target=self._run, daemon=True, name="tournament-refresher")
+            self._thread.start()
+
+    def stop(self, timeout_in_seconds: Optional[float] = None) -> None:
+        self._stop_requested.set()
+        with self._lock:
+            thread = self._thread
+        if thread is not None:
+            thread.join(timeout_in_seconds)
+
+    def refresh(self, tournament: RegisteredTournament) -> TournamentSnapshot:
+        """
+        Polls one tournament on the caller's thread, and publishes its snapshot.
+
+        Parameters:
+            tournament (RegisteredTournament): The tournament.
+
+        Returns:
+            TournamentSnapshot: The published snapshot, the previous one with a new `refreshed_at` if nothing changed.
+
+        Raises:
+            tornado.httpclient.HTTPClientError: If a document cannot be fetched or misses its deadline.
+        """
+        schedule_response, standings_response = revalidate_schedules_and_standings([tournament.series_id], fetcher=self.fetcher)[tournament.series_id]
+        previous_snapshot = self._snapshots.get(tournament.name)
+        previous_schedule_response, previous_standings_response = self._responses.get(tournament.name, (None, None))
+        if (
+            previous_snapshot is not None
+            and schedule_response == previous_schedule_response
+            and standings_response == previous_standings_response
+        ):
+            snapshot = TournamentSnapshot(
+                tournament, previous_snapshot.points_table_simulator, previous_snapshot.current_points_table, time.time(), previous_snapshot.version
+            )
+        else:
+            snapshot = TournamentSnapshot(
+                tournament,
+                _build_points_table_simulator(tournament, _parse_fixture_response(schedule_response)),
+                _parse_points_table_response(standings_response),
+                time.time(),
+                previous_snapshot.version + 1 if previous_snapshot is not None else 1,
+            )
+        self._responses[tournament.name] = (schedule_response, standings_response)
+        self._snapshots = {**self._snapshots, tournament.name: snapshot}
+        return snapshot
+
+    def _run(self) -> None:
+        now = self.clock()
+        polls: List[Tuple[float, str]] = [
+            (now + index / len(self.tournaments), name) for index, name in enumerate(self.tournaments)
+        ]
+        heapq.heapify(polls)
+        while polls and not self._stop_requested.wait(max(polls[0][0] - self.clock(), 0)):
+            _, name = heapq.heappop(polls)
+            tournament = self.tournaments[name]
+            try:
+                self.refresh(tournament)
+                interval_in_seconds = tournament.refresh_interval_in_seconds
+            except Exception as exception:     # pylint: disable = broad-exception-caught
+                logger.warning("Refresh of %s failed, its previous snapshot is kept: %s", name, exception)
+                interval_in_seconds = self.retry_interval_in_seconds
+            self._first_polls_done[name].set()
+            jitter = self.random_generator.uniform(-self.jitter_fraction, self.jitter_fraction) * interval_in_seconds
+            heapq.heappush(polls, (self.clock() + interval_in_seconds + jitter, name))
+
+
+def _build_points_table_simulator(tournament: RegisteredTournament, tournament_df: pd.DataFrame) -> Optional[PointsTableSimulator]:
+    try:
+        return PointsTableSimulator(
+            tournament_schedule=mark_undecided_matches(tournament_df),
+            points_for_a_win=tournament.points_for_a_win,
+            points_for_a_no_result=tournament.points_for_a_no_result,
+            points_for_a_draw=tournament.points_for_a_draw,
+            tournament_schedule_away_team_column_name="team_2",
+            tournament_schedule_home_team_column_name="team_1",
+        )
+    except AllMatchesCompletedError:
+        return None
+
+
+registered_tournaments = load_tournament_registry()
+tournament_refresher = TournamentRefresher(registered_tournaments)
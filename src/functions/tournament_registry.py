@@ -0,0 +1,66 @@
+import json
+import os
+from dataclasses import dataclass
+from typing import List, Optional
+
+DEFAULT_TOURNAMENT_REGISTRY_PATH = os.environ.get(
+    "PLAYOFF_CALCULATOR_TOURNAMENTS", os.path.join(os.path.dirname(os.path.dirname(__file__)), "static", "tournaments.json")
+)   # overridable so that a deployment can list its own tournaments
+DEFAULT_REFRESH_INTERVAL_IN_SECONDS = 60
+
+
+@dataclass(frozen=True)
+class RegisteredTournament:
+    """
+    A tournament served by its own page, with the scoring rules its fixture is simulated with.
+
+    Attributes:
+        name (str): Name of the tournament, which is also the name of its page.
+        series_id (int): ESPNcricinfo seriesId of the tournament.
+        points_for_a_win (int): Points awarded for a win.
+        points_for_a_no_result (int): Points awarded to both teams of a match without a result.
+        points_for_a_draw (int): Points awarded to both teams of a drawn match.
+        refresh_interval_in_seconds (float): How often the fixture and the points table are fetched again.
+    """
+
+    name: str
+    series_id: int
+    points_for_a_win: int = 2
+    points_for_a_no_result: int = 1
+    points_for_a_draw: int = 1
+    refresh_interval_in_seconds: float = DEFAULT_REFRESH_INTERVAL_IN_SECONDS
+
+    @property
+    def fixture_source(self) -> str:
+        return f"espncricinfo:{self.series_id}"
+
+
+def load_tournament_registry(path: Optional[str] = None) -> List[RegisteredTournament]:
+    """
+    Reads the registered tournaments from a JSON file holding a list of objects with the fields of
+    `RegisteredTournament`.
+
+    Parameters:
+        path (str, optional): Path of the file. Defaults to `src/static/tournaments.json`, or the path set by the
+            `PLAYOFF_CALCULATOR_TOURNAMENTS` environment variable.
+
+    Returns:
+        List[RegisteredTournament]: The tournaments, in the order they are listed.
+
+    Raises:
+        ValueError: If a tournament is missing a field, has an unknown one, or shares its name or series ID with
+            another one.
+    """
+    with open(path or DEFAULT_TOURNAMENT_REGISTRY_PATH, encoding="utf-8") as registry_file:
+        tournament_entries = json.load(registry_file)
+    tournaments = []
+    for tournament_entry in tournament_entries:
+        try:
+            tournaments.append(RegisteredTournament(**tournament_entry))
+        except TypeError as type_error:
+            raise ValueError(f"Invalid tournament {tournament_entry!r} in the registry: {type_error}") from type_error
+    if len({tournament.name for tournament in tournaments}) < len(tournaments):
+        raise ValueError("Every tournament in the registry must have its own name")
+    if len({tournament.series_id for tournament in tournaments}) < len(tournaments):
+        raise ValueError("Every tournament in the registry must have its own series ID")
+    return tournaments
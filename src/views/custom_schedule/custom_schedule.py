@@ -1,21 +1,24 @@
 from typing import Dict
-import pandas as pd
+import pyarrow as pa
 import streamlit as st
 from points_table_simulator.exceptions import (
     InvalidColumnNamesError,
     InvalidScheduleDataError
 )
-from points_table_simulator.points_table_simulator import PointsTableSimulator
+from src.functions.qualification_counting import MatchResult
+from src.functions.schedule_ingestion import load_uploaded_schedule
+from src.functions.session_state import load_session_fixture
 from src.functions.streamlit_view_functions import (
+    PROBABILITY_MODE,
     _display_given_fixture_and_current_points_table,
-    _generate_qualification_scenarios
+    _display_qualification_probabilities,
+    _generate_qualification_scenarios,
+    _select_simulation_mode
 )
 from src.static._styles import _apply_banner_styles, _create_banner
 
-session_state = {
-    "column_name_input_form_submitted": False,
-    "generate_qualification_scenarios_inputs_submitted": False,
-}
+UPLOADED_SCHEDULE_DETAILS_KEY = "details_of_the_uploaded_schedule"
+
 
 def _get_details_of_the_uploaded_schedule() -> Dict:
     """Create form inputs for custom column names."""
@@ -40,6 +43,18 @@ def _get_details_of_the_uploaded_schedule() -> Dict:
     points_for_a_win = input_column_5.number_input("Points for a win", min_value=1, value=2)
     points_for_a_draw = input_column_6.number_input("Points for a draw", min_value=0, value=1)
     points_for_a_no_result = input_column_7.number_input("Points for a no result", min_value=0, value=1)
+    home_team_win_probability_column_name = st.text_input(
+        "Home team win probability column name (optional)",
+        value="",
+        help="Column holding the probability of the home team winning each remaining match, used by the qualification probability mode. \
+            Leave it empty to treat every match as a coin toss",
+    )
+    counted_results = st.multiselect(
+        "Results a remaining match can end in",
+        options=[result.value for result in MatchResult],
+        default=[MatchResult.WIN.value, MatchResult.DRAW.value],
+        help="Used to count the share of all outcomes of the remaining matches in which the selected team qualifies",
+    )
 
     st.write("")
 
@@ -51,6 +66,8 @@ def _get_details_of_the_uploaded_schedule() -> Dict:
         "points_for_a_win": int(points_for_a_win),
         "points_for_a_draw": int(points_for_a_draw),
         "points_for_a_no_result": int(points_for_a_no_result),
+        "home_team_win_probability_column_name": home_team_win_probability_column_name.strip(),
+        "counted_results": tuple(counted_results),
     }
 
 
@@ -72,24 +89,47 @@ def simulate_the_qualification_for_custom_schedule():
             column_name_inputs_form_submitted = st.form_submit_button("Submit")
 
         if column_name_inputs_form_submitted:
-            session_state["column_name_input_form_submitted"] = True
+            st.session_state[UPLOADED_SCHEDULE_DETAILS_KEY] = details_of_the_uploaded_schedule
 
-        if session_state["column_name_input_form_submitted"]:
+        details_of_the_uploaded_schedule = st.session_state.get(UPLOADED_SCHEDULE_DETAILS_KEY)
+        if details_of_the_uploaded_schedule is not None:
             st.write("")
-            uploaded_fixture_df = pd.read_csv(fixture)
             try:
-                points_table_simulator = PointsTableSimulator(
-                    tournament_schedule=uploaded_fixture_df,
-                    points_for_a_win=details_of_the_uploaded_schedule["points_for_a_win"],
-                    tournament_schedule_away_team_column_name=details_of_the_uploaded_schedule["away_team_column_name"],
-                    tournament_schedule_home_team_column_name=details_of_the_uploaded_schedule["home_team_column_name"],
-                    tournament_schedule_winning_team_column_name=details_of_the_uploaded_schedule["winner_team_column_name"],
-                    tournament_schedule_match_number_column_name=details_of_the_uploaded_schedule["match_number_column_name"],
+                session_fixture = load_session_fixture(
+                    "custom_schedule",
+                    (fixture.file_id, tuple(details_of_the_uploaded_schedule.items())),
+                    lambda: (
+                        load_uploaded_schedule(
+                            fixture.getvalue(),
+                            home_team_column_name=details_of_the_uploaded_schedule["home_team_column_name"],
+                            away_team_column_name=details_of_the_uploaded_schedule["away_team_column_name"],
+                            winner_team_column_name=details_of_the_uploaded_schedule["winner_team_column_name"],
+                            match_number_column_name=details_of_the_uploaded_schedule["match_number_column_name"],
+                            points_for_a_win=details_of_the_uploaded_schedule["points_for_a_win"],
+                            points_for_a_draw=details_of_the_uploaded_schedule["points_for_a_draw"],
+                            points_for_a_no_result=details_of_the_uploaded_schedule["points_for_a_no_result"],
+                        ),
+                        None,
+                    ),
                 )
+                points_table_simulator = session_fixture.points_table_simulator
+                uploaded_fixture_df = points_table_simulator.tournament_schedule
+
+                _display_given_fixture_and_current_points_table(session_fixture.get_current_points_table(), uploaded_fixture_df)
 
-                _display_given_fixture_and_current_points_table(points_table_simulator.current_points_table, uploaded_fixture_df)
+                if _select_simulation_mode() == PROBABILITY_MODE:
+                    _display_qualification_probabilities(
+                        points_table_simulator,
+                        home_team_win_probability_column_name=details_of_the_uploaded_schedule["home_team_win_probability_column_name"],
+                    )
+                else:
+                    _generate_qualification_scenarios(
+                        points_table_simulator,
+                        counted_results=[MatchResult(result) for result in details_of_the_uploaded_schedule["counted_results"]],
+                    )
 
-                _generate_qualification_scenarios(points_table_simulator)
+            except pa.ArrowInvalid as csv_error:
+                st.error(f"Error: The uploaded file could not be read as a CSV: {csv_error}", icon="⚠️")
 
             except InvalidColumnNamesError as column_name_error:
                 st.error(f"Error: Given column '{column_name_error.column_value}' is not found in the given CSV", icon="⚠️")
@@ -1,41 +1,94 @@
+import time
+from typing import Dict, Optional
+import numpy as np
+import pandas as pd
 import streamlit as st
-from points_table_simulator import PointsTableSimulator
-from points_table_simulator.exceptions import AllMatchesCompletedError
-from src.functions.fixture_collector import (
-    fetch_points_table_for_given_tournament,
-    get_fixture_for_given_tournament
-)
+from src.functions.qualification_matrix import get_default_snapshot_path
+from src.functions.session_state import load_session_fixture
 from src.functions.streamlit_view_functions import (
+    PROBABILITY_MODE,
     _display_given_fixture_and_current_points_table,
-    _generate_qualification_scenarios
+    _display_qualification_probabilities,
+    _display_qualification_verdicts,
+    _generate_qualification_scenarios,
+    _select_simulation_mode
+)
+from src.functions.tournament_refresher import (
+    TournamentSnapshot,
+    tournament_refresher
 )
+from src.functions.tournament_registry import RegisteredTournament
 from src.views.custom_schedule.custom_schedule import (
     _apply_banner_styles,
     _create_banner
 )
 
+FIRST_SNAPSHOT_TIMEOUT_IN_SECONDS = 30
+
+
+def _get_tournament_snapshot(tournament: RegisteredTournament) -> Optional[TournamentSnapshot]:
+    """
+    Returns the latest snapshot of the tournament, published by the background refresher. Only the first page view of a
+    freshly started app waits, for the first poll of the tournament.
+    """
+    tournament_refresher.start()
+    snapshot = tournament_refresher.get_snapshot(tournament.name)
+    if snapshot is None:
+        with st.spinner("Fetching the fixture and the points table..."):
+            snapshot = tournament_refresher.wait_for_snapshot(tournament.name, FIRST_SNAPSHOT_TIMEOUT_IN_SECONDS)
+    return snapshot
+
 
-def simulate_for_ipl():
-    tournament_df = None
+def _get_net_run_rates(current_points_table: pd.DataFrame) -> Optional[Dict[str, float]]:
+    if "nrr" not in current_points_table.columns:
+        return None
+    net_run_rates = np.nan_to_num(np.asarray(pd.to_numeric(current_points_table["nrr"], errors="coerce"), dtype=np.float64))
+    return dict(zip(current_points_table["team"], net_run_rates.tolist()))
+
+
+def simulate_for_tournament(tournament: RegisteredTournament):
+    """
+    Displays the page of a registered tournament, from the latest snapshot of its fixture and points table. The page
+    never calls ESPNcricinfo itself.
+
+    Parameters:
+        tournament (RegisteredTournament): The tournament.
+    """
     _apply_banner_styles()
-    _create_banner(subtitle="For Indian Premier League")
+    _create_banner(subtitle=f"For {tournament.name}")
     st.write("")
-    try:
-        with st.balloons():
-            tournament_df = get_fixture_for_given_tournament(1410320)
-            points_table_simulator = PointsTableSimulator(
-                tournament_schedule=tournament_df,
-                points_for_a_win=2,
-                tournament_schedule_away_team_column_name="team_2",
-                tournament_schedule_home_team_column_name="team_1",
-            )
-            _display_given_fixture_and_current_points_table(
-                current_points_table=fetch_points_table_for_given_tournament(1410320),
-                expanded=True,
-                remaining_fixture=tournament_df,
-            )
-
-        _generate_qualification_scenarios(points_table_simulator)
-
-    except AllMatchesCompletedError:
+    snapshot = _get_tournament_snapshot(tournament)
+    if snapshot is None:
+        st.error("The fixture of the tournament could not be fetched. Please try again in a few moments.")
+        return
+    shared_points_table_simulator = snapshot.points_table_simulator
+    if shared_points_table_simulator is None:
         st.error("All league matches in the tournament are completed.")
+        return
+    st.caption(f"Fixture and points table updated {time.time() - snapshot.refreshed_at:.0f} seconds ago.")
+
+    with st.balloons():
+        session_fixture = load_session_fixture(
+            "tournament",
+            tournament.series_id,
+            lambda: (shared_points_table_simulator, snapshot.current_points_table),
+            maximum_age_in_seconds=0,
+        )
+        points_table_simulator = session_fixture.points_table_simulator
+        current_points_table = session_fixture.get_current_points_table()
+        _display_given_fixture_and_current_points_table(
+            current_points_table=current_points_table,
+            expanded=True,
+            remaining_fixture=points_table_simulator.tournament_schedule,
+        )
+
+    _display_qualification_verdicts(points_table_simulator)
+    if _select_simulation_mode() == PROBABILITY_MODE:
+        _display_qualification_probabilities(points_table_simulator)
+    else:
+        _generate_qualification_scenarios(
+            points_table_simulator,
+            fixture_source=tournament.fixture_source,
+            qualification_matrix_snapshot_path=get_default_snapshot_path(tournament.series_id),
+            net_run_rates=_get_net_run_rates(current_points_table),
+        )
@@ -0,0 +1,110 @@
+"""
+Brute-force references for the exact algorithms, on tournaments small enough to list every outcome of the remaining
+matches.
+"""
+import itertools
+import random
+from typing import Iterator, List, Optional, Sequence, Tuple
+import pandas as pd
+from points_table_simulator import PointsTableSimulator
+from src.functions.qualification_scenario_search import (
+    QualificationScenarioSearch
+)
+from src.functions.qualification_verdict import can_finish_in_top_positions
+
+ScheduledMatch = Tuple[str, str, Optional[str]]
+RESULTS_OTHER_THAN_A_WIN = ("Draw", "No Result")
+
+
+def generate_small_tournaments(number_of_tournaments: int, seed: int = 0) -> Iterator[List[ScheduledMatch]]:
+    """
+    Generates round-robin schedules of 4 or 5 teams with 3 to 6 matches left, whose completed matches include draws and
+    matches without a result.
+    """
+    random_generator = random.Random(seed)
+    for _ in range(number_of_tournaments):
+        teams = [f"Team {team_number + 1}" for team_number in range(random_generator.choice((4, 5)))]
+        pairings = list(itertools.combinations(teams, 2)) * (2 if len(teams) == 4 else 1)
+        random_generator.shuffle(pairings)
+        number_of_completed_matches = len(pairings) - random_generator.randint(3, 6)
+        yield [
+            (home_team, away_team, random_generator.choice((home_team, away_team, home_team, away_team) + RESULTS_OTHER_THAN_A_WIN))
+            if match_index < number_of_completed_matches else (home_team, away_team, None)
+            for match_index, (home_team, away_team) in enumerate(pairings)
+        ]
+
+
+def build_search(scheduled_matches: Sequence[ScheduledMatch]) -> QualificationScenarioSearch:
+    tournament_schedule = pd.DataFrame([
+        {"match_number": match_index + 1, "team_1": home_team, "team_2": away_team, "winner": winner}
+        for match_index, (home_team, away_team, winner) in enumerate(scheduled_matches)
+    ])
+    return QualificationScenarioSearch(PointsTableSimulator(
+        tournament_schedule=tournament_schedule,
+        points_for_a_win=2,
+        tournament_schedule_away_team_column_name="team_2",
+        tournament_schedule_home_team_column_name="team_1",
+    ))
+
+
+def decide_match(scheduled_matches: Sequence[ScheduledMatch], remaining_match_number: int, result: str) -> List[ScheduledMatch]:
+    """Gives a result to one of the remaining matches: "home", "away", "Draw" or "No Result"."""
+    match_index = [index for index, (_, _, winner) in enumerate(scheduled_matches) if winner is None][remaining_match_number]
+    home_team, away_team, _ = scheduled_matches[match_index]
+    winner = {"home": home_team, "away": away_team}.get(result, result)
+    return [*scheduled_matches[:match_index], (home_team, away_team, winner), *scheduled_matches[match_index + 1:]]
+
+
+def list_outcomes(search: QualificationScenarioSearch) -> List[Tuple[int, ...]]:
+    return list(itertools.product(*search.remaining_matches))
+
+
+def get_final_points(search: QualificationScenarioSearch, winners: Sequence[int]) -> List[int]:
+    points = list(search.current_points)
+    for winner in winners:
+        points[winner] += search.points_for_a_win
+    return points
+
+
+def qualifies(search: QualificationScenarioSearch, winners: Sequence[int], team_name: str, top_x_position_in_the_table: int) -> bool:
+    """Whether the team finishes within the top positions, with points ties going its way, as the app rules them."""
+    points = get_final_points(search, winners)
+    team_points = points[search.team_index[team_name]]
+    return sum(1 for other_points in points if other_points > team_points) < top_x_position_in_the_table
+
+
+def list_qualifying_outcomes(search: QualificationScenarioSearch, team_name: str, top_x_position_in_the_table: int) -> List[Tuple[int, ...]]:
+    return [winners for winners in list_outcomes(search) if qualifies(search, winners, team_name, top_x_position_in_the_table)]
+
+
+def get_minimum_number_of_wins_needed_by_trying_every_set_of_wins(
+    search: QualificationScenarioSearch, team_name: str, top_x_position_in_the_table: int
+) -> Optional[int]:
+    """Tries every set of the team's remaining matches to win, smallest sets first, and checks the rival matches exactly."""
+    selected_team = search.team_index[team_name]
+    own_matches = [match for match in search.remaining_matches if selected_team in match]
+    rival_matches = [(search.teams[home_team], search.teams[away_team]) for home_team, away_team in search.remaining_matches if selected_team not in (home_team, away_team)]
+    for number_of_wins in range(len(own_matches) + 1):
+        for won_matches in itertools.combinations(range(len(own_matches)), number_of_wins):
+            points = list(search.current_points)
+            for match_index, (home_team, away_team) in enumerate(own_matches):
+                winner = selected_team if match_index in won_matches else (away_team if home_team == selected_team else home_team)
+                points[winner] += search.points_for_a_win
+            if can_finish_in_top_positions(
+                dict(zip(search.teams, points)), rival_matches, team_name, top_x_position_in_the_table, search.points_for_a_win
+            ):
+                return number_of_wins
+    return None
+
+
+def generate_league(number_of_teams: int, number_of_remaining_matches: int, seed: int = 0) -> List[ScheduledMatch]:
+    """Generates a double round-robin league with the given number of matches left and a random winner for the others."""
+    random_generator = random.Random(seed)
+    teams = [f"Team {team_number + 1}" for team_number in range(number_of_teams)]
+    pairings = list(itertools.permutations(teams, 2))
+    random_generator.shuffle(pairings)
+    number_of_completed_matches = len(pairings) - number_of_remaining_matches
+    return [
+        (home_team, away_team, random_generator.choice((home_team, away_team)) if match_index < number_of_completed_matches else None)
+        for match_index, (home_team, away_team) in enumerate(pairings)
+    ]
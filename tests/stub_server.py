@@ -0,0 +1,141 @@
+"""
+A local stand-in for the ESPNcricinfo series API, serving JSON documents by path with an injected latency and answering
+`If-None-Match`/`If-Modified-Since` with 304 Not Modified.
+"""
+import hashlib
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List, Sequence, Tuple
+from urllib.parse import urlsplit
+
+LAST_MODIFIED = "Sun, 18 Oct 2026 00:00:00 GMT"
+TEAMS = ("Team 1", "Team 2", "Team 3")
+
+
+def get_schedule_document(results: Sequence[Tuple[str, str, str]] = ((TEAMS[0], TEAMS[1], TEAMS[0]),)) -> Dict[str, Any]:
+    """Schedule response of a round robin between `TEAMS`, whose first matches have the given home team, away team and winner."""
+    pairings = [(TEAMS[0], TEAMS[1]), (TEAMS[1], TEAMS[2]), (TEAMS[0], TEAMS[2])]
+    matches = []
+    for match_index, (home_team, away_team) in enumerate(pairings):
+        winner = results[match_index][2] if match_index < len(results) else None
+        matches.append({
+            "title": f"{match_index + 1}st Match",
+            "teams": [{"team": {"id": TEAMS.index(team), "longName": team}} for team in (home_team, away_team)],
+            "status": "RESULT" if winner is not None else "UPCOMING",
+            "statusText": f"{winner} won" if winner is not None else "Match yet to begin",
+            "winnerTeamId": TEAMS.index(winner) if winner is not None else None,
+        })
+    return {"content": {"matches": matches}}
+
+
+def get_standings_document() -> Dict[str, Any]:
+    """Standings response after `TEAMS[0]` beat `TEAMS[1]`."""
+    return {"content": {"standings": {"groups": [{"teamStats": [
+        {
+            "teamInfo": {"longName": team},
+            "rank": rank + 1,
+            "matchesPlayed": int(team != TEAMS[2]),
+            "matchesWon": int(team == TEAMS[0]),
+            "matchesLost": int(team == TEAMS[1]),
+            "matchesNoResult": 0,
+            "points": 2 * int(team == TEAMS[0]),
+            "nrr": 0.0,
+        }
+        for rank, team in enumerate(TEAMS)
+    ]}]}}}
+
+
+class StubServer:
+    """
+    Serves `documents` on localhost from a daemon thread, until `stop`. Also a context manager.
+
+    Attributes:
+        documents (Dict[str, Any]): Decoded JSON document of every path, such as "/schedule", replaceable while serving.
+        latency_in_seconds (float): Time every request waits before it is answered.
+        requested_paths (List[str]): Path of every request, in the order they arrived.
+        requested_headers (List[Dict[str, str]]): Headers of every request, in the same order.
+        not_modified_paths (List[str]): Path of every request answered with 304.
+        maximum_requests_in_flight (int): Most requests that were being answered at the same time.
+    """
+
+    def __init__(self, documents: Dict[str, Any], latency_in_seconds: float = 0.0):
+        self.documents = documents
+        self.latency_in_seconds = latency_in_seconds
+        self.requested_paths: List[str] = []
+        self.requested_headers: List[Dict[str, str]] = []
+        self.not_modified_paths: List[str] = []
+        self.maximum_requests_in_flight = 0
+        self._requests_in_flight = 0
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), self._get_handler_class())
+        self._server.daemon_threads = True
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+
+    @property
+    def url(self) -> str:
+        return f"http://127.0.0.1:{self._server.server_address[1]}"
+
+    def start(self) -> "StubServer":
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self) -> "StubServer":
+        return self.start()
+
+    def __exit__(self, *_) -> None:
+        self.stop()
+
+    def _get_handler_class(self):
+        stub_server = self
+
+        class _Handler(BaseHTTPRequestHandler):
+            def do_GET(self):     # pylint: disable = invalid-name
+                path = urlsplit(self.path).path
+                with stub_server._lock:
+                    stub_server.requested_paths.append(path)
+                    stub_server.requested_headers.append(dict(self.headers.items()))
+                    stub_server._requests_in_flight += 1
+                    stub_server.maximum_requests_in_flight = max(stub_server.maximum_requests_in_flight, stub_server._requests_in_flight)
+                try:
+                    time.sleep(stub_server.latency_in_seconds)
+                    self._answer(path)
+                finally:
+                    with stub_server._lock:
+                        stub_server._requests_in_flight -= 1
+
+            def _answer(self, path: str):
+                if path not in stub_server.documents:
+                    self.send_response(404)
+                    self.end_headers()
+                    return
+                body = json.dumps(stub_server.documents[path]).encode()
+                etag = f'"{hashlib.sha256(body).hexdigest()[:16]}"'
+                if "If-None-Match" in self.headers:     # takes precedence over If-Modified-Since
+                    is_not_modified = self.headers["If-None-Match"] == etag
+                else:
+                    is_not_modified = self.headers.get("If-Modified-Since") == LAST_MODIFIED
+                if is_not_modified:
+                    with stub_server._lock:
+                        stub_server.not_modified_paths.append(path)
+                    self.send_response(304)
+                    self.send_header("ETag", etag)
+                    self.end_headers()
+                    return
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.send_header("ETag", etag)
+                self.send_header("Last-Modified", LAST_MODIFIED)
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *_):     # pylint: disable = arguments-differ
+                pass
+
+        return _Handler
@@ -0,0 +1,72 @@
+import asyncio
+import time
+import pytest
+from tornado.httpclient import HTTPClientError
+from src.functions import async_fixture_collector
+from src.functions.async_fixture_collector import (
+    fetch_fixtures_and_points_tables,
+    fetch_fixtures_and_points_tables_async,
+    revalidate_schedules_and_standings_async
+)
+from src.functions.fixture_collector import espncricinfo_fetcher
+from src.functions.http_fetcher import CachedJsonFetcher
+from tests.stub_server import (
+    TEAMS,
+    StubServer,
+    get_schedule_document,
+    get_standings_document
+)
+
+
+@pytest.fixture(name="start_stub_server")
+def _start_stub_server(monkeypatch):
+    stub_servers = []
+
+    def start_stub_server(latency_in_seconds: float) -> StubServer:
+        stub_server = StubServer({"/schedule": get_schedule_document(), "/standings": get_standings_document()}, latency_in_seconds).start()
+        stub_servers.append(stub_server)
+        monkeypatch.setattr(async_fixture_collector, "ESPNCRICINFO_SERIES_API_URL", stub_server.url)
+        return stub_server
+
+    yield start_stub_server
+    for stub_server in stub_servers:
+        stub_server.stop()
+    espncricinfo_fetcher.clear()
+
+
+def test_requests_of_several_tournaments_run_concurrently_within_the_limit(start_stub_server):
+    stub_server = start_stub_server(latency_in_seconds=0.2)
+    start_time = time.perf_counter()
+    tournaments = asyncio.run(fetch_fixtures_and_points_tables_async(range(4), maximum_concurrent_requests=2, fetcher=CachedJsonFetcher()))
+    elapsed_time = time.perf_counter() - start_time
+    assert sorted(tournaments) == [0, 1, 2, 3]
+    assert len(stub_server.requested_paths) == 8
+    assert stub_server.maximum_requests_in_flight == 2
+    assert 0.8 <= elapsed_time < 1.5
+
+
+def test_a_request_fails_once_it_misses_its_deadline(start_stub_server):
+    start_stub_server(latency_in_seconds=1.0)
+    start_time = time.perf_counter()
+    with pytest.raises(HTTPClientError):
+        asyncio.run(fetch_fixtures_and_points_tables_async([1], request_deadline_in_seconds=0.2, fetcher=CachedJsonFetcher()))
+    assert time.perf_counter() - start_time < 0.9
+
+
+def test_sync_wrapper_parses_and_caches_the_documents(start_stub_server):
+    stub_server = start_stub_server(latency_in_seconds=0.0)
+    fixture_df, points_table_df = fetch_fixtures_and_points_tables([1])[1]
+    assert list(fixture_df["winner"]) == [TEAMS[0], "", ""]
+    assert list(points_table_df["team"]) == list(TEAMS)
+    fetch_fixtures_and_points_tables([1])
+    assert len(stub_server.requested_paths) == 2
+
+
+def test_revalidation_skips_the_cache_and_gets_304_for_unchanged_documents(start_stub_server):
+    stub_server = start_stub_server(latency_in_seconds=0.0)
+    fetcher = CachedJsonFetcher()
+    schedule_response, _ = asyncio.run(revalidate_schedules_and_standings_async([1], fetcher=fetcher))[1]
+    revalidated_schedule_response, _ = asyncio.run(revalidate_schedules_and_standings_async([1], fetcher=fetcher))[1]
+    assert len(stub_server.requested_paths) == 4
+    assert sorted(stub_server.not_modified_paths) == ["/schedule", "/standings"]
+    assert revalidated_schedule_response is schedule_response
@@ -0,0 +1,116 @@
+import threading
+import time
+import pytest
+import requests
+from src.functions.http_fetcher import (
+    CachedJsonFetcher,
+    NotModifiedWithoutCachedCopyError
+)
+from tests.stub_server import LAST_MODIFIED, StubServer, get_schedule_document
+
+TIME_TO_LIVE_IN_SECONDS = 60
+STALE_WHILE_REVALIDATE_IN_SECONDS = 900
+
+
+class ManualClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def build_fetcher(clock: ManualClock) -> CachedJsonFetcher:
+    return CachedJsonFetcher(
+        time_to_live_in_seconds=TIME_TO_LIVE_IN_SECONDS, stale_while_revalidate_in_seconds=STALE_WHILE_REVALIDATE_IN_SECONDS, clock=clock
+    )
+
+
+def wait_until(condition, timeout_in_seconds: float = 5.0) -> None:
+    deadline = time.perf_counter() + timeout_in_seconds
+    while not condition():
+        assert time.perf_counter() < deadline, "timed out"
+        time.sleep(0.01)
+
+
+def test_fresh_documents_are_served_from_the_cache():
+    clock = ManualClock()
+    fetcher = build_fetcher(clock)
+    with StubServer({"/schedule": get_schedule_document()}) as stub_server:
+        document = fetcher.get_json(f"{stub_server.url}/schedule", {"seriesId": 1})
+        clock.now += TIME_TO_LIVE_IN_SECONDS - 1
+        assert fetcher.get_json(f"{stub_server.url}/schedule", {"seriesId": 1}) is document
+        assert fetcher.get_json(f"{stub_server.url}/schedule", {"seriesId": 2}) == document
+    assert document == get_schedule_document()
+    assert stub_server.requested_paths == ["/schedule", "/schedule"]
+
+
+def test_expired_documents_are_revalidated_and_kept_when_not_modified():
+    clock = ManualClock()
+    fetcher = build_fetcher(clock)
+    with StubServer({"/schedule": get_schedule_document()}) as stub_server:
+        document = fetcher.get_json(f"{stub_server.url}/schedule")
+        clock.now += TIME_TO_LIVE_IN_SECONDS + STALE_WHILE_REVALIDATE_IN_SECONDS
+        assert fetcher.get_json(f"{stub_server.url}/schedule") is document
+        assert fetcher.revalidate_json(f"{stub_server.url}/schedule") is document
+    assert stub_server.not_modified_paths == ["/schedule", "/schedule"]
+    conditional_headers = stub_server.requested_headers[-1]
+    assert conditional_headers["If-Modified-Since"] == LAST_MODIFIED
+    assert "If-None-Match" in conditional_headers
+
+
+def test_stale_documents_are_served_while_they_are_revalidated():
+    clock = ManualClock()
+    fetcher = build_fetcher(clock)
+    with StubServer({"/schedule": get_schedule_document()}) as stub_server:
+        stale_document = fetcher.get_json(f"{stub_server.url}/schedule")
+        stub_server.documents["/schedule"] = get_schedule_document(results=())
+        stub_server.latency_in_seconds = 0.5
+        clock.now += TIME_TO_LIVE_IN_SECONDS
+        start_time = time.perf_counter()
+        assert fetcher.get_json(f"{stub_server.url}/schedule") is stale_document
+        assert fetcher.get_json(f"{stub_server.url}/schedule") is stale_document
+        assert time.perf_counter() - start_time < 0.25
+        wait_until(lambda: fetcher.get_json(f"{stub_server.url}/schedule") is not stale_document)
+    assert fetcher.get_json(f"{stub_server.url}/schedule") == get_schedule_document(results=())
+    assert len(stub_server.requested_paths) == 2
+
+
+def test_concurrent_callers_share_a_single_request_per_document():
+    fetcher = build_fetcher(ManualClock())
+    documents = {}
+    with StubServer({"/schedule": get_schedule_document()}, latency_in_seconds=0.3) as stub_server:
+
+        def get_document(caller: int) -> None:
+            documents[caller] = fetcher.get_json(f"{stub_server.url}/schedule", {"seriesId": caller % 2})
+
+        callers = [threading.Thread(target=get_document, args=(caller,)) for caller in range(8)]
+        for caller in callers:
+            caller.start()
+        for caller in callers:
+            caller.join()
+    assert len(stub_server.requested_paths) == 2
+    assert stub_server.maximum_requests_in_flight == 2
+    assert all(documents[caller] is documents[caller % 2] for caller in range(8))
+
+
+def test_not_modified_without_a_cached_copy_is_an_error():
+    fetcher = build_fetcher(ManualClock())
+    with pytest.raises(NotModifiedWithoutCachedCopyError):
+        fetcher.store_response("http://127.0.0.1/schedule", None, 304, {}, b"")
+
+
+def test_document_cleared_during_revalidation_is_fetched_in_full():
+    fetcher = build_fetcher(ManualClock())
+
+    class ClearingSession(requests.Session):
+        def get(self, *args, **kwargs):     # pylint: disable = arguments-differ
+            fetcher.clear()
+            return super().get(*args, **kwargs)
+
+    with StubServer({"/schedule": get_schedule_document()}) as stub_server:
+        document = fetcher.get_json(f"{stub_server.url}/schedule")
+        fetcher.session = ClearingSession()
+        assert fetcher.revalidate_json(f"{stub_server.url}/schedule") == document
+    assert stub_server.not_modified_paths == ["/schedule"]
+    assert "If-None-Match" not in stub_server.requested_headers[-1]
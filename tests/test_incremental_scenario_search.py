@@ -0,0 +1,72 @@
+import itertools
+from typing import List, Tuple
+from src.functions.incremental_scenario_search import (
+    iterate_qualifying_outcomes_incrementally
+)
+from src.functions.qualification_conditions import (
+    iterate_diverse_qualifying_outcomes
+)
+from src.functions.qualification_scenario_search import (
+    QualificationScenarioSearch
+)
+from tests.brute_force import (
+    build_search,
+    decide_match,
+    generate_small_tournaments,
+    list_qualifying_outcomes,
+    qualifies
+)
+
+RESULTS = ("home", "away", "Draw", "No Result")
+DESIRED_NUMBER_OF_SCENARIOS = 100     # more than the outcomes of any of the tournaments, so every search lists them all
+
+
+def _search_incrementally(
+    search: QualificationScenarioSearch, team_name: str, top_x_position_in_the_table: int, fixture_source: str
+) -> List[Tuple[int, ...]]:
+    return sorted(iterate_qualifying_outcomes_incrementally(
+        search, team_name, top_x_position_in_the_table, DESIRED_NUMBER_OF_SCENARIOS,
+        lambda _: search.iterate_qualifying_outcomes(team_name, top_x_position_in_the_table),
+        fixture_source,
+    ))
+
+
+def test_every_qualifying_outcome_is_found_again_after_a_result_lands():
+    fixture_source_numbers = itertools.count()
+    for scheduled_matches in generate_small_tournaments(12):
+        search = build_search(scheduled_matches)
+        for team_name, top_x_position_in_the_table, result in itertools.product(search.teams, range(1, len(search.teams)), RESULTS):
+            fixture_source = f"test:{next(fixture_source_numbers)}"
+            assert _search_incrementally(search, team_name, top_x_position_in_the_table, fixture_source) == sorted(
+                list_qualifying_outcomes(search, team_name, top_x_position_in_the_table)
+            )
+            next_search = build_search(decide_match(scheduled_matches, 0, result))
+            assert _search_incrementally(next_search, team_name, top_x_position_in_the_table, fixture_source) == sorted(
+                list_qualifying_outcomes(next_search, team_name, top_x_position_in_the_table)
+            )
+
+
+
+def _search_diverse_outcomes_incrementally(
+    search: QualificationScenarioSearch, team_name: str, top_x_position_in_the_table: int, fixture_source: str
+) -> List[Tuple[int, ...]]:
+    return list(iterate_qualifying_outcomes_incrementally(
+        search, team_name, top_x_position_in_the_table, DESIRED_NUMBER_OF_SCENARIOS,
+        lambda _: iterate_diverse_qualifying_outcomes(search, team_name, top_x_position_in_the_table),
+        fixture_source,
+    ))
+
+
+def test_diverse_scenarios_are_found_again_after_a_result_lands():
+    fixture_source_numbers = itertools.count()
+    for scheduled_matches in generate_small_tournaments(12, seed=2):
+        search = build_search(scheduled_matches)
+        for team_name, top_x_position_in_the_table, result in itertools.product(search.teams, range(1, len(search.teams)), RESULTS):
+            fixture_source = f"test-diverse:{next(fixture_source_numbers)}"
+            for current_search in (search, build_search(decide_match(scheduled_matches, 0, result))):
+                if not list_qualifying_outcomes(current_search, team_name, top_x_position_in_the_table):
+                    break     # the page and the API reject the request before searching
+                outcomes = _search_diverse_outcomes_incrementally(current_search, team_name, top_x_position_in_the_table, fixture_source)
+                assert outcomes
+                assert len(set(outcomes)) == len(outcomes)
+                assert all(qualifies(current_search, outcome, team_name, top_x_position_in_the_table) for outcome in outcomes)
@@ -0,0 +1,33 @@
+import itertools
+import time
+import pytest
+from src.functions.net_run_rate import (
+    NetRunRateRanking,
+    NetRunRateSearchBudgetExhaustedError,
+    NetRunRateVerdict
+)
+from tests.brute_force import build_search, generate_league
+
+
+def test_outcomes_are_those_the_team_does_not_miss_out_on():
+    search = build_search(generate_league(6, 8, seed=2))
+    for team_name, top_x_position_in_the_table in itertools.product(search.teams, (1, 3)):
+        net_run_rate_ranking = NetRunRateRanking(search.tournament_model, {team: float(team_number) for team_number, team in enumerate(search.teams)})
+        selected_team = search.team_index[team_name]
+        expected_outcomes = [
+            winners for winners in search.iterate_qualifying_outcomes(team_name, top_x_position_in_the_table)
+            if net_run_rate_ranking.assess(winners, selected_team, top_x_position_in_the_table).verdict != NetRunRateVerdict.MISSES_OUT_ON_NET_RUN_RATE
+        ]
+        outcomes = [winners for winners, _ in net_run_rate_ranking.iterate_qualifying_outcomes(search, team_name, top_x_position_in_the_table)]
+        assert outcomes == expected_outcomes
+
+
+def test_search_budget_is_honoured_when_every_outcome_misses_out_on_net_run_rate():
+    search = build_search(generate_league(10, 34, seed=8))
+    team_name = "Team 7"
+    net_run_rate_ranking = NetRunRateRanking(search.tournament_model, {team: -20.0 if team == team_name else 0.0 for team in search.teams})
+    start_time = time.perf_counter()
+    with pytest.raises(NetRunRateSearchBudgetExhaustedError) as budget_exhausted_error:
+        list(net_run_rate_ranking.iterate_qualifying_outcomes(search, team_name, 1, budget_in_seconds=0.2))
+    assert time.perf_counter() - start_time < 1.5
+    assert budget_exhausted_error.value.number_of_scenarios_found == 0
@@ -0,0 +1,75 @@
+import itertools
+import time
+import pytest
+from src.functions import parallel_scenario_search
+from src.functions.net_run_rate import (
+    NetRunRateRanking,
+    NetRunRateSearchBudgetExhaustedError
+)
+from src.functions.parallel_scenario_search import (
+    find_qualifying_outcomes_in_parallel
+)
+from tests.brute_force import (
+    build_search,
+    generate_league,
+    list_qualifying_outcomes
+)
+
+
+@pytest.fixture(autouse=True)
+def shut_down_the_shared_worker_pool():
+    yield
+    parallel_scenario_search.shutdown_worker_pool()
+
+
+def test_workers_find_every_qualifying_outcome_once():
+    search = build_search(generate_league(6, 8, seed=2))
+    for team_name, top_x_position_in_the_table in itertools.product(search.teams[:3], (1, 3)):
+        expected_outcomes = list_qualifying_outcomes(search, team_name, top_x_position_in_the_table)
+        outcomes = find_qualifying_outcomes_in_parallel(search, team_name, top_x_position_in_the_table, 10 ** 6, number_of_workers=2)
+        assert sorted(outcomes) == sorted(expected_outcomes)
+
+
+def test_workers_stop_at_the_maximum_number_of_outcomes():
+    search = build_search(generate_league(6, 12, seed=4))
+    team_name = search.teams[0]
+    expected_outcomes = set(list_qualifying_outcomes(search, team_name, 3))
+    outcomes = find_qualifying_outcomes_in_parallel(search, team_name, 3, 5, number_of_workers=2)
+    assert len(outcomes) == 5
+    assert set(outcomes) <= expected_outcomes
+
+
+def test_net_run_rate_outcomes_are_filtered_by_the_workers():
+    search = build_search(generate_league(6, 8, seed=2))
+    net_run_rate_ranking = NetRunRateRanking(search.tournament_model, {team: float(team_number) for team_number, team in enumerate(search.teams)})
+    for team_name in search.teams:
+        expected_outcomes = list(net_run_rate_ranking.iterate_qualifying_outcomes(search, team_name, 3))
+        outcomes = list(net_run_rate_ranking.iterate_qualifying_outcomes_in_parallel(search, team_name, 3, 10 ** 6))
+        assert sorted(outcomes, key=lambda outcome: outcome[0]) == sorted(expected_outcomes, key=lambda outcome: outcome[0])
+
+
+def test_parallel_search_budget_is_honoured():
+    search = build_search(generate_league(10, 34, seed=8))
+    team_name = "Team 7"
+    net_run_rate_ranking = NetRunRateRanking(search.tournament_model, {team: -20.0 if team == team_name else 0.0 for team in search.teams})
+    start_time = time.perf_counter()
+    with pytest.raises(NetRunRateSearchBudgetExhaustedError) as budget_exhausted_error:
+        list(net_run_rate_ranking.iterate_qualifying_outcomes_in_parallel(search, team_name, 1, 3, budget_in_seconds=0.5))
+    assert time.perf_counter() - start_time < 1.5
+    assert budget_exhausted_error.value.number_of_scenarios_found == 0
+
+
+def test_searches_reuse_the_prewarmed_worker_pool(monkeypatch):
+    monkeypatch.setattr(parallel_scenario_search, "default_number_of_workers", lambda: 2)
+    search = build_search(generate_league(6, 8, seed=2))
+    team_name = search.teams[0]
+    parallel_scenario_search.prewarm_worker_pool()
+    worker_pool = parallel_scenario_search._shared_worker_pool
+    assert worker_pool is not None
+    worker_process_ids = set(worker_pool.executor._processes)
+    assert len(worker_process_ids) == 2
+    for maximum_number_of_outcomes in (10 ** 6, 3):
+        outcomes = find_qualifying_outcomes_in_parallel(search, team_name, 3, maximum_number_of_outcomes)
+        assert len(outcomes) == min(maximum_number_of_outcomes, len(list_qualifying_outcomes(search, team_name, 3)))
+    assert parallel_scenario_search._shared_worker_pool is worker_pool
+    assert set(worker_pool.executor._processes) == worker_process_ids
@@ -0,0 +1,58 @@
+import itertools
+import pytest
+from src.functions.qualification_conditions import (
+    MatchCondition,
+    derive_qualification_conditions,
+    iterate_diverse_qualifying_outcomes
+)
+from tests.brute_force import (
+    build_search,
+    generate_small_tournaments,
+    list_qualifying_outcomes,
+    qualifies
+)
+
+
+def _iterate_requests():
+    for scheduled_matches in generate_small_tournaments(15, seed=1):
+        search = build_search(scheduled_matches)
+        for team_name, top_x_position_in_the_table in itertools.product(search.teams, range(1, len(search.teams))):
+            yield search, team_name, top_x_position_in_the_table, list_qualifying_outcomes(search, team_name, top_x_position_in_the_table)
+
+
+def test_conditions_match_the_qualifying_outcomes():
+    for search, team_name, top_x_position_in_the_table, qualifying_outcomes in _iterate_requests():
+        if not qualifying_outcomes:
+            with pytest.raises(ValueError):
+                derive_qualification_conditions(search, team_name, top_x_position_in_the_table)
+            continue
+        selected_team = search.team_index[team_name]
+        minimum_number_of_wins_needed = min(outcome.count(selected_team) for outcome in qualifying_outcomes)
+        for known_minimum_number_of_wins in (None, minimum_number_of_wins_needed):
+            conditions = derive_qualification_conditions(search, team_name, top_x_position_in_the_table, known_minimum_number_of_wins)
+            for match_index, condition in enumerate(conditions.match_conditions):
+                winners = {outcome[match_index] for outcome in qualifying_outcomes}
+                assert (match_index in conditions.required_winners) == (len(winners) == 1)
+                if match_index in conditions.required_winners:
+                    assert winners == {conditions.required_winners[match_index]}
+                if condition == MatchCondition.DOES_NOT_MATTER:
+                    home_team, away_team = search.remaining_matches[match_index]
+                    for outcome in qualifying_outcomes:
+                        flipped_outcome = list(outcome)
+                        flipped_outcome[match_index] = away_team if outcome[match_index] == home_team else home_team
+                        assert qualifies(search, flipped_outcome, team_name, top_x_position_in_the_table)
+
+
+def test_diverse_outcomes_qualify_and_differ_in_the_matches_that_matter():
+    for search, team_name, top_x_position_in_the_table, qualifying_outcomes in _iterate_requests():
+        if not qualifying_outcomes:
+            continue
+        conditions = derive_qualification_conditions(search, team_name, top_x_position_in_the_table)
+        outcomes = list(iterate_diverse_qualifying_outcomes(search, team_name, top_x_position_in_the_table, conditions))
+        assert outcomes
+        assert all(qualifies(search, outcome, team_name, top_x_position_in_the_table) for outcome in outcomes)
+        relevant_results = [tuple(outcome[match_index] for match_index in conditions.relevant_matches) for outcome in outcomes]
+        assert len(set(relevant_results)) == len(relevant_results)
+        assert set(relevant_results) == {
+            tuple(outcome[match_index] for match_index in conditions.relevant_matches) for outcome in qualifying_outcomes
+        }
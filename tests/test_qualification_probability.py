@@ -0,0 +1,64 @@
+import numpy as np
+import pytest
+from src.functions.qualification_probability import (
+    PositionProbabilities,
+    estimate_position_probabilities
+)
+
+CURRENT_POINTS = {"Team 1": 4, "Team 2": 2, "Team 3": 2, "Team 4": 0}
+REMAINING_MATCHES = [("Team 1", "Team 2"), ("Team 3", "Team 4"), ("Team 2", "Team 3"), ("Team 4", "Team 1")]
+
+
+def test_the_same_seed_reproduces_the_same_estimate():
+    estimates = [
+        estimate_position_probabilities(CURRENT_POINTS, REMAINING_MATCHES, 2, seed=seed, maximum_number_of_samples=20_000, chunk_size=3_000)
+        for seed in (7, 7, 8)
+    ]
+    assert estimates[0].number_of_samples == estimates[1].number_of_samples == 20_000
+    assert np.array_equal(estimates[0].position_counts, estimates[1].position_counts)
+    assert not np.array_equal(estimates[0].position_counts, estimates[2].position_counts)
+
+
+def test_home_team_win_probabilities_weight_the_outcomes():
+    position_probabilities = estimate_position_probabilities(
+        {"Home": 0, "Away": 0}, [("Home", "Away")], 2, home_team_win_probabilities=[0.8], seed=0, maximum_number_of_samples=200_000
+    )
+    lower_bounds, upper_bounds = position_probabilities.confidence_intervals()
+    assert lower_bounds[0, 0] <= 0.8 <= upper_bounds[0, 0]
+    assert position_probabilities.probabilities[0, 0] == pytest.approx(0.8, abs=0.01)
+
+    certain_estimate = estimate_position_probabilities(
+        CURRENT_POINTS, REMAINING_MATCHES, 2, home_team_win_probabilities=[1, 1, 0, 0], seed=0, maximum_number_of_samples=1_000
+    )
+    assert certain_estimate.top_positions_probabilities(1).iloc[0].to_dict() == {
+        "team": "Team 1", "probability": 1.0, "lower_bound": pytest.approx(0.996, abs=0.001), "upper_bound": 1.0
+    }
+
+
+def test_wilson_intervals_are_bounded_and_contain_the_estimate():
+    position_probabilities = PositionProbabilities(["Team 1", "Team 2"], np.array([[50, 50], [50, 50]]), 100)
+    lower_bounds, upper_bounds = position_probabilities.confidence_intervals()
+    assert lower_bounds[0, 0] == pytest.approx(0.4038, abs=1e-4)
+    assert upper_bounds[0, 0] == pytest.approx(0.5962, abs=1e-4)
+
+    counts = np.arange(0, 101)
+    lower_bounds, upper_bounds = position_probabilities.confidence_intervals(counts)
+    assert lower_bounds[0] == 0 and upper_bounds[-1] == pytest.approx(1)
+    probabilities = counts / 100
+    assert np.all((0 <= lower_bounds) & (lower_bounds <= probabilities) & (probabilities <= upper_bounds + 1e-12) & (upper_bounds <= 1))
+
+
+def test_sampling_stops_early_once_the_intervals_are_narrow_enough_or_when_cancelled():
+    def estimate(**kwargs) -> PositionProbabilities:
+        return estimate_position_probabilities(CURRENT_POINTS, REMAINING_MATCHES, 2, seed=0, maximum_number_of_samples=10 ** 6, chunk_size=10_000, **kwargs)
+
+    narrow_enough_estimate = estimate(confidence_interval_half_width=0.01)
+    assert narrow_enough_estimate.number_of_samples == 10_000
+    assert narrow_enough_estimate.maximum_confidence_interval_half_width() <= 0.01
+    assert estimate(confidence_interval_half_width=0.004).number_of_samples == 60_000
+    assert estimate(is_cancelled=lambda: True).number_of_samples == 10_000
+
+
+def test_teams_missing_from_the_points_table_are_rejected():
+    with pytest.raises(ValueError, match="Team 5"):
+        estimate_position_probabilities(CURRENT_POINTS, REMAINING_MATCHES + [("Team 1", "Team 5")], 2, seed=0)
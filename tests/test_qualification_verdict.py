@@ -0,0 +1,57 @@
+import itertools
+from src.functions import qualification_verdict
+from src.functions.qualification_verdict import QualificationVerdict
+from tests.brute_force import (
+    build_search,
+    generate_league,
+    generate_small_tournaments,
+    get_minimum_number_of_wins_needed_by_trying_every_set_of_wins,
+    list_outcomes,
+    qualifies
+)
+
+
+def _get_expected_verdict(search, outcomes, team_name, top_x_position_in_the_table):
+    number_of_qualifying_outcomes = sum(qualifies(search, outcome, team_name, top_x_position_in_the_table) for outcome in outcomes)
+    if number_of_qualifying_outcomes == 0:
+        return QualificationVerdict.ELIMINATED
+    if number_of_qualifying_outcomes == len(outcomes):
+        return QualificationVerdict.CLINCHED
+    return QualificationVerdict.IN_CONTENTION
+
+
+def test_verdicts_match_the_outcomes_in_which_the_team_qualifies():
+    for scheduled_matches in generate_small_tournaments(25, seed=3):
+        search = build_search(scheduled_matches)
+        outcomes = list_outcomes(search)
+        for team_name, top_x_position_in_the_table in itertools.product(search.teams, range(1, len(search.teams))):
+            expected_verdict = _get_expected_verdict(search, outcomes, team_name, top_x_position_in_the_table)
+            assert search.get_qualification_verdict(team_name, top_x_position_in_the_table) == expected_verdict
+
+
+def test_verdicts_left_unsettled_by_the_work_limit_fall_back_to_in_contention(monkeypatch):
+    monkeypatch.setattr(qualification_verdict, "MAXIMUM_NUMBER_OF_ASSIGNMENTS", 0)
+    for scheduled_matches in generate_small_tournaments(25, seed=3):
+        search = build_search(scheduled_matches)
+        outcomes = list_outcomes(search)
+        for team_name, top_x_position_in_the_table in itertools.product(search.teams, range(1, len(search.teams))):
+            expected_verdict = _get_expected_verdict(search, outcomes, team_name, top_x_position_in_the_table)
+            verdict = search.get_qualification_verdict(team_name, top_x_position_in_the_table)
+            assert verdict in (expected_verdict, QualificationVerdict.IN_CONTENTION)
+
+
+def test_minimum_number_of_wins_needed_matches_every_set_of_wins_in_a_league():
+    search = build_search(generate_league(10, 40, seed=4))
+    for team_name, top_x_position_in_the_table in itertools.product(search.teams, (1, 4, 8)):
+        expected_number_of_wins = get_minimum_number_of_wins_needed_by_trying_every_set_of_wins(search, team_name, top_x_position_in_the_table)
+        assert search.get_minimum_number_of_wins_needed(team_name, top_x_position_in_the_table) == expected_number_of_wins
+
+
+def test_minimum_number_of_wins_needed_is_settled_for_a_team_with_many_matches_left():
+    search = build_search(generate_league(20, 170, seed=7))
+    team_name = max(search.teams, key=lambda team: sum(search.team_index[team] in match for match in search.remaining_matches))
+    number_of_remaining_matches = sum(search.team_index[team_name] in match for match in search.remaining_matches)
+    assert number_of_remaining_matches > 20
+    for top_x_position_in_the_table in (1, 4, 10):
+        minimum_number_of_wins_needed = search.get_minimum_number_of_wins_needed(team_name, top_x_position_in_the_table)
+        assert minimum_number_of_wins_needed is not None and 0 <= minimum_number_of_wins_needed <= number_of_remaining_matches
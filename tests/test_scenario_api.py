@@ -0,0 +1,197 @@
+import asyncio
+import json
+import threading
+import urllib.error
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional, Tuple
+import pytest
+import tornado.httpserver
+import tornado.testing
+from api_server import make_application
+from src.functions import scenario_api
+from src.functions.scenario_api import Query, QueryError, ScenarioApi
+from src.functions.tournament_refresher import TournamentSnapshot
+from src.functions.tournament_registry import RegisteredTournament
+from tests.brute_force import build_search, generate_league
+
+LEAGUE = RegisteredTournament("League", 910001)
+COMPLETED_LEAGUE = RegisteredTournament("Completed League", 910002)
+EARLY_LEAGUE = RegisteredTournament("Early League", 910003)
+UNFETCHED_LEAGUE = RegisteredTournament("Unfetched League", 910004)
+TEAM_IN_CONTENTION = "Team 4"
+ELIMINATED_TEAM = "Team 1"     # cannot finish first in the league
+
+
+class StubRefresher:
+    """Publishes fixed snapshots, in place of the refresher that polls ESPNcricinfo."""
+
+    def __init__(self):
+        self.tournaments = {tournament.name: tournament for tournament in (LEAGUE, COMPLETED_LEAGUE, EARLY_LEAGUE, UNFETCHED_LEAGUE)}
+        self.snapshots: Dict[str, Optional[TournamentSnapshot]] = {
+            LEAGUE.name: self._build_snapshot(LEAGUE, number_of_remaining_matches=4),
+            COMPLETED_LEAGUE.name: self._build_snapshot(COMPLETED_LEAGUE, number_of_remaining_matches=0),
+            EARLY_LEAGUE.name: self._build_snapshot(EARLY_LEAGUE, number_of_remaining_matches=25),
+        }
+        self.number_of_starts = 0
+
+    @staticmethod
+    def _build_snapshot(tournament: RegisteredTournament, number_of_remaining_matches: int) -> TournamentSnapshot:
+        points_table_simulator = build_search(generate_league(6, max(number_of_remaining_matches, 1), seed=0)).points_table_simulator
+        return TournamentSnapshot(
+            tournament,
+            points_table_simulator if number_of_remaining_matches else None,
+            points_table_simulator.current_points_table,
+            refreshed_at=0.0,
+            version=1,
+        )
+
+    def get_snapshot(self, tournament_name: str) -> Optional[TournamentSnapshot]:
+        return self.snapshots.get(tournament_name)
+
+    def wait_for_snapshot(self, tournament_name: str, timeout_in_seconds: float) -> Optional[TournamentSnapshot]:     # pylint: disable = unused-argument
+        return self.snapshots.get(tournament_name)
+
+    def start(self) -> None:
+        self.number_of_starts += 1
+
+
+@pytest.fixture(name="api")
+def fixture_api() -> ScenarioApi:
+    return ScenarioApi(StubRefresher(), first_snapshot_timeout_in_seconds=0)
+
+
+def get_final_documents(documents: List[Dict]) -> Dict[int, Dict]:
+    """The last document of every query, which is the one of its kind or its error."""
+    return {document["index"]: document for document in documents}
+
+
+def test_queries_are_read_and_validated():
+    query = Query.from_document({"kind": "scenarios", "tournament": 910001, "team": "Team 4", "number_of_scenarios": "5", "seed": "7"})
+    assert query == Query("scenarios", "910001", "Team 4", number_of_scenarios=5, seed=7)
+    assert Query.from_document({"kind": "standings", "tournament": "League"}).time_budget_in_seconds == scenario_api.DEFAULT_TIME_BUDGET_IN_SECONDS
+    invalid_documents = [
+        ({"kind": "standings", "tournament": "League", "colour": "blue"}, "Unknown query fields: colour"),
+        ({"kind": "fixtures", "tournament": "League"}, "'kind' must be one of"),
+        ({"kind": "standings"}, "'tournament' is required"),
+        ({"kind": "feasibility", "tournament": "League"}, "'team' is required by feasibility queries"),
+        ({"kind": "scenarios", "tournament": "League", "team": "Team 4", "number_of_scenarios": 51}, "'number_of_scenarios' must be between 1 and 50"),
+        ({"kind": "probabilities", "tournament": "League", "seed": -1}, "'seed' must be at least 0"),
+        ({"kind": "probabilities", "tournament": "League", "time_budget_in_seconds": "soon"}, "'time_budget_in_seconds' must be a number"),
+    ]
+    for document, message in invalid_documents:
+        with pytest.raises(QueryError, match=message) as query_error:
+            Query.from_document(document)
+        assert query_error.value.status == 400
+
+
+def test_every_query_of_a_batch_ends_with_its_answer_or_its_error(api):
+    queries = [
+        Query("standings", "League"),
+        Query("feasibility", "910001", TEAM_IN_CONTENTION, top_x_position_in_the_table=2),
+        QueryError(400, "'kind' must be one of standings, feasibility, scenarios, probabilities"),
+        Query("scenarios", "League", TEAM_IN_CONTENTION, top_x_position_in_the_table=2, number_of_scenarios=2),
+        Query("probabilities", "League", top_x_position_in_the_table=2, maximum_number_of_samples=1_000, seed=0),
+        Query("scenarios", "World Cup", TEAM_IN_CONTENTION),
+        Query("feasibility", "League", "Team 9"),
+        Query("scenarios", "Completed League", TEAM_IN_CONTENTION),
+        Query("scenarios", "League", ELIMINATED_TEAM, top_x_position_in_the_table=1),
+        Query("scenarios", "Early League", TEAM_IN_CONTENTION),
+        Query("standings", "Unfetched League"),
+    ]
+    documents = list(api.iterate_answers(queries))
+    final_documents = get_final_documents(documents)
+    assert [final_documents[index]["type"] for index in range(5)] == ["standings", "feasibility", "error", "scenarios", "probabilities"]
+    assert [document["type"] for document in documents if document["index"] == 3] == ["scenario", "scenario", "scenarios"]
+    assert final_documents[3]["number_of_scenarios"] == 2 and not final_documents[3]["is_budget_exhausted"]
+    assert final_documents[4]["number_of_samples"] == 1_000
+    assert [final_documents[index]["status"] for index in range(5, len(queries))] == [404, 404, 409, 422, 422, 503]
+    assert [document["index"] for document in documents] == sorted(document["index"] for document in documents)
+
+
+def test_queries_stop_with_what_they_have_once_their_time_budget_runs_out(api):
+    queries = [
+        Query("scenarios", "League", TEAM_IN_CONTENTION, top_x_position_in_the_table=2, time_budget_in_seconds=0),
+        Query("probabilities", "League", maximum_number_of_samples=1_000_000, time_budget_in_seconds=0),
+    ]
+    final_documents = get_final_documents(list(api.iterate_answers(queries)))
+    assert final_documents[0]["number_of_scenarios"] == 0 and final_documents[0]["is_budget_exhausted"]
+    assert final_documents[1]["number_of_samples"] < 1_000_000 and final_documents[1]["is_budget_exhausted"]
+
+
+def test_queries_left_when_the_batch_budget_runs_out_are_answered_with_504(api, monkeypatch):
+    clock = [0.0]
+    monkeypatch.setattr(scenario_api.time, "monotonic", lambda: clock[0])
+    answers = api.iterate_answers([Query("standings", "League")] * 3, time_budget_in_seconds=10)
+    assert next(answers)["type"] == "standings"
+    clock[0] = 10.0
+    assert [(document["index"], document["status"]) for document in answers] == [(1, 504), (2, 504)]
+    assert list(api.iterate_answers([Query("standings", "League")], is_cancelled=lambda: True)) == []
+
+
+def test_qualification_conditions_are_derived_once_across_threads(api):
+    tournament_state = api._get_tournament_state(LEAGUE)
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        qualification_conditions = list(executor.map(
+            lambda _: tournament_state.get_qualification_conditions(TEAM_IN_CONTENTION, 2), range(8)
+        ))
+    assert all(conditions is qualification_conditions[0] for conditions in qualification_conditions)
+
+
+@pytest.fixture(name="api_url")
+def fixture_api_url(api):
+    socket, port = tornado.testing.bind_unused_port()
+    loop = asyncio.new_event_loop()
+    is_serving = threading.Event()
+    executor = ThreadPoolExecutor(max_workers=2)
+
+    def serve():
+        asyncio.set_event_loop(loop)
+        http_server = tornado.httpserver.HTTPServer(make_application(api, executor))
+        http_server.add_sockets([socket])
+        loop.call_soon(is_serving.set)
+        loop.run_forever()
+        http_server.stop()
+
+    server_thread = threading.Thread(target=serve, daemon=True)
+    server_thread.start()
+    is_serving.wait()
+    yield f"http://127.0.0.1:{port}"
+    loop.call_soon_threadsafe(loop.stop)
+    server_thread.join()
+    executor.shutdown()
+
+
+def send(url: str, body: Optional[bytes] = None) -> Tuple[int, List[Dict]]:
+    try:
+        with urllib.request.urlopen(urllib.request.Request(url, data=body), timeout=30) as response:
+            status, response_body = response.status, response.read()
+    except urllib.error.HTTPError as http_error:
+        status, response_body = http_error.code, http_error.read()
+    return status, [json.loads(line) for line in response_body.decode().splitlines()]
+
+
+def test_the_server_answers_errors_with_their_status(api_url):
+    for path, expected_status in (
+        ("/v1/tournaments/World%20Cup/standings", 404),
+        ("/v1/tournaments/League/scenarios?team=Team%209", 404),
+        ("/v1/tournaments/League/scenarios?team=Team%204&number_of_scenarios=100", 400),
+        ("/v1/tournaments/Completed%20League/scenarios?team=Team%204", 409),
+        ("/v1/tournaments/Early%20League/scenarios?team=Team%204", 422),
+        ("/v1/tournaments/League/scenarios?team=Team%201&top_x_position_in_the_table=1", 422),
+    ):
+        status, documents = send(f"{api_url}{path}")
+        assert (status, documents[-1]["type"], documents[-1]["status"]) == (expected_status, "error", expected_status), path
+
+    status, documents = send(f"{api_url}/v1/tournaments/League/scenarios?team=Team%204&top_x_position_in_the_table=2&number_of_scenarios=2")
+    assert status == 200
+    assert [document["type"] for document in documents] == ["scenario", "scenario", "scenarios"]
+
+
+def test_the_server_answers_504_to_the_queries_of_a_spent_batch(api_url):
+    queries = [{"kind": "standings", "tournament": "League"}, {"kind": "standings"}]
+    status, documents = send(f"{api_url}/v1/queries", json.dumps({"queries": queries, "time_budget_in_seconds": 0}).encode())
+    assert status == 200
+    assert [(document["index"], document["status"]) for document in documents] == [(0, 504), (1, 400)]
+    status, documents = send(f"{api_url}/v1/queries", b'{"queries": "standings"}')
+    assert (status, documents[0]["status"]) == (400, 400)
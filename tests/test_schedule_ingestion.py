@@ -0,0 +1,71 @@
+import pandas as pd
+import pyarrow as pa
+import pytest
+from points_table_simulator.exceptions import InvalidColumnNamesError
+from src.functions import schedule_ingestion
+from src.functions.schedule_ingestion import (
+    load_uploaded_schedule,
+    read_schedule_csv
+)
+
+SCHEDULE_CSV = b"""match_number,home,away,winner,venue
+1,Chennai,Mumbai,Chennai,Chepauk
+2,Delhi,Kolkata,,Kotla
+3,Mumbai,Delhi,No Result,Wankhede
+4,Kolkata,Chennai,,Eden Gardens
+"""
+COLUMN_NAMES = ("home", "away", "winner", "match_number")
+
+
+@pytest.fixture(autouse=True)
+def empty_the_schedule_cache():
+    schedule_ingestion._schedule_cache.clear()
+    yield
+    schedule_ingestion._schedule_cache.clear()
+
+
+def test_team_columns_are_categoricals_sharing_the_same_categories():
+    schedule_df = read_schedule_csv(SCHEDULE_CSV, "home", "away", "winner")
+    for column in ("home", "away"):
+        assert isinstance(schedule_df[column].dtype, pd.CategoricalDtype)
+        assert list(schedule_df[column].cat.categories) == ["Chennai", "Delhi", "Kolkata", "Mumbai"]
+    assert schedule_df["home"].cat.codes.tolist() == [0, 1, 3, 2]
+    assert schedule_df["away"].cat.codes.tolist() == [3, 2, 1, 0]
+    assert schedule_df["winner"].tolist() == ["Chennai", None, "No Result", None]
+    assert schedule_df["match_number"].dtype == "int64"
+    assert schedule_df["venue"].tolist() == ["Chepauk", "Kotla", "Wankhede", "Eden Gardens"]
+
+
+def test_team_codes_that_look_like_integers_stay_team_names():
+    schedule_df = read_schedule_csv(b"match_number,home,away,winner\n1,10,2,10\n2,2,7,\n3,7,10,\n", "home", "away", "winner")
+    assert list(schedule_df["home"].cat.categories) == ["10", "2", "7"]
+    assert schedule_df["winner"].tolist() == ["10", None, None]
+
+
+def test_the_same_upload_is_served_from_the_cache():
+    points_table_simulator = load_uploaded_schedule(SCHEDULE_CSV, *COLUMN_NAMES, points_for_a_win=2)
+    assert load_uploaded_schedule(bytes(SCHEDULE_CSV), *COLUMN_NAMES, points_for_a_win=2) is points_table_simulator
+    assert load_uploaded_schedule(SCHEDULE_CSV, *COLUMN_NAMES, points_for_a_win=4) is not points_table_simulator
+    assert load_uploaded_schedule(SCHEDULE_CSV.replace(b"Kotla", b"Delhi"), *COLUMN_NAMES, points_for_a_win=2) is not points_table_simulator
+    assert points_table_simulator.current_points_table.set_index("team")["points"].to_dict() == {
+        "Chennai": 2, "Mumbai": 1, "Delhi": 1, "Kolkata": 0
+    }
+
+
+def test_the_least_recently_used_schedule_is_evicted(monkeypatch):
+    monkeypatch.setattr(schedule_ingestion, "MAXIMUM_NUMBER_OF_CACHED_SCHEDULES", 2)
+    points_table_simulators = {
+        points_for_a_win: load_uploaded_schedule(SCHEDULE_CSV, *COLUMN_NAMES, points_for_a_win=points_for_a_win) for points_for_a_win in (2, 3)
+    }
+    load_uploaded_schedule(SCHEDULE_CSV, *COLUMN_NAMES, points_for_a_win=2)
+    load_uploaded_schedule(SCHEDULE_CSV, *COLUMN_NAMES, points_for_a_win=4)
+    assert load_uploaded_schedule(SCHEDULE_CSV, *COLUMN_NAMES, points_for_a_win=2) is points_table_simulators[2]
+    assert load_uploaded_schedule(SCHEDULE_CSV, *COLUMN_NAMES, points_for_a_win=3) is not points_table_simulators[3]
+
+
+def test_invalid_uploads_are_reported():
+    with pytest.raises(pa.ArrowInvalid):
+        load_uploaded_schedule(b"match_number,home,away,winner\n1,Chennai,Mumbai,,extra\n", *COLUMN_NAMES, points_for_a_win=2)
+    with pytest.raises(InvalidColumnNamesError):
+        load_uploaded_schedule(SCHEDULE_CSV, "home_team", "away", "winner", "match_number", points_for_a_win=2)
+    assert not schedule_ingestion._schedule_cache
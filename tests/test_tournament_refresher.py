@@ -0,0 +1,45 @@
+import time
+import pytest
+from src.functions import async_fixture_collector
+from src.functions.http_fetcher import CachedJsonFetcher
+from src.functions.tournament_refresher import TournamentRefresher
+from src.functions.tournament_registry import RegisteredTournament
+from tests.stub_server import (
+    TEAMS,
+    StubServer,
+    get_schedule_document,
+    get_standings_document
+)
+
+LATENCY_IN_SECONDS = 0.3
+TOURNAMENT = RegisteredTournament("Test League", 1)
+
+
+@pytest.fixture(name="stub_server")
+def _stub_server(monkeypatch):
+    with StubServer({"/schedule": get_schedule_document(), "/standings": get_standings_document()}, LATENCY_IN_SECONDS) as stub_server:
+        monkeypatch.setattr(async_fixture_collector, "ESPNCRICINFO_SERIES_API_URL", stub_server.url)
+        yield stub_server
+
+
+def test_schedule_and_standings_are_fetched_concurrently(stub_server):
+    refresher = TournamentRefresher([TOURNAMENT], fetcher=CachedJsonFetcher())
+    start_time = time.perf_counter()
+    snapshot = refresher.refresh(TOURNAMENT)
+    assert time.perf_counter() - start_time < 1.6 * LATENCY_IN_SECONDS
+    assert sorted(stub_server.requested_paths) == ["/schedule", "/standings"]
+    assert snapshot.version == 1
+    assert snapshot.points_table_simulator is not None
+    assert list(snapshot.current_points_table["team"]) == list(TEAMS)
+
+
+def test_unchanged_documents_are_revalidated_and_keep_the_snapshot(stub_server):
+    refresher = TournamentRefresher([TOURNAMENT], fetcher=CachedJsonFetcher())
+    first_snapshot = refresher.refresh(TOURNAMENT)
+    second_snapshot = refresher.refresh(TOURNAMENT)
+    assert sorted(stub_server.not_modified_paths) == ["/schedule", "/standings"]
+    assert second_snapshot.version == 1
+    assert second_snapshot.points_table_simulator is first_snapshot.points_table_simulator
+
+    stub_server.documents["/schedule"] = get_schedule_document(((TEAMS[0], TEAMS[1], TEAMS[0]), (TEAMS[1], TEAMS[2], TEAMS[2])))
+    assert refresher.refresh(TOURNAMENT).version == 2